@@ -1,3 +1,5 @@
+import asyncio
+
 import strawberry
 from strawberry.types import Info
 
@@ -6,6 +8,10 @@ from treasury.services.gateways.ttb_api.main.application.models.gql.label_approv
     CreateLabelApprovalJobInput,
     CreateLabelApprovalJobResponse
 )
+from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.create_label_image_upload_request import (
+    CreateLabelImageUploadInput,
+    CreateLabelImageUploadResponse
+)
 from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.update_label_approval_job_requests import (
     SetLabelApprovalJobStatusInput,
     SetLabelApprovalJobStatusResponse,
@@ -20,35 +26,53 @@ from treasury.services.gateways.ttb_api.main.application.models.gql.label_approv
 
 @strawberry.type
 class LabelApprovalJobsRelated(MutationsCommon):
+    # The service blocks on the database, blob storage and the LLM, so it is called from a worker thread
+    # to keep the event loop free for subscriptions and other requests
+
+    @strawberry.mutation  # type: ignore
+    async def create_label_approval_job(self, input: CreateLabelApprovalJobInput, info: Info) -> CreateLabelApprovalJobResponse:
+        """
+        Create a new label approval job. Returns once the job is stored, the label images are analyzed in the
+        background - follow them with labelApprovalJobUpdates, or set waitForAnalysis to get the analyzed job
+        """
+        return await asyncio.to_thread(
+            MutationsCommon._label_approval_jobs_service.create_label_approval_job,
+            info=info,
+            input=input
+        )
 
     @strawberry.mutation  # type: ignore
-    def create_label_approval_job(self, input: CreateLabelApprovalJobInput, info: Info) -> CreateLabelApprovalJobResponse:
-        """Create a new label approval job"""
-        return MutationsCommon._label_approval_jobs_service.create_label_approval_job(
+    async def create_label_image_upload(self, input: CreateLabelImageUploadInput, info: Info) -> CreateLabelImageUploadResponse:
+        """Presign a direct upload of a label image to blob storage"""
+        return await asyncio.to_thread(
+            MutationsCommon._label_approval_jobs_service.create_label_image_upload,
             info=info,
             input=input
         )
 
     @strawberry.mutation  # type: ignore
-    def set_label_approval_job_status(self, input: SetLabelApprovalJobStatusInput, info: Info) -> SetLabelApprovalJobStatusResponse:
+    async def set_label_approval_job_status(self, input: SetLabelApprovalJobStatusInput, info: Info) -> SetLabelApprovalJobStatusResponse:
         """Set the status of a label approval job"""
-        return MutationsCommon._label_approval_jobs_service.set_label_approval_job_status(
+        return await asyncio.to_thread(
+            MutationsCommon._label_approval_jobs_service.set_label_approval_job_status,
             info=info,
             input=input
         )
 
     @strawberry.mutation  # type: ignore
-    def add_review_comment(self, input: AddReviewCommentInput, info: Info) -> AddReviewCommentResponse:
+    async def add_review_comment(self, input: AddReviewCommentInput, info: Info) -> AddReviewCommentResponse:
         """Add a review comment to a label approval job"""
-        return MutationsCommon._label_approval_jobs_service.add_review_comment(
+        return await asyncio.to_thread(
+            MutationsCommon._label_approval_jobs_service.add_review_comment,
             info=info,
             input=input
         )
 
     @strawberry.mutation  # type: ignore
-    def analyze_label_approval_job(self, input: AnalyzeLabelApprovalJobInput, info: Info) -> AnalyzeLabelApprovalJobResponse:
+    async def analyze_label_approval_job(self, input: AnalyzeLabelApprovalJobInput, info: Info) -> AnalyzeLabelApprovalJobResponse:
         """Analyze label images for a label approval job"""
-        return MutationsCommon._label_approval_jobs_service.analyze_label_approval_job(
+        return await asyncio.to_thread(
+            MutationsCommon._label_approval_jobs_service.analyze_label_approval_job,
             info=info,
             input=input
         )
\ No newline at end of file
@@ -1,3 +1,5 @@
+import asyncio
+
 import strawberry
 import uuid
 from typing import Optional
@@ -13,6 +15,10 @@ from treasury.services.gateways.ttb_api.main.application.models.gql.label_approv
     GetLabelApprovalJobInput,
     GetLabelApprovalJobResponse
 )
+from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.get_label_image_ocr_overlay_request import (
+    GetLabelImageOcrOverlayInput,
+    GetLabelImageOcrOverlayResponse
+)
 from treasury.services.gateways.ttb_api.main.application.models.mappers.object_mapper import ObjectMapper
 
 
@@ -40,3 +46,17 @@ class LabelApprovalJobsRelated(QueriesCommon):
             info=info,
             input=input
         )
+
+    @strawberry.field
+    async def get_label_image_ocr_overlay(
+            self,
+            info: Info,
+            input: GetLabelImageOcrOverlayInput
+    ) -> GetLabelImageOcrOverlayResponse:
+        """Get the URL of a label image with its OCR bounding boxes drawn on, rendered once and then cached"""
+        # The first request downloads, OCRs and stores the image, for seconds - off the event loop
+        return await asyncio.to_thread(
+            QueriesCommon._label_approval_jobs_service.get_label_image_ocr_overlay,
+            info=info,
+            input=input
+        )
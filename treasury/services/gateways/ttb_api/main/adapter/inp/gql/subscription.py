@@ -0,0 +1,11 @@
+import strawberry
+
+from treasury.services.gateways.ttb_api.main.adapter.inp.gql.subscriptions.label_approval_jobs_related import \
+    LabelApprovalJobsRelated
+
+
+@strawberry.type
+class Subscription(
+    LabelApprovalJobsRelated
+):
+    pass
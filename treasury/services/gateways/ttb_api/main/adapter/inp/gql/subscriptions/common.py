@@ -0,0 +1,5 @@
+from treasury.services.gateways.ttb_api.main.application.usecases.label_approval_jobs import LabelApprovalJobsService
+
+
+class SubscriptionsCommon:
+    _label_approval_jobs_service: LabelApprovalJobsService = LabelApprovalJobsService()
@@ -0,0 +1,29 @@
+import uuid
+from typing import AsyncGenerator
+
+import strawberry
+from strawberry.types import Info
+
+from treasury.services.gateways.ttb_api.main.adapter.inp.gql.subscriptions.common import SubscriptionsCommon
+from treasury.services.gateways.ttb_api.main.application.models.dto.label_approval_job_update_dto import \
+    LabelApprovalJobUpdateDTO
+
+
+@strawberry.type
+class LabelApprovalJobsRelated(SubscriptionsCommon):
+
+    @strawberry.subscription  # type: ignore
+    async def label_approval_job_updates(
+            self,
+            info: Info,
+            job_id: uuid.UUID
+    ) -> AsyncGenerator[LabelApprovalJobUpdateDTO, None]:
+        """
+        Live progress of a label approval job: the current state first, then each pipeline stage as it completes.
+        The stream ends with analysis_done or failed
+        """
+        async for update in SubscriptionsCommon._label_approval_jobs_service.subscribe_to_label_approval_job_updates(
+            info=info,
+            job_id=job_id
+        ):
+            yield update
@@ -0,0 +1,91 @@
+import asyncio
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_upload_staging_adapter import \
+    UploadTooLargeError
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import MAX_IMAGE_SIZE_BYTES
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_uploads import LabelImageUploadsService
+from treasury.services.gateways.ttb_api.main.application.usecases.security.security_context_factory import \
+    SecurityContextFactory
+from treasury.services.gateways.ttb_api.main.application.usecases.user_management import UserManagementService
+
+
+class LabelImageUploadsRoute:
+    """
+    POST /uploads/label-images with the raw image as the request body (Content-Type: image/png, image/jpeg
+    or image/gif). The caller is authenticated like a GraphQL request (bearer token, resolved through the
+    SecurityContextFactory given to app_init) before anything is read. The body is streamed to the staging
+    area, the returned upload_id is then passed to createLabelApprovalJob as job_metadata.label_image_upload_id.
+    """
+
+    _logger = GlobalConfig.get_logger(__name__)
+    _label_image_uploads_service: LabelImageUploadsService = LabelImageUploadsService()
+
+    def __init__(
+            self,
+            security_context_factory: SecurityContextFactory,
+            user_management_service: UserManagementService = None
+    ) -> None:
+        self._security_context_factory = security_context_factory
+        self._user_management_service_lazy = user_management_service
+
+    @property
+    def _user_management_service(self) -> UserManagementService:
+        # Lazy initialization of the user management service
+        if self._user_management_service_lazy is None:
+            self._user_management_service_lazy = UserManagementService()
+        return self._user_management_service_lazy
+
+    async def upload_label_image(self, request: Request) -> JSONResponse:
+        # The token check and the user lookup block (database, key fetches) - off the event loop
+        if not await asyncio.to_thread(self._is_authenticated, request):
+            # Rejected before anything is staged
+            return self._error("Not authenticated", status_code=401)
+
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_IMAGE_SIZE_BYTES:
+            # Reject before reading any of the body
+            return self._error("Image data exceeds maximum allowed size of 10 MB", status_code=413)
+
+        try:
+            staged = await self._label_image_uploads_service.stage_upload(
+                content_type=request.headers.get("content-type"),
+                chunks=request.stream()
+            )
+        except UploadTooLargeError:
+            return self._error("Image data exceeds maximum allowed size of 10 MB", status_code=413)
+        except ValueError as e:
+            return self._error(str(e), status_code=415)
+        except Exception as e:
+            self._logger.exception(f"Error staging label image upload: {str(e)}")
+            return self._error("Error uploading label image", status_code=500)
+
+        return JSONResponse(
+            {
+                "success": True,
+                "upload_id": staged.upload_id,
+                "size_bytes": staged.size_bytes,
+                "sha256": staged.sha256,
+            },
+            status_code=201
+        )
+
+    def _is_authenticated(self, request: Request) -> bool:
+        """The same checks as the GraphQL mutations: a verified bearer token of a known user"""
+        try:
+            security_context = self._security_context_factory.from_strawberry_request(request)
+            security_context.verify_bearer_token_once()
+            authenticated_entity = security_context.get_authenticated_entity_from_security_ctx()
+            if authenticated_entity is None:
+                return False
+            return self._user_management_service.get_user_by_authenticated_entity(entity=authenticated_entity) is not None
+        except Exception as e:
+            self._logger.info(f"Label image upload not authenticated error={e}")
+            return False
+
+    @classmethod
+    def _error(cls, message: str, status_code: int) -> JSONResponse:
+        return JSONResponse({"success": False, "message": message}, status_code=status_code)
@@ -0,0 +1,91 @@
+"""Process-wide pooled HTTP clients for outbound adapters"""
+
+import importlib.util
+import threading
+from typing import Optional
+
+import httpx
+
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 30.0
+DEFAULT_WRITE_TIMEOUT_SECONDS = 60.0
+DEFAULT_POOL_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONNECTIONS_PER_CLIENT = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS_PER_CLIENT = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+
+class HttpClientProvider:
+    """
+    Hands out one long-lived httpx.Client per upstream, so connections (and their TCP/TLS handshakes)
+    are reused across requests and across adapter instances.
+
+    Each upstream gets its own connection limits, shared by all the hosts its client talks to, so a burst
+    of image downloads cannot starve the OpenAI pool. HTTP/2 is negotiated when the h2 package is installed. Timeouts and limits are
+    read from HTTP_* config, with per-upstream read timeout overrides (LLM completions are slow).
+    """
+
+    OPENAI = "openai"
+    BLOB_STORAGE = "blob-storage"
+    IMAGE_DOWNLOADS = "image-downloads"
+
+    _clients: dict[str, httpx.Client] = {}
+    _lock = threading.Lock()
+    _logger = GlobalConfig.get_logger(__name__)
+
+    @classmethod
+    def get_client(cls, upstream: str, read_timeout_seconds: Optional[float] = None) -> httpx.Client:
+        """
+        Get the shared client for an upstream, creating it on first use.
+
+        Args:
+            upstream: Pool name, one of the class constants (or any other stable name)
+            read_timeout_seconds: Read timeout for this upstream, used only when the client is created
+        """
+        with cls._lock:
+            client = cls._clients.get(upstream)
+            if client is None or client.is_closed:
+                client = cls._create_client(upstream, read_timeout_seconds)
+                cls._clients[upstream] = client
+            return client
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every pooled client (e.g. on application shutdown)"""
+        with cls._lock:
+            clients = list(cls._clients.values())
+            cls._clients.clear()
+        for client in clients:
+            client.close()
+
+    @classmethod
+    def is_http2_available(cls) -> bool:
+        return importlib.util.find_spec("h2") is not None
+
+    @classmethod
+    def _create_client(cls, upstream: str, read_timeout_seconds: Optional[float]) -> httpx.Client:
+        timeout = httpx.Timeout(
+            connect=cls._float_config("HTTP_CONNECT_TIMEOUT_SECONDS", DEFAULT_CONNECT_TIMEOUT_SECONDS),
+            read=read_timeout_seconds or cls._float_config("HTTP_READ_TIMEOUT_SECONDS", DEFAULT_READ_TIMEOUT_SECONDS),
+            write=cls._float_config("HTTP_WRITE_TIMEOUT_SECONDS", DEFAULT_WRITE_TIMEOUT_SECONDS),
+            pool=cls._float_config("HTTP_POOL_TIMEOUT_SECONDS", DEFAULT_POOL_TIMEOUT_SECONDS),
+        )
+        limits = httpx.Limits(
+            max_connections=int(cls._float_config("HTTP_MAX_CONNECTIONS_PER_CLIENT", DEFAULT_MAX_CONNECTIONS_PER_CLIENT)),
+            max_keepalive_connections=int(cls._float_config(
+                "HTTP_MAX_KEEPALIVE_CONNECTIONS_PER_CLIENT",
+                DEFAULT_MAX_KEEPALIVE_CONNECTIONS_PER_CLIENT
+            )),
+            keepalive_expiry=cls._float_config("HTTP_KEEPALIVE_EXPIRY_SECONDS", DEFAULT_KEEPALIVE_EXPIRY_SECONDS),
+        )
+        http2 = cls.is_http2_available()
+        cls._logger.info(f"Creating pooled HTTP client upstream={upstream} http2={http2} timeout={timeout} limits={limits}")
+        return httpx.Client(http2=http2, timeout=timeout, limits=limits, follow_redirects=True)
+
+    @classmethod
+    def _float_config(cls, key: str, default: float) -> float:
+        value = getattr(config, key)
+        return float(value) if value else default
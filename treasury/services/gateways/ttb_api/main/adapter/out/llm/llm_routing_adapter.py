@@ -0,0 +1,315 @@
+"""Routes LLM requests across model tiers with escalation and hedged requests"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Optional, Callable, TypeVar
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.llm.openai_adapter import OpenAiAdapter
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+T = TypeVar("T")
+
+DEFAULT_ROUTING_MODELS = [OpenAiAdapter.GPT_5_MINI, OpenAiAdapter.GPT_5_1]
+DEFAULT_HEDGE_DEADLINE_SECONDS = 30.0
+# Below this many samples the observed p95 is too noisy - the configured deadline is used instead
+MIN_LATENCY_SAMPLES_FOR_P95 = 20
+LATENCY_WINDOW_SIZE = 500
+MAX_CONCURRENT_LLM_REQUESTS = 16
+DEFAULT_METRICS_LOG_INTERVAL_SECONDS = 300.0
+
+
+class LlmModelMetrics(BaseModel):
+    """Latency and routing counters for a single model"""
+    model: str
+    requests: int = 0
+    failures: int = 0
+    rejected_outputs: int = 0
+    escalations: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
+    p50_seconds: Optional[float] = None
+    p95_seconds: Optional[float] = None
+    p99_seconds: Optional[float] = None
+
+    def summary(self) -> str:
+        return (
+            f"model={self.model} requests={self.requests} failures={self.failures} "
+            f"rejected_outputs={self.rejected_outputs} escalations={self.escalations} "
+            f"hedged_requests={self.hedged_requests} hedge_wins={self.hedge_wins} "
+            f"p50_seconds={self.p50_seconds} p95_seconds={self.p95_seconds} p99_seconds={self.p99_seconds}"
+        )
+
+
+class LlmRoutingMetrics:
+    """Thread-safe per-model latency window and escalation/hedging counters"""
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE) -> None:
+        self._window_size = window_size
+        self._latencies: dict[str, deque[float]] = {}
+        self._counters: dict[str, LlmModelMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _counters_for(self, model: str) -> LlmModelMetrics:
+        if model not in self._counters:
+            self._counters[model] = LlmModelMetrics(model=model)
+            self._latencies[model] = deque(maxlen=self._window_size)
+        return self._counters[model]
+
+    def record_request(self, model: str, latency_seconds: float, succeeded: bool) -> None:
+        with self._lock:
+            counters = self._counters_for(model)
+            counters.requests += 1
+            if succeeded:
+                self._latencies[model].append(latency_seconds)
+            else:
+                counters.failures += 1
+
+    def record_rejected_output(self, model: str) -> None:
+        with self._lock:
+            self._counters_for(model).rejected_outputs += 1
+
+    def record_escalation(self, from_model: str) -> None:
+        with self._lock:
+            self._counters_for(from_model).escalations += 1
+
+    def record_hedge(self, model: str, hedge_won: bool) -> None:
+        with self._lock:
+            counters = self._counters_for(model)
+            counters.hedged_requests += 1
+            if hedge_won:
+                counters.hedge_wins += 1
+
+    def latency_percentile(self, model: str, percentile: float) -> Optional[float]:
+        """Latency percentile (0-100) of the successful requests in the window, None without samples"""
+        with self._lock:
+            samples = sorted(self._latencies.get(model, ()))
+        return self._percentile(samples, percentile)
+
+    def sample_count(self, model: str) -> int:
+        with self._lock:
+            return len(self._latencies.get(model, ()))
+
+    def snapshot(self) -> list[LlmModelMetrics]:
+        with self._lock:
+            snapshot = []
+            for model, counters in self._counters.items():
+                samples = sorted(self._latencies[model])
+                snapshot.append(counters.model_copy(update={
+                    "p50_seconds": self._percentile(samples, 50),
+                    "p95_seconds": self._percentile(samples, 95),
+                    "p99_seconds": self._percentile(samples, 99),
+                }))
+            return snapshot
+
+    @classmethod
+    def _percentile(cls, sorted_samples: list[float], percentile: float) -> Optional[float]:
+        if not sorted_samples:
+            return None
+        # nearest-rank percentile
+        rank = max(1, math.ceil(percentile / 100.0 * len(sorted_samples)))
+        return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+class LlmRoutingAdapter:
+    """
+    Sends each request to the cheapest model tier first (LLM_ROUTING_MODELS, default gpt-5-mini then
+    gpt-5.1) and escalates to the next tier only when the output does not parse or is judged low
+    confidence. With LLM_HEDGING_ENABLED, a duplicate request is sent to the same model once the
+    model's observed p95 latency has passed and whichever response arrives first is used.
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    _shared_metrics = LlmRoutingMetrics()
+    _metrics_logger = GlobalConfig.get_logger(__name__)
+
+    def __init__(
+            self,
+            llm_client: OpenAiAdapter = None,
+            models: Optional[list[str]] = None,
+            hedging_enabled: Optional[bool] = None,
+            hedge_deadline_seconds: Optional[float] = None,
+            metrics: LlmRoutingMetrics = None
+    ) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._llm_client_lazy = llm_client
+        self._models = models or self._models_from_config()
+        self._hedging_enabled = hedging_enabled if hedging_enabled is not None else \
+            (config.LLM_HEDGING_ENABLED or "false").lower() == "true"
+        self._hedge_deadline_seconds = hedge_deadline_seconds or \
+            float(config.LLM_HEDGE_DEADLINE_SECONDS or DEFAULT_HEDGE_DEADLINE_SECONDS)
+        self._metrics = metrics or LlmRoutingAdapter._shared_metrics
+
+    @property
+    def _llm_client(self) -> OpenAiAdapter:
+        if self._llm_client_lazy is None:
+            self._llm_client_lazy = OpenAiAdapter.get_singleton_instance_of()
+        return self._llm_client_lazy
+
+    @property
+    def metrics(self) -> LlmRoutingMetrics:
+        return self._metrics
+
+    @classmethod
+    async def log_metrics_periodically(
+            cls,
+            interval_seconds: float = DEFAULT_METRICS_LOG_INTERVAL_SECONDS,
+            metrics: LlmRoutingMetrics = None
+    ) -> None:
+        """
+        Log a snapshot of the routing metrics of each model every interval_seconds until cancelled. Without
+        metrics, those shared by every adapter created without its own (the whole process) are logged.
+        """
+        metrics = metrics or cls._shared_metrics
+        while True:
+            await asyncio.sleep(interval_seconds)
+            for model_metrics in metrics.snapshot():
+                cls._metrics_logger.info(f"LLM routing metrics {model_metrics.summary()}")
+
+    @classmethod
+    def _models_from_config(cls) -> list[str]:
+        if not config.LLM_ROUTING_MODELS:
+            return list(DEFAULT_ROUTING_MODELS)
+        return [model.strip() for model in config.LLM_ROUTING_MODELS.split(",") if model.strip()]
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=MAX_CONCURRENT_LLM_REQUESTS,
+                    thread_name_prefix="llm-hedge"
+                )
+            return cls._executor
+
+    def complete_prompt(
+            self,
+            prompt: str,
+            parse: Callable[[str], T],
+            is_confident: Optional[Callable[[T], bool]] = None,
+            **kwargs
+    ) -> T:
+        """
+        Complete a text prompt, escalating across model tiers (see complete_with_routing)
+
+        Args:
+            prompt: User prompt to complete
+            parse: Converts the completion into the result, raises ValueError on schema-invalid output
+            is_confident: Optional check of the parsed result, False escalates to the next tier
+            kwargs: Passed through to OpenAiAdapter.complete_prompt
+        """
+        return self.complete_with_routing(
+            call=lambda model: self._llm_client.complete_prompt(prompt=prompt, model=model, **kwargs),
+            parse=parse,
+            is_confident=is_confident
+        )
+
+    def complete_prompt_with_media(
+            self,
+            prompt: str,
+            parse: Callable[[str], T],
+            is_confident: Optional[Callable[[T], bool]] = None,
+            **kwargs
+    ) -> T:
+        """
+        Complete a prompt with media, escalating across model tiers (see complete_with_routing)
+
+        Args:
+            prompt: User prompt to complete
+            parse: Converts the completion into the result, raises ValueError on schema-invalid output
+            is_confident: Optional check of the parsed result, False escalates to the next tier
+            kwargs: Passed through to OpenAiAdapter.complete_prompt_with_media (media_url, media_base64, ...)
+        """
+        return self.complete_with_routing(
+            call=lambda model: self._llm_client.complete_prompt_with_media(prompt=prompt, model=model, **kwargs),
+            parse=parse,
+            is_confident=is_confident
+        )
+
+    def complete_with_routing(
+            self,
+            call: Callable[[str], str],
+            parse: Callable[[str], T],
+            is_confident: Optional[Callable[[T], bool]] = None
+    ) -> T:
+        """
+        Run call(model) on each model tier in turn until the output parses and is confident.
+
+        A failed request or a parse error on the last tier is raised. A low-confidence result on the
+        last tier is returned as is - there is no better model left to ask.
+        """
+        for tier, model in enumerate(self._models):
+            is_last_tier = tier == len(self._models) - 1
+            try:
+                completion = self._call_with_hedging(call, model)
+                result = parse(completion)
+            except Exception as e:
+                if is_last_tier:
+                    raise
+                if isinstance(e, ValueError):
+                    self._metrics.record_rejected_output(model)
+                self._escalate(model, reason=f"{type(e).__name__}: {str(e)[:200]}")
+                continue
+
+            if is_confident is None or is_confident(result) or is_last_tier:
+                return result
+
+            self._metrics.record_rejected_output(model)
+            self._escalate(model, reason="low confidence output")
+
+        raise ValueError("No LLM routing models configured")
+
+    def _escalate(self, model: str, reason: str) -> None:
+        self._metrics.record_escalation(model)
+        self._logger.warning(f"Escalating LLM request from model={model} reason={reason}")
+
+    def _call_with_hedging(self, call: Callable[[str], str], model: str) -> str:
+        if not self._hedging_enabled:
+            return self._timed_call(call, model)
+
+        executor = self._get_executor()
+        primary: Future[str] = executor.submit(self._timed_call, call, model)
+        done, _ = wait([primary], timeout=self._hedge_deadline(model))
+        if done:
+            return primary.result()
+
+        # The primary request is in the slow tail - race a duplicate against it
+        hedge: Future[str] = executor.submit(self._timed_call, call, model)
+        pending = {primary, hedge}
+        first_error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self._metrics.record_hedge(model, hedge_won=future is hedge)
+                    self._logger.info(f"Hedged LLM request model={model} hedge_won={future is hedge}")
+                    # The slower request cannot be interrupted mid-flight; its result is discarded
+                    return future.result()
+                first_error = first_error or future.exception()
+
+        self._metrics.record_hedge(model, hedge_won=False)
+        raise first_error
+
+    def _hedge_deadline(self, model: str) -> float:
+        if self._metrics.sample_count(model) < MIN_LATENCY_SAMPLES_FOR_P95:
+            return self._hedge_deadline_seconds
+        return self._metrics.latency_percentile(model, 95)
+
+    def _timed_call(self, call: Callable[[str], str], model: str) -> str:
+        started = time.perf_counter()
+        try:
+            completion = call(model)
+        except Exception:
+            self._metrics.record_request(model, time.perf_counter() - started, succeeded=False)
+            raise
+        latency = time.perf_counter() - started
+        self._metrics.record_request(model, latency, succeeded=True)
+        self._logger.info(f"LLM request model={model} latency_seconds={latency:.3f}")
+        return completion
@@ -1,20 +1,24 @@
 """OpenAI Adapter for LLM operations"""
 
 import base64
-import os
+import threading
 from typing import Optional, Generator
 from pathlib import Path
 import mimetypes
 
+import httpx
 from openai import OpenAI
+from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletion
 
+from treasury.services.gateways.ttb_api.main.adapter.out.http.http_client_provider import HttpClientProvider
 from treasury.services.gateways.ttb_api.main.application.config import config
 from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
 
 SUPPORTED_IMAGE_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
 SUPPORTED_MEDIA_TYPES = SUPPORTED_IMAGE_TYPES | {'application/pdf'}
 DEFAULT_MAX_TOKENS = 4000
+DEFAULT_LLM_READ_TIMEOUT_SECONDS = 300.0
 
 class OpenAiAdapter:
 
@@ -23,7 +27,15 @@ class OpenAiAdapter:
     GPT_4O = "gpt-4o"
     DEFAULT_TEMPERATURE = 1.0
 
-    def __init__(self, api_key: Optional[str] = None, model: str = GPT_5_1) -> None:
+    _instance: Optional['OpenAiAdapter'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+            self,
+            api_key: Optional[str] = None,
+            model: str = GPT_5_1,
+            http_client: Optional[httpx.Client] = None
+    ) -> None:
         self._logger = GlobalConfig.get_logger(__name__)
         self._api_key = api_key or config.OPENAI_API_KEY
         self._model = model
@@ -31,7 +43,20 @@ class OpenAiAdapter:
         if not self._api_key:
             self._logger.warning("No OpenAI API key provided. Set OPENAI_API_KEY environment variable.")
 
-        self._client = OpenAI(api_key=self._api_key)
+        # Pooled keep-alive connections shared with every other OpenAiAdapter in the process
+        http_client = http_client or HttpClientProvider.get_client(
+            HttpClientProvider.OPENAI,
+            read_timeout_seconds=float(config.OPENAI_READ_TIMEOUT_SECONDS or DEFAULT_LLM_READ_TIMEOUT_SECONDS)
+        )
+        self._client = OpenAI(api_key=self._api_key, http_client=http_client)
+
+    @classmethod
+    def get_singleton_instance_of(cls) -> 'OpenAiAdapter':
+        """Process-wide adapter with the default model, shared by the use case services"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = OpenAiAdapter()
+            return cls._instance
 
     def complete_prompt(
             self,
@@ -39,7 +64,8 @@ class OpenAiAdapter:
             model: Optional[str] = None,
             temperature: float = DEFAULT_TEMPERATURE,
             max_tokens: Optional[int] = DEFAULT_MAX_TOKENS,
-            system_prompt: Optional[str] = None
+            system_prompt: Optional[str] = None,
+            prompt_version: Optional[str] = None
     ) -> str:
         """
         Complete a text prompt using OpenAI (non-streaming)
@@ -50,6 +76,7 @@ class OpenAiAdapter:
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
             system_prompt: Optional system prompt to set context
+            prompt_version: Optional prompt version, logged with the token usage
 
         Returns:
             Completion response as string
@@ -75,10 +102,7 @@ class OpenAiAdapter:
 
             completion_text = response.choices[0].message.content or ""
 
-            self._logger.info(
-                f"Completed prompt with {response.usage.total_tokens} tokens "
-                f"(prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})"
-            )
+            self._log_usage(response.usage, model=response.model, prompt_version=prompt_version)
 
             return completion_text
 
@@ -92,7 +116,8 @@ class OpenAiAdapter:
             model: Optional[str] = None,
             temperature: float = DEFAULT_TEMPERATURE,
             max_tokens: Optional[int] = DEFAULT_MAX_TOKENS,
-            system_prompt: Optional[str] = None
+            system_prompt: Optional[str] = None,
+            prompt_version: Optional[str] = None
     ) -> Generator[str, None, None]:
         """
         Complete a text prompt using OpenAI (streaming)
@@ -103,6 +128,7 @@ class OpenAiAdapter:
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
             system_prompt: Optional system prompt to set context
+            prompt_version: Optional prompt version, logged with the token usage
 
         Yields:
             Completion response chunks as strings
@@ -122,13 +148,17 @@ class OpenAiAdapter:
                 model=model or self._model,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens,
-                stream=True
+                max_completion_tokens=max_tokens,
+                stream=True,
+                # the final chunk then carries the token usage (with no choices)
+                stream_options={"include_usage": True}
             )
 
             for chunk in stream:
-                if chunk.choices[0].delta.content:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
+                if chunk.usage:
+                    self._log_usage(chunk.usage, model=chunk.model, prompt_version=prompt_version)
 
         except Exception as e:
             self._logger.error(f"Failed to stream prompt completion: {str(e)}")
@@ -144,7 +174,8 @@ class OpenAiAdapter:
             model: Optional[str] = None,
             temperature: float = DEFAULT_TEMPERATURE,
             max_tokens: Optional[int] = DEFAULT_MAX_TOKENS,
-            system_prompt: Optional[str] = None
+            system_prompt: Optional[str] = None,
+            prompt_version: Optional[str] = None
     ) -> str:
         """
         Complete a prompt with media (image, PDF, etc.) using OpenAI (non-streaming)
@@ -159,6 +190,7 @@ class OpenAiAdapter:
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
             system_prompt: Optional system prompt to set context
+            prompt_version: Optional prompt version, logged with the token usage
 
         Returns:
             Completion response as string
@@ -211,10 +243,7 @@ class OpenAiAdapter:
 
             completion_text = response.choices[0].message.content or ""
 
-            self._logger.info(
-                f"Completed multimodal prompt with {response.usage.total_tokens} tokens "
-                f"(prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})"
-            )
+            self._log_usage(response.usage, model=response.model, prompt_version=prompt_version)
 
             return completion_text
 
@@ -232,7 +261,8 @@ class OpenAiAdapter:
             model: Optional[str] = None,
             temperature: float = DEFAULT_TEMPERATURE,
             max_tokens: Optional[int] = DEFAULT_MAX_TOKENS,
-            system_prompt: Optional[str] = None
+            system_prompt: Optional[str] = None,
+            prompt_version: Optional[str] = None
     ) -> Generator[str, None, None]:
         """
         Complete a prompt with media (image, PDF, etc.) using OpenAI (streaming)
@@ -247,6 +277,7 @@ class OpenAiAdapter:
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
             system_prompt: Optional system prompt to set context
+            prompt_version: Optional prompt version, logged with the token usage
 
         Yields:
             Completion response chunks as strings
@@ -293,18 +324,33 @@ class OpenAiAdapter:
                 model=effective_model,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens,
-                stream=True
+                max_completion_tokens=max_tokens,
+                stream=True,
+                # the final chunk then carries the token usage (with no choices)
+                stream_options={"include_usage": True}
             )
 
             for chunk in stream:
-                if chunk.choices[0].delta.content:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
+                if chunk.usage:
+                    self._log_usage(chunk.usage, model=chunk.model, prompt_version=prompt_version)
 
         except Exception as e:
             self._logger.error(f"Failed to stream prompt completion with media: {str(e)}")
             raise
 
+    def _log_usage(self, usage: Optional[CompletionUsage], model: str, prompt_version: Optional[str]) -> None:
+        """Log token accounting per prompt version, including the prompt tokens served from the provider's cache"""
+        if usage is None:
+            return
+        cached_tokens = usage.prompt_tokens_details.cached_tokens if usage.prompt_tokens_details else None
+        self._logger.info(
+            f"LLM usage prompt_version={prompt_version or 'unversioned'} model={model} "
+            f"prompt_tokens={usage.prompt_tokens} cached_prompt_tokens={cached_tokens or 0} "
+            f"completion_tokens={usage.completion_tokens} total_tokens={usage.total_tokens}"
+        )
+
     def _prepare_media_content(
             self,
             media_path: Optional[str] = None,
@@ -1,6 +1,7 @@
 """OCR Adapter Module"""
 
 from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import OcrTextLayout
 from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import (
     BoundingBox,
     OcrWord,
@@ -15,5 +16,6 @@ __all__ = [
     'OcrWord',
     'OcrLine',
     'OcrBlock',
-    'OcrResult'
+    'OcrResult',
+    'OcrTextLayout'
 ]
\ No newline at end of file
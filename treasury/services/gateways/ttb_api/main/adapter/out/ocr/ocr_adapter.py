@@ -1,19 +1,28 @@
 """OCR Adapter using Tesseract for text extraction from images"""
 
 import base64
+import hashlib
 import io
 from typing import Optional, Dict, List, Literal
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
+import httpx
+import numpy as np
 import pytesseract
-import requests
-
-from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import (
-    OcrResult,
-    OcrBlock,
-    OcrLine,
-    OcrWord,
-    BoundingBox
+
+from treasury.services.gateways.ttb_api.main.adapter.out.http.http_client_provider import HttpClientProvider
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_annotation import OcrAnnotationRenderer
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import OcrTextLayout
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import OcrResult
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_preprocessing import (
+    OcrImagePreprocessor,
+    OcrPreprocessingConfig
+)
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_profiles import OcrProfile
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling import (
+    OcrTiledRecognizer,
+    OcrTilingConfig
 )
+from treasury.services.gateways.ttb_api.main.application.config import config
 
 from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
 
@@ -23,25 +32,61 @@ DATA_URI_PREFIX = 'data:image'
 
 class OcrAdapter:
 
-    def __init__(self, tesseract_cmd: Optional[str] = None):
+    def __init__(
+            self,
+            tesseract_cmd: Optional[str] = None,
+            http_client: Optional[httpx.Client] = None,
+            preprocessing: Optional[OcrPreprocessingConfig] = None,
+            tiling: Optional[OcrTilingConfig] = None,
+            tiled_recognizer: Optional[OcrTiledRecognizer] = None,
+            profile: Optional[OcrProfile] = None
+    ):
         self._logger = GlobalConfig.get_logger(__name__)
+        self._http_client_lazy = http_client
+        # Preprocessing before recognition, the OCR_PREPROCESSING preset unless given ("none" by default)
+        self._preprocessor = OcrImagePreprocessor(
+            preprocessing or OcrPreprocessingConfig.from_preset(config.OCR_PREPROCESSING)
+        )
+        # Large images are recognized as tiles in parallel when OCR_TILING_ENABLED (off by default)
+        self._tiled_recognizer = tiled_recognizer or OcrTiledRecognizer(tiling or OcrTilingConfig.from_config())
+        # Tesseract settings of calls that do not name a profile, OCR_PROFILE unless given ("default")
+        self._default_profile = profile or OcrProfile.from_preset(config.OCR_PROFILE)
         # Set tesseract command path if provided
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
-    def extract_text_from_url(self, image_url: str) -> OcrResult:
+    @property
+    def _http_client(self) -> httpx.Client:
+        if self._http_client_lazy is None:
+            self._http_client_lazy = HttpClientProvider.get_client(HttpClientProvider.IMAGE_DOWNLOADS)
+        return self._http_client_lazy
+
+    def settings_digest(self) -> str:
+        """
+        Short digest of the settings besides the profile that change what Tesseract reads - preprocessing
+        and tiling - for keys of results derived from the OCR
+        """
+        tiling_config = self._tiled_recognizer.tiling_config
+        settings = {
+            "preprocessing": self._preprocessor.config.model_dump(),
+            # Tiling settings only matter when tiling is on
+            "tiling": tiling_config.model_dump() if tiling_config.enabled else None,
+        }
+        return hashlib.sha256(repr(sorted(settings.items())).encode("utf-8")).hexdigest()[:12]
+
+    def extract_text_from_url(self, image_url: str, profile: Optional[OcrProfile] = None) -> OcrResult:
         try:
             # Download image from URL
-            response = requests.get(image_url, timeout=30)
+            response = self._http_client.get(image_url)
             response.raise_for_status()
 
             # Convert to PIL Image
             image = Image.open(io.BytesIO(response.content))
 
             # Process with OCR
-            return self._process_image(image)
+            return self._process_image(image, profile)
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             self._logger.error(f"Failed to download image from {image_url}: {str(e)}")
             return OcrResult(
                 full_text="",
@@ -66,7 +111,7 @@ class OcrAdapter:
                 error_message=f"OCR processing failed: {str(e)}"
             )
 
-    def extract_text(self, base64_encoded_image: str) -> OcrResult:
+    def extract_text(self, base64_encoded_image: str, profile: Optional[OcrProfile] = None) -> OcrResult:
         try:
             # Remove data URI prefix if present
             if base64_encoded_image.startswith(DATA_URI_PREFIX):
@@ -80,7 +125,7 @@ class OcrAdapter:
             image = Image.open(io.BytesIO(image_bytes))
 
             # Process with OCR
-            return self._process_image(image)
+            return self._process_image(image, profile)
 
         except Exception as e:
             self._logger.error(f"Failed to process base64 image: {str(e)}")
@@ -95,34 +140,57 @@ class OcrAdapter:
                 error_message=f"Failed to decode/process image: {str(e)}"
             )
 
-    def _process_image(self, image: Image.Image) -> OcrResult:
+    def extract_text_from_image(self, image: Image.Image, profile: Optional[OcrProfile] = None) -> OcrResult:
+        return self._process_image(image, profile)
+
+    def _process_image(self, image: Image.Image, profile: Optional[OcrProfile] = None) -> OcrResult:
         try:
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
+            profile = profile or self._default_profile
+            lang, tesseract_config = profile.languages, profile.tesseract_config()
+
+            # Convert to RGB if necessary - grayscale and bilevel images (e.g. the OCR rendition
+            # of a label image) are passed to Tesseract as they are
+            if image.mode not in ('RGB', 'L', '1'):
                 image = image.convert('RGB')
 
             # Get image dimensions
             width, height = image.size
 
+            # Rescale, straighten, binarize ... as configured; boxes are mapped back to the original image
+            preprocessed = self._preprocessor.preprocess(image)
+
             # Get detailed OCR data
             # Output includes: level, page_num, block_num, par_num, line_num, word_num,
             # left, top, width, height, conf, text
-            ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+            tiled = self._tiled_recognizer.should_tile(preprocessed.image)
+            if tiled:
+                ocr_data = self._tiled_recognizer.recognize(preprocessed.image, lang, tesseract_config)
+            else:
+                ocr_data = pytesseract.image_to_data(
+                    preprocessed.image, lang=lang, config=tesseract_config, output_type=pytesseract.Output.DICT
+                )
+            ocr_data = preprocessed.map_ocr_data_to_original(ocr_data)
 
-            # Parse OCR data into structured format
-            words, blocks = self._parse_ocr_data(ocr_data)
+            # Parse OCR data into columnar words, lines and blocks
+            layout = OcrTextLayout.from_ocr_data(ocr_data)
 
-            # Get full text
-            full_text = pytesseract.image_to_string(image).strip()
+            # Get full text - for tiles, from the merged blocks in reading order rather than another
+            # Tesseract pass over the whole image
+            if tiled:
+                full_text = layout.text_in_reading_order()
+            else:
+                full_text = pytesseract.image_to_string(
+                    preprocessed.image, lang=lang, config=tesseract_config
+                ).strip()
 
             # Calculate average confidence (excluding -1 confidence values)
-            confidences = [float(conf) for conf in ocr_data['conf'] if int(conf) != -1]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            confidences = np.asarray(ocr_data['conf'], dtype=np.float64)
+            confidences = confidences[confidences.astype(np.int64) != -1]
+            avg_confidence = float(confidences.mean()) if len(confidences) else 0.0
 
-            return OcrResult(
+            return OcrResult.from_layout(
+                layout,
                 full_text=full_text,
-                blocks=blocks,
-                words=words,
                 average_confidence=avg_confidence,
                 image_width=width,
                 image_height=height,
@@ -155,129 +223,6 @@ class OcrAdapter:
                 error_message=f"OCR processing error: {str(e)}"
             )
 
-    def _parse_ocr_data(self, ocr_data: Dict) -> tuple[List[OcrWord], List[OcrBlock]]:
-        all_words: List[OcrWord] = []
-        lines_dict: Dict[tuple, Dict] = {}
-
-        n_boxes = len(ocr_data['text'])
-
-        for i in range(n_boxes):
-            # Skip empty text and invalid confidence
-            text = str(ocr_data['text'][i]).strip()
-            conf = int(ocr_data['conf'][i])
-
-            if not text or conf == -1:
-                continue
-
-            # Extract position data
-            level = int(ocr_data['level'][i])
-            block_num = int(ocr_data['block_num'][i])
-            par_num = int(ocr_data['par_num'][i])
-            line_num = int(ocr_data['line_num'][i])
-
-            left = int(ocr_data['left'][i])
-            top = int(ocr_data['top'][i])
-            width = int(ocr_data['width'][i])
-            height = int(ocr_data['height'][i])
-
-            bounding_box = BoundingBox(x=left, y=top, width=width, height=height)
-
-            # Level 5 is word level
-            if level == 5:
-                word = OcrWord(
-                    text=text,
-                    confidence=float(conf),
-                    bounding_box=bounding_box
-                )
-                all_words.append(word)
-
-                # Organize by line
-                line_key = (block_num, par_num, line_num)
-                if line_key not in lines_dict:
-                    lines_dict[line_key] = {
-                        'words': [],
-                        'block_num': block_num,
-                        'par_num': par_num
-                    }
-                lines_dict[line_key]['words'].append(word)
-
-        # Build lines and blocks
-        blocks: List[OcrBlock] = []
-
-        # Group lines by block
-        block_lines: Dict[int, List[OcrLine]] = {}
-
-        for line_key, line_data in lines_dict.items():
-            block_num, par_num, line_num = line_key
-            words = line_data['words']
-
-            if not words:
-                continue
-
-            # Calculate line bounding box
-            min_x = min(w.bounding_box.x for w in words)
-            min_y = min(w.bounding_box.y for w in words)
-            max_x = max(w.bounding_box.x2 for w in words)
-            max_y = max(w.bounding_box.y2 for w in words)
-
-            line_bbox = BoundingBox(
-                x=min_x,
-                y=min_y,
-                width=max_x - min_x,
-                height=max_y - min_y
-            )
-
-            # Calculate average confidence for line
-            line_conf = sum(w.confidence for w in words) / len(words)
-
-            # Concatenate text
-            line_text = ' '.join(w.text for w in words)
-
-            line = OcrLine(
-                text=line_text,
-                words=words,
-                confidence=line_conf,
-                bounding_box=line_bbox
-            )
-
-            if block_num not in block_lines:
-                block_lines[block_num] = []
-            block_lines[block_num].append(line)
-
-        # Build blocks
-        for block_num, lines in block_lines.items():
-            if not lines:
-                continue
-
-            # Calculate block bounding box
-            min_x = min(line.bounding_box.x for line in lines)
-            min_y = min(line.bounding_box.y for line in lines)
-            max_x = max(line.bounding_box.x2 for line in lines)
-            max_y = max(line.bounding_box.y2 for line in lines)
-
-            block_bbox = BoundingBox(
-                x=min_x,
-                y=min_y,
-                width=max_x - min_x,
-                height=max_y - min_y
-            )
-
-            # Calculate average confidence for block
-            block_conf = sum(line.confidence for line in lines) / len(lines)
-
-            # Concatenate text
-            block_text = '\n'.join(line.text for line in lines)
-
-            block = OcrBlock(
-                text=block_text,
-                lines=lines,
-                confidence=block_conf,
-                bounding_box=block_bbox
-            )
-            blocks.append(block)
-
-        return all_words, blocks
-
     def draw_bounding_boxes_from_base64(
             self,
             base64_encoded_image: str,
@@ -309,25 +254,10 @@ class OcrAdapter:
                     image_format = parts[0].split('image/')[1].split(';')[0]
                 base64_encoded_image = parts[1]
 
-            # Decode base64 to bytes
-            image_bytes = base64.b64decode(base64_encoded_image)
-
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(image_bytes))
-
-            # Draw bounding boxes
-            annotated_image = self._draw_boxes_on_image(
-                image, ocr_result, draw_level, box_color, show_confidence
+            annotated_bytes = OcrAnnotationRenderer(box_color, show_confidence).render_bytes(
+                base64.b64decode(base64_encoded_image), ocr_result, draw_level, image_format=image_format
             )
-
-            # Convert back to base64
-            buffer = io.BytesIO()
-            annotated_image.save(buffer, format=image_format.upper())
-            buffer.seek(0)
-            annotated_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-
-            # Return with data URI prefix
-            return f"data:image/{image_format};base64,{annotated_base64}"
+            return f"data:image/{image_format};base64,{base64.b64encode(annotated_bytes).decode('utf-8')}"
 
         except Exception as e:
             self._logger.error(f"Failed to draw bounding boxes on base64 image: {str(e)}")
@@ -342,10 +272,11 @@ class OcrAdapter:
             ocr_result: OcrResult,
             draw_level: Literal['words', 'lines', 'blocks'] = 'words',
             box_color: str = 'red',
-            show_confidence: bool = True
+            show_confidence: bool = True,
+            image_bytes: Optional[bytes] = None
     ) -> str:
         """
-        Download image from URL, draw bounding boxes, and return annotated image as base64
+        Draw bounding boxes on the image at a URL and return annotated image as base64
 
         Args:
             image_url: URL of the image to annotate
@@ -353,134 +284,34 @@ class OcrAdapter:
             draw_level: Level to draw ('words', 'lines', or 'blocks')
             box_color: Color of bounding boxes (e.g., 'red', 'green', '#FF0000')
             show_confidence: Whether to show confidence scores on boxes
+            image_bytes: The image already downloaded (e.g. for OCR), downloaded from image_url if not given
 
         Returns:
             Base64 encoded annotated image string with data URI prefix
         """
         try:
-            # Download image from URL
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(response.content))
+            if image_bytes is None:
+                response = self._http_client.get(image_url)
+                response.raise_for_status()
+                image_bytes = response.content
 
-            # Draw bounding boxes
-            annotated_image = self._draw_boxes_on_image(
-                image, ocr_result, draw_level, box_color, show_confidence
+            annotated_bytes = OcrAnnotationRenderer(box_color, show_confidence).render_bytes(
+                image_bytes, ocr_result, draw_level
             )
-
-            # Convert to base64
-            buffer = io.BytesIO()
-            annotated_image.save(buffer, format='JPEG')
-            buffer.seek(0)
-            annotated_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-
-            # Return with data URI prefix
-            return f"data:image/jpeg;base64,{annotated_base64}"
+            return f"data:image/jpeg;base64,{base64.b64encode(annotated_bytes).decode('utf-8')}"
 
         except Exception as e:
             self._logger.error(f"Failed to draw bounding boxes on image from URL: {str(e)}")
             # Return empty data URI on error
             return "data:image/jpeg;base64,"
 
-    def _draw_boxes_on_image(
+    def draw_bounding_boxes_on_image(
             self,
             image: Image.Image,
             ocr_result: OcrResult,
-            draw_level: Literal['words', 'lines', 'blocks'],
-            box_color: str,
-            show_confidence: bool
+            draw_level: Literal['words', 'lines', 'blocks'] = 'words',
+            box_color: str = 'red',
+            show_confidence: bool = True
     ) -> Image.Image:
-        """
-        Internal method to draw bounding boxes on an image
-
-        Args:
-            image: PIL Image to annotate
-            ocr_result: OcrResult with bounding boxes
-            draw_level: Level to draw ('words', 'lines', or 'blocks')
-            box_color: Color of bounding boxes
-            show_confidence: Whether to show confidence scores
-
-        Returns:
-            Annotated PIL Image
-        """
-        # Create a copy to avoid modifying original
-        annotated = image.copy()
-        draw = ImageDraw.Draw(annotated)
-
-        # Try to load a font, fall back to default if unavailable
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 12)
-        except Exception:
-            try:
-                font = ImageFont.truetype("arial.ttf", 12)
-            except Exception:
-                font = ImageFont.load_default()
-
-        # Draw based on selected level
-        if draw_level == 'words':
-            for word in ocr_result.words:
-                self._draw_single_box(
-                    draw, word.bounding_box, word.confidence if show_confidence else None,
-                    box_color, font
-                )
-
-        elif draw_level == 'lines':
-            for block in ocr_result.blocks:
-                for line in block.lines:
-                    self._draw_single_box(
-                        draw, line.bounding_box, line.confidence if show_confidence else None,
-                        box_color, font
-                    )
-
-        elif draw_level == 'blocks':
-            for block in ocr_result.blocks:
-                self._draw_single_box(
-                    draw, block.bounding_box, block.confidence if show_confidence else None,
-                    box_color, font
-                )
-
-        return annotated
-
-    def _draw_single_box(
-            self,
-            draw: ImageDraw.ImageDraw,
-            bbox: BoundingBox,
-            confidence: Optional[float],
-            color: str,
-            font: ImageFont.ImageFont
-    ) -> None:
-        """
-        Draw a single bounding box with optional confidence label
-
-        Args:
-            draw: ImageDraw object
-            bbox: Bounding box to draw
-            confidence: Optional confidence score to display
-            color: Box color
-            font: Font for text labels
-        """
-        # Draw rectangle
-        draw.rectangle(
-            [(bbox.x, bbox.y), (bbox.x2, bbox.y2)],
-            outline=color,
-            width=2
-        )
-
-        # Draw confidence label if provided
-        if confidence is not None:
-            label = f"{confidence:.1f}%"
-            # Position label above box
-            label_y = max(0, bbox.y - 15)
-
-            # Draw text background for readability
-            try:
-                # For newer Pillow versions with textbbox
-                text_bbox = draw.textbbox((bbox.x, label_y), label, font=font)
-                draw.rectangle(text_bbox, fill='white')
-            except AttributeError:
-                # Fallback for older Pillow versions
-                pass
-
-            draw.text((bbox.x, label_y), label, fill=color, font=font)
\ No newline at end of file
+        """Draw bounding boxes on an image already decoded (e.g. the one passed to extract_text_from_image)"""
+        return OcrAnnotationRenderer(box_color, show_confidence).render(image, ocr_result, draw_level)
@@ -0,0 +1,195 @@
+"""Columnar (array-backed) word, line and block layout of an OCR result"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import (
+    OcrBlock,
+    OcrWord
+)
+
+# Tesseract level of word entries in image_to_data output
+WORD_LEVEL = 5
+
+# Views are validated in bulk, which is faster than constructing the models one by one
+WORD_LIST_ADAPTER = TypeAdapter(List[OcrWord])
+BLOCK_LIST_ADAPTER = TypeAdapter(List[OcrBlock])
+
+
+class OcrTextLayout:
+    """
+    The words of an OCR result as NumPy columns - boxes, confidences and line/block ids - with the line and
+    block boxes and confidences computed by vectorized group-bys. Lines and blocks are numbered in order of
+    first appearance, as Tesseract reports them. The Pydantic OcrWord/OcrLine/OcrBlock views are only built
+    when asked for (e.g. when an OcrResult is serialized), with the line and block objects sharing the words.
+    """
+
+    def __init__(
+            self,
+            texts: List[str],
+            boxes: np.ndarray,
+            confidences: np.ndarray,
+            line_ids: np.ndarray,
+            line_block_ids: np.ndarray,
+            line_boxes: np.ndarray,
+            line_confidences: np.ndarray,
+            block_boxes: np.ndarray,
+            block_confidences: np.ndarray
+    ) -> None:
+        # Per word; boxes are (x, y, width, height) rows
+        self.texts = texts
+        self.boxes = boxes
+        self.confidences = confidences
+        self.line_ids = line_ids
+        # Per line
+        self.line_block_ids = line_block_ids
+        self.line_boxes = line_boxes
+        self.line_confidences = line_confidences
+        # Per block
+        self.block_boxes = block_boxes
+        self.block_confidences = block_confidences
+
+    @property
+    def word_count(self) -> int:
+        return len(self.texts)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_boxes)
+
+    @property
+    def block_count(self) -> int:
+        return len(self.block_boxes)
+
+    @classmethod
+    def empty(cls) -> 'OcrTextLayout':
+        return cls.from_ocr_data({})
+
+    @classmethod
+    def from_ocr_data(cls, ocr_data: Dict) -> 'OcrTextLayout':
+        """Words of pytesseract image_to_data output - entries without text or with confidence -1 are skipped"""
+        texts = np.array([str(text).strip() for text in ocr_data.get('text', [])], dtype=object)
+        n_entries = len(texts)
+
+        def column(key: str, dtype) -> np.ndarray:
+            return np.asarray(ocr_data[key], dtype=dtype) if n_entries else np.zeros(0, dtype=dtype)
+
+        # Word confidences are truncated to whole numbers, as Tesseract reports them
+        confidences = column('conf', np.float64).astype(np.int64)
+        keep = (column('level', np.int64) == WORD_LEVEL) & (confidences != -1) & (texts != '')
+
+        boxes = np.stack(
+            [column(key, np.int64)[keep] for key in ('left', 'top', 'width', 'height')], axis=1
+        ).reshape(-1, 4)
+        confidences = confidences[keep].astype(np.float64)
+        hierarchy = np.stack(
+            [column(key, np.int64)[keep] for key in ('block_num', 'par_num', 'line_num')], axis=1
+        ).reshape(-1, 3)
+
+        line_ids, first_word_of_line = cls._group_ids_in_order_of_appearance(hierarchy)
+        line_block_ids, _ = cls._group_ids_in_order_of_appearance(hierarchy[first_word_of_line, :1])
+        line_boxes = cls._group_boxes(boxes, line_ids, len(first_word_of_line))
+        line_confidences = cls._group_means(confidences, line_ids, len(first_word_of_line))
+        n_blocks = int(line_block_ids.max()) + 1 if len(line_block_ids) else 0
+
+        return cls(
+            texts=texts[keep].tolist(),
+            boxes=boxes,
+            confidences=confidences,
+            line_ids=line_ids,
+            line_block_ids=line_block_ids,
+            line_boxes=line_boxes,
+            line_confidences=line_confidences,
+            # A block's confidence is the mean of its lines' confidences
+            block_boxes=cls._group_boxes(line_boxes, line_block_ids, n_blocks),
+            block_confidences=cls._group_means(line_confidences, line_block_ids, n_blocks),
+        )
+
+    @classmethod
+    def _group_ids_in_order_of_appearance(cls, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Group id of each row (equal keys share one, numbered by first appearance) and each group's first row"""
+        if len(keys) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        _, first_rows, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        order = np.argsort(first_rows, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return rank[inverse.reshape(-1)], first_rows[order]
+
+    @classmethod
+    def _group_boxes(cls, boxes: np.ndarray, group_ids: np.ndarray, n_groups: int) -> np.ndarray:
+        """Union of the (x, y, width, height) boxes of each group"""
+        x0 = np.full(n_groups, np.iinfo(np.int64).max)
+        y0 = np.full(n_groups, np.iinfo(np.int64).max)
+        x1 = np.full(n_groups, np.iinfo(np.int64).min)
+        y1 = np.full(n_groups, np.iinfo(np.int64).min)
+        np.minimum.at(x0, group_ids, boxes[:, 0])
+        np.minimum.at(y0, group_ids, boxes[:, 1])
+        np.maximum.at(x1, group_ids, boxes[:, 0] + boxes[:, 2])
+        np.maximum.at(y1, group_ids, boxes[:, 1] + boxes[:, 3])
+        return np.stack([x0, y0, x1 - x0, y1 - y0], axis=1).reshape(-1, 4)
+
+    @classmethod
+    def _group_means(cls, values: np.ndarray, group_ids: np.ndarray, n_groups: int) -> np.ndarray:
+        counts = np.bincount(group_ids, minlength=n_groups)
+        return np.bincount(group_ids, weights=values, minlength=n_groups) / np.maximum(counts, 1)
+
+    def _words_of_lines(self) -> List[np.ndarray]:
+        """Word indices of each line, in reading order within the line"""
+        if self.line_count == 0:
+            return []
+        order = np.argsort(self.line_ids, kind='stable')
+        return np.split(order, np.cumsum(np.bincount(self.line_ids, minlength=self.line_count))[:-1])
+
+    def line_texts(self) -> List[str]:
+        return [' '.join(self.texts[i] for i in words) for words in self._words_of_lines()]
+
+    def block_texts(self) -> List[str]:
+        block_lines: List[List[str]] = [[] for _ in range(self.block_count)]
+        for block_id, line_text in zip(self.line_block_ids.tolist(), self.line_texts()):
+            block_lines[block_id].append(line_text)
+        return ['\n'.join(lines) for lines in block_lines]
+
+    def text_in_reading_order(self) -> str:
+        """Block texts top to bottom, then left to right, separated by blank lines"""
+        order = np.lexsort((self.block_boxes[:, 0], self.block_boxes[:, 1]))
+        block_texts = self.block_texts()
+        return '\n\n'.join(block_texts[i] for i in order.tolist()).strip()
+
+    @classmethod
+    def _box_dicts(cls, boxes: np.ndarray) -> List[Dict[str, int]]:
+        return [{'x': x, 'y': y, 'width': width, 'height': height} for x, y, width, height in boxes.tolist()]
+
+    def words(self) -> List[OcrWord]:
+        """Pydantic views of the words"""
+        return WORD_LIST_ADAPTER.validate_python([
+            {'text': text, 'confidence': confidence, 'bounding_box': box}
+            for text, confidence, box in zip(self.texts, self.confidences.tolist(), self._box_dicts(self.boxes))
+        ])
+
+    def blocks(self, words: Optional[List[OcrWord]] = None) -> List[OcrBlock]:
+        """Pydantic views of the blocks, their lines holding the given word views (built if not given)"""
+        words = self.words() if words is None else words
+        line_confidences, line_boxes = self.line_confidences.tolist(), self._box_dicts(self.line_boxes)
+        block_lines: List[List[Dict]] = [[] for _ in range(self.block_count)]
+        for line_id, (word_ids, text) in enumerate(zip(self._words_of_lines(), self.line_texts())):
+            block_lines[int(self.line_block_ids[line_id])].append({
+                'text': text,
+                # Model instances are not revalidated, so the lines share the word views
+                'words': [words[i] for i in word_ids.tolist()],
+                'confidence': line_confidences[line_id],
+                'bounding_box': line_boxes[line_id],
+            })
+        return BLOCK_LIST_ADAPTER.validate_python([
+            {
+                'text': '\n'.join(line['text'] for line in lines),
+                'lines': lines,
+                'confidence': confidence,
+                'bounding_box': box,
+            }
+            for lines, confidence, box in zip(
+                block_lines, self.block_confidences.tolist(), self._box_dicts(self.block_boxes)
+            )
+        ])
@@ -1,7 +1,10 @@
 """Pydantic models for OCR results"""
 
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Optional, List, Any, Tuple, TYPE_CHECKING
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, model_validator
+
+if TYPE_CHECKING:
+    from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import OcrTextLayout
 
 
 class BoundingBox(BaseModel):
@@ -51,21 +54,75 @@ class OcrBlock(BaseModel):
 
 
 class OcrResult(BaseModel):
-    """Complete OCR result for an image"""
+    """
+    Complete OCR result for an image. Results of OcrAdapter keep the words in a columnar OcrTextLayout
+    (see from_layout); the blocks and words below are built from it on first access or serialization.
+    """
     full_text: str = Field(..., description="All detected text concatenated")
-    blocks: List[OcrBlock] = Field(default_factory=list, description="Text blocks detected")
-    words: List[OcrWord] = Field(default_factory=list, description="All words detected")
     average_confidence: float = Field(..., ge=0.0, le=100.0, description="Average confidence across all text")
     image_width: int = Field(..., description="Width of processed image in pixels")
     image_height: int = Field(..., description="Height of processed image in pixels")
     success: bool = Field(default=True, description="Whether OCR was successful")
     error_message: Optional[str] = Field(None, description="Error message if OCR failed")
 
+    _layout: Optional['OcrTextLayout'] = PrivateAttr(default=None)
+    _blocks: Optional[List[OcrBlock]] = PrivateAttr(default=None)
+    _words: Optional[List[OcrWord]] = PrivateAttr(default=None)
+
+    @model_validator(mode='wrap')
+    @classmethod
+    def _validate_views(cls, data: Any, handler) -> 'OcrResult':
+        # blocks and words given as values are validated and kept as they are
+        blocks = words = None
+        if isinstance(data, dict):
+            data = dict(data)
+            blocks, words = data.pop('blocks', None), data.pop('words', None)
+        result = handler(data)
+        if blocks is not None:
+            result._blocks = [OcrBlock.model_validate(block) for block in blocks]
+        if words is not None:
+            result._words = [OcrWord.model_validate(word) for word in words]
+        return result
+
+    @classmethod
+    def from_layout(cls, layout: 'OcrTextLayout', **fields) -> 'OcrResult':
+        result = cls(**fields)
+        result._layout = layout
+        return result
+
+    @property
+    def layout(self) -> Optional['OcrTextLayout']:
+        """The columnar words, lines and blocks, if the result was built from them"""
+        return self._layout
+
+    @computed_field(description="Text blocks detected")
+    @property
+    def blocks(self) -> List[OcrBlock]:
+        if self._blocks is None:
+            # Lines of the blocks share the word views
+            self._blocks = self._layout.blocks(self.words) if self._layout is not None else []
+        return self._blocks
+
+    @computed_field(description="All words detected")
+    @property
+    def words(self) -> List[OcrWord]:
+        if self._words is None:
+            self._words = self._layout.words() if self._layout is not None else []
+        return self._words
+
     @property
     def word_count(self) -> int:
         """Total number of words detected"""
+        if self._words is None and self._layout is not None:
+            return self._layout.word_count
         return len(self.words)
 
+    def word_texts_and_confidences(self) -> Tuple[List[str], List[float]]:
+        """Text and confidence of each word, in Tesseract's order, without building the word views"""
+        if self._words is None and self._layout is not None:
+            return list(self._layout.texts), self._layout.confidences.tolist()
+        return [word.text for word in self.words], [word.confidence for word in self.words]
+
     @property
     def high_confidence_words(self) -> List[OcrWord]:
         """Words with confidence >= 80%"""
@@ -74,4 +131,4 @@ class OcrResult(BaseModel):
     @property
     def low_confidence_words(self) -> List[OcrWord]:
         """Words with confidence < 80%"""
-        return [word for word in self.words if not word.is_high_confidence]
\ No newline at end of file
+        return [word for word in self.words if not word.is_high_confidence]
@@ -0,0 +1,295 @@
+"""Image preprocessing applied before Tesseract recognition, implemented with vectorized NumPy operations"""
+
+import math
+from typing import Optional, Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PIL import Image
+from pydantic import BaseModel
+
+# Tesseract is most accurate when capital letters are roughly 20-40 px tall
+DEFAULT_TARGET_TEXT_HEIGHT_PX = 32
+# Rescaling never goes beyond these factors, whatever the text height estimate says
+MIN_SCALE = 0.25
+MAX_SCALE = 4.0
+# Rescaling by less than this is not worth the resampling
+MIN_SCALE_CHANGE = 0.1
+# Deskew and text height estimation look at a downsampled copy of at most this size
+ANALYSIS_MAX_SIDE_PX = 1024
+DESKEW_STEP_DEGREES = 0.5
+# Deskew scores at most this many ink pixels
+DESKEW_MAX_SAMPLE_PIXELS = 200_000
+
+
+class OcrPreprocessingConfig(BaseModel):
+    """Steps run before recognition, in this order: grayscale, rescale, deskew, denoise, threshold"""
+    grayscale: bool = False
+    # Rescale so that lines of text are about this many pixels tall, None keeps the resolution
+    target_text_height_px: Optional[int] = None
+    # Images are never made larger than this on their longest side
+    max_side_px: int = 4096
+    deskew: bool = False
+    max_deskew_degrees: float = 10.0
+    # 3x3 median filter, removes speckle from photos and scans
+    denoise: bool = False
+    # Local mean thresholding, robust to uneven lighting and coloured label backgrounds
+    adaptive_threshold: bool = False
+    threshold_window_px: int = 31
+    threshold_offset: float = 10.0
+
+    @property
+    def is_noop(self) -> bool:
+        return not (self.grayscale or self.target_text_height_px or self.deskew or self.denoise
+                    or self.adaptive_threshold)
+
+    @classmethod
+    def presets(cls) -> Dict[str, 'OcrPreprocessingConfig']:
+        """Named configurations, selectable with OCR_PREPROCESSING"""
+        return {
+            "none": cls(),
+            "grayscale": cls(grayscale=True),
+            "binarized": cls(
+                grayscale=True,
+                target_text_height_px=DEFAULT_TARGET_TEXT_HEIGHT_PX,
+                adaptive_threshold=True
+            ),
+            "full": cls(
+                grayscale=True,
+                target_text_height_px=DEFAULT_TARGET_TEXT_HEIGHT_PX,
+                deskew=True,
+                denoise=True,
+                adaptive_threshold=True
+            ),
+        }
+
+    @classmethod
+    def from_preset(cls, name: Optional[str]) -> 'OcrPreprocessingConfig':
+        presets = cls.presets()
+        name = (name or "none").strip().lower()
+        if name not in presets:
+            raise ValueError(f"Unknown OCR preprocessing preset '{name}', expected one of: {', '.join(presets)}")
+        return presets[name]
+
+
+class PreprocessedOcrImage:
+    """A preprocessed image and the transform needed to map boxes found on it back to the original"""
+
+    def __init__(
+            self,
+            image: Image.Image,
+            original_size: tuple[int, int],
+            scale: float = 1.0,
+            rotation_degrees: float = 0.0
+    ) -> None:
+        self.image = image
+        self.original_size = original_size
+        self.scale = scale
+        self.rotation_degrees = rotation_degrees
+
+    @property
+    def is_identity(self) -> bool:
+        return self.scale == 1.0 and self.rotation_degrees == 0.0
+
+    def map_ocr_data_to_original(self, ocr_data: Dict) -> Dict:
+        """
+        pytesseract image_to_data output with the boxes moved to original image coordinates. Boxes are
+        rotated back around their centre, so their size is kept (deskew angles are small).
+        """
+        if self.is_identity:
+            return ocr_data
+
+        left = np.asarray(ocr_data['left'], dtype=np.float64)
+        top = np.asarray(ocr_data['top'], dtype=np.float64)
+        width = np.asarray(ocr_data['width'], dtype=np.float64)
+        height = np.asarray(ocr_data['height'], dtype=np.float64)
+
+        center_x = left + width / 2
+        center_y = top + height / 2
+        if self.rotation_degrees:
+            # The image was rotated counterclockwise around its centre, undo it for the box centres
+            processed_width, processed_height = self.image.size
+            pivot_x, pivot_y = processed_width / 2, processed_height / 2
+            theta = math.radians(self.rotation_degrees)
+            dx, dy = center_x - pivot_x, center_y - pivot_y
+            center_x = pivot_x + dx * math.cos(theta) - dy * math.sin(theta)
+            center_y = pivot_y + dx * math.sin(theta) + dy * math.cos(theta)
+
+        width = width / self.scale
+        height = height / self.scale
+        center_x = center_x / self.scale
+        center_y = center_y / self.scale
+
+        original_width, original_height = self.original_size
+        mapped = dict(ocr_data)
+        mapped['left'] = np.clip(np.rint(center_x - width / 2), 0, original_width).astype(int).tolist()
+        mapped['top'] = np.clip(np.rint(center_y - height / 2), 0, original_height).astype(int).tolist()
+        mapped['width'] = np.rint(width).astype(int).tolist()
+        mapped['height'] = np.rint(height).astype(int).tolist()
+        return mapped
+
+
+class OcrImagePreprocessor:
+    """
+    Prepares label images for Tesseract: huge phone photos are scaled down and tiny crops scaled up
+    to a text height Tesseract reads well, then the image is optionally straightened, denoised and
+    binarized. All pixel-level steps work on whole NumPy arrays.
+    """
+
+    def __init__(self, config: OcrPreprocessingConfig) -> None:
+        self._config = config
+
+    @property
+    def config(self) -> OcrPreprocessingConfig:
+        return self._config
+
+    def preprocess(self, image: Image.Image) -> PreprocessedOcrImage:
+        original_size = image.size
+        if self._config.is_noop:
+            return PreprocessedOcrImage(image=image, original_size=original_size)
+
+        gray = np.asarray(image.convert('L'))
+
+        scale = 1.0
+        if self._config.target_text_height_px:
+            scale = self._rescale_factor(gray)
+            if scale != 1.0:
+                gray = self._resize(gray, scale)
+
+        rotation_degrees = 0.0
+        if self._config.deskew:
+            rotation_degrees = self.estimate_skew_degrees(gray, self._config.max_deskew_degrees)
+            if rotation_degrees:
+                background = int(np.median(np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])))
+                gray = np.asarray(Image.fromarray(gray).rotate(
+                    rotation_degrees,
+                    resample=Image.Resampling.BILINEAR,
+                    fillcolor=background
+                ))
+
+        if self._config.denoise:
+            gray = self.median_filter_3x3(gray)
+
+        if self._config.adaptive_threshold:
+            gray = self.adaptive_threshold(gray, self._config.threshold_window_px, self._config.threshold_offset)
+
+        return PreprocessedOcrImage(
+            image=Image.fromarray(gray),
+            original_size=original_size,
+            scale=scale,
+            rotation_degrees=rotation_degrees
+        )
+
+    def _rescale_factor(self, gray: np.ndarray) -> float:
+        height, width = gray.shape
+        text_height = self.estimate_text_height_px(gray)
+        scale = self._config.target_text_height_px / text_height if text_height else 1.0
+        scale = min(max(scale, MIN_SCALE), MAX_SCALE, self._config.max_side_px / max(height, width))
+        return 1.0 if abs(scale - 1.0) < MIN_SCALE_CHANGE else scale
+
+    @classmethod
+    def _resize(cls, gray: np.ndarray, scale: float) -> np.ndarray:
+        height, width = gray.shape
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return np.asarray(Image.fromarray(gray).resize(size, Image.Resampling.LANCZOS))
+
+    @classmethod
+    def otsu_threshold(cls, gray: np.ndarray) -> int:
+        """Global grey level that best separates ink from background"""
+        histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+        levels = np.arange(256, dtype=np.float64)
+        weight_background = np.cumsum(histogram)
+        weight_foreground = weight_background[-1] - weight_background
+        sum_background = np.cumsum(histogram * levels)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_background = sum_background / weight_background
+            mean_foreground = (sum_background[-1] - sum_background) / weight_foreground
+            variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        return int(np.nanargmax(variance)) if np.any(np.isfinite(variance)) else 127
+
+    @classmethod
+    def ink_mask(cls, gray: np.ndarray) -> np.ndarray:
+        """True for text pixels; the minority side of the Otsu threshold is taken to be the text"""
+        dark = gray <= cls.otsu_threshold(gray)
+        return dark if dark.mean() <= 0.5 else ~dark
+
+    @classmethod
+    def _downsampled(cls, gray: np.ndarray) -> tuple[np.ndarray, int]:
+        step = max(1, math.ceil(max(gray.shape) / ANALYSIS_MAX_SIDE_PX))
+        return gray[::step, ::step], step
+
+    @classmethod
+    def estimate_text_height_px(cls, gray: np.ndarray) -> Optional[float]:
+        """
+        Median height of the runs of rows that contain ink, i.e. of the text lines. Good enough for
+        picking a scale factor; None if no text-like rows are found.
+        """
+        sample, step = cls._downsampled(gray)
+        ink = cls.ink_mask(sample)
+        row_has_ink = ink.sum(axis=1) > max(1, int(0.01 * ink.shape[1]))
+        edges = np.diff(np.concatenate(([0], row_has_ink.astype(np.int8), [0])))
+        run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        # Single rows are noise, runs over a third of the image are pictures or borders
+        run_lengths = run_lengths[(run_lengths >= 2) & (run_lengths <= ink.shape[0] / 3)]
+        if run_lengths.size == 0:
+            return None
+        return float(np.median(run_lengths)) * step
+
+    @classmethod
+    def estimate_skew_degrees(cls, gray: np.ndarray, max_degrees: float) -> float:
+        """
+        Counterclockwise rotation (in degrees, as for PIL's Image.rotate) that makes the text lines
+        horizontal. Each candidate angle is scored by how sharply the ink pixels, projected onto the
+        vertical axis, bunch up into rows.
+        """
+        sample, _ = cls._downsampled(gray)
+        ys, xs = np.nonzero(cls.ink_mask(sample))
+        if ys.size < 100:
+            return 0.0
+        if ys.size > DESKEW_MAX_SAMPLE_PIXELS:
+            keep = np.random.default_rng(0).choice(ys.size, DESKEW_MAX_SAMPLE_PIXELS, replace=False)
+            ys, xs = ys[keep], xs[keep]
+
+        angles = np.arange(-max_degrees, max_degrees + DESKEW_STEP_DEGREES / 2, DESKEW_STEP_DEGREES)
+        thetas = np.radians(angles)
+        # Row of every ink pixel after rotating by each candidate angle: shape (angles, pixels)
+        rows = np.rint(ys[None, :] * np.cos(thetas)[:, None] - xs[None, :] * np.sin(thetas)[:, None]).astype(np.int64)
+        rows -= rows.min(axis=1, keepdims=True)
+        n_rows = int(rows.max()) + 1
+        offsets = (np.arange(len(angles)) * n_rows)[:, None]
+        profiles = np.bincount((rows + offsets).ravel(), minlength=len(angles) * n_rows).reshape(len(angles), n_rows)
+        scores = (profiles.astype(np.float64) ** 2).sum(axis=1)
+        best_angle = float(angles[int(np.argmax(scores))])
+        return 0.0 if abs(best_angle) < DESKEW_STEP_DEGREES / 2 else best_angle
+
+    @classmethod
+    def median_filter_3x3(cls, gray: np.ndarray) -> np.ndarray:
+        padded = np.pad(gray, 1, mode='edge')
+        windows = sliding_window_view(padded, (3, 3)).reshape(gray.shape[0], gray.shape[1], 9)
+        return np.partition(windows, 4, axis=-1)[..., 4]
+
+    @classmethod
+    def adaptive_threshold(cls, gray: np.ndarray, window_px: int, offset: float) -> np.ndarray:
+        """
+        Black text on white: a pixel is ink if it differs from the mean of its window_px neighbourhood
+        by more than offset. Window sums come from an integral image, so the cost does not depend on the
+        window size. Text is taken to be the polarity with fewer such pixels (strokes are thinner than
+        the background around them), so light text on a dark background comes out inverted.
+        """
+        height, width = gray.shape
+        integral = np.zeros((height + 1, width + 1), dtype=np.int64)
+        integral[1:, 1:] = gray.astype(np.int64).cumsum(axis=0).cumsum(axis=1)
+
+        half = window_px // 2
+        y0 = np.clip(np.arange(height) - half, 0, height)
+        y1 = np.clip(np.arange(height) + half + 1, 0, height)
+        x0 = np.clip(np.arange(width) - half, 0, width)
+        x1 = np.clip(np.arange(width) + half + 1, 0, width)
+        window_sums = (integral[np.ix_(y1, x1)] - integral[np.ix_(y0, x1)]
+                       - integral[np.ix_(y1, x0)] + integral[np.ix_(y0, x0)])
+        local_mean = window_sums / ((y1 - y0)[:, None] * (x1 - x0)[None, :])
+
+        dark_ink = gray < local_mean - offset
+        light_ink = gray > local_mean + offset
+        ink = dark_ink if np.count_nonzero(dark_ink) <= np.count_nonzero(light_ink) else light_ink
+        return np.where(ink, 0, 255).astype(np.uint8)
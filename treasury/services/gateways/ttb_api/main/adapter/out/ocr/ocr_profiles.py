@@ -0,0 +1,122 @@
+"""Named Tesseract settings (page segmentation, engine, languages, whitelist) for OCR calls"""
+
+import shlex
+from typing import Optional, Dict
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.application.config import config
+
+DEFAULT_PROFILE_NAME = "default"
+
+# Characters seen on label text: brand names, classes, "41.3% ALC./VOL.", "750 mL", "12 FL. OZ." and the warning
+LABEL_TEXT_WHITELIST = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    " %.,:;/()&'-"
+)
+
+
+class OcrProfile(BaseModel):
+    """
+    Tesseract settings for one kind of label. None leaves Tesseract's default in place - the "default"
+    profile passes no options at all.
+    """
+    name: str
+    # Page segmentation mode (--psm): 3 fully automatic, 6 a single block, 11 sparse text, ...
+    page_segmentation_mode: Optional[int] = None
+    # OCR engine mode (--oem): 1 LSTM only; 0 and 2 need the legacy traineddata
+    engine_mode: Optional[int] = None
+    # Tesseract language set, e.g. "eng" or "eng+fra"
+    languages: Optional[str] = None
+    char_whitelist: Optional[str] = None
+    # tessedit_do_invert: False skips the second pass Tesseract makes over light-on-dark text
+    invert: Optional[bool] = None
+    # Any further -c variables
+    variables: Dict[str, str] = {}
+
+    def tesseract_config(self) -> str:
+        """The config argument of pytesseract's image_to_data/image_to_string"""
+        options = []
+        if self.page_segmentation_mode is not None:
+            options.append(f"--psm {self.page_segmentation_mode}")
+        if self.engine_mode is not None:
+            options.append(f"--oem {self.engine_mode}")
+        variables = dict(self.variables)
+        if self.char_whitelist is not None:
+            variables["tessedit_char_whitelist"] = self.char_whitelist
+        if self.invert is not None:
+            variables["tessedit_do_invert"] = "1" if self.invert else "0"
+        # pytesseract splits config with shlex, so values with spaces are quoted
+        options.extend(f"-c {shlex.quote(f'{key}={value}')}" for key, value in variables.items())
+        return " ".join(options)
+
+    @classmethod
+    def presets(cls) -> Dict[str, 'OcrProfile']:
+        return {
+            # Tesseract's defaults: full automatic page segmentation, all configured models
+            DEFAULT_PROFILE_NAME: cls(name=DEFAULT_PROFILE_NAME),
+            # Scattered text in no particular order, typical of front labels
+            "sparse": cls(name="sparse", page_segmentation_mode=11, engine_mode=1, languages="eng"),
+            # A uniform block of text, e.g. a back label dominated by the government warning
+            "block": cls(name="block", page_segmentation_mode=6, engine_mode=1, languages="eng"),
+            # Sparse, restricted to label characters and without the inverted-text pass - fastest
+            "fast": cls(
+                name="fast",
+                page_segmentation_mode=11,
+                engine_mode=1,
+                languages="eng",
+                char_whitelist=LABEL_TEXT_WHITELIST,
+                invert=False
+            ),
+        }
+
+    @classmethod
+    def from_preset(cls, name: Optional[str]) -> 'OcrProfile':
+        presets = cls.presets()
+        name = (name or DEFAULT_PROFILE_NAME).strip().lower()
+        if name not in presets:
+            raise ValueError(f"Unknown OCR profile '{name}', expected one of {', '.join(presets)}")
+        return presets[name]
+
+
+class OcrProfileSelector:
+    """
+    Picks the OCR profile for a product class. OCR_PROFILE_BY_PRODUCT_CLASS maps classes to profiles, e.g.
+    "beer=sparse,gin=fast,wine=sparse"; a class is matched exactly first, then by any mapped class
+    it contains as a word ("lager beer" -> beer). Other classes get OCR_PROFILE ("default" unless set).
+    """
+
+    def __init__(
+            self,
+            default_profile: Optional[OcrProfile] = None,
+            profiles_by_product_class: Optional[Dict[str, OcrProfile]] = None
+    ) -> None:
+        self._default_profile = default_profile or OcrProfile.from_preset(config.OCR_PROFILE)
+        if profiles_by_product_class is None:
+            profiles_by_product_class = self.parse_profiles_by_product_class(config.OCR_PROFILE_BY_PRODUCT_CLASS)
+        self._profiles_by_product_class = {
+            product_class.strip().lower(): profile for product_class, profile in profiles_by_product_class.items()
+        }
+
+    @classmethod
+    def parse_profiles_by_product_class(cls, value: Optional[str]) -> Dict[str, OcrProfile]:
+        profiles = {}
+        for entry in (value or "").split(","):
+            if not entry.strip():
+                continue
+            product_class, separator, profile_name = entry.partition("=")
+            if not separator:
+                raise ValueError(f"Invalid OCR_PROFILE_BY_PRODUCT_CLASS entry '{entry}', expected class=profile")
+            profiles[product_class.strip().lower()] = OcrProfile.from_preset(profile_name)
+        return profiles
+
+    def profile_for(self, product_class: Optional[str]) -> OcrProfile:
+        product_class = (product_class or "").strip().lower()
+        if product_class in self._profiles_by_product_class:
+            return self._profiles_by_product_class[product_class]
+        words = product_class.split()
+        for mapped_class, profile in self._profiles_by_product_class.items():
+            mapped_words = mapped_class.split()
+            if any(words[i:i + len(mapped_words)] == mapped_words for i in range(len(words))):
+                return profile
+        return self._default_profile
@@ -0,0 +1,213 @@
+"""Parallel OCR of large images as overlapping tiles across a process pool"""
+
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+import multiprocessing
+from typing import Optional, Dict, List
+
+import pytesseract
+from PIL import Image
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import WORD_LEVEL
+from treasury.services.gateways.ttb_api.main.application.config import config
+
+DEFAULT_MIN_IMAGE_SIDE_PX = 2000
+DEFAULT_TILE_SIZE_PX = 1024
+# Must exceed the longest word (and the tallest line) expected on a label, see OcrTile
+DEFAULT_OVERLAP_PX = 200
+# Block numbers of a tile are offset by tile index * this, so they stay unique after merging
+TILE_BLOCK_NUM_STRIDE = 10_000
+
+OCR_DATA_KEYS = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                 'left', 'top', 'width', 'height', 'conf', 'text')
+
+
+class OcrTilingConfig(BaseModel):
+    """When and how images are split into tiles, OCR_TILING_* configuration by default"""
+    enabled: bool = False
+    # Images whose longest side is shorter than this are recognized in one call
+    min_image_side_px: int = DEFAULT_MIN_IMAGE_SIDE_PX
+    tile_size_px: int = DEFAULT_TILE_SIZE_PX
+    overlap_px: int = DEFAULT_OVERLAP_PX
+
+    @classmethod
+    def from_config(cls) -> 'OcrTilingConfig':
+        return cls(
+            enabled=(config.OCR_TILING_ENABLED or "false").strip().lower() == "true",
+            min_image_side_px=int(config.OCR_TILING_MIN_IMAGE_SIDE_PX or DEFAULT_MIN_IMAGE_SIDE_PX),
+            tile_size_px=int(config.OCR_TILE_SIZE_PX or DEFAULT_TILE_SIZE_PX),
+            overlap_px=int(config.OCR_TILE_OVERLAP_PX or DEFAULT_OVERLAP_PX),
+        )
+
+
+class OcrTile(BaseModel):
+    """
+    A tile of the image, and its core: the part of the tile that no other tile's core covers. Cores
+    partition the image, so a word is kept only from the tile whose core contains the word's centre -
+    words repeated in the overlap zones, and words cut off at a tile edge, are dropped.
+    """
+    x: int
+    y: int
+    width: int
+    height: int
+    core_x0: int
+    core_y0: int
+    core_x1: int
+    core_y1: int
+
+    def owns(self, center_x: float, center_y: float) -> bool:
+        return self.core_x0 <= center_x < self.core_x1 and self.core_y0 <= center_y < self.core_y1
+
+
+class OcrProcessPool:
+    """
+    Worker processes shared by all OCR calls of the API process, created on first use. OCR_MAX_WORKERS
+    sets their number (default: one per core). Workers are spawned rather than forked, which is safe
+    in a multi-threaded server.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                max_workers = int(config.OCR_MAX_WORKERS or 0) or os.cpu_count() or 1
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def recognize_tile(
+        tile_image: Image.Image,
+        tesseract_cmd: str,
+        lang: Optional[str] = None,
+        tesseract_config: str = ''
+) -> Optional[Dict]:
+    """
+    Word-level OCR data of one tile, None if Tesseract is not installed - runs in a worker process.
+    pytesseract's errors cannot be unpickled in the calling process (they would break the pool), so
+    they are not raised as they are.
+    """
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    try:
+        return pytesseract.image_to_data(
+            tile_image, lang=lang, config=tesseract_config, output_type=pytesseract.Output.DICT
+        )
+    except pytesseract.TesseractNotFoundError:
+        return None
+    except pytesseract.TesseractError as e:
+        raise RuntimeError(f"Tesseract failed on a tile: {e.message}") from None
+
+
+class OcrTiledRecognizer:
+    """
+    Splits large images into overlapping tiles, recognizes the tiles in parallel and merges the results
+    into one pytesseract image_to_data style dict in image coordinates. Wall-clock time on a large label
+    goes down with the number of cores, at the cost of Tesseract not seeing layout across tile edges.
+    """
+
+    def __init__(self, tiling_config: OcrTilingConfig, executor: Optional[Executor] = None) -> None:
+        self._tiling_config = tiling_config
+        self._executor_lazy = executor
+
+    @property
+    def tiling_config(self) -> OcrTilingConfig:
+        return self._tiling_config
+
+    @property
+    def _executor(self) -> Executor:
+        # Lazy initialization of the shared worker processes
+        if self._executor_lazy is None:
+            self._executor_lazy = OcrProcessPool.get_executor()
+        return self._executor_lazy
+
+    def should_tile(self, image: Image.Image) -> bool:
+        return self._tiling_config.enabled and max(image.size) >= self._tiling_config.min_image_side_px
+
+    def recognize(self, image: Image.Image, lang: Optional[str] = None, tesseract_config: str = '') -> Dict:
+        tiles = self.plan_tiles(
+            image.size[0],
+            image.size[1],
+            self._tiling_config.tile_size_px,
+            self._tiling_config.overlap_px
+        )
+        tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+        futures = [
+            self._executor.submit(
+                recognize_tile,
+                image.crop((tile.x, tile.y, tile.x + tile.width, tile.y + tile.height)),
+                tesseract_cmd,
+                lang,
+                tesseract_config
+            )
+            for tile in tiles
+        ]
+        tile_results = [future.result() for future in futures]
+        if any(ocr_data is None for ocr_data in tile_results):
+            raise pytesseract.TesseractNotFoundError()
+        return self.merge(tiles, tile_results)
+
+    @classmethod
+    def plan_tiles(cls, width: int, height: int, tile_size: int, overlap: int) -> List[OcrTile]:
+        """Tiles of at most tile_size covering the image, neighbours overlapping by overlap pixels"""
+        xs = cls._tile_starts(width, tile_size, overlap)
+        ys = cls._tile_starts(height, tile_size, overlap)
+        tiles = []
+        for row, y in enumerate(ys):
+            for column, x in enumerate(xs):
+                tile_width, tile_height = min(tile_size, width - x), min(tile_size, height - y)
+                tiles.append(OcrTile(
+                    x=x,
+                    y=y,
+                    width=tile_width,
+                    height=tile_height,
+                    # Neighbouring cores meet in the middle of the overlap
+                    core_x0=0 if column == 0 else (x + xs[column - 1] + tile_size) // 2,
+                    core_y0=0 if row == 0 else (y + ys[row - 1] + tile_size) // 2,
+                    core_x1=width if column == len(xs) - 1 else (xs[column + 1] + x + tile_size) // 2,
+                    core_y1=height if row == len(ys) - 1 else (ys[row + 1] + y + tile_size) // 2,
+                ))
+        return tiles
+
+    @classmethod
+    def _tile_starts(cls, length: int, tile_size: int, overlap: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        stride = tile_size - overlap
+        starts = list(range(0, length - tile_size, stride))
+        # The last tile is aligned with the end of the image
+        starts.append(length - tile_size)
+        return starts
+
+    @classmethod
+    def merge(cls, tiles: List[OcrTile], tile_results: List[Dict]) -> Dict:
+        """Word entries of all tiles in image coordinates, each word taken from the tile owning it"""
+        merged: Dict[str, list] = {key: [] for key in OCR_DATA_KEYS}
+        for tile_index, (tile, ocr_data) in enumerate(zip(tiles, tile_results)):
+            for i in range(len(ocr_data['text'])):
+                if int(ocr_data['level'][i]) != WORD_LEVEL:
+                    continue
+                left = int(ocr_data['left'][i]) + tile.x
+                top = int(ocr_data['top'][i]) + tile.y
+                width, height = int(ocr_data['width'][i]), int(ocr_data['height'][i])
+                if not tile.owns(left + width / 2, top + height / 2):
+                    continue
+                for key in OCR_DATA_KEYS:
+                    merged[key].append(ocr_data[key][i])
+                merged['left'][-1] = left
+                merged['top'][-1] = top
+                merged['block_num'][-1] = tile_index * TILE_BLOCK_NUM_STRIDE + int(ocr_data['block_num'][i])
+        return merged
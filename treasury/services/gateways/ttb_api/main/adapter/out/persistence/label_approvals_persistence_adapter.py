@@ -1,10 +1,12 @@
 import uuid
+from datetime import datetime
 from typing import Optional
 
 from treasury.services.gateways.ttb_api.main.adapter.out.persistence.common.db_config import DbConfig
 from treasury.services.gateways.ttb_api.main.adapter.out.persistence.common.persistence_adapter_base import \
     PersistenceAdapterBase
-from sqlalchemy import and_, or_, delete, func, String
+from sqlalchemy import and_, or_, delete, func, String, cast, update, ColumnElement
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm.session import Session
 
 from treasury.services.gateways.ttb_api.main.application.models.domain.entity_descriptor import EntityDescriptor
@@ -161,6 +163,103 @@ class LabelApprovalJobsPersistenceAdapter(PersistenceAdapterBase):
 
             return jobs, total_count
 
+    def list_jobs_with_inline_images(
+            self,
+            after_job_id: Optional[uuid.UUID] = None,
+            limit: int = 100
+    ) -> list[LabelApprovalJob]:
+        """
+        Next batch of jobs whose metadata may still hold base64 label images, in id order after
+        after_job_id (keyset pagination - no OFFSET scans, stable while rows are being rewritten).
+        Not indexed: each batch scans the table up to its limit (see _has_label_image_with); callers
+        check the label images themselves.
+        """
+        with Session(self._orm_engine, expire_on_commit=False, autocommit=False) as session:
+            query = session.query(LabelApprovalJob).filter(
+                self._has_label_image_with(session, "base64")
+            )
+            if after_job_id is not None:
+                query = query.filter(LabelApprovalJob.id > after_job_id)  # type: ignore
+            jobs = query.order_by(LabelApprovalJob.id).limit(limit).all()
+            return self._ensure_jobs_metadata_deserialized(jobs)
+
+    def list_jobs_with_pending_uploads(
+            self,
+            after_job_id: Optional[uuid.UUID] = None,
+            limit: int = 100
+    ) -> list[LabelApprovalJob]:
+        """
+        Next batch of jobs whose label images wait for the spooled upload (pending_upload_key), in id
+        order after after_job_id. Not indexed (see _has_label_image_with) - LabelImageUploadDrainService
+        only looks when the spool had images to upload.
+        """
+        with Session(self._orm_engine, expire_on_commit=False, autocommit=False) as session:
+            query = session.query(LabelApprovalJob).filter(
+                self._has_label_image_with(session, "pending_upload_key")
+            )
+            if after_job_id is not None:
+                query = query.filter(LabelApprovalJob.id > after_job_id)  # type: ignore
+            jobs = query.order_by(LabelApprovalJob.id).limit(limit).all()
+            return self._ensure_jobs_metadata_deserialized(jobs)
+
+    def list_job_label_data(
+            self,
+            after_job_id: Optional[uuid.UUID] = None,
+            limit: int = 1000
+    ) -> list[tuple[uuid.UUID, Optional[dict], Optional[dict]]]:
+        """
+        Next batch of (job id, product_info given on the form, extracted_product_info of the first label
+        image) in id order after after_job_id, as the stored JSON. Only these two values are read from the
+        metadata - not the label images - so that bulk audits can scan every job cheaply.
+        """
+        with Session(self._orm_engine, expire_on_commit=False, autocommit=False) as session:
+            query = session.query(
+                LabelApprovalJob.id,
+                LabelApprovalJob.job_metadata["product_info"],
+                LabelApprovalJob.job_metadata[("label_images", 0, "extracted_product_info")]
+            )
+            if after_job_id is not None:
+                query = query.filter(LabelApprovalJob.id > after_job_id)  # type: ignore
+            return [tuple(row) for row in query.order_by(LabelApprovalJob.id).limit(limit).all()]
+
+    def set_job_metadata_if_unchanged(
+            self,
+            job_id: uuid.UUID,
+            job_metadata: dict,
+            expected_updated_at: datetime
+    ) -> bool:
+        """
+        Replace the metadata of a job only if the job was not updated since expected_updated_at.
+        Used by background rewrites that must not clobber concurrent edits; updated_at is left as is.
+
+        Returns:
+            True if the metadata was replaced
+        """
+        with Session(self._orm_engine, expire_on_commit=False, autocommit=False) as session:
+            result = session.execute(
+                update(LabelApprovalJob)
+                .where(LabelApprovalJob.id == job_id)  # type: ignore
+                .where(LabelApprovalJob.updated_at == expected_updated_at)  # type: ignore
+                .values(job_metadata=job_metadata)
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    @classmethod
+    def _has_label_image_with(cls, session: Session, field: str) -> ColumnElement[bool]:
+        """
+        Matches jobs with a label image whose <field> is set. On PostgreSQL a JSON path predicate on the
+        metadata. Elsewhere (SQLite in tests and local runs) a text pre-filter that depends on how the JSON
+        column is serialized: json.dumps with its default separators writes `"<field>": "` for a string
+        value, a serializer with compact separators would never match.
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            return func.jsonb_path_exists(
+                cast(LabelApprovalJob.job_metadata, JSONB),
+                f'$.label_images[*] ? (@.{field} != null)'
+            )
+        return cast(LabelApprovalJob.job_metadata, String).like(f'%"{field}": "%')
+
     @classmethod
     def _ensure_job_metadata_deserialized(cls, job: Optional[LabelApprovalJob]) -> Optional[LabelApprovalJob]:
         """Ensure job_metadata is a JobMetadata object, not a dict.
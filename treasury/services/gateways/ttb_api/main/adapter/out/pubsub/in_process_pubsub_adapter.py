@@ -0,0 +1,94 @@
+"""In-process publish/subscribe adapter backed by asyncio queues"""
+
+import asyncio
+import threading
+from typing import Optional
+
+from treasury.services.gateways.ttb_api.main.adapter.out.pubsub.pubsub_adapter import PubSubAdapter, \
+    PubSubSubscription
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+DEFAULT_MAX_QUEUED_MESSAGES = 100
+
+
+class _InProcessSubscription(PubSubSubscription):
+
+    def __init__(self, adapter: 'InProcessPubSubAdapter', topic: str, max_queued_messages: int) -> None:
+        self._adapter = adapter
+        self._topic = topic
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queued_messages)
+
+    def deliver(self, message: str) -> None:
+        """Hand a message to the subscriber's event loop (callable from any thread)"""
+        self._loop.call_soon_threadsafe(self._enqueue, message)
+
+    def _enqueue(self, message: str) -> None:
+        if self._queue.full():
+            # Slow subscriber: drop the oldest message rather than blocking publishers
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    async def __anext__(self) -> str:
+        return await self._queue.get()
+
+    async def close(self) -> None:
+        self._adapter.unsubscribe(self._topic, self)
+
+
+class InProcessPubSubAdapter(PubSubAdapter):
+    """
+    Delivers messages to subscribers living in the same process. Publishers may run on any thread,
+    each subscriber receives messages on the event loop it subscribed from.
+    """
+
+    _instance: Optional['InProcessPubSubAdapter'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_queued_messages: int = DEFAULT_MAX_QUEUED_MESSAGES) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._max_queued_messages = max_queued_messages
+        self._subscriptions: dict[str, set[_InProcessSubscription]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_singleton_instance_of(cls) -> 'InProcessPubSubAdapter':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = InProcessPubSubAdapter()
+            return cls._instance
+
+    def publish(self, topic: str, message: str) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(topic, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.deliver(message)
+            except RuntimeError as e:
+                # The subscriber's event loop has been closed
+                self._logger.warning(f"Dropping message for closed subscriber on topic={topic}: {str(e)}")
+                self.unsubscribe(topic, subscription)
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(topic, ()))
+
+    async def subscribe(self, topic: str) -> PubSubSubscription:
+        subscription = _InProcessSubscription(
+            adapter=self,
+            topic=topic,
+            max_queued_messages=self._max_queued_messages
+        )
+        with self._lock:
+            self._subscriptions.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, topic: str, subscription: PubSubSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(topic)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[topic]
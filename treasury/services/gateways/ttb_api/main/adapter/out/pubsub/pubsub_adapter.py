@@ -0,0 +1,36 @@
+"""Publish/subscribe port used to push job progress to live subscribers"""
+
+from abc import ABC, abstractmethod
+
+
+class PubSubSubscription(ABC):
+    """An open subscription to a single topic. Iterate to receive messages, close when done."""
+
+    def __aiter__(self) -> 'PubSubSubscription':
+        return self
+
+    @abstractmethod
+    async def __anext__(self) -> str:
+        """Wait for the next message published on the topic"""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Stop receiving messages and release the subscription"""
+
+
+class PubSubAdapter(ABC):
+
+    @abstractmethod
+    def publish(self, topic: str, message: str) -> None:
+        """
+        Publish a message to every current subscriber of a topic.
+        Safe to call from synchronous code running on any thread.
+        """
+
+    @abstractmethod
+    def subscriber_count(self, topic: str) -> int:
+        """Number of open subscriptions for a topic"""
+
+    @abstractmethod
+    async def subscribe(self, topic: str) -> PubSubSubscription:
+        """Open a subscription. Messages published after this returns are delivered to it."""
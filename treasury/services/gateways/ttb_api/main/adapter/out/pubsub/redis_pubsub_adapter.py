@@ -0,0 +1,56 @@
+"""Redis publish/subscribe adapter, for running several API workers against one (local) broker"""
+
+from typing import Optional
+
+import redis
+import redis.asyncio
+
+from treasury.services.gateways.ttb_api.main.adapter.out.pubsub.pubsub_adapter import PubSubAdapter, \
+    PubSubSubscription
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+
+class _RedisSubscription(PubSubSubscription):
+
+    def __init__(self, client: redis.asyncio.Redis, pubsub: redis.asyncio.client.PubSub) -> None:
+        self._client = client
+        self._pubsub = pubsub
+
+    async def __anext__(self) -> str:
+        while True:
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            if message is not None and message.get("type") == "message":
+                data = message["data"]
+                return data.decode("utf-8") if isinstance(data, bytes) else data
+
+    async def close(self) -> None:
+        await self._pubsub.aclose()
+        await self._client.aclose()
+
+
+class RedisPubSubAdapter(PubSubAdapter):
+    """
+    Uses Redis channels so that updates published by one worker process reach subscribers connected
+    to another. Any Redis-protocol server works, including a local one during development.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._redis_url = redis_url or config.PUBSUB_REDIS_URL
+        if not self._redis_url:
+            raise ValueError("No Redis URL provided. Set PUBSUB_REDIS_URL environment variable.")
+        self._client = redis.Redis.from_url(self._redis_url)
+
+    def publish(self, topic: str, message: str) -> None:
+        self._client.publish(topic, message)
+
+    def subscriber_count(self, topic: str) -> int:
+        counts = self._client.pubsub_numsub(topic)
+        return int(counts[0][1]) if counts else 0
+
+    async def subscribe(self, topic: str) -> PubSubSubscription:
+        client = redis.asyncio.Redis.from_url(self._redis_url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(topic)
+        return _RedisSubscription(client=client, pubsub=pubsub)
@@ -0,0 +1,163 @@
+"""Content-addressed blob storage port for label images"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+LABEL_IMAGES_PREFIX = "label-images"
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpg": "jpg",
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+}
+
+
+class PresignedUpload(BaseModel):
+    """A form POST that lets a client upload one object directly to storage"""
+    url: str
+    # Form fields to send along with the file (the file itself goes last, in a field named "file")
+    fields: dict[str, str]
+    key: str
+    expires_in_seconds: int
+
+
+class BlobMetadata(BaseModel):
+    """What storage knows about an object without it being downloaded"""
+    size_bytes: int
+    content_type: Optional[str] = None
+
+
+class BlobStorageAdapter(ABC):
+    """
+    Stores label images under a key derived from their SHA-256 (label-images/{sha256}.{ext}), so the
+    same bytes always map to the same object and URL. Uploading an image that is already stored is a
+    lookup only - resubmitted labels do not create new objects, and caches keyed on the URL keep hitting.
+    """
+
+    def __init__(self) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+
+    @abstractmethod
+    def get_url(self, key: str) -> Optional[str]:
+        """URL of the object stored under key, None if there is no such object"""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str) -> str:
+        """
+        Store data under key, replacing any existing object, and return its URL
+
+        Raises:
+            RuntimeError: If the upload fails
+        """
+
+    @abstractmethod
+    def read(self, key: str) -> Optional[bytes]:
+        """Contents of the object stored under key, None if there is no such object"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete the object stored under key, if any"""
+
+    def head(self, key: str) -> Optional[BlobMetadata]:
+        """
+        Size and content type of the object stored under key, None if there is no such object. Backends
+        that can look them up without downloading the object override this; the default reads it.
+        """
+        data = self.read(key)
+        return BlobMetadata(size_bytes=len(data)) if data is not None else None
+
+    def read_range(self, key: str, start: int, length: int) -> Optional[bytes]:
+        """
+        At most length bytes of the object stored under key from offset start, None if there is no such
+        object. Backends that support ranged reads override this; the default reads the whole object.
+        """
+        data = self.read(key)
+        return data[start:start + length] if data is not None else None
+
+    def copy(self, source_key: str, key: str, content_type: str) -> str:
+        """
+        Copy an object to another key and return the URL of the copy. Backends that can copy
+        server-side override this; the default reads the object and stores it again.
+
+        Raises:
+            RuntimeError: If the source object does not exist or the copy fails
+        """
+        data = self.read(source_key)
+        if data is None:
+            raise RuntimeError(f"Blob {source_key} not found")
+        return self.put(key, data, content_type)
+
+    @property
+    def supports_presigned_uploads(self) -> bool:
+        return False
+
+    def create_presigned_upload(
+            self,
+            key: str,
+            content_type: str,
+            max_size_bytes: int,
+            expires_in_seconds: int
+    ) -> PresignedUpload:
+        """
+        Authorize a client to upload one object of at most max_size_bytes directly to key
+
+        Raises:
+            NotImplementedError: If the backend does not support direct uploads
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support presigned uploads")
+
+    @classmethod
+    def content_key(cls, sha256: str, content_type: str) -> str:
+        extension = CONTENT_TYPE_EXTENSIONS.get(content_type, "jpg")
+        return f"{LABEL_IMAGES_PREFIX}/{sha256}.{extension}"
+
+    @classmethod
+    def variant_key(cls, sha256: str, variant: str, extension: str) -> str:
+        """Key of a rendition derived from the image with the given SHA-256"""
+        return f"{LABEL_IMAGES_PREFIX}/{sha256}/{variant}.{extension}"
+
+    def upload_image(
+            self,
+            image_data: bytes,
+            content_type: str,
+            sha256: Optional[str] = None,
+            source_key: Optional[str] = None
+    ) -> str:
+        """
+        Store an image under its content address, skipping the upload if it is already stored.
+
+        Args:
+            image_data: Raw image bytes
+            content_type: MIME type of the image (e.g., 'image/jpeg')
+            sha256: Hex SHA-256 of image_data if already known, computed otherwise
+            source_key: Key the same bytes are already stored under (e.g. a direct upload), copied
+                instead of uploading image_data again
+
+        Returns:
+            Stable URL of the stored image
+
+        Raises:
+            RuntimeError: If the upload fails
+        """
+        key = self.content_key(sha256 or hashlib.sha256(image_data).hexdigest(), content_type)
+
+        try:
+            existing_url = self.get_url(key)
+        except Exception as e:
+            # Not being able to tell only costs a redundant upload of identical bytes
+            self._logger.warning(f"Blob existence check failed, uploading anyway key={key} error={str(e)}")
+            existing_url = None
+
+        if existing_url:
+            self._logger.info(f"Label image already stored, skipping upload key={key}")
+            return existing_url
+
+        if source_key:
+            return self.copy(source_key, key, content_type)
+        return self.put(key, image_data, content_type)
@@ -0,0 +1,49 @@
+"""Selects the blob storage backend from configuration"""
+
+import threading
+from typing import Optional
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.resilient_blob_storage_adapter import \
+    ResilientBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.application.config import config
+
+
+class BlobStorageAdapterFactory:
+    """
+    BLOB_STORAGE_BACKEND selects the backend: "vercel" (default), "s3" for S3-compatible storage
+    or "local" for a directory on the local filesystem. One adapter instance is shared by the process,
+    wrapped with retries and a circuit breaker.
+    """
+
+    VERCEL = "vercel"
+    S3 = "s3"
+    LOCAL = "local"
+
+    _instance: Optional[BlobStorageAdapter] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_singleton_instance_of(cls) -> BlobStorageAdapter:
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = ResilientBlobStorageAdapter(cls.create(config.BLOB_STORAGE_BACKEND))
+            return cls._instance
+
+    @classmethod
+    def create(cls, backend: Optional[str]) -> BlobStorageAdapter:
+        backend = (backend or cls.VERCEL).strip().lower()
+        # Backends are imported on demand so that e.g. boto3 is only loaded when S3 is used
+        if backend == cls.VERCEL:
+            from treasury.services.gateways.ttb_api.main.adapter.out.storage.vercel_blob_storage_adapter import \
+                VercelBlobStorageAdapter
+            return VercelBlobStorageAdapter()
+        if backend == cls.S3:
+            from treasury.services.gateways.ttb_api.main.adapter.out.storage.s3_blob_storage_adapter import \
+                S3BlobStorageAdapter
+            return S3BlobStorageAdapter()
+        if backend == cls.LOCAL:
+            from treasury.services.gateways.ttb_api.main.adapter.out.storage.local_filesystem_blob_storage_adapter import \
+                LocalFilesystemBlobStorageAdapter
+            return LocalFilesystemBlobStorageAdapter()
+        raise ValueError(f"Unknown BLOB_STORAGE_BACKEND '{backend}', expected one of: vercel, s3, local")
@@ -0,0 +1,95 @@
+"""Local spool for label images whose upload to blob storage failed"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+DEFAULT_SPOOL_DIR_NAME = "ttb-label-image-spool"
+METADATA_SUFFIX = ".meta.json"
+
+
+class SpooledLabelImage(BaseModel):
+    key: str
+    content_type: str
+    size_bytes: int
+
+
+class LabelImageSpoolAdapter:
+    """
+    Holds the bytes of label images under their blob key in a spool directory (LABEL_IMAGE_SPOOL_DIR,
+    defaults to a directory under the system temp dir) until they can be uploaded. Each image has a
+    metadata file next to it that is written last, so only complete entries are listed.
+
+    The spool must be on persistent storage shared by the API processes for spooled images to survive
+    restarts.
+    """
+
+    def __init__(self, spool_dir: Optional[str] = None) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._spool_dir = Path(
+            spool_dir or config.LABEL_IMAGE_SPOOL_DIR or os.path.join(tempfile.gettempdir(), DEFAULT_SPOOL_DIR_NAME)
+        ).resolve()
+        self._spool_dir.mkdir(parents=True, exist_ok=True)
+
+    def spool(self, key: str, data: bytes, content_type: str) -> SpooledLabelImage:
+        """
+        Store an image for a later upload
+
+        Raises:
+            RuntimeError: If the image cannot be written
+        """
+        path = self._path(key)
+        entry = SpooledLabelImage(key=key, content_type=content_type, size_bytes=len(data))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomically(path, data)
+            self._write_atomically(self._metadata_path(path), entry.model_dump_json().encode("utf-8"))
+        except OSError as e:
+            raise RuntimeError(f"Failed to spool label image {key}: {str(e)}") from e
+
+        self._logger.info(f"Spooled label image key={key} size_bytes={len(data)}")
+        return entry
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        return path.read_bytes() if self._metadata_path(path).is_file() else None
+
+    def list_entries(self) -> list[SpooledLabelImage]:
+        """Spooled images, oldest first"""
+        metadata_paths = sorted(self._spool_dir.rglob(f"*{METADATA_SUFFIX}"), key=lambda p: p.stat().st_mtime)
+        entries = []
+        for metadata_path in metadata_paths:
+            try:
+                entries.append(SpooledLabelImage.model_validate(json.loads(metadata_path.read_text())))
+            except (OSError, ValueError) as e:
+                self._logger.warning(f"Skipping unreadable spool entry {metadata_path}: {str(e)}")
+        return entries
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        # Metadata first, so a half-deleted entry is never listed
+        self._metadata_path(path).unlink(missing_ok=True)
+        path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self._spool_dir / key).resolve()
+        if not path.is_relative_to(self._spool_dir):
+            raise ValueError(f"Spool key escapes the spool directory: {key}")
+        return path
+
+    @classmethod
+    def _metadata_path(cls, path: Path) -> Path:
+        return path.with_name(path.name + METADATA_SUFFIX)
+
+    @classmethod
+    def _write_atomically(cls, path: Path, data: bytes) -> None:
+        partial_path = path.with_name(path.name + ".part")
+        partial_path.write_bytes(data)
+        os.replace(partial_path, path)
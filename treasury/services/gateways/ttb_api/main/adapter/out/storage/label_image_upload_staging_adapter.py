@@ -0,0 +1,115 @@
+"""Local staging area for streamed label image uploads"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+DEFAULT_STAGING_DIR_NAME = "ttb-label-image-uploads"
+
+
+class StagedUpload(BaseModel):
+    upload_id: str
+    image_type: str
+    size_bytes: int
+    sha256: str
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+class LabelImageUploadStagingAdapter:
+    """
+    Streams uploaded label images to files in a staging directory (LABEL_IMAGE_UPLOAD_DIR, defaults to
+    a directory under the system temp dir) until a label approval job references them by upload id.
+    Only one chunk of the request body is held in memory at a time.
+    """
+
+    def __init__(self, staging_dir: Optional[str] = None) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._staging_dir = Path(
+            staging_dir or config.LABEL_IMAGE_UPLOAD_DIR or os.path.join(tempfile.gettempdir(), DEFAULT_STAGING_DIR_NAME)
+        )
+        self._staging_dir.mkdir(parents=True, exist_ok=True)
+
+    async def stage(self, chunks: AsyncIterator[bytes], image_type: str, max_size_bytes: int) -> StagedUpload:
+        """
+        Write a stream of chunks to a new staged upload.
+
+        Raises:
+            UploadTooLargeError: As soon as the stream exceeds max_size_bytes (nothing is kept)
+        """
+        upload_id = uuid.uuid4().hex
+        final_path = self._path(upload_id, image_type)
+        partial_path = final_path.with_suffix(final_path.suffix + ".part")
+        digest = hashlib.sha256()
+        size_bytes = 0
+
+        try:
+            # File I/O runs in worker threads, off the event loop serving other requests
+            f = await asyncio.to_thread(open, partial_path, "wb")
+            try:
+                async for chunk in chunks:
+                    size_bytes += len(chunk)
+                    if size_bytes > max_size_bytes:
+                        raise UploadTooLargeError(f"Upload exceeds maximum allowed size of {max_size_bytes} bytes")
+                    digest.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                f.close()
+            # only complete uploads become visible under their final name
+            await asyncio.to_thread(os.replace, partial_path, final_path)
+        except BaseException:
+            # Not awaited, so that the partial file is removed even when the request is cancelled
+            partial_path.unlink(missing_ok=True)
+            raise
+
+        self._logger.info(f"Staged label image upload upload_id={upload_id} size_bytes={size_bytes}")
+        return StagedUpload(upload_id=upload_id, image_type=image_type, size_bytes=size_bytes, sha256=digest.hexdigest())
+
+    def read(self, upload_id: str) -> Optional[tuple[bytes, str]]:
+        """The bytes and image type of a staged upload, None if it does not exist"""
+        path = self._find_path(upload_id)
+        if path is None:
+            return None
+        return path.read_bytes(), path.suffix.lstrip(".")
+
+    def delete(self, upload_id: str) -> None:
+        path = self._find_path(upload_id)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def delete_expired(self, max_age_seconds: float) -> int:
+        """Delete staged uploads (and abandoned partial files) older than max_age_seconds"""
+        deleted = 0
+        cutoff = time.time() - max_age_seconds
+        for path in self._staging_dir.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    deleted += 1
+            except OSError as e:
+                self._logger.warning(f"Failed to delete expired staged upload path={path} error={e}")
+        return deleted
+
+    def _path(self, upload_id: str, image_type: str) -> Path:
+        return self._staging_dir / f"{upload_id}.{image_type}"
+
+    def _find_path(self, upload_id: str) -> Optional[Path]:
+        try:
+            # upload ids are generated by us - anything else must not be turned into a path
+            upload_id = uuid.UUID(hex=upload_id).hex
+        except (ValueError, TypeError):
+            return None
+        matches = [p for p in self._staging_dir.glob(f"{upload_id}.*") if not p.name.endswith(".part")]
+        return matches[0] if matches else None
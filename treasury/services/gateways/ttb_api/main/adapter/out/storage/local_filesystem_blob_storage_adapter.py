@@ -0,0 +1,77 @@
+"""Local filesystem blob storage adapter for development and tests"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter, \
+    BlobMetadata
+from treasury.services.gateways.ttb_api.main.application.config import config
+
+DEFAULT_ROOT_DIR_NAME = "ttb-blob-storage"
+
+
+class LocalFilesystemBlobStorageAdapter(BlobStorageAdapter):
+    """
+    Stores blobs as files under a root directory (BLOB_STORAGE_LOCAL_DIR, defaults to a directory under
+    the system temp dir). URLs are file:// URLs unless a public base URL (BLOB_STORAGE_LOCAL_BASE_URL)
+    is configured for serving the directory over HTTP.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, base_url: Optional[str] = None) -> None:
+        super().__init__()
+        self._root_dir = Path(
+            root_dir or config.BLOB_STORAGE_LOCAL_DIR or os.path.join(tempfile.gettempdir(), DEFAULT_ROOT_DIR_NAME)
+        ).resolve()
+        self._root_dir.mkdir(parents=True, exist_ok=True)
+        self._base_url = (base_url or config.BLOB_STORAGE_LOCAL_BASE_URL or "").rstrip("/")
+
+    def get_url(self, key: str) -> Optional[str]:
+        return self._url(key) if self._path(key).is_file() else None
+
+    def put(self, key: str, data: bytes, content_type: str) -> str:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial_path = path.with_name(path.name + ".part")
+            partial_path.write_bytes(data)
+            os.replace(partial_path, path)
+        except OSError as e:
+            self._logger.error(f"Failed to store blob key={key}: {str(e)}")
+            raise RuntimeError(f"Failed to store blob {key}: {str(e)}") from e
+
+        url = self._url(key)
+        self._logger.info(f"Stored blob on local filesystem: {url}")
+        return url
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        return path.read_bytes() if path.is_file() else None
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def head(self, key: str) -> Optional[BlobMetadata]:
+        # Files carry no content type
+        path = self._path(key)
+        return BlobMetadata(size_bytes=path.stat().st_size) if path.is_file() else None
+
+    def read_range(self, key: str, start: int, length: int) -> Optional[bytes]:
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        with path.open("rb") as file:
+            file.seek(start)
+            return file.read(length)
+
+    def _path(self, key: str) -> Path:
+        path = (self._root_dir / key).resolve()
+        if not path.is_relative_to(self._root_dir):
+            raise ValueError(f"Blob key escapes the storage root: {key}")
+        return path
+
+    def _url(self, key: str) -> str:
+        if self._base_url:
+            return f"{self._base_url}/{key}"
+        return self._path(key).as_uri()
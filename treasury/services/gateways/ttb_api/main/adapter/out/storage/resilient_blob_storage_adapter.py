@@ -0,0 +1,73 @@
+"""Blob storage decorator adding retries and a circuit breaker"""
+
+from typing import Optional
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter, \
+    BlobMetadata, PresignedUpload
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.utils.circuit_breaker import CircuitBreaker
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT_SECONDS = 30.0
+
+
+class ResilientBlobStorageAdapter(BlobStorageAdapter):
+    """
+    Wraps a blob storage backend so that every call is retried with jittered backoff, and fails fast
+    (CircuitOpenError, a RuntimeError) while the backend is down. Per-request timeouts are set by the
+    backends themselves (HttpClientProvider for Vercel, botocore config for S3).
+
+    Configured with BLOB_STORAGE_MAX_ATTEMPTS, BLOB_STORAGE_CIRCUIT_FAILURE_THRESHOLD and
+    BLOB_STORAGE_CIRCUIT_RESET_SECONDS.
+    """
+
+    def __init__(self, blob_storage_adapter: BlobStorageAdapter, circuit_breaker: CircuitBreaker = None) -> None:
+        super().__init__()
+        self._blob_storage_adapter = blob_storage_adapter
+        self._circuit_breaker = circuit_breaker or CircuitBreaker(
+            name=f"blob-storage-{type(blob_storage_adapter).__name__}",
+            max_attempts=int(config.BLOB_STORAGE_MAX_ATTEMPTS or DEFAULT_MAX_ATTEMPTS),
+            failure_threshold=int(config.BLOB_STORAGE_CIRCUIT_FAILURE_THRESHOLD or DEFAULT_FAILURE_THRESHOLD),
+            reset_timeout_seconds=float(config.BLOB_STORAGE_CIRCUIT_RESET_SECONDS or DEFAULT_RESET_TIMEOUT_SECONDS),
+        )
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self._circuit_breaker
+
+    def get_url(self, key: str) -> Optional[str]:
+        return self._circuit_breaker.call(lambda: self._blob_storage_adapter.get_url(key))
+
+    def put(self, key: str, data: bytes, content_type: str) -> str:
+        # Puts are idempotent - the key is the content address
+        return self._circuit_breaker.call(lambda: self._blob_storage_adapter.put(key, data, content_type))
+
+    def read(self, key: str) -> Optional[bytes]:
+        return self._circuit_breaker.call(lambda: self._blob_storage_adapter.read(key))
+
+    def delete(self, key: str) -> None:
+        self._circuit_breaker.call(lambda: self._blob_storage_adapter.delete(key))
+
+    def head(self, key: str) -> Optional[BlobMetadata]:
+        return self._circuit_breaker.call(lambda: self._blob_storage_adapter.head(key))
+
+    def read_range(self, key: str, start: int, length: int) -> Optional[bytes]:
+        return self._circuit_breaker.call(lambda: self._blob_storage_adapter.read_range(key, start, length))
+
+    def copy(self, source_key: str, key: str, content_type: str) -> str:
+        return self._circuit_breaker.call(lambda: self._blob_storage_adapter.copy(source_key, key, content_type))
+
+    @property
+    def supports_presigned_uploads(self) -> bool:
+        return self._blob_storage_adapter.supports_presigned_uploads
+
+    def create_presigned_upload(
+            self,
+            key: str,
+            content_type: str,
+            max_size_bytes: int,
+            expires_in_seconds: int
+    ) -> PresignedUpload:
+        # Signing is local, there is nothing to retry
+        return self._blob_storage_adapter.create_presigned_upload(key, content_type, max_size_bytes, expires_in_seconds)
@@ -0,0 +1,175 @@
+"""S3-compatible blob storage adapter (AWS S3, MinIO, Cloudflare R2, ...)"""
+
+from typing import Optional, Any
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter, \
+    BlobMetadata, PresignedUpload
+from treasury.services.gateways.ttb_api.main.application.config import config
+
+# Content-addressed objects never change, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 30.0
+
+
+class S3BlobStorageAdapter(BlobStorageAdapter):
+    """
+    Stores blobs in an S3 bucket (BLOB_STORAGE_S3_BUCKET). BLOB_STORAGE_S3_ENDPOINT_URL points the client
+    at an S3-compatible service such as MinIO; credentials come from the usual AWS environment variables
+    or instance role. Object URLs are built from BLOB_STORAGE_S3_PUBLIC_BASE_URL (e.g. a CDN in front of
+    the bucket) when set, otherwise from the endpoint and bucket name.
+    """
+
+    def __init__(
+            self,
+            bucket: Optional[str] = None,
+            endpoint_url: Optional[str] = None,
+            region_name: Optional[str] = None,
+            public_base_url: Optional[str] = None,
+            s3_client: Any = None
+    ) -> None:
+        super().__init__()
+        self._bucket = bucket or config.BLOB_STORAGE_S3_BUCKET
+        if not self._bucket:
+            raise ValueError("BLOB_STORAGE_S3_BUCKET must be set to use S3 blob storage")
+        self._s3_client = s3_client or boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or config.BLOB_STORAGE_S3_ENDPOINT_URL,
+            region_name=region_name or config.BLOB_STORAGE_S3_REGION,
+            # Path-style addressing works with MinIO and any bucket name. Retries are left to the
+            # circuit breaker of ResilientBlobStorageAdapter so that attempts are not multiplied
+            config=Config(
+                signature_version="s3v4",
+                s3={"addressing_style": "path"},
+                connect_timeout=float(config.BLOB_STORAGE_CONNECT_TIMEOUT_SECONDS or DEFAULT_CONNECT_TIMEOUT_SECONDS),
+                read_timeout=float(config.BLOB_STORAGE_READ_TIMEOUT_SECONDS or DEFAULT_READ_TIMEOUT_SECONDS),
+                retries={"max_attempts": 1, "mode": "standard"},
+            ),
+        )
+        self._public_base_url = (public_base_url or config.BLOB_STORAGE_S3_PUBLIC_BASE_URL or "").rstrip("/")
+
+    def get_url(self, key: str) -> Optional[str]:
+        try:
+            self._s3_client.head_object(Bucket=self._bucket, Key=key)
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise RuntimeError(f"Failed to look up S3 object {key}: {str(e)}") from e
+        return self._url(key)
+
+    def put(self, key: str, data: bytes, content_type: str) -> str:
+        try:
+            self._s3_client.put_object(
+                Bucket=self._bucket,
+                Key=key,
+                Body=data,
+                ContentType=content_type,
+                CacheControl=IMMUTABLE_CACHE_CONTROL,
+            )
+        except (BotoCoreError, ClientError) as e:
+            self._logger.error(f"Failed to upload image to S3: {str(e)}")
+            raise RuntimeError(f"Failed to upload image to S3: {str(e)}") from e
+
+        url = self._url(key)
+        self._logger.info(f"Uploaded image to S3: {url}")
+        return url
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            response = self._s3_client.get_object(Bucket=self._bucket, Key=key)
+            return response["Body"].read()
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise RuntimeError(f"Failed to download S3 object {key}: {str(e)}") from e
+
+    def head(self, key: str) -> Optional[BlobMetadata]:
+        try:
+            response = self._s3_client.head_object(Bucket=self._bucket, Key=key)
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise RuntimeError(f"Failed to look up S3 object {key}: {str(e)}") from e
+        return BlobMetadata(size_bytes=response["ContentLength"], content_type=response.get("ContentType"))
+
+    def read_range(self, key: str, start: int, length: int) -> Optional[bytes]:
+        try:
+            response = self._s3_client.get_object(
+                Bucket=self._bucket,
+                Key=key,
+                Range=f"bytes={start}-{start + length - 1}",
+            )
+            return response["Body"].read()
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            # The range starts at or past the end of the object
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                return b""
+            raise RuntimeError(f"Failed to download S3 object {key}: {str(e)}") from e
+
+    def delete(self, key: str) -> None:
+        try:
+            self._s3_client.delete_object(Bucket=self._bucket, Key=key)
+        except (BotoCoreError, ClientError) as e:
+            raise RuntimeError(f"Failed to delete S3 object {key}: {str(e)}") from e
+
+    def copy(self, source_key: str, key: str, content_type: str) -> str:
+        """Server-side copy - the bytes never pass through the API"""
+        try:
+            self._s3_client.copy_object(
+                Bucket=self._bucket,
+                Key=key,
+                CopySource={"Bucket": self._bucket, "Key": source_key},
+                ContentType=content_type,
+                CacheControl=IMMUTABLE_CACHE_CONTROL,
+                MetadataDirective="REPLACE",
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise RuntimeError(f"Failed to copy S3 object {source_key} to {key}: {str(e)}") from e
+        return self._url(key)
+
+    @property
+    def supports_presigned_uploads(self) -> bool:
+        return True
+
+    def create_presigned_upload(
+            self,
+            key: str,
+            content_type: str,
+            max_size_bytes: int,
+            expires_in_seconds: int
+    ) -> PresignedUpload:
+        """
+        Presigned POST policy for key. Unlike a presigned PUT, the policy lets S3 itself reject uploads
+        larger than max_size_bytes or of a different content type.
+        """
+        presigned = self._s3_client.generate_presigned_post(
+            Bucket=self._bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size_bytes],
+            ],
+            ExpiresIn=expires_in_seconds,
+        )
+        return PresignedUpload(
+            url=presigned["url"],
+            fields=presigned["fields"],
+            key=key,
+            expires_in_seconds=expires_in_seconds,
+        )
+
+    def _url(self, key: str) -> str:
+        if self._public_base_url:
+            return f"{self._public_base_url}/{key}"
+        return f"{self._s3_client.meta.endpoint_url.rstrip('/')}/{self._bucket}/{key}"
+
+    @classmethod
+    def _is_not_found(cls, e: ClientError) -> bool:
+        return e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
@@ -1,54 +1,66 @@
 """Vercel Blob Storage adapter for uploading images"""
 
 import os
-import uuid
 from typing import Optional
 
-import requests
+import httpx
 
-from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.adapter.out.http.http_client_provider import HttpClientProvider
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter
 
+# Content-addressed objects never change, so they can be cached for as long as Vercel allows
+IMMUTABLE_CACHE_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
 
-class VercelBlobStorageAdapter:
+
+class VercelBlobStorageAdapter(BlobStorageAdapter):
 
     VERCEL_BLOB_API_URL = "https://blob.vercel-storage.com"
+    VERCEL_BLOB_API_VERSION = "7"
 
-    def __init__(self, token: Optional[str] = None) -> None:
-        self._logger = GlobalConfig.get_logger(__name__)
+    def __init__(self, token: Optional[str] = None, http_client: Optional[httpx.Client] = None) -> None:
+        super().__init__()
+        self._http_client = http_client or HttpClientProvider.get_client(HttpClientProvider.BLOB_STORAGE)
         self._token = token or os.environ.get("BLOB_READ_WRITE_TOKEN")
         if not self._token:
             self._logger.warning("No BLOB_READ_WRITE_TOKEN provided. Vercel Blob uploads will fail.")
 
-    def upload_image(self, image_data: bytes, filename: str, content_type: str) -> str:
-        """
-        Upload an image to Vercel Blob Storage.
-
-        Args:
-            image_data: Raw image bytes
-            filename: Desired filename (will be prefixed with a unique path)
-            content_type: MIME type of the image (e.g., 'image/jpeg')
+    def get_url(self, key: str) -> Optional[str]:
+        """Look up the blob's metadata by pathname, None if Vercel does not know it"""
+        try:
+            response = self._http_client.get(
+                self.VERCEL_BLOB_API_URL,
+                params={"url": key},
+                headers=self._headers(),
+            )
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json().get("url")
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Failed to look up Vercel Blob {key}: {str(e)}") from e
 
-        Returns:
-            Public URL of the uploaded blob
+    def put(self, key: str, data: bytes, content_type: str) -> str:
+        """
+        Upload a blob to Vercel Blob Storage under exactly the given pathname.
 
         Raises:
             RuntimeError: If upload fails
         """
-        # Generate a unique path to avoid collisions
-        unique_filename = f"label-images/{uuid.uuid4()}/{filename}"
-
         headers = {
-            "Authorization": f"Bearer {self._token}",
+            **self._headers(),
             "x-content-type": content_type,
-            "x-api-version": "7",
+            # The key is the content address - the URL must not get a random suffix
+            "x-add-random-suffix": "0",
+            # Two concurrent uploads of the same bytes race to write identical content
+            "x-allow-overwrite": "1",
+            "x-cache-control-max-age": str(IMMUTABLE_CACHE_MAX_AGE_SECONDS),
         }
 
         try:
-            response = requests.put(
-                f"{self.VERCEL_BLOB_API_URL}/{unique_filename}",
+            response = self._http_client.put(
+                f"{self.VERCEL_BLOB_API_URL}/{key}",
                 headers=headers,
-                data=image_data,
-                timeout=60,
+                content=data,
             )
             response.raise_for_status()
 
@@ -60,6 +72,37 @@ class VercelBlobStorageAdapter:
             self._logger.info(f"Uploaded image to Vercel Blob: {url}")
             return url
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             self._logger.error(f"Failed to upload image to Vercel Blob: {str(e)}")
             raise RuntimeError(f"Failed to upload image to Vercel Blob: {str(e)}") from e
+
+    def read(self, key: str) -> Optional[bytes]:
+        url = self.get_url(key)
+        if url is None:
+            return None
+        try:
+            response = self._http_client.get(url)
+            response.raise_for_status()
+            return response.content
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Failed to download Vercel Blob {key}: {str(e)}") from e
+
+    def delete(self, key: str) -> None:
+        url = self.get_url(key)
+        if url is None:
+            return
+        try:
+            response = self._http_client.post(
+                f"{self.VERCEL_BLOB_API_URL}/delete",
+                headers=self._headers(),
+                json={"urls": [url]},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Failed to delete Vercel Blob {key}: {str(e)}") from e
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self._token}",
+            "x-api-version": self.VERCEL_BLOB_API_VERSION,
+        }
@@ -1,3 +1,7 @@
+import asyncio
+import contextlib
+from typing import AsyncIterator
+
 import strawberry
 from strawberry.asgi import GraphQL
 
@@ -7,11 +11,19 @@ from starlette.responses import JSONResponse
 from starlette.requests import Request
 
 from treasury.services.gateways.ttb_api.main.adapter.inp.gql.error_handler import ErrorHandlerExtension
+from treasury.services.gateways.ttb_api.main.adapter.out.http.http_client_provider import HttpClientProvider
 from treasury.services.gateways.ttb_api.main.adapter.inp.gql.mutation import Mutation
 from treasury.services.gateways.ttb_api.main.adapter.inp.gql.query import Query
+from treasury.services.gateways.ttb_api.main.adapter.inp.gql.subscription import Subscription
+from treasury.services.gateways.ttb_api.main.adapter.inp.http.label_image_uploads_route import LabelImageUploadsRoute
+from treasury.services.gateways.ttb_api.main.adapter.out.llm.llm_routing_adapter import LlmRoutingAdapter, \
+    DEFAULT_METRICS_LOG_INTERVAL_SECONDS
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling import OcrProcessPool
 from treasury.services.gateways.ttb_api.main.application.config import config
 from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import AnalysisMode
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_upload_drain import \
+    LabelImageUploadDrainService, DEFAULT_DRAIN_INTERVAL_SECONDS
 from treasury.services.gateways.ttb_api.main.application.usecases.security.graphql_with_security_context import \
     GraphQlWithSecurityContext
 from treasury.services.gateways.ttb_api.main.application.usecases.security.security_context_factory import \
@@ -27,6 +39,34 @@ class ApiServiceConfig:
         ApiServiceConfig.logger.info("Health check started.")
         return JSONResponse({"status": "healthy"}, status_code=200)
 
+    @staticmethod
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        # Uploads label images spooled during a blob storage outage, 0 disables it
+        drain_interval_seconds = float(config.BLOB_UPLOAD_DRAIN_INTERVAL_SECONDS or DEFAULT_DRAIN_INTERVAL_SECONDS)
+        # Logs the per-model LLM latency and escalation/hedge counters, 0 disables it
+        metrics_log_interval_seconds = float(
+            config.LLM_METRICS_LOG_INTERVAL_SECONDS or DEFAULT_METRICS_LOG_INTERVAL_SECONDS
+        )
+        background_tasks = []
+        if drain_interval_seconds > 0:
+            background_tasks.append(asyncio.create_task(
+                LabelImageUploadDrainService().drain_periodically(drain_interval_seconds)
+            ))
+        if metrics_log_interval_seconds > 0:
+            background_tasks.append(asyncio.create_task(
+                LlmRoutingAdapter.log_metrics_periodically(metrics_log_interval_seconds)
+            ))
+        yield
+        for task in background_tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        # Close the pooled outbound HTTP connections on shutdown
+        HttpClientProvider.close_all()
+        # Stop the tiled OCR worker processes, if any were started
+        OcrProcessPool.shutdown()
+
     @classmethod
     def app_init(cls, security_context_factory: SecurityContextFactory) -> Starlette:
 
@@ -34,6 +74,7 @@ class ApiServiceConfig:
         schema = strawberry.Schema(
             query=Query,
             mutation=Mutation,
+            subscription=Subscription,
             extensions=[ErrorHandlerExtension]
         )
 
@@ -48,7 +89,7 @@ class ApiServiceConfig:
         cls.logger.info(f"CORS allowed origins={allow_origins}")
 
         # Wrap with CORS middleware
-        app = Starlette()
+        app = Starlette(lifespan=cls.lifespan)
         app.add_middleware(
             CORSMiddleware,
             #  allow_origins=["*"] combined with allow_credentials=True, which is not allowed by browsers -
@@ -59,8 +100,17 @@ class ApiServiceConfig:
             allow_headers=["*"],
         )
         app.add_route("/health", cls.health_check, methods=["GET"])
+        # Binary label image uploads, streamed instead of sent as base64 inside the GraphQL request
+        app.add_route(
+            "/uploads/label-images",
+            LabelImageUploadsRoute(security_context_factory=security_context_factory).upload_label_image,
+            methods=["POST"]
+        )
         app.add_route("/graphql", graphql_app, methods=["GET", "POST", "OPTIONS"])
         app.add_route("/graphql/", graphql_app, methods=["GET", "POST", "OPTIONS"])  # Handle trailing slash
+        # Subscriptions (graphql-transport-ws / graphql-ws) are served over a websocket on the same path
+        app.router.add_websocket_route("/graphql", graphql_app)
+        app.router.add_websocket_route("/graphql/", graphql_app)
         return app
 
     @property
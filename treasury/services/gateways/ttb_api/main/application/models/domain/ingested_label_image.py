@@ -0,0 +1,21 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class IngestedLabelImage(BaseModel):
+    """A submitted label image, decoded once and validated. The same bytes are used for hashing and upload."""
+    model_config = ConfigDict(frozen=True)
+
+    data: bytes
+    # From the data URI header, e.g. "image/jpg"
+    declared_content_type: Optional[str] = None
+    # Sniffed from the magic bytes, e.g. "png"
+    image_format: str
+    width: int
+    height: int
+    sha256: str
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
@@ -21,6 +21,25 @@ class LabelApprovalStatus(str, Enum):
 class AnalysisMode(str, Enum):
     using_llm = "using_llm"
     pytesseract = "pytesseract"
+    # OCR first, only the fields OCR could not confirm are asked of the LLM
+    tiered = "tiered"
+
+
+class AnalysisTier(str, Enum):
+    """The analysis that decided a field of a tiered analysis"""
+    ocr = "ocr"
+    llm = "llm"
+
+
+class OcrOverlayLevel(str, Enum):
+    """The OCR boxes drawn on an OCR overlay of a label image"""
+    words = "words"
+    lines = "lines"
+    blocks = "blocks"
+
+
+# The checks of LabelImageAnalysisResult, each with a <field>_found and <field>_found_results_reasoning
+LABEL_ANALYSIS_FIELDS = ("brand_name", "product_class", "alcohol_content", "net_contents", "health_warning")
 
 
 class LabelImageAnalysisResult(BaseModel):
@@ -49,6 +68,13 @@ class LabelImageAnalysisResult(BaseModel):
     # of the warning text is present). This can be a bonus feature if you have time.
     health_warning_found: Optional[bool] = None
     health_warning_found_results_reasoning: Optional[str] = None
+    # Share (0-1) of the statutory warning text found on the label, and the phrases of it that were not,
+    # when warnings were given (see GovernmentWarningIndex)
+    health_warning_text_coverage: Optional[float] = None
+    health_warning_missing_phrases: Optional[list[str]] = None
+
+    # Tiered analysis only - the tier that decided each field (see LABEL_ANALYSIS_FIELDS)
+    decided_by: Optional[dict[str, AnalysisTier]] = None
 
 
 class LabelImage(BaseModel):
@@ -57,6 +83,15 @@ class LabelImage(BaseModel):
     image_url: Optional[str] = None
     image_content_type: Optional[str] = None
 
+    # Renditions derived once on ingestion (see LabelImageVariantsService), None for older records
+    thumbnail_url: Optional[str] = None  # small JPEG for lists
+    display_url: Optional[str] = None  # JPEG downscaled for viewing and for vision LLMs
+    ocr_url: Optional[str] = None  # grayscale PNG in the original's pixel grid for OCR
+
+    # Blob key of an image whose upload failed and was spooled to local disk (image_url is None until
+    # LabelImageUploadDrainService uploads it and clears this)
+    pending_upload_key: Optional[str] = None
+
     # Kept for backward compatibility with old records that stored base64 directly.
     # New records will have base64=None and image_url set instead.
     base64: Optional[str] = None
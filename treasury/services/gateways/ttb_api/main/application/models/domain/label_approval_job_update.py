@@ -0,0 +1,41 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Any
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import \
+    LabelImageAnalysisResult, LabelApprovalStatus
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
+
+
+class LabelApprovalJobStage(str, Enum):
+    uploaded = "uploaded"
+    ocr_done = "ocr_done"
+    extraction_partial = "extraction_partial"
+    extraction_done = "extraction_done"
+    analysis_done = "analysis_done"
+    failed = "failed"
+
+    def is_terminal(self) -> bool:
+        """The analysis pipeline has finished, no further updates follow for this run"""
+        return self in (LabelApprovalJobStage.analysis_done, LabelApprovalJobStage.failed)
+
+
+class LabelApprovalJobUpdate(BaseModel):
+    """Progress of a label approval job through the analysis pipeline, pushed to live subscribers"""
+    job_id: uuid.UUID
+    stage: LabelApprovalJobStage
+    created_at: datetime
+    status: Optional[LabelApprovalStatus] = None
+    message: Optional[str] = None
+
+    # extraction_partial: a single field of the extraction, as soon as the LLM has produced it
+    field_path: Optional[str] = None
+    field_value: Optional[Any] = None
+    field_verified: Optional[bool] = None
+
+    # ocr_done / extraction_done / analysis_done: results available so far
+    extracted_product_info: Optional[BrandDataStrict] = None
+    analysis_result: Optional[LabelImageAnalysisResult] = None
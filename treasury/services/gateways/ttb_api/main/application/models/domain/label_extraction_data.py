@@ -1,6 +1,16 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
-import re
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, List, Optional
+
+from treasury.services.gateways.ttb_api.main.application.utils.quantities import (
+    net_contents_millilitres,
+    parse_alcohol_content
+)
+
+# Matches "41%" or "41.3%"
+ALCOHOL_CONTENT_ABV_PATTERN = r"^\d+(\.\d+)?%$"
+
+# Matches “700 mL”, “70 cL”, “12 fl oz”
+NET_CONTENTS_PATTERN = r"^\d+(\.\d+)?\s?(mL|ml|cL|cl|fl oz|fl\. oz\.|fL oz|fL\. oz\.)$"
 
 
 class ProductOtherInfo(BaseModel):
@@ -13,48 +23,59 @@ class ProductInfoStrict(BaseModel):
     name: Optional[str] = None
     product_class_type: Optional[str] = None
 
-    # Matches "41%" or "41.3%"
     alcohol_content_abv: Optional[str] = Field(
         default=None,
-        pattern=r"^\d+(\.\d+)?%$",
+        pattern=ALCOHOL_CONTENT_ABV_PATTERN,
         description="Alcohol by volume, e.g. '41%' or '41.3%'"
     )
 
-    # Matches “700 mL”, “70 cL”, “12 fl oz”
     net_contents: Optional[str] = Field(
         default=None,
-        pattern=r"^\d+(\.\d+)?\s?(mL|ml|cL|cl|fl oz|fl\. oz\.|fL oz|fL\. oz\.)$",
+        pattern=NET_CONTENTS_PATTERN,
         description="Net contents with unit, e.g. '700 mL'"
     )
 
     other_info: Optional[ProductOtherInfo] = None
 
+    # alcohol_content_abv and net_contents as numbers, parsed once when the model is created (None if not given)
+    alcohol_content_percent: Optional[float] = None
+    net_contents_ml: Optional[float] = None
+
+    @model_validator(mode="after")
+    def _parse_quantities(self) -> 'ProductInfoStrict':
+        """Derive the numeric values from the text ones, which stay the source of truth"""
+        self.alcohol_content_percent = parse_alcohol_content(self.alcohol_content_abv)
+        self.net_contents_ml = net_contents_millilitres(self.net_contents)
+        return self
+
     def alcohol_content_abv_cleaned(self) -> float:
         """Convert alcohol content to float percentage"""
-        match = re.match(r"^(\d+(\.\d+)?)%$", self.alcohol_content_abv)
-        if not match:
+        if self.alcohol_content_percent is None:
             raise ValueError(f"Invalid alcohol content format: {self.alcohol_content_abv}")
-        return float(match.group(1))
+        return self.alcohol_content_percent
 
     def net_contents_as_millilitres(self) -> float:
         """Convert net contents to millilitres"""
-        match = re.match(r"^(\d+(\.\d+)?)\s?(mL|ml|cL|cl|fl oz|fL oz)$", self.net_contents)
-        if not match:
+        if self.net_contents_ml is None:
             raise ValueError(f"Invalid net contents format: {self.net_contents}")
-
-        quantity = float(match.group(1))
-        unit = match.group(3)
-
-        if unit.lower() == "mL":
-            return quantity
-        elif unit.lower() == "cL":
-            return quantity * 10
-        elif unit.lower() == "fl oz":
-            return quantity * 29.5735  # 1 fl oz = 29.5735 mL
-        else:
-            raise ValueError(f"Unknown unit: {unit}")
+        return self.net_contents_ml
 
 
 class BrandDataStrict(BaseModel):
     brand_name: Optional[str] = None
     products: List[ProductInfoStrict] = []
+
+
+class LabelExtractionStreamEvent(BaseModel):
+    """
+    Incremental result of a streaming label extraction.
+
+    Field events carry a single completed field (e.g. field_path="products.0.alcohol_content_abv"),
+    along with the outcome of the local format check for fields that have one. The final event has
+    is_final=True and carries the fully validated brand_data.
+    """
+    field_path: Optional[str] = None
+    value: Optional[Any] = None
+    verified: Optional[bool] = None
+    is_final: bool = False
+    brand_data: Optional[BrandDataStrict] = None
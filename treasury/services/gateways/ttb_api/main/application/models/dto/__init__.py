@@ -13,6 +13,9 @@ from treasury.services.gateways.ttb_api.main.application.models.dto.label_image_
     LabelImageDTO,
     LabelImageAnalysisResultDTO
 )
+from treasury.services.gateways.ttb_api.main.application.models.dto.label_approval_job_update_dto import (
+    LabelApprovalJobUpdateDTO
+)
 
 __all__ = [
     'JobMetadataDTO',
@@ -21,5 +24,6 @@ __all__ = [
     'ProductInfoStrictDTO',
     'BrandDataStrictDTO',
     'LabelImageDTO',
-    'LabelImageAnalysisResultDTO'
+    'LabelImageAnalysisResultDTO',
+    'LabelApprovalJobUpdateDTO'
 ]
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""DTOs for label approval job progress updates"""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+import strawberry
+from strawberry.scalars import JSON
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job_update import \
+    LabelApprovalJobUpdate
+from treasury.services.gateways.ttb_api.main.application.models.dto.label_extraction_dto import BrandDataStrictDTO
+from treasury.services.gateways.ttb_api.main.application.models.dto.label_image_dto import LabelImageAnalysisResultDTO
+
+
+@strawberry.experimental.pydantic.type(model=LabelApprovalJobUpdate)
+class LabelApprovalJobUpdateDTO:
+    """DTO for a label approval job progress update"""
+    job_id: uuid.UUID
+    stage: strawberry.auto
+    created_at: datetime
+    status: strawberry.auto
+    message: Optional[str] = None
+    field_path: Optional[str] = None
+    field_value: Optional[JSON] = None
+    field_verified: Optional[bool] = None
+    extracted_product_info: Optional[BrandDataStrictDTO] = None
+    analysis_result: Optional[LabelImageAnalysisResultDTO] = None
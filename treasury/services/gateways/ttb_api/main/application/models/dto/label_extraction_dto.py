@@ -25,6 +25,8 @@ class ProductInfoStrictDTO:
     product_class_type: strawberry.auto
     alcohol_content_abv: strawberry.auto
     net_contents: strawberry.auto
+    alcohol_content_percent: strawberry.auto
+    net_contents_ml: strawberry.auto
     other_info: Optional[ProductOtherInfoDTO] = None
 
 
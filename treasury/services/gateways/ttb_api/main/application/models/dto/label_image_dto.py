@@ -31,6 +31,10 @@ class LabelImageDTO:
     """DTO for label image"""
     image_url: Optional[str] = None
     image_content_type: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    display_url: Optional[str] = None
+    ocr_url: Optional[str] = None
+    pending_upload_key: Optional[str] = None
     base64: Optional[str] = None
     upload_date: Optional[datetime] = None
     approved: Optional[bool] = None
@@ -16,7 +16,9 @@ class JobMetadataInput:
     manufacturer: Optional[str] = None
     warnings: Optional[str] = None
     label_image_base64: Optional[str] = None  # base64 representation of the label image
-    analysis_mode: Optional[AnalysisMode] = AnalysisMode.using_llm  # analysis mode: using_llm or pytesseract
+    label_image_upload_id: Optional[str] = None  # upload_id returned by POST /uploads/label-images (instead of base64)
+    label_image_object_key: Optional[str] = None  # object_key of a direct upload, see createLabelImageUpload
+    analysis_mode: Optional[AnalysisMode] = AnalysisMode.using_llm  # analysis mode: using_llm, pytesseract or tiered
 
 
 @strawberry.input
@@ -24,6 +26,7 @@ class CreateLabelApprovalJobInput:
     """Input for creating a new label approval job"""
     status: Optional[LabelApprovalStatus] = LabelApprovalStatus.pending
     job_metadata: Optional[JobMetadataInput] = None
+    wait_for_analysis: Optional[bool] = False  # respond with the analyzed job instead of right after storing it
 
 
 @strawberry.type
@@ -0,0 +1,30 @@
+from typing import Optional
+
+import strawberry
+
+
+@strawberry.input
+class CreateLabelImageUploadInput:
+    """Input for requesting a direct upload of a label image to blob storage"""
+    content_type: str  # image/png, image/jpeg or image/gif
+
+
+@strawberry.type
+class LabelImageUploadField:
+    """A form field to send along with the image in the upload POST"""
+    name: str
+    value: str
+
+
+@strawberry.type
+class CreateLabelImageUploadResponse:
+    """
+    Presigned upload: POST a multipart form to upload_url with upload_fields followed by the image in a
+    field named "file", then pass object_key to createLabelApprovalJob as job_metadata.label_image_object_key
+    """
+    upload_url: Optional[str] = None
+    upload_fields: Optional[list[LabelImageUploadField]] = None
+    object_key: Optional[str] = None
+    expires_in_seconds: Optional[int] = None
+    success: bool
+    message: Optional[str] = None
@@ -0,0 +1,23 @@
+import uuid
+from typing import Optional
+
+import strawberry
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import OcrOverlayLevel
+
+
+@strawberry.input
+class GetLabelImageOcrOverlayInput:
+    """Input for getting the OCR overlay of a label image of a job"""
+    job_id: uuid.UUID
+    image_index: int = 0  # Index into job_metadata.label_images
+    draw_level: OcrOverlayLevel = OcrOverlayLevel.words
+    show_confidence: bool = True
+
+
+@strawberry.type
+class GetLabelImageOcrOverlayResponse:
+    """Response from getting the OCR overlay of a label image"""
+    overlay_url: Optional[str] = None
+    success: bool
+    message: Optional[str] = None
@@ -0,0 +1,160 @@
+"""Verification of the statutory government warning text on OCR text, against a precomputed shingle index"""
+
+import bisect
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+# 27 CFR 16.21 - the heading must be in capital letters (and bold), the rest of the text may be in any case
+GOVERNMENT_WARNING_TEXT = (
+    "GOVERNMENT WARNING: (1) According to the Surgeon General, women should not drink alcoholic beverages during "
+    "pregnancy because of the risk of birth defects. (2) Consumption of alcoholic beverages impairs your ability to "
+    "drive a car or operate machinery, and may cause health problems."
+)
+
+# Wordings accepted on labels, by name. Case and punctuation are ignored when matching, so only the words differ.
+GOVERNMENT_WARNING_VARIANTS: Dict[str, str] = {
+    "statutory": GOVERNMENT_WARNING_TEXT,
+    # Labels that drop the (1) and (2) statement numbers
+    "unnumbered": GOVERNMENT_WARNING_TEXT.replace("(1) ", "").replace("(2) ", ""),
+}
+
+# Words per shingle: a misread word loses the shingles that contain it, the words around it stay covered
+SHINGLE_SIZE = 3
+DEFAULT_MIN_WARNING_COVERAGE = 0.9
+
+WORD = re.compile(r'\w+')
+# A word hyphenated across a line break
+LINE_BREAK_HYPHEN = re.compile(r'-\s*\n\s*')
+
+
+class _Word(NamedTuple):
+    text: str
+    start: int
+    end: int
+
+
+def _words(text: str) -> List[_Word]:
+    return [_Word(match.group(), match.start(), match.end()) for match in WORD.finditer(text)]
+
+
+class GovernmentWarningVerification(BaseModel):
+    """How much of the government warning text is on a label, and whether its heading is in capitals"""
+    # Share (0-1) of the words of the closest accepted wording found on the label, in order
+    coverage: float = 0.0
+    # The accepted wording the label was aligned with (see GOVERNMENT_WARNING_VARIANTS)
+    variant: Optional[str] = None
+    # Runs of words of that wording not found on the label
+    missing_phrases: List[str] = []
+    heading_found: bool = False
+    # "GOVERNMENT WARNING" in capital letters, as required
+    heading_all_caps: bool = False
+    # All caps heading and at least min_coverage of the text
+    compliant: bool = False
+
+    def describe(self) -> str:
+        """A sentence on the coverage of the warning text, for the analysis reasoning"""
+        if self.coverage == 1.0:
+            return "The full statutory warning text was found."
+        if not self.missing_phrases or self.coverage == 0.0:
+            return "The statutory warning text was not found."
+        missing = ", ".join(f"'{phrase}'" for phrase in self.missing_phrases)
+        return f"{self.coverage:.0%} of the statutory warning text was found, missing {missing}."
+
+
+class GovernmentWarningIndex:
+    """
+    The accepted wordings of the government warning as word shingles (SHINGLE_SIZE consecutive lowercased
+    words) with their positions, built once. An OCR text is verified by looking up each of its shingles,
+    then aligning the hits with each wording - the longest chain of hits in order on both sides - so that
+    OCR noise, line breaks and other label text in between do not matter. A verification takes well under
+    a millisecond for a label and needs no model call.
+    """
+
+    def __init__(self, variants: Dict[str, str] = None, shingle_size: int = SHINGLE_SIZE) -> None:
+        self._shingle_size = shingle_size
+        self._variants: List[Tuple[str, str, List[_Word]]] = [
+            (name, text, _words(text)) for name, text in (variants or GOVERNMENT_WARNING_VARIANTS).items()
+        ]
+        # Shingle -> (wording, position of its first word) of every occurrence
+        self._shingles: Dict[Tuple[str, ...], List[Tuple[int, int]]] = {}
+        for variant, (_, _, words) in enumerate(self._variants):
+            normalized = [word.text.lower() for word in words]
+            for position in range(len(normalized) - shingle_size + 1):
+                shingle = tuple(normalized[position:position + shingle_size])
+                self._shingles.setdefault(shingle, []).append((variant, position))
+
+    def verify(self, ocr_text: str, min_coverage: float = DEFAULT_MIN_WARNING_COVERAGE) -> GovernmentWarningVerification:
+        """The verification of the government warning in OCR text (lines joined with line breaks)"""
+        ocr_words = [word.text for word in _words(LINE_BREAK_HYPHEN.sub('', ocr_text))]
+        normalized = [word.lower() for word in ocr_words]
+
+        # (OCR word position, wording word position) of each shingle found, per wording
+        hits: List[List[Tuple[int, int]]] = [[] for _ in self._variants]
+        for ocr_position in range(len(normalized) - self._shingle_size + 1):
+            shingle = tuple(normalized[ocr_position:ocr_position + self._shingle_size])
+            for variant, position in self._shingles.get(shingle, ()):
+                hits[variant].append((ocr_position, position))
+
+        result = GovernmentWarningVerification()
+        for variant, (name, text, words) in enumerate(self._variants):
+            covered = [False] * len(words)
+            for _, position in self._longest_chain(hits[variant]):
+                covered[position:position + self._shingle_size] = [True] * self._shingle_size
+            coverage = sum(covered) / len(words)
+            if result.variant is None or coverage > result.coverage:
+                result.variant = name
+                result.coverage = coverage
+                result.missing_phrases = self._missing_phrases(text, words, covered)
+
+        headings = [
+            (ocr_words[i], ocr_words[i + 1]) for i in range(len(normalized) - 1)
+            if normalized[i] == "government" and normalized[i + 1] == "warning"
+        ]
+        result.heading_found = len(headings) > 0
+        result.heading_all_caps = any(first.isupper() and second.isupper() for first, second in headings)
+        result.compliant = result.heading_all_caps and result.coverage >= min_coverage
+        return result
+
+    @classmethod
+    def _longest_chain(cls, hits: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """The longest subsequence of hits increasing in both positions (hits are in OCR order)"""
+        # Hits at the same OCR position in decreasing wording order, so that at most one of them is chained
+        ordered = sorted(hits, key=lambda hit: (hit[0], -hit[1]))
+        tail_positions: List[int] = []
+        tail_hits: List[int] = []
+        previous: List[Optional[int]] = []
+        for index, (_, position) in enumerate(ordered):
+            length = bisect.bisect_left(tail_positions, position)
+            previous.append(tail_hits[length - 1] if length > 0 else None)
+            if length == len(tail_positions):
+                tail_positions.append(position)
+                tail_hits.append(index)
+            else:
+                tail_positions[length] = position
+                tail_hits[length] = index
+
+        chain = []
+        index = tail_hits[-1] if tail_hits else None
+        while index is not None:
+            chain.append(ordered[index])
+            index = previous[index]
+        return chain[::-1]
+
+    @classmethod
+    def _missing_phrases(cls, text: str, words: List[_Word], covered: List[bool]) -> List[str]:
+        """The runs of words not covered, as they read in the wording"""
+        phrases = []
+        run_start = None
+        for position, is_covered in enumerate(covered + [True]):
+            if not is_covered and run_start is None:
+                run_start = position
+            elif is_covered and run_start is not None:
+                phrases.append(text[words[run_start].start:words[position - 1].end])
+                run_start = None
+        return phrases
+
+
+# The index of the accepted wordings, built once per process
+GOVERNMENT_WARNING_INDEX = GovernmentWarningIndex()
@@ -0,0 +1,269 @@
+"""Checks of OCR text against the label data given on the form, compiled once per job"""
+
+import re
+from typing import Optional, Dict, List, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
+from treasury.services.gateways.ttb_api.main.application.utils.approximate_matching import (
+    ApproximateMatch,
+    ApproximatePhraseFinder
+)
+from treasury.services.gateways.ttb_api.main.application.utils.quantities import (
+    NET_CONTENTS_BASE_UNITS,
+    NET_CONTENTS_UNIT_VARIATIONS,
+    MILLILITRES_PER_UNIT,
+    alcohol_contents_equal,
+    net_contents_base_unit,
+    net_contents_equal
+)
+
+DEFAULT_FUZZY_MIN_SIMILARITY = 0.85
+DEFAULT_FUZZY_MIN_OCR_CONFIDENCE = 40.0
+
+# Product classes that count as found for a given class (e.g. Beer and Lager Beer are the same)
+PRODUCT_CLASS_EQUIVALENTS: Dict[str, List[str]] = {
+    'beer': ['lager beer', 'lager', 'ale', 'pilsner'],
+    'lager beer': ['beer', 'lager', 'pilsner'],
+    'gin': ['london gin', 'london dry gin', 'dry gin'],
+    'london gin': ['gin', 'london dry gin', 'dry gin'],
+    'vodka': ['vodka'],
+    'whiskey': ['whisky', 'bourbon', 'rye whiskey', 'scotch'],
+    'whisky': ['whiskey', 'bourbon', 'rye whisky', 'scotch'],
+    'bourbon': ['whiskey', 'whisky', 'kentucky bourbon', 'straight bourbon'],
+    'rum': ['rum', 'dark rum', 'white rum', 'gold rum'],
+    'tequila': ['tequila', 'mezcal'],
+    'wine': ['wine', 'red wine', 'white wine', 'rose wine'],
+}
+
+NET_CONTENTS_VALUE_AND_UNIT = re.compile(r'(\d+(?:\.\d+)?)\s*(.+)')
+NET_CONTENTS_VALUE = re.compile(r'(\d+(?:\.\d+)?)')
+# Every number followed by "%" or a volume unit, for comparing the values on a label by number
+QUANTITY_IN_TEXT = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(%|fl\.?\s*oz\.?|fluid\s*ounces?|ml|milliliters?|millilitres?|cl|centiliters?|centilitres?'
+    r'|liters?|litres?|l|ounces?|oz\.?|gallons?|gal\.?)(?![a-z])'
+)
+
+GOVERNMENT_WARNING = "GOVERNMENT WARNING"
+
+
+class FuzzyMatchingConfig(BaseModel):
+    """Approximate matching of the brand name and product class, OCR_FUZZY_* configuration by default"""
+    enabled: bool = True
+    # How close the OCR words must be: 0.85 allows one edit per 7 characters of the given text
+    min_similarity: float = DEFAULT_FUZZY_MIN_SIMILARITY
+    # Mean Tesseract confidence (0-100) below which OCR words are not matched approximately
+    min_ocr_confidence: float = DEFAULT_FUZZY_MIN_OCR_CONFIDENCE
+
+    @classmethod
+    def from_config(cls) -> 'FuzzyMatchingConfig':
+        return cls(
+            enabled=(config.OCR_FUZZY_MATCHING_ENABLED or "true").strip().lower() == "true",
+            min_similarity=float(config.OCR_FUZZY_MIN_SIMILARITY or DEFAULT_FUZZY_MIN_SIMILARITY),
+            min_ocr_confidence=float(config.OCR_FUZZY_MIN_OCR_CONFIDENCE or DEFAULT_FUZZY_MIN_OCR_CONFIDENCE),
+        )
+
+
+class LabelAnalysisMatches(BaseModel):
+    """Which of the given label fields were found in OCR text, None for fields not given on the form"""
+    brand_name_found: Optional[bool] = None
+    # Set when the brand name was only found approximately
+    brand_name_match: Optional[ApproximateMatch] = None
+    product_class_found: Optional[bool] = None
+    # Set when the product class (or an equivalent) was only found approximately
+    product_class_match: Optional[ApproximateMatch] = None
+    alcohol_content_found: Optional[bool] = None
+    net_contents_found: Optional[bool] = None
+    health_warning_found: Optional[bool] = None
+
+
+class LabelAnalysisMatcher:
+    """
+    The pytesseract analysis checks for the label data given on the form. Everything that depends only on
+    the form - the lowercased brand name, the product class and its equivalents, the alcohol content and
+    net contents spellings to look for - is worked out once, when the matcher is created. Each OCR text is
+    then lowercased and whitespace-normalized once, and every check is a substring search of that text
+    (regex only for the last-resort net contents check), so one matcher can re-verify many OCR texts cheaply.
+
+    A brand name or product class not found verbatim may still be found approximately among the OCR words
+    (see ApproximatePhraseFinder and FuzzyMatchingConfig), so that a misread letter such as "STONF'S THROW"
+    does not fail the check. An alcohol content or net contents not found as spelled on the form is compared
+    by value with the quantities on the label ("40.0%" is 40%, "25.4 FL OZ" is 750 mL, see quantities.py),
+    unless compare_quantities_by_value is off.
+    The government warning is only matched exactly.
+
+    Case sensitivity rules:
+    1. Brand Name - case-INSENSITIVE (e.g., "STONE'S THROW" matches "Stone's Throw")
+    2. Product Class/Type - case-INSENSITIVE, with fuzzy matching for related types
+    3. Alcohol Content - case-INSENSITIVE, number + "%" match
+    4. Net Contents - case-INSENSITIVE, volume match (e.g., "750 mL", "12 OZ")
+    5. Health Warning - ONLY field requiring ALL CAPS ("GOVERNMENT WARNING" exact match)
+    """
+
+    def __init__(
+            self,
+            given_brand_info: Optional[BrandDataStrict],
+            fuzzy_matching: Optional[FuzzyMatchingConfig] = None,
+            compare_quantities_by_value: bool = True
+    ) -> None:
+        self._fuzzy_matching = fuzzy_matching or FuzzyMatchingConfig.from_config()
+        self._brand_name: Optional[str] = None
+        self._product_classes: Optional[Tuple[str, ...]] = None
+        self._alcohol_contents: Optional[Tuple[str, ...]] = None
+        self._net_contents: Optional[Tuple[str, ...]] = None
+        self._net_contents_without_spaces: Optional[str] = None
+        self._net_contents_with_any_unit: Optional[re.Pattern] = None
+        self._alcohol_content_percent: Optional[float] = None
+        self._net_contents_ml: Optional[float] = None
+        self._warnings_were_given: Optional[bool] = None
+
+        if not given_brand_info:
+            return
+
+        if given_brand_info.brand_name:
+            self._brand_name = given_brand_info.brand_name.lower()
+
+        if not given_brand_info.products:
+            return
+        product = given_brand_info.products[0]
+
+        if product.product_class_type:
+            self._product_classes = self.product_class_equivalents(product.product_class_type.lower())
+
+        if product.alcohol_content_abv:
+            alcohol_value = product.alcohol_content_abv.replace('%', '').strip()
+            # The value followed by "%", with or without a space (every "47.3% ABV", "ALC 47.3%", ... contains one)
+            self._alcohol_contents = (f"{alcohol_value}%", f"{alcohol_value} %")
+            self._alcohol_content_percent = product.alcohol_content_percent if compare_quantities_by_value else None
+
+        if product.net_contents:
+            self._compile_net_contents(product.net_contents.lower())
+            self._net_contents_ml = product.net_contents_ml if compare_quantities_by_value else None
+
+        self._warnings_were_given = (
+            product.other_info is not None and
+            product.other_info.warnings is not None and
+            len(product.other_info.warnings.strip()) > 0
+        )
+
+    @classmethod
+    def product_class_equivalents(cls, given_class: str) -> Tuple[str, ...]:
+        """The given class, its equivalents, and the base classes it is a variant of"""
+        product_classes = [given_class, *PRODUCT_CLASS_EQUIVALENTS.get(given_class, [])]
+        product_classes.extend(
+            base_class for base_class, variants in PRODUCT_CLASS_EQUIVALENTS.items() if given_class in variants
+        )
+        return tuple(dict.fromkeys(product_classes))
+
+    def _compile_net_contents(self, net_contents: str) -> None:
+        needles = [net_contents]
+        self._net_contents_without_spaces = net_contents.replace(' ', '')
+
+        match = NET_CONTENTS_VALUE_AND_UNIT.match(net_contents)
+        if match:
+            value = match.group(1)
+            base_unit = NET_CONTENTS_BASE_UNITS.get(match.group(2).strip())
+            if base_unit:
+                # The value and any spelling of the unit, with or without a space
+                for variation in NET_CONTENTS_UNIT_VARIATIONS[base_unit]:
+                    needles.extend((f"{value}{variation}", f"{value} {variation}"))
+        self._net_contents = tuple(dict.fromkeys(needles))
+
+        # Last resort: the value followed by any common volume unit
+        match = NET_CONTENTS_VALUE.match(net_contents)
+        if match:
+            self._net_contents_with_any_unit = re.compile(rf'{re.escape(match.group(1))} ?(ml|l|cl|oz|fl ?oz|gal)')
+
+    def match(
+            self,
+            extracted_text: str,
+            word_texts: Optional[Sequence[str]] = None,
+            word_confidences: Optional[Sequence[float]] = None
+    ) -> LabelAnalysisMatches:
+        """
+        The checks against one OCR text. The OCR words and their confidences are used for approximate
+        matching; without them the words of the text are used, regardless of confidence.
+        """
+        result = LabelAnalysisMatches()
+        extracted_text_lower = extracted_text.lower()
+        normalized_text = ' '.join(extracted_text_lower.split())
+        if not word_texts:
+            word_texts, word_confidences = extracted_text.split(), None
+        # Words prepared for approximate matching, and the quantities on the label, on first use
+        finder: Optional[ApproximatePhraseFinder] = None
+        quantities: Optional[List[Tuple[float, str]]] = None
+
+        if self._brand_name is not None:
+            result.brand_name_found = self._brand_name in extracted_text_lower
+            if not result.brand_name_found and self._fuzzy_matching.enabled:
+                finder = finder or ApproximatePhraseFinder(word_texts, word_confidences)
+                result.brand_name_match = self._find_approximately(finder, [self._brand_name])
+                result.brand_name_found = result.brand_name_match is not None
+
+        if self._product_classes is not None:
+            result.product_class_found = any(
+                product_class in extracted_text_lower for product_class in self._product_classes
+            )
+            if not result.product_class_found and self._fuzzy_matching.enabled:
+                finder = finder or ApproximatePhraseFinder(word_texts, word_confidences)
+                result.product_class_match = self._find_approximately(finder, self._product_classes)
+                result.product_class_found = result.product_class_match is not None
+
+        if self._alcohol_contents is not None:
+            result.alcohol_content_found = any(needle in normalized_text for needle in self._alcohol_contents)
+            if not result.alcohol_content_found and self._alcohol_content_percent is not None:
+                quantities = quantities if quantities is not None else self._quantities(normalized_text)
+                result.alcohol_content_found = any(
+                    unit == '%' and alcohol_contents_equal(value, self._alcohol_content_percent)
+                    for value, unit in quantities
+                )
+
+        if self._net_contents is not None:
+            result.net_contents_found = (
+                any(needle in normalized_text for needle in self._net_contents) or
+                self._net_contents_without_spaces in normalized_text.replace(' ', '') or
+                (
+                    self._net_contents_with_any_unit is not None and
+                    self._net_contents_with_any_unit.search(normalized_text) is not None
+                )
+            )
+            if not result.net_contents_found and self._net_contents_ml is not None:
+                quantities = quantities if quantities is not None else self._quantities(normalized_text)
+                result.net_contents_found = any(
+                    unit != '%' and net_contents_equal(value * MILLILITRES_PER_UNIT[unit], self._net_contents_ml)
+                    for value, unit in quantities
+                )
+
+        if self._warnings_were_given is not None:
+            # "GOVERNMENT WARNING" in ALL CAPS in the original text, not lowercased
+            result.health_warning_found = GOVERNMENT_WARNING in extracted_text if self._warnings_were_given else None
+
+        return result
+
+    @classmethod
+    def _quantities(cls, normalized_text: str) -> List[Tuple[float, str]]:
+        """(value, "%" or the base unit) of every alcohol content and net contents in the text"""
+        quantities = []
+        for match in QUANTITY_IN_TEXT.finditer(normalized_text):
+            unit = '%' if match.group(2) == '%' else net_contents_base_unit(match.group(2))
+            if unit is not None:
+                quantities.append((float(match.group(1)), unit))
+        return quantities
+
+    def _find_approximately(
+            self,
+            finder: ApproximatePhraseFinder,
+            phrases: Sequence[str]
+    ) -> Optional[ApproximateMatch]:
+        """The closest approximate match of any of the phrases"""
+        matches = [
+            finder.find(
+                phrase,
+                min_similarity=self._fuzzy_matching.min_similarity,
+                min_ocr_confidence=self._fuzzy_matching.min_ocr_confidence
+            )
+            for phrase in phrases
+        ]
+        return max((match for match in matches if match is not None), key=lambda match: match.similarity, default=None)
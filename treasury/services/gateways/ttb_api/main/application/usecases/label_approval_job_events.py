@@ -0,0 +1,73 @@
+import uuid
+from typing import Optional
+
+from treasury.services.gateways.ttb_api.main.adapter.out.pubsub.in_process_pubsub_adapter import \
+    InProcessPubSubAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.pubsub.pubsub_adapter import PubSubAdapter, \
+    PubSubSubscription
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job_update import \
+    LabelApprovalJobUpdate, LabelApprovalJobStage
+from treasury.services.gateways.ttb_api.main.application.utils.datetime_utils import DateTimeUtils
+
+
+class LabelApprovalJobEventsService:
+    """Publishes label approval job progress updates and opens subscriptions to them"""
+
+    _logger = GlobalConfig.get_logger(__name__)
+    _TOPIC_PREFIX = "label-approval-jobs"
+
+    def __init__(self, pubsub_adapter: PubSubAdapter = None) -> None:
+        self._pubsub_adapter_lazy = pubsub_adapter
+
+    @property
+    def _pubsub_adapter(self) -> PubSubAdapter:
+        # Lazy initialization - a Redis broker is only needed when several workers share subscribers
+        if self._pubsub_adapter_lazy is None:
+            if config.PUBSUB_REDIS_URL:
+                from treasury.services.gateways.ttb_api.main.adapter.out.pubsub.redis_pubsub_adapter import \
+                    RedisPubSubAdapter
+                self._pubsub_adapter_lazy = RedisPubSubAdapter(redis_url=config.PUBSUB_REDIS_URL)
+            else:
+                self._pubsub_adapter_lazy = InProcessPubSubAdapter.get_singleton_instance_of()
+        return self._pubsub_adapter_lazy
+
+    @classmethod
+    def _topic(cls, job_id: uuid.UUID) -> str:
+        return f"{cls._TOPIC_PREFIX}/{job_id}"
+
+    def publish_stage(self, job_id: uuid.UUID, stage: LabelApprovalJobStage, **partial_results) -> None:
+        """Publish a stage event for a job, with any partial results available at that stage"""
+        self.publish(LabelApprovalJobUpdate(
+            job_id=job_id,
+            stage=stage,
+            created_at=DateTimeUtils.get_utc_now(),
+            **partial_results
+        ))
+
+    def publish(self, update: LabelApprovalJobUpdate) -> None:
+        """Publish an update. Failures are logged and never interrupt the analysis pipeline."""
+        try:
+            self._pubsub_adapter.publish(self._topic(update.job_id), update.model_dump_json())
+        except Exception as e:
+            self._logger.exception(f"Failed to publish update job={update.job_id} stage={update.stage} error={e}")
+
+    def has_subscribers(self, job_id: uuid.UUID) -> bool:
+        try:
+            return self._pubsub_adapter.subscriber_count(self._topic(job_id)) > 0
+        except Exception as e:
+            self._logger.exception(f"Failed to count subscribers job={job_id} error={e}")
+            return False
+
+    async def subscribe(self, job_id: uuid.UUID) -> PubSubSubscription:
+        """Open a subscription to a job's updates, see parse_update for decoding the messages"""
+        return await self._pubsub_adapter.subscribe(self._topic(job_id))
+
+    @classmethod
+    def parse_update(cls, message: str) -> Optional[LabelApprovalJobUpdate]:
+        try:
+            return LabelApprovalJobUpdate.model_validate_json(message)
+        except ValueError as e:
+            cls._logger.warning(f"Ignoring malformed job update message error={e}")
+            return None
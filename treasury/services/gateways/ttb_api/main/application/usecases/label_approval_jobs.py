@@ -1,29 +1,45 @@
+import asyncio
 import base64
+import hashlib
+import threading
 import uuid
-from io import BytesIO
-from typing import Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional, AsyncGenerator
 
-from PIL import Image
 from strawberry.types import Info
 
 from treasury.services.gateways.ttb_api.main.adapter.out.persistence.label_approvals_persistence_adapter import \
     LabelApprovalJobsPersistenceAdapter
-from treasury.services.gateways.ttb_api.main.adapter.out.storage.vercel_blob_storage_adapter import \
-    VercelBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter_factory import \
+    BlobStorageAdapterFactory
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_spool_adapter import \
+    LabelImageSpoolAdapter
 from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.entity_descriptor import EntityDescriptor
+from treasury.services.gateways.ttb_api.main.application.models.domain.ingested_label_image import IngestedLabelImage
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import LabelApprovalJob, \
     JobMetadata, LabelImage, AnalysisMode
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job_update import \
+    LabelApprovalJobUpdate, LabelApprovalJobStage
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict, \
     ProductInfoStrict, ProductOtherInfo
 from treasury.services.gateways.ttb_api.main.application.models.domain.user import User
 from treasury.services.gateways.ttb_api.main.application.models.dto.label_approval_job_dto import LabelApprovalJobDTO, \
     JobMetadataDTO
+from treasury.services.gateways.ttb_api.main.application.models.dto.label_approval_job_update_dto import \
+    LabelApprovalJobUpdateDTO
 from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.analyze_label_approval_job_input import \
     AnalyzeLabelApprovalJobInput, AnalyzeLabelApprovalJobResponse
 from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.create_label_approval_job_request import (
     CreateLabelApprovalJobInput,
     CreateLabelApprovalJobResponse
 )
+from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.create_label_image_upload_request import (
+    CreateLabelImageUploadInput,
+    CreateLabelImageUploadResponse,
+    LabelImageUploadField
+)
 from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.update_label_approval_job_requests import (
     SetLabelApprovalJobStatusInput,
     SetLabelApprovalJobStatusResponse,
@@ -38,32 +54,77 @@ from treasury.services.gateways.ttb_api.main.application.models.gql.label_approv
     GetLabelApprovalJobInput,
     GetLabelApprovalJobResponse
 )
+from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.get_label_image_ocr_overlay_request import (
+    GetLabelImageOcrOverlayInput,
+    GetLabelImageOcrOverlayResponse
+)
 from treasury.services.gateways.ttb_api.main.application.models.mappers.object_mapper import ObjectMapper
+from treasury.services.gateways.ttb_api.main.application.usecases.label_approval_job_events import \
+    LabelApprovalJobEventsService
 from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis import \
     LabelDataAnalysisService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import \
+    LabelImageIngestionService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ocr_overlay import \
+    LabelImageOcrOverlayService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_uploads import LabelImageUploadsService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_variants import \
+    LabelImageVariantsService, LabelImageVariants
+from treasury.services.gateways.ttb_api.main.application.utils.datetime_utils import DateTimeUtils
+from treasury.services.gateways.ttb_api.main.application.utils.quantities import parse_alcohol_content, parse_net_contents
 from treasury.services.gateways.ttb_api.main.application.usecases.security.security_context import SecurityContext
 from treasury.services.gateways.ttb_api.main.application.usecases.user_management import UserManagementService
 
-MAX_IMAGE_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
+# Analyses of newly created jobs running at the same time, each mostly waiting on the LLM or OCR
+MAX_CONCURRENT_BACKGROUND_ANALYSES = 4
+
 
 class LabelApprovalJobsService:
+    _background_analysis_executor: Optional[ThreadPoolExecutor] = None
+    _background_analysis_executor_lock = threading.Lock()
+
     def __init__(
             self,
             label_approval_jobs_persistence_adapter: LabelApprovalJobsPersistenceAdapter = None,
             label_data_analysis_service: LabelDataAnalysisService = None,
             user_management_service: UserManagementService = None,
-            vercel_blob_storage_adapter: VercelBlobStorageAdapter = None
+            blob_storage_adapter: BlobStorageAdapter = None,
+            label_approval_job_events_service: LabelApprovalJobEventsService = None,
+            label_image_uploads_service: LabelImageUploadsService = None,
+            label_image_variants_service: LabelImageVariantsService = None,
+            label_image_spool_adapter: LabelImageSpoolAdapter = None,
+            label_image_ocr_overlay_service: LabelImageOcrOverlayService = None,
+            analysis_executor: Executor = None
     ) -> None:
         self._logger = GlobalConfig.get_logger(__name__)
         self._label_approval_jobs_persistence_adapter_lazy = label_approval_jobs_persistence_adapter
         self._label_data_analysis_service_lazy = label_data_analysis_service
         self._user_management_service_lazy = user_management_service
-        self._vercel_blob_storage_adapter_lazy = vercel_blob_storage_adapter
+        self._blob_storage_adapter_lazy = blob_storage_adapter
+        self._label_approval_job_events_service_lazy = label_approval_job_events_service
+        self._label_image_uploads_service_lazy = label_image_uploads_service
+        self._label_image_variants_service_lazy = label_image_variants_service
+        self._label_image_spool_adapter_lazy = label_image_spool_adapter
+        self._label_image_ocr_overlay_service_lazy = label_image_ocr_overlay_service
+        self._analysis_executor_lazy = analysis_executor
 
     @classmethod
     def get_singleton_instance_of(cls) -> 'LabelApprovalJobsService':
         return LabelApprovalJobsService()
 
+    @property
+    def _analysis_executor(self) -> Executor:
+        # Lazy initialization of the thread pool shared by all instances for background analyses
+        if self._analysis_executor_lazy is None:
+            with LabelApprovalJobsService._background_analysis_executor_lock:
+                if LabelApprovalJobsService._background_analysis_executor is None:
+                    LabelApprovalJobsService._background_analysis_executor = ThreadPoolExecutor(
+                        max_workers=MAX_CONCURRENT_BACKGROUND_ANALYSES,
+                        thread_name_prefix="label-analysis"
+                    )
+            self._analysis_executor_lazy = LabelApprovalJobsService._background_analysis_executor
+        return self._analysis_executor_lazy
+
     @property
     def _user_management_service(self) -> UserManagementService:
         # Lazy initialization of the user management service
@@ -86,11 +147,51 @@ class LabelApprovalJobsService:
         return self._label_approval_jobs_persistence_adapter_lazy
 
     @property
-    def _vercel_blob_storage_adapter(self) -> VercelBlobStorageAdapter:
-        # Lazy initialization of the Vercel Blob storage adapter
-        if self._vercel_blob_storage_adapter_lazy is None:
-            self._vercel_blob_storage_adapter_lazy = VercelBlobStorageAdapter()
-        return self._vercel_blob_storage_adapter_lazy
+    def _blob_storage_adapter(self) -> BlobStorageAdapter:
+        # Lazy initialization of the configured blob storage backend (BLOB_STORAGE_BACKEND)
+        if self._blob_storage_adapter_lazy is None:
+            self._blob_storage_adapter_lazy = BlobStorageAdapterFactory.get_singleton_instance_of()
+        return self._blob_storage_adapter_lazy
+
+    @property
+    def _label_approval_job_events_service(self) -> LabelApprovalJobEventsService:
+        # Lazy initialization of the job events service
+        if self._label_approval_job_events_service_lazy is None:
+            self._label_approval_job_events_service_lazy = LabelApprovalJobEventsService()
+        return self._label_approval_job_events_service_lazy
+
+    @property
+    def _label_image_uploads_service(self) -> LabelImageUploadsService:
+        # Lazy initialization of the label image uploads service
+        if self._label_image_uploads_service_lazy is None:
+            self._label_image_uploads_service_lazy = LabelImageUploadsService()
+        return self._label_image_uploads_service_lazy
+
+    @property
+    def _label_image_variants_service(self) -> LabelImageVariantsService:
+        # Lazy initialization - renditions are stored in the same blob storage as the originals
+        if self._label_image_variants_service_lazy is None:
+            self._label_image_variants_service_lazy = LabelImageVariantsService(
+                blob_storage_adapter=self._blob_storage_adapter
+            )
+        return self._label_image_variants_service_lazy
+
+    @property
+    def _label_image_spool_adapter(self) -> LabelImageSpoolAdapter:
+        # Lazy initialization of the spool for images whose upload failed
+        if self._label_image_spool_adapter_lazy is None:
+            self._label_image_spool_adapter_lazy = LabelImageSpoolAdapter()
+        return self._label_image_spool_adapter_lazy
+
+    @property
+    def _label_image_ocr_overlay_service(self) -> LabelImageOcrOverlayService:
+        # Lazy initialization of the OCR overlay service, sharing the blob storage and spool adapters
+        if self._label_image_ocr_overlay_service_lazy is None:
+            self._label_image_ocr_overlay_service_lazy = LabelImageOcrOverlayService(
+                blob_storage_adapter=self._blob_storage_adapter,
+                label_image_spool_adapter=self._label_image_spool_adapter
+            )
+        return self._label_image_ocr_overlay_service_lazy
 
     def create_label_approval_job(
             self,
@@ -125,9 +226,9 @@ class LabelApprovalJobsService:
 
             # Format net_contents to include units if not already present
             net_contents_formatted = input.job_metadata.net_contents
-            if net_contents_formatted and not any(
-                    unit in net_contents_formatted for unit in ['mL', 'ml', 'cL', 'cl', 'fl oz', 'fL oz']):
-                net_contents_formatted = f"{net_contents_formatted} mL"
+            parsed_net_contents = parse_net_contents(net_contents_formatted)
+            if parsed_net_contents is not None and parsed_net_contents.unit is None:
+                net_contents_formatted = f"{net_contents_formatted.strip()} mL"
 
             # Validate input metadata - alcohol content percentage
             try:
@@ -150,9 +251,24 @@ class LabelApprovalJobsService:
                 )
 
             # Validate input metadata - one image required (jpg, png or gif)
+            upload_id = input.job_metadata.label_image_upload_id
+            object_key = input.job_metadata.label_image_object_key
             try:
-                self._verify_label_image_or_raise(input.job_metadata.label_image_base64,
-                                                  permitted_types=["jpg", "png", "gif", "jpeg"])
+                if object_key:
+                    # The client uploaded the image straight to blob storage (see create_label_image_upload)
+                    ingested_image = self._label_image_uploads_service.ingest_direct_upload(
+                        object_key,
+                        permitted_types=["jpg", "png", "gif", "jpeg"]
+                    )
+                elif upload_id:
+                    # The image was streamed to POST /uploads/label-images beforehand
+                    ingested_image = self._label_image_uploads_service.ingest_staged_upload(
+                        upload_id,
+                        permitted_types=["jpg", "png", "gif", "jpeg"]
+                    )
+                else:
+                    ingested_image = self._verify_label_image_or_raise(input.job_metadata.label_image_base64,
+                                                                       permitted_types=["jpg", "png", "gif", "jpeg"])
             except ValueError as ve:
                 return CreateLabelApprovalJobResponse(
                     job=None,
@@ -163,8 +279,12 @@ class LabelApprovalJobsService:
             # Determine analysis mode from input, default to using_llm
             analysis_mode = input.job_metadata.analysis_mode if input.job_metadata.analysis_mode else AnalysisMode.using_llm
 
-            # Upload label image to Vercel Blob Storage
-            label_images = self._upload_and_create_label_images(input.job_metadata.label_image_base64)
+            # Upload label image to blob storage
+            label_images = self._upload_and_create_label_images(
+                None if upload_id or object_key else input.job_metadata.label_image_base64,
+                ingested_image=ingested_image,
+                source_key=object_key
+            )
 
             # Convert input metadata to JobMetadata domain model
             job_metadata = JobMetadata(
@@ -213,13 +333,32 @@ class LabelApprovalJobsService:
                     message="Failed to create label approval job"
                 )
 
-            job_with_analysis: Optional[LabelApprovalJob] = self._analyze_label_images(created_job)
-            if job_with_analysis is not None:
-                self._label_approval_jobs_persistence_adapter.set_job_metadata(
-                    job_id=created_job.id,
-                    job_metadata=job_with_analysis.get_job_metadata().model_dump(exclude_none=False),
+            self._label_approval_job_events_service.publish_stage(
+                created_job.id,
+                LabelApprovalJobStage.uploaded,
+                status=created_job.status
+            )
+
+            if object_key and label_images and label_images[0].image_url:
+                # The image now lives at its content address
+                self._label_image_uploads_service.discard_direct_upload(object_key)
+            elif upload_id:
+                self._label_image_uploads_service.discard_staged_upload(upload_id)
+
+            if input.wait_for_analysis:
+                # The caller asked for the analyzed job in the response
+                job_with_analysis: Optional[LabelApprovalJob] = self._analyze_and_store(
+                    created_job,
                     updated_by=authenticated_entity
                 )
+                if job_with_analysis is not None:
+                    created_job = job_with_analysis.model_copy(
+                        update={"job_metadata": self._without_spooled_images(job_with_analysis)}
+                    )
+            else:
+                # Analyzed after the response: the caller gets the job id right away and follows the analysis
+                # through the labelApprovalJobUpdates subscription (or by polling the job)
+                self._analysis_executor.submit(self._analyze_in_background, created_job, authenticated_entity)
 
             # Convert to DTO
             # job_metadata_dto: JobMetadataDTO = ObjectMapper.map(created_job.get_job_metadata(), JobMetadataDTO)
@@ -263,16 +402,7 @@ class LabelApprovalJobsService:
                 message="Failed to get label approval job"
             )
 
-        job_with_analysis: Optional[LabelApprovalJob] = self._analyze_label_images(
-            job=job,
-            analysis_mode_override=analysis_mode_override
-        )
-        if job_with_analysis is not None:
-            self._label_approval_jobs_persistence_adapter.set_job_metadata(
-                job_id=job.id,
-                job_metadata=job_with_analysis.get_job_metadata().model_dump(exclude_none=False),
-                updated_by=authenticated_entity
-            )
+        self._analyze_and_store(job, updated_by=authenticated_entity, analysis_mode_override=analysis_mode_override)
 
         # Convert to DTO
         job_dto: LabelApprovalJobDTO = ObjectMapper.map(job, LabelApprovalJobDTO)
@@ -283,6 +413,34 @@ class LabelApprovalJobsService:
             message="Label approval job analyzed successfully"
         )
 
+    def _analyze_in_background(self, job: LabelApprovalJob, updated_by: EntityDescriptor) -> None:
+        """Analyze a newly created job on the background executor, where nobody is waiting for errors"""
+        try:
+            self._analyze_and_store(job, updated_by=updated_by)
+        except Exception as e:
+            self._logger.exception(f"Error analyzing label approval job id={job.id}: {str(e)}")
+            self._publish_analysis_outcome(job, None)
+
+    def _analyze_and_store(
+            self,
+            job: LabelApprovalJob,
+            updated_by: EntityDescriptor,
+            analysis_mode_override: Optional[AnalysisMode] = None
+    ) -> Optional[LabelApprovalJob]:
+        """Analyze the label images of a job, store the results and tell live subscribers"""
+        job_with_analysis: Optional[LabelApprovalJob] = self._analyze_label_images(
+            job=job,
+            analysis_mode_override=analysis_mode_override
+        )
+        if job_with_analysis is not None:
+            self._label_approval_jobs_persistence_adapter.set_job_metadata(
+                job_id=job.id,
+                job_metadata=self._without_spooled_images(job_with_analysis).model_dump(exclude_none=False),
+                updated_by=updated_by
+            )
+        self._publish_analysis_outcome(job, job_with_analysis)
+        return job_with_analysis
+
     def _analyze_label_images(
             self,
             job: LabelApprovalJob,
@@ -291,28 +449,125 @@ class LabelApprovalJobsService:
         """Analyze label images using image recognition"""
         self._logger.info(f"Analyzing label images for job id {job.id}, analysis_mode_override={analysis_mode_override}")
         updated_job: Optional[LabelApprovalJob] = self._label_data_analysis_service.analyze_label_data(
-            job=job,
+            job=self._with_spooled_images(job),
             analysis_mode_override=analysis_mode_override
         )
         return updated_job
 
+    def _with_spooled_images(self, job: LabelApprovalJob) -> LabelApprovalJob:
+        """The job with images still waiting for their upload inlined as base64 for the analysis services,
+        which read either image_url or base64. The job itself is left as is."""
+        label_images = job.get_job_metadata().label_images or []
+        if not any(label_image.pending_upload_key and not label_image.base64 for label_image in label_images):
+            return job
+
+        job_clone = LabelApprovalJob.model_validate(job.model_dump())
+        for label_image in job_clone.get_job_metadata().label_images:
+            if not label_image.pending_upload_key or label_image.base64:
+                continue
+            # Drained in the meantime? Then it is in blob storage under the same key
+            image_bytes = self._label_image_spool_adapter.read(label_image.pending_upload_key)
+            if image_bytes is None:
+                image_bytes = self._blob_storage_adapter.read(label_image.pending_upload_key)
+            if image_bytes is None:
+                self._logger.warning(f"Spooled label image not found key={label_image.pending_upload_key}")
+                continue
+            label_image.base64 = (f"data:{label_image.image_content_type or 'image/jpeg'};base64,"
+                                  f"{base64.b64encode(image_bytes).decode('ascii')}")
+        return job_clone
+
+    @classmethod
+    def _without_spooled_images(cls, job: LabelApprovalJob) -> JobMetadata:
+        """Metadata of an analyzed job without the base64 inlined by _with_spooled_images"""
+        job_metadata = job.get_job_metadata().model_copy(deep=True)
+        for label_image in job_metadata.label_images or []:
+            if label_image.pending_upload_key:
+                label_image.base64 = None
+        return job_metadata
+
+    def _publish_analysis_outcome(self, job: LabelApprovalJob, job_with_analysis: Optional[LabelApprovalJob]) -> None:
+        """Tell live subscribers that the analysis pipeline for the job has finished"""
+        if job_with_analysis is None:
+            self._label_approval_job_events_service.publish_stage(
+                job.id,
+                LabelApprovalJobStage.failed,
+                status=job.status,
+                message="Label image analysis failed"
+            )
+            return
+
+        self._label_approval_job_events_service.publish(self._to_job_update(job_with_analysis))
+
+    @classmethod
+    def _to_job_update(cls, job: LabelApprovalJob) -> LabelApprovalJobUpdate:
+        """Snapshot of a job's latest analysis state, as a job update"""
+        label_images = job.get_job_metadata().label_images or []
+        analyzed_image: Optional[LabelImage] = label_images[0] if label_images else None
+        analysis_result = analyzed_image.analysis_result if analyzed_image else None
+
+        return LabelApprovalJobUpdate(
+            job_id=job.id,
+            stage=LabelApprovalJobStage.analysis_done if analysis_result else LabelApprovalJobStage.uploaded,
+            created_at=DateTimeUtils.get_utc_now(),
+            status=job.status,
+            extracted_product_info=analyzed_image.extracted_product_info if analyzed_image else None,
+            analysis_result=analysis_result
+        )
+
+    async def subscribe_to_label_approval_job_updates(
+            self,
+            info: Info,
+            job_id: uuid.UUID
+    ) -> AsyncGenerator[LabelApprovalJobUpdateDTO, None]:
+        """
+        Stream progress updates for a label approval job until its analysis is done or failed, or the client
+        disconnects.
+
+        The first update is a snapshot of the job's current state, so a client that subscribes after
+        (part of) the analysis has run still starts from the latest result - and the stream ends there
+        if the job is already analyzed.
+        """
+        # Subscribe before reading the snapshot so that no update published in between is lost
+        subscription = await self._label_approval_job_events_service.subscribe(job_id)
+        try:
+            job: Optional[LabelApprovalJob] = await asyncio.to_thread(
+                self._label_approval_jobs_persistence_adapter.get_approval_job_by_id,
+                job_id=job_id
+            )
+            if job is None:
+                yield ObjectMapper.map(LabelApprovalJobUpdate(
+                    job_id=job_id,
+                    stage=LabelApprovalJobStage.failed,
+                    created_at=DateTimeUtils.get_utc_now(),
+                    message=f"Label approval job with ID {job_id} not found"
+                ), LabelApprovalJobUpdateDTO)
+                return
+
+            snapshot: LabelApprovalJobUpdate = self._to_job_update(job)
+            yield ObjectMapper.map(snapshot, LabelApprovalJobUpdateDTO)
+            if snapshot.stage.is_terminal():
+                return
+
+            async for message in subscription:
+                update = self._label_approval_job_events_service.parse_update(message)
+                if update is None:
+                    continue
+                yield ObjectMapper.map(update, LabelApprovalJobUpdateDTO)
+                if update.stage.is_terminal():
+                    return
+        finally:
+            await subscription.close()
+
     @classmethod
     def _verify_net_contents_or_raise(cls, net_contents: Optional[str]) -> None:
         """Verify that the net contents in milli litres is a valid positive number string"""
         if net_contents is None:
             return
-        try:
-            # regexp to extract numeric part only
-            net_contents = net_contents.strip()
-
-            # Remove any non-numeric characters (like units)
-            numeric_part = ''.join(filter(lambda c: c.isdigit() or c == '.' or c == '-', net_contents))
-
-            value = float(numeric_part)
-        except ValueError:
+        parsed = parse_net_contents(net_contents)
+        if parsed is None:
             raise ValueError("Net contents in milli litres must be a valid number")
 
-        if value < 0:
+        if parsed.quantity < 0:
             raise ValueError("Net contents in milli litres must be a positive number")
 
     @classmethod
@@ -320,84 +575,37 @@ class LabelApprovalJobsService:
         """Verify that the alcohol content percentage is a valid percentage string (e.g., '5%', '12.5%')"""
         if alcohol_content_percentage is None:
             return
-        if alcohol_content_percentage.endswith('%'):
-            alcohol_content_percentage = alcohol_content_percentage.replace('%', '')
-
-        try:
-            value = float(alcohol_content_percentage)
-        except ValueError:
+        value = parse_alcohol_content(alcohol_content_percentage)
+        if value is None:
             raise ValueError("Alcohol content percentage must be a valid number followed by '%'")
 
         if value < 0 or value > 100:
             raise ValueError("Alcohol content percentage must be between 0% and 100%")
 
-    def _verify_label_image_or_raise(self, label_image_base64: str, permitted_types: list[str]) -> None:
-        """Verify that the label image is provided and is of a permitted type (e.g., jpg, png, gif)"""
-        if not label_image_base64:
-            raise ValueError("Label image is required")
-
-        # Simple check for permitted types in base64 string
-        if not any(label_image_base64.startswith(f"data:image/{img_type};base64,") for img_type in permitted_types):
-            logger = GlobalConfig.get_logger(__name__)
-            logger.info(f"Label image type not permitted. Provided image base64 starts with: img_type={label_image_base64[:30]}...")
-            raise ValueError(f"Label image must be one of the following types: {', '.join(permitted_types)}")
-
-        # Extract and verify the actual image contents
-        try:
-            # Extract the base64 data (remove the data URI prefix)
-            if ',' in label_image_base64:
-                base64_data = label_image_base64.split(',', 1)[1]
-            else:
-                raise ValueError("Invalid base64 image format")
-
-            # Decode the base64 string
-            image_data = base64.b64decode(base64_data, validate=True)
-
-            if len(image_data) == 0:
-                raise ValueError("Image data is empty")
-
-            # Try to open and verify the image
-            image = Image.open(BytesIO(image_data))
-
-            # Verify that this is indeed a valid image
-            image.verify()
+    def _verify_label_image_or_raise(self, label_image_base64: str, permitted_types: list[str]) -> IngestedLabelImage:
+        """Verify that the label image is provided and is of a permitted type (e.g., jpg, png, gif).
+        Returns the decoded image, so that it does not need to be decoded again for the upload."""
+        return LabelImageIngestionService.ingest(label_image_base64, permitted_types=permitted_types)
 
-            # Re-open the image to check the format (verify() closes the file)
-            image = Image.open(BytesIO(image_data))
-            image_format = image.format.lower() if image.format else None
-
-            # Normalize permitted types (jpg -> jpeg for comparison with PIL format)
-            normalized_permitted_types = [t.lower().replace('jpg', 'jpeg') for t in permitted_types]
-            if 'jpeg' in normalized_permitted_types and 'jpg' not in [t.lower() for t in permitted_types]:
-                normalized_permitted_types.append('jpg')
-
-            if image_format not in normalized_permitted_types:
-                raise ValueError(f"Image format {image_format} does not match declared type in data URI")
-
-            # Check that the image has valid dimensions
-            if image.width <= 0 or image.height <= 0:
-                raise ValueError("Image has invalid dimensions")
-
-            # bytes data length check
-            if len(image_data) > MAX_IMAGE_SIZE_BYTES:
-                raise ValueError("Image data exceeds maximum allowed size of 10 MB")
-
-        except ValueError:
-            # Re-raise ValueError with our message
-            raise
-        except Exception as e:
-            # Catch all other exceptions (base64 decode errors, PIL errors, etc.)
-            self._logger.exception(f"Error verifying label image: {str(e)}")
-            raise ValueError(f"Invalid or corrupted image")
-
-    def _upload_and_create_label_images(self, label_image_base64: str) -> list[LabelImage]:
-        """Upload label image to Vercel Blob Storage and create LabelImage list with URL reference.
-        Falls back to storing base64 directly if upload fails."""
-        if not label_image_base64:
+    def _upload_and_create_label_images(
+            self,
+            label_image_base64: Optional[str],
+            ingested_image: Optional[IngestedLabelImage] = None,
+            source_key: Optional[str] = None
+    ) -> list[LabelImage]:
+        """Upload label image to content-addressed blob storage and create LabelImage list with URL reference.
+        Reuses the bytes of an already ingested image (base64 or streamed upload), otherwise decodes
+        the base64 string. An image already in blob storage (source_key) is copied instead of uploaded.
+        If the upload fails (after the retries of the blob storage adapter), the image is spooled to local
+        disk and referenced by pending_upload_key until LabelImageUploadDrainService uploads it. Storing
+        the base64 in the job is the last resort, when the spool cannot be written either."""
+        if not label_image_base64 and ingested_image is None:
             return []
 
         image_content_type = None
-        if label_image_base64.startswith("data:image/jpg;base64,"):
+        if not label_image_base64:
+            image_content_type = ingested_image.declared_content_type
+        elif label_image_base64.startswith("data:image/jpg;base64,"):
             image_content_type = "image/jpg"
         elif label_image_base64.startswith("data:image/jpeg;base64,"):
             image_content_type = "image/jpeg"
@@ -406,36 +614,116 @@ class LabelApprovalJobsService:
         elif label_image_base64.startswith("data:image/gif;base64,"):
             image_content_type = "image/gif"
 
-        # Determine file extension from content type
-        ext_map = {"image/jpg": "jpg", "image/jpeg": "jpg", "image/png": "png", "image/gif": "gif"}
-        extension = ext_map.get(image_content_type, "jpg")
-
-        # Decode base64 data
-        base64_data = label_image_base64.split(',', 1)[1] if ',' in label_image_base64 else label_image_base64
-        image_bytes = base64.b64decode(base64_data)
+        image_bytes = ingested_image.data if ingested_image else LabelImageIngestionService.decode(label_image_base64)
 
         try:
-            image_url = self._vercel_blob_storage_adapter.upload_image(
+            # Stored under its SHA-256, so resubmitting the same image reuses the existing object and URL
+            image_url = self._blob_storage_adapter.upload_image(
                 image_data=image_bytes,
-                filename=f"label.{extension}",
                 content_type=image_content_type or "image/jpeg",
+                sha256=ingested_image.sha256 if ingested_image else None,
+                source_key=source_key,
             )
-            self._logger.info(f"Label image uploaded to Vercel Blob: {image_url}")
+            self._logger.info(f"Label image uploaded to blob storage: {image_url}")
 
+            variants = self._create_label_image_variants(image_bytes, ingested_image)
             return [LabelImage(
                 image_url=image_url,
                 image_content_type=image_content_type,
+                thumbnail_url=variants.thumbnail_url,
+                display_url=variants.display_url,
+                ocr_url=variants.ocr_url,
+                base64=None,
+            )]
+        except Exception as e:
+            self._logger.warning(f"Blob storage upload failed, spooling the label image: {str(e)}")
+
+        sha256 = ingested_image.sha256 if ingested_image else hashlib.sha256(image_bytes).hexdigest()
+        pending_upload_key = BlobStorageAdapter.content_key(sha256, image_content_type or "image/jpeg")
+        try:
+            self._label_image_spool_adapter.spool(pending_upload_key, image_bytes, image_content_type or "image/jpeg")
+            return [LabelImage(
+                image_url=None,
+                image_content_type=image_content_type,
+                pending_upload_key=pending_upload_key,
                 base64=None,
             )]
         except Exception as e:
-            # Fallback: store base64 directly if blob upload fails
-            self._logger.warning(f"Vercel Blob upload failed, falling back to base64 storage: {str(e)}")
+            # Last resort: store base64 directly in the job
+            self._logger.error(f"Failed to spool label image, falling back to base64 storage: {str(e)}")
+            if not label_image_base64:
+                label_image_base64 = f"data:{image_content_type};base64,{base64.b64encode(image_bytes).decode('ascii')}"
             return [LabelImage(
                 image_url=None,
                 image_content_type=image_content_type,
                 base64=label_image_base64,
             )]
 
+    def _create_label_image_variants(
+            self,
+            image_bytes: bytes,
+            ingested_image: Optional[IngestedLabelImage]
+    ) -> LabelImageVariants:
+        """Thumbnail, display and OCR renditions of the label image. Consumers fall back to image_url
+        without them, so a failure here does not fail the job."""
+        try:
+            return self._label_image_variants_service.create_variants(
+                image_bytes,
+                sha256=ingested_image.sha256 if ingested_image else None
+            )
+        except Exception as e:
+            self._logger.warning(f"Failed to create label image variants: {str(e)}")
+            return LabelImageVariants()
+
+    def create_label_image_upload(
+            self,
+            info: Info,
+            input: CreateLabelImageUploadInput
+    ) -> CreateLabelImageUploadResponse:
+        """Presign a direct upload of a label image to blob storage, so the image bytes bypass the API"""
+        try:
+            security_context = SecurityContext.from_info(info)
+            authenticated_entity = security_context.get_authenticated_entity_from_security_ctx()
+            authenticated_user: Optional[User] = self._user_management_service.get_user_by_authenticated_entity(
+                entity=authenticated_entity
+            )
+            if authenticated_user is None:
+                return CreateLabelImageUploadResponse(
+                    success=False,
+                    message="Authenticated user not found"
+                )
+
+            try:
+                presigned_upload = self._label_image_uploads_service.create_direct_upload(input.content_type)
+            except ValueError as ve:
+                return CreateLabelImageUploadResponse(
+                    success=False,
+                    message="Invalid label image: " + str(ve)
+                )
+            except NotImplementedError:
+                return CreateLabelImageUploadResponse(
+                    success=False,
+                    message="Direct uploads are not supported by the configured blob storage, use POST /uploads/label-images"
+                )
+
+            return CreateLabelImageUploadResponse(
+                upload_url=presigned_upload.url,
+                upload_fields=[
+                    LabelImageUploadField(name=name, value=value) for name, value in presigned_upload.fields.items()
+                ],
+                object_key=presigned_upload.key,
+                expires_in_seconds=presigned_upload.expires_in_seconds,
+                success=True,
+                message="Label image upload created successfully"
+            )
+
+        except Exception as e:
+            self._logger.error(f"Error creating label image upload: {str(e)}")
+            return CreateLabelImageUploadResponse(
+                success=False,
+                message=f"Error creating label image upload: {str(e)}"
+            )
+
     def set_label_approval_job_status(
             self,
             info: Info,
@@ -656,3 +944,50 @@ class LabelApprovalJobsService:
                 success=False,
                 message=f"Error getting label approval job: {str(e)}"
             )
+
+    def get_label_image_ocr_overlay(
+            self,
+            info: Info,
+            input: GetLabelImageOcrOverlayInput
+    ) -> GetLabelImageOcrOverlayResponse:
+        """URL of a label image with its OCR boxes drawn on, rendered on the first request for it"""
+        try:
+            job = self._label_approval_jobs_persistence_adapter.get_approval_job_by_id(
+                job_id=input.job_id
+            )
+
+            if job is None:
+                return GetLabelImageOcrOverlayResponse(
+                    overlay_url=None,
+                    success=False,
+                    message=f"Label approval job with ID {input.job_id} not found"
+                )
+
+            label_images = job.get_job_metadata().label_images or []
+            if not 0 <= input.image_index < len(label_images):
+                return GetLabelImageOcrOverlayResponse(
+                    overlay_url=None,
+                    success=False,
+                    message=f"Label approval job {input.job_id} has no label image at index {input.image_index}"
+                )
+
+            overlay_url = self._label_image_ocr_overlay_service.get_overlay_url(
+                job=job,
+                label_image=label_images[input.image_index],
+                draw_level=input.draw_level,
+                show_confidence=input.show_confidence
+            )
+
+            return GetLabelImageOcrOverlayResponse(
+                overlay_url=overlay_url,
+                success=True,
+                message="OCR overlay retrieved successfully"
+            )
+
+        except Exception as e:
+            self._logger.error(f"Error getting OCR overlay of label image: {str(e)}")
+            return GetLabelImageOcrOverlayResponse(
+                overlay_url=None,
+                success=False,
+                message=f"Error getting OCR overlay of label image: {str(e)}"
+            )
@@ -0,0 +1,398 @@
+"""Bulk re-verification of the stored label data of jobs against their forms, as vectorized comparisons"""
+
+import csv
+import math
+import time
+import uuid
+from typing import Optional, Callable, Dict, Iterable, List, NamedTuple, Sequence, TextIO, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.persistence.label_approvals_persistence_adapter import \
+    LabelApprovalJobsPersistenceAdapter
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.usecases.label_analysis_matcher import (
+    GOVERNMENT_WARNING,
+    LabelAnalysisMatcher
+)
+from treasury.services.gateways.ttb_api.main.application.utils.quantities import (
+    ALCOHOL_CONTENT_ABSOLUTE_TOLERANCE,
+    NET_CONTENTS_RELATIVE_TOLERANCE,
+    net_contents_millilitres,
+    parse_alcohol_content
+)
+
+DEFAULT_AUDIT_BATCH_SIZE = 5000
+
+# (job id, product_info given on the form, extracted_product_info of the first label image) as stored JSON
+LabelData = Tuple[uuid.UUID, Optional[dict], Optional[dict]]
+
+# Percentage points the stated alcohol content may differ by (27 CFR 5.65 for distilled spirits)
+ALCOHOL_CONTENT_TOLERANCE = 0.3
+
+
+def _normalized(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    return ' '.join(text.lower().split()) or None
+
+
+def _first_product(brand_data: Optional[dict]) -> dict:
+    products = (brand_data or {}).get("products") or []
+    return (products[0] if products else None) or {}
+
+
+class LabelAuditVocabulary:
+    """
+    The distinct values seen by an audit, shared by its batches: normalized brand names and product classes
+    get integer ids, quantities are parsed once per distinct text, and string comparisons are made once per
+    distinct (given, extracted) pair. Stored label data repeats the same few values over and over, so the
+    per-job work left is looking values up.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, Dict[str, int]] = {"brand_name": {}, "product_class": {}}
+        self._values: Dict[str, List[str]] = {"brand_name": [], "product_class": []}
+        self._quantities: Dict[str, Dict[str, float]] = {"alcohol_content": {}, "net_contents": {}}
+        self._pair_results: Dict[str, Dict[int, bool]] = {"brand_name": {}, "product_class": {}}
+
+    def id_of(self, kind: str, text: Optional[str]) -> int:
+        """The id of the normalized text, -1 if there is none"""
+        normalized = _normalized(text)
+        if normalized is None:
+            return -1
+        ids = self._ids[kind]
+        if normalized not in ids:
+            ids[normalized] = len(ids)
+            self._values[kind].append(normalized)
+        return ids[normalized]
+
+    def quantity_of(self, kind: str, text: Optional[str], stored_value: Optional[float] = None) -> float:
+        """
+        The alcohol content in % or the net contents in mL, NaN if missing or not understood. Jobs stored
+        since ProductInfoStrict carries the numeric values have them (stored_value); older ones are parsed.
+        """
+        if stored_value is not None:
+            return stored_value
+        if not text:
+            return math.nan
+        quantities = self._quantities[kind]
+        if text not in quantities:
+            value = parse_alcohol_content(text) if kind == "alcohol_content" else net_contents_millilitres(text)
+            quantities[text] = value if value is not None else math.nan
+        return quantities[text]
+
+    def pairwise(self, kind: str, given_ids: np.ndarray, extracted_ids: np.ndarray) -> np.ndarray:
+        """Whether each extracted value contains the given one (or an equivalent class), False if either is missing"""
+        result = np.zeros(len(given_ids), dtype=bool)
+        valid = (given_ids >= 0) & (extracted_ids >= 0)
+        codes = (given_ids[valid].astype(np.int64) << 32) | extracted_ids[valid].astype(np.int64)
+        unique_codes, inverse = np.unique(codes, return_inverse=True)
+        results = np.fromiter(
+            (self._pair_result(kind, code) for code in unique_codes.tolist()), dtype=bool, count=len(unique_codes)
+        )
+        result[valid] = results[inverse]
+        return result
+
+    def _pair_result(self, kind: str, code: int) -> bool:
+        pair_results = self._pair_results[kind]
+        if code not in pair_results:
+            given, extracted = self._values[kind][code >> 32], self._values[kind][code & 0xFFFFFFFF]
+            if kind == "product_class":
+                pair_results[code] = any(
+                    product_class in extracted for product_class in LabelAnalysisMatcher.product_class_equivalents(given)
+                )
+            else:
+                pair_results[code] = given in extracted
+        return pair_results[code]
+
+
+class LabelAuditColumns:
+    """
+    The label data of a batch of jobs as NumPy columns: brand name and product class ids (-1 if missing),
+    alcohol contents in % and net contents in mL (NaN if missing), whether warnings were given and whether
+    the extracted warnings carry the all-caps heading. Given values are from the form, extracted values
+    from the first label image.
+    """
+
+    def __init__(
+            self,
+            job_ids: List[uuid.UUID],
+            vocabulary: LabelAuditVocabulary,
+            given_brand_ids: np.ndarray,
+            extracted_brand_ids: np.ndarray,
+            given_class_ids: np.ndarray,
+            extracted_class_ids: np.ndarray,
+            given_abv: np.ndarray,
+            extracted_abv: np.ndarray,
+            given_ml: np.ndarray,
+            extracted_ml: np.ndarray,
+            warnings_given: np.ndarray,
+            extracted_warning_heading: np.ndarray
+    ) -> None:
+        self.job_ids = job_ids
+        self.vocabulary = vocabulary
+        self.given_brand_ids = given_brand_ids
+        self.extracted_brand_ids = extracted_brand_ids
+        self.given_class_ids = given_class_ids
+        self.extracted_class_ids = extracted_class_ids
+        self.given_abv = given_abv
+        self.extracted_abv = extracted_abv
+        self.given_ml = given_ml
+        self.extracted_ml = extracted_ml
+        self.warnings_given = warnings_given
+        self.extracted_warning_heading = extracted_warning_heading
+
+    @property
+    def job_count(self) -> int:
+        return len(self.job_ids)
+
+    @classmethod
+    def from_label_data(cls, label_data: Sequence[LabelData], vocabulary: LabelAuditVocabulary) -> 'LabelAuditColumns':
+        columns: Dict[str, list] = {name: [] for name in (
+            "given_brand_ids", "extracted_brand_ids", "given_class_ids", "extracted_class_ids", "given_abv",
+            "extracted_abv", "given_ml", "extracted_ml", "warnings_given", "extracted_warning_heading"
+        )}
+        for _, given, extracted in label_data:
+            given_product, extracted_product = _first_product(given), _first_product(extracted)
+            columns["given_brand_ids"].append(vocabulary.id_of("brand_name", (given or {}).get("brand_name")))
+            columns["extracted_brand_ids"].append(vocabulary.id_of("brand_name", (extracted or {}).get("brand_name")))
+            columns["given_class_ids"].append(vocabulary.id_of("product_class", given_product.get("product_class_type")))
+            columns["extracted_class_ids"].append(
+                vocabulary.id_of("product_class", extracted_product.get("product_class_type"))
+            )
+            for prefix, product in (("given", given_product), ("extracted", extracted_product)):
+                columns[f"{prefix}_abv"].append(vocabulary.quantity_of(
+                    "alcohol_content", product.get("alcohol_content_abv"), product.get("alcohol_content_percent")
+                ))
+                columns[f"{prefix}_ml"].append(vocabulary.quantity_of(
+                    "net_contents", product.get("net_contents"), product.get("net_contents_ml")
+                ))
+            given_warnings = (given_product.get("other_info") or {}).get("warnings")
+            extracted_warnings = (extracted_product.get("other_info") or {}).get("warnings")
+            columns["warnings_given"].append(bool(given_warnings and given_warnings.strip()))
+            columns["extracted_warning_heading"].append(bool(extracted_warnings) and GOVERNMENT_WARNING in extracted_warnings)
+
+        return cls(
+            job_ids=[job_id for job_id, _, _ in label_data],
+            vocabulary=vocabulary,
+            given_brand_ids=np.array(columns["given_brand_ids"], dtype=np.int32),
+            extracted_brand_ids=np.array(columns["extracted_brand_ids"], dtype=np.int32),
+            given_class_ids=np.array(columns["given_class_ids"], dtype=np.int32),
+            extracted_class_ids=np.array(columns["extracted_class_ids"], dtype=np.int32),
+            given_abv=np.array(columns["given_abv"], dtype=np.float64),
+            extracted_abv=np.array(columns["extracted_abv"], dtype=np.float64),
+            given_ml=np.array(columns["given_ml"], dtype=np.float64),
+            extracted_ml=np.array(columns["extracted_ml"], dtype=np.float64),
+            warnings_given=np.array(columns["warnings_given"], dtype=bool),
+            extracted_warning_heading=np.array(columns["extracted_warning_heading"], dtype=bool),
+        )
+
+
+class LabelAuditRule(NamedTuple):
+    """A comparison of every job of a batch at once: (jobs it applies to, jobs that pass) as boolean arrays"""
+    name: str
+    description: str
+    evaluate: Callable[[LabelAuditColumns], Tuple[np.ndarray, np.ndarray]]
+
+
+def _brand_name(columns: LabelAuditColumns) -> Tuple[np.ndarray, np.ndarray]:
+    applies = columns.given_brand_ids >= 0
+    return applies, columns.vocabulary.pairwise("brand_name", columns.given_brand_ids, columns.extracted_brand_ids)
+
+
+def _product_class(columns: LabelAuditColumns) -> Tuple[np.ndarray, np.ndarray]:
+    applies = columns.given_class_ids >= 0
+    return applies, columns.vocabulary.pairwise("product_class", columns.given_class_ids, columns.extracted_class_ids)
+
+
+def _alcohol_content_equal(columns: LabelAuditColumns) -> Tuple[np.ndarray, np.ndarray]:
+    # NaN - not given or not extracted - is never close to anything
+    return ~np.isnan(columns.given_abv), np.isclose(
+        columns.given_abv, columns.extracted_abv, rtol=0.0, atol=ALCOHOL_CONTENT_ABSOLUTE_TOLERANCE
+    )
+
+
+def _alcohol_content_within_tolerance(columns: LabelAuditColumns) -> Tuple[np.ndarray, np.ndarray]:
+    return ~np.isnan(columns.given_abv), np.abs(columns.given_abv - columns.extracted_abv) <= ALCOHOL_CONTENT_TOLERANCE
+
+
+def _net_contents(columns: LabelAuditColumns) -> Tuple[np.ndarray, np.ndarray]:
+    return ~np.isnan(columns.given_ml), np.isclose(
+        columns.given_ml, columns.extracted_ml, rtol=NET_CONTENTS_RELATIVE_TOLERANCE, atol=0.0
+    )
+
+
+def _health_warning(columns: LabelAuditColumns) -> Tuple[np.ndarray, np.ndarray]:
+    return columns.warnings_given, columns.warnings_given & columns.extracted_warning_heading
+
+
+AUDIT_RULES: Dict[str, LabelAuditRule] = {rule.name: rule for rule in [
+    LabelAuditRule("brand_name", "The extracted brand name contains the one on the form", _brand_name),
+    LabelAuditRule("product_class", "The extracted product class contains the form's or an equivalent", _product_class),
+    LabelAuditRule("alcohol_content", "The extracted alcohol content equals the form's", _alcohol_content_equal),
+    LabelAuditRule(
+        "alcohol_content_tolerance",
+        f"The extracted alcohol content is within {ALCOHOL_CONTENT_TOLERANCE} percentage points of the form's",
+        _alcohol_content_within_tolerance
+    ),
+    LabelAuditRule("net_contents", "The extracted net contents equal the form's, in any unit", _net_contents),
+    LabelAuditRule("health_warning", "The extracted warnings have the all-caps heading, if warnings were given", _health_warning),
+]}
+
+# Outcomes of a rule for a job
+OUTCOME_NOT_APPLICABLE, OUTCOME_FAIL, OUTCOME_PASS = -1, 0, 1
+
+
+class LabelAuditRuleSummary(BaseModel):
+    name: str
+    applicable: int = 0
+    passed: int = 0
+    failed: int = 0
+
+
+class LabelAuditSummary(BaseModel):
+    """Totals of an audit run"""
+    jobs_audited: int = 0
+    # Jobs failing at least one rule
+    jobs_failed: int = 0
+    rules: List[LabelAuditRuleSummary] = []
+    elapsed_seconds: float = 0.0
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.jobs_audited / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        rules = " ".join(f"{rule.name}={rule.passed}/{rule.applicable}" for rule in self.rules)
+        return (
+            f"jobs_audited={self.jobs_audited} jobs_failed={self.jobs_failed} {rules} "
+            f"elapsed_seconds={self.elapsed_seconds:.1f} jobs_per_second={self.jobs_per_second:.0f}"
+        )
+
+
+class LabelAuditCsvReport:
+    """One CSV row per job - its id and pass, fail or an empty cell per rule - for failing jobs only by default"""
+
+    OUTCOME_LABELS = np.array(["", "fail", "pass"])
+
+    def __init__(self, output: TextIO, rule_names: List[str], failing_jobs_only: bool = True) -> None:
+        self._writer = csv.writer(output)
+        self._failing_jobs_only = failing_jobs_only
+        self._writer.writerow(["job_id", *rule_names])
+
+    def write(self, job_ids: List[uuid.UUID], outcomes: np.ndarray) -> None:
+        """outcomes: (rules, jobs) array of OUTCOME_*"""
+        if self._failing_jobs_only:
+            rows = np.flatnonzero((outcomes == OUTCOME_FAIL).any(axis=0))
+        else:
+            rows = np.arange(outcomes.shape[1])
+        labels = self.OUTCOME_LABELS[outcomes[:, rows] + 1].T
+        self._writer.writerows([job_ids[row], *row_labels] for row, row_labels in zip(rows.tolist(), labels.tolist()))
+
+
+class LabelAuditService:
+    """
+    Re-verifies the label data stored with jobs - the extracted_product_info of their first label image -
+    against the product_info given on their forms, without running the extraction again. Jobs are read in
+    keyset-paginated batches of just those two JSON values, each batch is turned into LabelAuditColumns, and
+    every rule (AUDIT_RULES) is one vectorized comparison over the batch, so auditing all historical jobs
+    against a new rule is a scan of the table rather than a job-by-job pipeline run.
+    """
+
+    def __init__(
+            self,
+            label_approval_jobs_persistence_adapter: LabelApprovalJobsPersistenceAdapter = None,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._label_approval_jobs_persistence_adapter_lazy = label_approval_jobs_persistence_adapter
+        self._clock = clock
+
+    @property
+    def _label_approval_jobs_persistence_adapter(self) -> LabelApprovalJobsPersistenceAdapter:
+        # Lazy initialization of the persistence adapter
+        if self._label_approval_jobs_persistence_adapter_lazy is None:
+            self._label_approval_jobs_persistence_adapter_lazy = LabelApprovalJobsPersistenceAdapter()
+        return self._label_approval_jobs_persistence_adapter_lazy
+
+    def audit(
+            self,
+            rule_names: Optional[List[str]] = None,
+            batch_size: int = DEFAULT_AUDIT_BATCH_SIZE,
+            max_jobs: Optional[int] = None,
+            report: Optional[LabelAuditCsvReport] = None,
+            on_batch_done: Optional[Callable[[LabelAuditSummary], None]] = None
+    ) -> LabelAuditSummary:
+        """
+        Audit the stored jobs in id order.
+
+        Args:
+            rule_names: Rules of AUDIT_RULES to evaluate (default: all)
+            batch_size: Jobs read and compared at once
+            max_jobs: Optional number of jobs to audit
+            report: Optional CSV report the outcomes are written to
+            on_batch_done: Called with the running totals after every batch
+        """
+        return self.audit_label_data(
+            self._stored_label_data(batch_size, max_jobs),
+            rule_names=rule_names,
+            report=report,
+            on_batch_done=on_batch_done
+        )
+
+    def _stored_label_data(self, batch_size: int, max_jobs: Optional[int]) -> Iterable[List[LabelData]]:
+        after_job_id, jobs_read = None, 0
+        while max_jobs is None or jobs_read < max_jobs:
+            limit = batch_size if max_jobs is None else min(batch_size, max_jobs - jobs_read)
+            batch = self._label_approval_jobs_persistence_adapter.list_job_label_data(
+                after_job_id=after_job_id,
+                limit=limit
+            )
+            if not batch:
+                return
+            yield batch
+            after_job_id, jobs_read = batch[-1][0], jobs_read + len(batch)
+
+    def audit_label_data(
+            self,
+            batches: Iterable[Sequence[LabelData]],
+            rule_names: Optional[List[str]] = None,
+            report: Optional[LabelAuditCsvReport] = None,
+            on_batch_done: Optional[Callable[[LabelAuditSummary], None]] = None
+    ) -> LabelAuditSummary:
+        """Audit batches of label data (see audit)"""
+        rules = [AUDIT_RULES[name] for name in (rule_names or list(AUDIT_RULES))]
+        vocabulary = LabelAuditVocabulary()
+        summary = LabelAuditSummary(rules=[LabelAuditRuleSummary(name=rule.name) for rule in rules])
+        started = self._clock()
+
+        for batch in batches:
+            columns = LabelAuditColumns.from_label_data(batch, vocabulary)
+            outcomes = self.evaluate(columns, rules)
+
+            summary.jobs_audited += columns.job_count
+            summary.jobs_failed += int((outcomes == OUTCOME_FAIL).any(axis=0).sum())
+            for rule_summary, rule_outcomes in zip(summary.rules, outcomes):
+                rule_summary.applicable += int((rule_outcomes != OUTCOME_NOT_APPLICABLE).sum())
+                rule_summary.passed += int((rule_outcomes == OUTCOME_PASS).sum())
+                rule_summary.failed += int((rule_outcomes == OUTCOME_FAIL).sum())
+            if report is not None:
+                report.write(columns.job_ids, outcomes)
+
+            summary.elapsed_seconds = self._clock() - started
+            if on_batch_done is not None:
+                on_batch_done(summary)
+
+        self._logger.info(f"Label audit done: {summary.summary()}")
+        return summary
+
+    @classmethod
+    def evaluate(cls, columns: LabelAuditColumns, rules: List[LabelAuditRule]) -> np.ndarray:
+        """(rules, jobs) array of the OUTCOME_* of each rule for each job of the batch"""
+        outcomes = np.full((len(rules), columns.job_count), OUTCOME_NOT_APPLICABLE, dtype=np.int8)
+        for rule_outcomes, rule in zip(outcomes, rules):
+            applies, passes = rule.evaluate(columns)
+            rule_outcomes[applies] = np.where(passes[applies], OUTCOME_PASS, OUTCOME_FAIL)
+        return outcomes
@@ -1,14 +1,23 @@
 from typing import Optional
 
+from treasury.services.gateways.ttb_api.main.adapter.out.llm.llm_routing_adapter import LlmRoutingAdapter
 from treasury.services.gateways.ttb_api.main.adapter.out.llm.openai_adapter import OpenAiAdapter
 from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import LabelApprovalJob, \
     LabelImageAnalysisResult, LabelImage, JobMetadata, AnalysisMode
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job_update import \
+    LabelApprovalJobStage
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
+from treasury.services.gateways.ttb_api.main.application.usecases.government_warning_index import \
+    GOVERNMENT_WARNING_INDEX
+from treasury.services.gateways.ttb_api.main.application.usecases.label_approval_job_events import \
+    LabelApprovalJobEventsService
 from treasury.services.gateways.ttb_api.main.application.usecases.label_data_extraction import \
     LabelDataExtractionService
 from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_pytesseract import \
     LabelDataAnalysisPytesseractService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_tiered import \
+    LabelDataAnalysisTieredService
 from treasury.services.gateways.ttb_api.main.application.usecases.llm_prompts import LlmPrompts
 
 
@@ -18,17 +27,23 @@ class LabelDataAnalysisService:
             self,
             label_data_extraction_service: LabelDataExtractionService = None,
             openai_adapter: OpenAiAdapter = None,
-            pytesseract_analysis_service: LabelDataAnalysisPytesseractService = None
+            pytesseract_analysis_service: LabelDataAnalysisPytesseractService = None,
+            label_approval_job_events_service: LabelApprovalJobEventsService = None,
+            llm_router: LlmRoutingAdapter = None,
+            tiered_analysis_service: LabelDataAnalysisTieredService = None
     ) -> None:
         self._label_data_extraction_service_lazy = label_data_extraction_service
         self._openai_adapter_lazy = openai_adapter
         self._pytesseract_analysis_service_lazy = pytesseract_analysis_service
+        self._label_approval_job_events_service_lazy = label_approval_job_events_service
+        self._llm_router_lazy = llm_router
+        self._tiered_analysis_service_lazy = tiered_analysis_service
         self._logger = GlobalConfig.get_logger(__name__)
 
     @property
     def _openai_adapter(self) -> OpenAiAdapter:
         if self._openai_adapter_lazy is None:
-            self._openai_adapter_lazy = OpenAiAdapter()
+            self._openai_adapter_lazy = OpenAiAdapter.get_singleton_instance_of()
         return self._openai_adapter_lazy
 
     @property
@@ -43,6 +58,27 @@ class LabelDataAnalysisService:
             self._pytesseract_analysis_service_lazy = LabelDataAnalysisPytesseractService()
         return self._pytesseract_analysis_service_lazy
 
+    @property
+    def _llm_router(self) -> LlmRoutingAdapter:
+        if self._llm_router_lazy is None:
+            self._llm_router_lazy = LlmRoutingAdapter(llm_client=self._openai_adapter)
+        return self._llm_router_lazy
+
+    @property
+    def _tiered_analysis_service(self) -> LabelDataAnalysisTieredService:
+        if self._tiered_analysis_service_lazy is None:
+            self._tiered_analysis_service_lazy = LabelDataAnalysisTieredService(
+                pytesseract_analysis_service=self._pytesseract_analysis_service,
+                llm_router=self._llm_router
+            )
+        return self._tiered_analysis_service_lazy
+
+    @property
+    def _label_approval_job_events_service(self) -> LabelApprovalJobEventsService:
+        if self._label_approval_job_events_service_lazy is None:
+            self._label_approval_job_events_service_lazy = LabelApprovalJobEventsService()
+        return self._label_approval_job_events_service_lazy
+
     def analyze_label_data(
             self,
             job: LabelApprovalJob,
@@ -60,9 +96,9 @@ class LabelDataAnalysisService:
         try:
             # TODO: There can be multiple images, for now we analyze only the first one
             image_to_analyze = job_meta.label_images[0]
-            extracted_label_data: BrandDataStrict = self._label_data_extraction_service.extract_label_data(
-                base64_image=image_to_analyze.base64,
-                image_url=image_to_analyze.image_url,
+            extracted_label_data: BrandDataStrict = self._extract_label_data(
+                job=job,
+                image_to_analyze=image_to_analyze,
                 analysis_mode=analysis_mode
             )
 
@@ -83,6 +119,12 @@ class LabelDataAnalysisService:
                     job=job_clone,
                     image_to_analyze=image_to_analyze_with_ext_data
                 )
+            elif analysis_mode == AnalysisMode.tiered:
+                # OCR first, the LLM only for the fields OCR could not confirm
+                job_clone = self._tiered_analysis_service.answer_analysis_questions_tiered(
+                    job=job_clone,
+                    image_to_analyze=image_to_analyze_with_ext_data
+                )
             else:
                 # Default to LLM analysis
                 job_clone = self.answer_analysis_questions_with_llm(
@@ -100,6 +142,80 @@ class LabelDataAnalysisService:
             self._logger.exception(f"Error during label data extraction job={job.id} error={e}")
             return None
 
+    def _extract_label_data(
+            self,
+            job: LabelApprovalJob,
+            image_to_analyze: LabelImage,
+            analysis_mode: AnalysisMode
+    ) -> BrandDataStrict:
+        """Run the extraction stage, publishing its progress to live subscribers of the job"""
+        events = self._label_approval_job_events_service
+
+        if analysis_mode in (AnalysisMode.pytesseract, AnalysisMode.tiered):
+            # The OCR rendition is a grayscale copy of the original; OCR_PREPROCESSING applies on top of it
+            extracted_label_data = self._label_data_extraction_service.extract_label_data(
+                base64_image=image_to_analyze.base64,
+                image_url=image_to_analyze.ocr_url or image_to_analyze.image_url,
+                analysis_mode=AnalysisMode.pytesseract
+            )
+            events.publish_stage(job.id, LabelApprovalJobStage.ocr_done, extracted_product_info=extracted_label_data)
+            return extracted_label_data
+
+        # The display rendition is all a vision model looks at, and much smaller to download
+        image_url = image_to_analyze.display_url or image_to_analyze.image_url
+        if not events.has_subscribers(job.id):
+            extracted_label_data = self._label_data_extraction_service.extract_label_data(
+                base64_image=image_to_analyze.base64,
+                image_url=image_url,
+                analysis_mode=analysis_mode
+            )
+        else:
+            # Someone is watching - stream the completion and push each field as soon as it is parsed
+            extracted_label_data = None
+            for event in self._label_data_extraction_service.extract_label_data_stream(
+                base64_image=image_to_analyze.base64,
+                image_url=image_url
+            ):
+                if event.is_final:
+                    extracted_label_data = event.brand_data
+                else:
+                    events.publish_stage(
+                        job.id,
+                        LabelApprovalJobStage.extraction_partial,
+                        field_path=event.field_path,
+                        field_value=event.value,
+                        field_verified=event.verified
+                    )
+
+        events.publish_stage(job.id, LabelApprovalJobStage.extraction_done, extracted_product_info=extracted_label_data)
+        return extracted_label_data
+
+    def _parse_analysis_result(self, response: str) -> LabelImageAnalysisResult:
+        self._logger.info(f"Label analysis response={response}")
+        # json cleanup and parse response, straight from the JSON text
+        return LabelDataExtractionService.extract_model_from_response(response, LabelImageAnalysisResult)
+
+    @classmethod
+    def _verify_warning_text(
+            cls,
+            analysis_result: LabelImageAnalysisResult,
+            given_brand_label_info: BrandDataStrict,
+            extracted_brand_label_info: Optional[BrandDataStrict]
+    ) -> None:
+        """The coverage of the statutory text by the extracted warnings, checked locally when warnings were given"""
+        if analysis_result.health_warning_found is None or not extracted_brand_label_info:
+            return
+        extracted_warnings = "\n".join(
+            product.other_info.warnings
+            for product in extracted_brand_label_info.products
+            if product.other_info and product.other_info.warnings
+        )
+        verification = GOVERNMENT_WARNING_INDEX.verify(extracted_warnings)
+        analysis_result.health_warning_text_coverage = verification.coverage
+        analysis_result.health_warning_missing_phrases = verification.missing_phrases
+        analysis_result.health_warning_found_results_reasoning = \
+            f"{analysis_result.health_warning_found_results_reasoning or ''} {verification.describe()}".strip()
+
     def answer_analysis_questions_with_llm(self, job: LabelApprovalJob, image_to_analyze: LabelImage) -> Optional[LabelApprovalJob]:
         """Analyze the extracted label data and answer the analysis questions"""
 
@@ -112,14 +228,14 @@ class LabelDataAnalysisService:
         )
 
         try:
-            response: str = self._openai_adapter.complete_prompt(
+            # schema-invalid answers are retried on the next model tier
+            analysis_result: LabelImageAnalysisResult = self._llm_router.complete_prompt(
                 prompt=prompt,
+                system_prompt=LlmPrompts.TTB_LABEL_ANALYSIS_SYSTEM_PROMPT,
+                prompt_version=LlmPrompts.LABEL_ANALYSIS_PROMPT_VERSION,
+                parse=self._parse_analysis_result,
             )
-            self._logger.info(f"Label analysis response={response}")
-            # json cleanup
-            response_cleaned: dict = LabelDataExtractionService.extract_json_from_response(response)
-            # parse response
-            analysis_result: LabelImageAnalysisResult = LabelImageAnalysisResult.model_validate(response_cleaned)
+            self._verify_warning_text(analysis_result, given_brand_label_info, extracted_brand_label_info)
 
             # inputs are immutable ... clone and update
             job_clone = LabelApprovalJob.model_validate(job.model_dump())
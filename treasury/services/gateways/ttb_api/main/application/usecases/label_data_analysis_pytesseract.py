@@ -1,8 +1,11 @@
 """Label data analysis using pytesseract OCR"""
-from typing import Optional
+from typing import Optional, List
+
+from pydantic import BaseModel
 
 from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
 from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import OcrResult
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_profiles import OcrProfileSelector
 from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import (
     LabelApprovalJob,
@@ -11,13 +14,36 @@ from treasury.services.gateways.ttb_api.main.application.models.domain.label_app
     JobMetadata
 )
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
+from treasury.services.gateways.ttb_api.main.application.usecases.government_warning_index import (
+    GOVERNMENT_WARNING_INDEX,
+    GovernmentWarningVerification
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_analysis_matcher import (
+    FuzzyMatchingConfig,
+    LabelAnalysisMatcher,
+    LabelAnalysisMatches
+)
+from treasury.services.gateways.ttb_api.main.application.utils.approximate_matching import ApproximateMatch
+
+
+class PytesseractLabelAnalysis(BaseModel):
+    """The pytesseract analysis of a label image, with the matches it was made from"""
+    analysis_result: LabelImageAnalysisResult
+    matches: LabelAnalysisMatches
 
 
 class LabelDataAnalysisPytesseractService:
     """Service for analyzing label data using pytesseract OCR"""
 
-    def __init__(self, ocr_adapter: OcrAdapter = None) -> None:
+    def __init__(
+            self,
+            ocr_adapter: OcrAdapter = None,
+            ocr_profile_selector: OcrProfileSelector = None,
+            fuzzy_matching: FuzzyMatchingConfig = None
+    ) -> None:
         self._ocr_adapter_lazy = ocr_adapter
+        self._ocr_profile_selector_lazy = ocr_profile_selector
+        self._fuzzy_matching_lazy = fuzzy_matching
         self._logger = GlobalConfig.get_logger(__name__)
 
     @property
@@ -26,24 +52,68 @@ class LabelDataAnalysisPytesseractService:
             self._ocr_adapter_lazy = OcrAdapter()
         return self._ocr_adapter_lazy
 
+    @property
+    def _ocr_profile_selector(self) -> OcrProfileSelector:
+        # Lazy initialization of the product class to OCR profile mapping (OCR_PROFILE_BY_PRODUCT_CLASS)
+        if self._ocr_profile_selector_lazy is None:
+            self._ocr_profile_selector_lazy = OcrProfileSelector()
+        return self._ocr_profile_selector_lazy
+
+    @property
+    def _fuzzy_matching(self) -> FuzzyMatchingConfig:
+        # Lazy initialization of the approximate matching thresholds (OCR_FUZZY_*)
+        if self._fuzzy_matching_lazy is None:
+            self._fuzzy_matching_lazy = FuzzyMatchingConfig.from_config()
+        return self._fuzzy_matching_lazy
+
     def answer_analysis_questions_with_pytesseract(
             self,
             job: LabelApprovalJob,
             image_to_analyze: LabelImage
     ) -> Optional[LabelApprovalJob]:
         """Analyze the extracted label data and answer the analysis questions using pytesseract OCR"""
+        analysis = self.analyze_label_image(job, image_to_analyze)
+        if analysis is None:
+            return None
+
+        # Clone and update job
+        job_clone = LabelApprovalJob.model_validate(job.model_dump())
+        job_metadata_clone: JobMetadata = job_clone.get_job_metadata()
+
+        image_to_analyze_clone: LabelImage = image_to_analyze.model_copy(deep=True)
+        image_to_analyze_clone.analysis_result = analysis.analysis_result
+
+        # Replace the first image with the updated one
+        job_metadata_clone.label_images[0] = image_to_analyze_clone
+        job_clone.job_metadata = job_metadata_clone
+
+        return job_clone
+
+    def analyze_label_image(
+            self,
+            job: LabelApprovalJob,
+            image_to_analyze: LabelImage
+    ) -> Optional[PytesseractLabelAnalysis]:
+        """OCR the label image and check it against the label data given on the form, None if OCR failed"""
 
         given_brand_label_info = job.get_job_metadata().product_info
 
         try:
+            # Tesseract settings for the kind of label, by the product class given on the form
+            product_class = self.ocr_product_class_of(job)
+            ocr_profile = self._ocr_profile_selector.profile_for(product_class)
+            self._logger.info(f"OCR profile for job={job.id} product_class={product_class}: {ocr_profile.name}")
+
             # Extract text from image using pytesseract — use URL for new records, base64 for old
             if image_to_analyze.image_url and not image_to_analyze.base64:
                 ocr_result: OcrResult = self._ocr_adapter.extract_text_from_url(
-                    image_url=image_to_analyze.image_url
+                    image_url=image_to_analyze.image_url,
+                    profile=ocr_profile
                 )
             else:
                 ocr_result: OcrResult = self._ocr_adapter.extract_text(
-                    base64_encoded_image=image_to_analyze.base64
+                    base64_encoded_image=image_to_analyze.base64,
+                    profile=ocr_profile
                 )
 
             if not ocr_result.success:
@@ -53,56 +123,77 @@ class LabelDataAnalysisPytesseractService:
             extracted_text = ocr_result.full_text
             self._logger.info(f"OCR extracted text for job={job.id}: {extracted_text[:500]}...")
 
-            # Analyze the extracted text against given brand info
-            analysis_result = self._analyze_ocr_text(
+            # Analyze the extracted text against given brand info, the OCR words for approximate matches
+            word_texts, word_confidences = ocr_result.word_texts_and_confidences()
+            return self.analyze_text(
                 extracted_text=extracted_text,
-                given_brand_info=given_brand_label_info
+                given_brand_info=given_brand_label_info,
+                word_texts=word_texts,
+                word_confidences=word_confidences
             )
 
-            # Clone and update job
-            job_clone = LabelApprovalJob.model_validate(job.model_dump())
-            job_metadata_clone: JobMetadata = job_clone.get_job_metadata()
-
-            image_to_analyze_clone: LabelImage = image_to_analyze.model_copy(deep=True)
-            image_to_analyze_clone.analysis_result = analysis_result
-
-            # Replace the first image with the updated one
-            job_metadata_clone.label_images[0] = image_to_analyze_clone
-            job_clone.job_metadata = job_metadata_clone
-
-            return job_clone
-
         except Exception as e:
-            self._logger.exception(f"answer_analysis_questions_with_pytesseract - Error during label analysis job={job.id} error={e}")
+            self._logger.exception(f"analyze_label_image - Error during label analysis job={job.id} error={e}")
             return None
 
+    @classmethod
+    def ocr_product_class_of(cls, job: LabelApprovalJob) -> Optional[str]:
+        """The product class picking the OCR profile of a job: the first given on the form, else the job's"""
+        brand_info = job.get_job_metadata().product_info
+        for product in (brand_info.products if brand_info else []):
+            if product.product_class_type:
+                return product.product_class_type
+        return job.product_class
+
     def _analyze_ocr_text(
             self,
             extracted_text: str,
-            given_brand_info: Optional[BrandDataStrict]
+            given_brand_info: Optional[BrandDataStrict],
+            word_texts: Optional[List[str]] = None,
+            word_confidences: Optional[List[float]] = None
+    ) -> LabelImageAnalysisResult:
+        """Analyze OCR extracted text against given brand information (see LabelAnalysisMatcher for the rules)"""
+        return self.analyze_text(extracted_text, given_brand_info, word_texts, word_confidences).analysis_result
+
+    def analyze_text(
+            self,
+            extracted_text: str,
+            given_brand_info: Optional[BrandDataStrict],
+            word_texts: Optional[List[str]] = None,
+            word_confidences: Optional[List[float]] = None
+    ) -> PytesseractLabelAnalysis:
+        """The analysis result of OCR extracted text, and the matches it was made from"""
+        matcher = LabelAnalysisMatcher(given_brand_info, fuzzy_matching=self._fuzzy_matching)
+        matches = matcher.match(extracted_text, word_texts=word_texts, word_confidences=word_confidences)
+        # The full statutory text, when a warning is required
+        warning_verification = GOVERNMENT_WARNING_INDEX.verify(extracted_text) \
+            if matches.health_warning_found is not None else None
+        return PytesseractLabelAnalysis(
+            analysis_result=self._analysis_result(matches, given_brand_info, warning_verification),
+            matches=matches
+        )
+
+    def _analysis_result(
+            self,
+            matches: LabelAnalysisMatches,
+            given_brand_info: Optional[BrandDataStrict],
+            warning_verification: Optional[GovernmentWarningVerification] = None
     ) -> LabelImageAnalysisResult:
-        """
-        Analyze OCR extracted text against given brand information.
-
-        Case sensitivity rules:
-        1. Brand Name - case-INSENSITIVE (e.g., "STONE'S THROW" matches "Stone's Throw")
-        2. Product Class/Type - case-INSENSITIVE, with fuzzy matching for related types
-        3. Alcohol Content - case-INSENSITIVE, number + "%" match
-        4. Net Contents - case-INSENSITIVE, volume match (e.g., "750 mL", "12 OZ")
-        5. Health Warning - ONLY field requiring ALL CAPS ("GOVERNMENT WARNING" exact match)
-        """
+        """The analysis result, with the reasoning for each check, of the matches of the given brand information"""
         result = LabelImageAnalysisResult()
-        extracted_text_lower = extracted_text.lower()
 
         if not given_brand_info:
             return result
 
         # 1. Check brand name - case-insensitive match (e.g., "STONE'S THROW" matches "Stone's Throw")
         if given_brand_info.brand_name:
-            brand_name_lower = given_brand_info.brand_name.lower()
-            brand_name_found = brand_name_lower in extracted_text_lower
-            result.brand_name_found = brand_name_found
-            if brand_name_found:
+            result.brand_name_found = matches.brand_name_found
+            if matches.brand_name_match is not None:
+                result.brand_name_found_results_reasoning = (
+                    f"The brand name '{given_brand_info.brand_name}' was found on the label as "
+                    f"{self._describe_approximate_match(matches.brand_name_match)} using OCR text extraction."
+                )
+            elif matches.brand_name_found:
                 result.brand_name_found_results_reasoning = (
                     f"The brand name '{given_brand_info.brand_name}' was found on the label (case-insensitive match) using OCR text extraction."
                 )
@@ -118,11 +209,13 @@ class LabelDataAnalysisPytesseractService:
 
             # 2. Check product class/type - allow close matches
             if product.product_class_type:
-                product_class_lower = product.product_class_type.lower()
-                # Check for exact match or common variations
-                product_class_found = self._check_product_class_match(product_class_lower, extracted_text_lower)
-                result.product_class_found = product_class_found
-                if product_class_found:
+                result.product_class_found = matches.product_class_found
+                if matches.product_class_match is not None:
+                    result.product_class_found_results_reasoning = (
+                        f"The product class '{product.product_class_type}' (or a close equivalent) was found on the label as "
+                        f"{self._describe_approximate_match(matches.product_class_match)} using OCR text extraction."
+                    )
+                elif matches.product_class_found:
                     result.product_class_found_results_reasoning = (
                         f"The product class '{product.product_class_type}' (or a close equivalent) was found on the label using OCR text extraction."
                     )
@@ -134,12 +227,9 @@ class LabelDataAnalysisPytesseractService:
 
             # 3. Check alcohol content - look for number + "%"
             if product.alcohol_content_abv:
-                alcohol_value = product.alcohol_content_abv.replace('%', '').strip()
-                self._logger.debug(f"Checking alcohol content: looking for '{alcohol_value}' in extracted text")
-                alcohol_found = self._check_alcohol_content_match(alcohol_value, extracted_text_lower)
-                result.alcohol_content_found = alcohol_found
-                self._logger.debug(f"Alcohol content match result: {alcohol_found}")
-                if alcohol_found:
+                result.alcohol_content_found = matches.alcohol_content_found
+                self._logger.debug(f"Alcohol content match result: {matches.alcohol_content_found}")
+                if matches.alcohol_content_found:
                     result.alcohol_content_found_results_reasoning = (
                         f"The alcohol content '{product.alcohol_content_abv}' was found on the label using OCR text extraction."
                     )
@@ -151,11 +241,9 @@ class LabelDataAnalysisPytesseractService:
 
             # 4. Check net contents - volume match
             if product.net_contents:
-                self._logger.debug(f"Checking net contents: looking for '{product.net_contents}' in extracted text")
-                net_contents_found = self._check_net_contents_match(product.net_contents, extracted_text_lower)
-                result.net_contents_found = net_contents_found
-                self._logger.debug(f"Net contents match result: {net_contents_found}")
-                if net_contents_found:
+                result.net_contents_found = matches.net_contents_found
+                self._logger.debug(f"Net contents match result: {matches.net_contents_found}")
+                if matches.net_contents_found:
                     result.net_contents_found_results_reasoning = (
                         f"The net contents '{product.net_contents}' was found on the label using OCR text extraction."
                     )
@@ -166,17 +254,9 @@ class LabelDataAnalysisPytesseractService:
                     )
 
             # 5. Check health warning - "GOVERNMENT WARNING" must be ALL CAPS
-            warnings_were_given = (
-                product.other_info is not None and
-                product.other_info.warnings is not None and
-                len(product.other_info.warnings.strip()) > 0
-            )
-
-            if warnings_were_given:
-                # Check for exact "GOVERNMENT WARNING" in ALL CAPS in original text (not lowercased)
-                health_warning_found = "GOVERNMENT WARNING" in extracted_text
-                result.health_warning_found = health_warning_found
-                if health_warning_found:
+            if matches.health_warning_found is not None:
+                result.health_warning_found = matches.health_warning_found
+                if matches.health_warning_found:
                     result.health_warning_found_results_reasoning = (
                         "The required 'GOVERNMENT WARNING' text was found on the label in the correct all-caps format using OCR text extraction."
                     )
@@ -185,144 +265,18 @@ class LabelDataAnalysisPytesseractService:
                         "The form requires a government warning, but the OCR extracted label data does not contain "
                         "'GOVERNMENT WARNING' in the required all-caps format."
                     )
+                if warning_verification is not None:
+                    result.health_warning_found_results_reasoning += f" {warning_verification.describe()}"
+                    result.health_warning_text_coverage = warning_verification.coverage
+                    result.health_warning_missing_phrases = warning_verification.missing_phrases
             else:
                 result.health_warning_found = None
                 result.health_warning_found_results_reasoning = "Not applicable - no warnings provided in the form."
 
         return result
 
-    def _check_product_class_match(self, given_class: str, extracted_text: str) -> bool:
-        """
-        Check for product class match, allowing close equivalents.
-        E.g., Beer and Lager Beer are the same, Gin and London Gin are the same.
-        """
-        # Direct match
-        if given_class in extracted_text:
-            return True
-
-        # Common equivalents mapping
-        equivalents = {
-            'beer': ['lager beer', 'lager', 'ale', 'pilsner'],
-            'lager beer': ['beer', 'lager', 'pilsner'],
-            'gin': ['london gin', 'london dry gin', 'dry gin'],
-            'london gin': ['gin', 'london dry gin', 'dry gin'],
-            'vodka': ['vodka'],
-            'whiskey': ['whisky', 'bourbon', 'rye whiskey', 'scotch'],
-            'whisky': ['whiskey', 'bourbon', 'rye whisky', 'scotch'],
-            'bourbon': ['whiskey', 'whisky', 'kentucky bourbon', 'straight bourbon'],
-            'rum': ['rum', 'dark rum', 'white rum', 'gold rum'],
-            'tequila': ['tequila', 'mezcal'],
-            'wine': ['wine', 'red wine', 'white wine', 'rose wine'],
-        }
-
-        # Check if given class has equivalents and any match
-        if given_class in equivalents:
-            for equivalent in equivalents[given_class]:
-                if equivalent in extracted_text:
-                    return True
-
-        # Check if extracted text contains the base category
-        for base_class, variants in equivalents.items():
-            if given_class in variants and base_class in extracted_text:
-                return True
-
-        return False
-
-    def _check_alcohol_content_match(self, alcohol_value: str, extracted_text: str) -> bool:
-        """
-        Check for alcohol content match - look for number + "%" patterns.
-        OCR text may have newlines, extra whitespace, so normalize before matching.
-        """
-        import re
-
-        # Normalize extracted text: replace newlines and multiple spaces with single space
-        normalized_text = re.sub(r'\s+', ' ', extracted_text).strip()
-
-        # Various patterns to match
-        patterns_to_check = [
-            f"{alcohol_value}%",           # "47.3%"
-            f"{alcohol_value} %",          # "47.3 %"
-            f"{alcohol_value}% alc",       # "47.3% alc"
-            f"{alcohol_value}% abv",       # "47.3% abv"
-            f"alc {alcohol_value}%",       # "alc 47.3%"
-            f"abv {alcohol_value}%",       # "abv 47.3%"
-            f"{alcohol_value} % alc",      # "47.3 % alc"
-            f"{alcohol_value} % abv",      # "47.3 % abv"
-            f"alcohol {alcohol_value}%",   # "alcohol 47.3%"
-        ]
-
-        for pattern in patterns_to_check:
-            if pattern in normalized_text:
-                return True
-
-        # Also try regex pattern for more flexible matching (handles spacing variations)
-        # Match: number, optional space, %, anywhere in text
-        regex_pattern = rf'{re.escape(alcohol_value)}\s*%'
-        if re.search(regex_pattern, normalized_text):
-            return True
-
-        return False
-
-    def _check_net_contents_match(self, net_contents: str, extracted_text: str) -> bool:
-        """
-        Check for net contents match - volume patterns like "750 mL", "12 OZ".
-        OCR text may have newlines, extra whitespace, so normalize before matching.
-        """
-        import re
-
-        # Normalize extracted text: replace newlines and multiple spaces with single space
-        normalized_text = re.sub(r'\s+', ' ', extracted_text).strip()
-
-        net_contents_lower = net_contents.lower()
-
-        # Direct match
-        if net_contents_lower in normalized_text:
-            return True
-
-        # Without spaces (e.g., "750ml" vs "750 ml")
-        net_contents_no_space = net_contents_lower.replace(' ', '')
-        normalized_no_space = normalized_text.replace(' ', '')
-        if net_contents_no_space in normalized_no_space:
-            return True
-
-        # Common unit variations
-        unit_variations = {
-            'ml': ['ml', 'milliliter', 'millilitre', 'milliliters', 'millilitres'],
-            'cl': ['cl', 'centiliter', 'centilitre', 'centiliters', 'centilitres'],
-            'fl oz': ['fl oz', 'fl. oz.', 'fl. oz', 'fluid ounce', 'fluid ounces', 'floz'],
-            'oz': ['oz', 'oz.', 'ounce', 'ounces'],
-            'l': ['l', 'liter', 'litre', 'liters', 'litres'],
-            'gal': ['gal', 'gal.', 'gallon', 'gallons'],
-        }
-
-        # Extract numeric value and unit from given net contents
-        match = re.match(r'(\d+(?:\.\d+)?)\s*(.+)', net_contents_lower)
-        if match:
-            value = match.group(1)
-            unit = match.group(2).strip()
-
-            # Find the base unit
-            base_unit = None
-            for base, variations in unit_variations.items():
-                if unit in variations or unit == base:
-                    base_unit = base
-                    break
-
-            if base_unit:
-                # Check for value + any variation of the unit using regex (handles spacing)
-                for variation in unit_variations.get(base_unit, [base_unit]):
-                    # Regex: number, optional whitespace, unit
-                    regex_pattern = rf'{re.escape(value)}\s*{re.escape(variation)}'
-                    if re.search(regex_pattern, normalized_text):
-                        return True
-
-        # Fallback: just search for the numeric value followed by any common volume unit
-        match = re.match(r'(\d+(?:\.\d+)?)', net_contents_lower)
-        if match:
-            value = match.group(1)
-            # Check if value + ml/ml/l appears anywhere
-            volume_pattern = rf'{re.escape(value)}\s*(ml|l|cl|oz|fl\s*oz|gal)'
-            if re.search(volume_pattern, normalized_text):
-                return True
-
-        return False
\ No newline at end of file
+    @classmethod
+    def _describe_approximate_match(cls, match: ApproximateMatch) -> str:
+        edits = f"{match.distance} character edit{'s' if match.distance != 1 else ''}"
+        ocr_confidence = f", OCR confidence {match.ocr_confidence:.0f}%" if match.ocr_confidence is not None else ""
+        return f"'{match.text}', an approximate match ({edits}, similarity {match.similarity:.2f}{ocr_confidence})"
@@ -0,0 +1,161 @@
+"""Tiered label data analysis: pytesseract OCR first, the LLM only for the fields OCR could not confirm"""
+from typing import Optional, List
+
+from treasury.services.gateways.ttb_api.main.adapter.out.llm.llm_routing_adapter import LlmRoutingAdapter
+from treasury.services.gateways.ttb_api.main.application.config import config
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import (
+    LabelApprovalJob,
+    LabelImageAnalysisResult,
+    LabelImage,
+    JobMetadata,
+    AnalysisTier,
+    LABEL_ANALYSIS_FIELDS
+)
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
+from treasury.services.gateways.ttb_api.main.application.usecases.label_analysis_matcher import LabelAnalysisMatches
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_pytesseract import (
+    LabelDataAnalysisPytesseractService,
+    PytesseractLabelAnalysis
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_extraction import \
+    LabelDataExtractionService
+from treasury.services.gateways.ttb_api.main.application.usecases.llm_prompts import LlmPrompts
+
+# Same threshold as OcrWord.is_high_confidence
+DEFAULT_TIERED_MIN_OCR_CONFIDENCE = 80.0
+
+
+class LabelDataAnalysisTieredService:
+    """
+    Service for the tiered analysis mode. The label is checked with pytesseract OCR first, and a field is
+    decided by OCR when it was found verbatim, or found approximately in words read with at least
+    ANALYSIS_TIERED_MIN_OCR_CONFIDENCE. Only the other fields - not found, or found in words OCR was unsure
+    of - are asked of the LLM, with a prompt that lists just those fields and the label image. A clean
+    label makes no LLM call at all. LabelImageAnalysisResult.decided_by records the tier of each field.
+    """
+
+    def __init__(
+            self,
+            pytesseract_analysis_service: LabelDataAnalysisPytesseractService = None,
+            llm_router: LlmRoutingAdapter = None,
+            min_ocr_confidence: Optional[float] = None
+    ) -> None:
+        self._pytesseract_analysis_service_lazy = pytesseract_analysis_service
+        self._llm_router_lazy = llm_router
+        self._min_ocr_confidence = min_ocr_confidence if min_ocr_confidence is not None else \
+            float(config.ANALYSIS_TIERED_MIN_OCR_CONFIDENCE or DEFAULT_TIERED_MIN_OCR_CONFIDENCE)
+        self._logger = GlobalConfig.get_logger(__name__)
+
+    @property
+    def _pytesseract_analysis_service(self) -> LabelDataAnalysisPytesseractService:
+        # Lazy initialization of the OCR tier
+        if self._pytesseract_analysis_service_lazy is None:
+            self._pytesseract_analysis_service_lazy = LabelDataAnalysisPytesseractService()
+        return self._pytesseract_analysis_service_lazy
+
+    @property
+    def _llm_router(self) -> LlmRoutingAdapter:
+        # Lazy initialization of the LLM tier
+        if self._llm_router_lazy is None:
+            self._llm_router_lazy = LlmRoutingAdapter()
+        return self._llm_router_lazy
+
+    def answer_analysis_questions_tiered(
+            self,
+            job: LabelApprovalJob,
+            image_to_analyze: LabelImage
+    ) -> Optional[LabelApprovalJob]:
+        """Answer the analysis questions with OCR, escalating the fields OCR could not confirm to the LLM"""
+        given_brand_label_info = job.get_job_metadata().product_info
+
+        try:
+            analysis = self._pytesseract_analysis_service.analyze_label_image(job, image_to_analyze)
+            if analysis is None:
+                # OCR failed - as if the label had no text, every field given on the form is escalated
+                analysis = self._pytesseract_analysis_service.analyze_text("", given_brand_label_info)
+
+            fields_to_escalate = self._fields_to_escalate(analysis.matches)
+            self._logger.info(f"Tiered analysis for job={job.id} escalating fields={fields_to_escalate} to the LLM")
+            analysis_result = self._escalate_to_llm(
+                job=job,
+                image_to_analyze=image_to_analyze,
+                analysis=analysis,
+                fields=fields_to_escalate
+            )
+
+            # inputs are immutable ... clone and update
+            job_clone = LabelApprovalJob.model_validate(job.model_dump())
+            job_metadata_clone: JobMetadata = job_clone.get_job_metadata()
+
+            image_to_analyze_clone: LabelImage = image_to_analyze.model_copy(deep=True)
+            image_to_analyze_clone.analysis_result = analysis_result
+
+            # replace the first image with the updated one
+            job_metadata_clone.label_images[0] = image_to_analyze_clone
+            job_clone.job_metadata = job_metadata_clone
+            return job_clone
+        except Exception as e:
+            # gracefully handle errors
+            self._logger.exception(f"answer_analysis_questions_tiered - Error during label analysis job={job.id} error={e}")
+            return None
+
+    def _fields_to_escalate(self, matches: LabelAnalysisMatches) -> List[str]:
+        """The fields given on the form that OCR did not find, or only found in words it was unsure of"""
+        fields = []
+        for field in LABEL_ANALYSIS_FIELDS:
+            found = getattr(matches, f"{field}_found")
+            if found is None:
+                # Not given on the form, nothing to check
+                continue
+            approximate_match = getattr(matches, f"{field}_match", None)
+            if not found or (
+                    approximate_match is not None and
+                    (approximate_match.ocr_confidence or 0.0) < self._min_ocr_confidence
+            ):
+                fields.append(field)
+        return fields
+
+    def _escalate_to_llm(
+            self,
+            job: LabelApprovalJob,
+            image_to_analyze: LabelImage,
+            analysis: PytesseractLabelAnalysis,
+            fields: List[str]
+    ) -> LabelImageAnalysisResult:
+        """The OCR analysis result with the LLM's answers for the fields, the OCR answers if the LLM call fails"""
+        result = analysis.analysis_result.model_copy(deep=True)
+        result.decided_by = {field: AnalysisTier.ocr for field in LABEL_ANALYSIS_FIELDS}
+        if not fields:
+            return result
+
+        given_brand_label_info: BrandDataStrict = job.get_job_metadata().product_info
+        # The display rendition is all a vision model looks at, and much smaller to download
+        image_url = image_to_analyze.display_url or image_to_analyze.image_url
+        media = {"media_url": image_url} if image_url else {"media_base64": image_to_analyze.base64}
+        try:
+            llm_result: LabelImageAnalysisResult = self._llm_router.complete_prompt_with_media(
+                prompt=LlmPrompts.get_label_verification_prompt(given_brand_label_info, fields),
+                system_prompt=LlmPrompts.TTB_LABEL_VERIFICATION_SYSTEM_PROMPT,
+                prompt_version=LlmPrompts.LABEL_VERIFICATION_PROMPT_VERSION,
+                parse=lambda response: self._parse_verification_result(response, fields),
+                **media
+            )
+        except Exception as e:
+            self._logger.exception(f"Tiered analysis LLM tier failed for job={job.id}, keeping the OCR answers error={e}")
+            return result
+
+        for field in fields:
+            setattr(result, f"{field}_found", getattr(llm_result, f"{field}_found"))
+            setattr(result, f"{field}_found_results_reasoning", getattr(llm_result, f"{field}_found_results_reasoning"))
+            result.decided_by[field] = AnalysisTier.llm
+        return result
+
+    def _parse_verification_result(self, response: str, fields: List[str]) -> LabelImageAnalysisResult:
+        """The LLM's answers for the fields, a ValueError (retried on the next model tier) if any is missing"""
+        self._logger.info(f"Label verification response={response}")
+        response_cleaned: dict = LabelDataExtractionService.extract_json_from_response(response)
+        missing_fields = [field for field in fields if not isinstance(response_cleaned.get(f"{field}_found"), bool)]
+        if missing_fields:
+            raise ValueError(f"Label verification response has no answer for fields={missing_fields}")
+        return LabelImageAnalysisResult.model_validate(response_cleaned)
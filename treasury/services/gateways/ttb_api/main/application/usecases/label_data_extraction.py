@@ -1,32 +1,65 @@
-import json
 import re
-from typing import Optional
+from typing import Generator, Optional, Type
 
+from pydantic import ValidationError
+
+from treasury.services.gateways.ttb_api.main.adapter.out.llm.llm_routing_adapter import LlmRoutingAdapter
 from treasury.services.gateways.ttb_api.main.adapter.out.llm.openai_adapter import OpenAiAdapter
 from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
 from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import AnalysisMode
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
+    ALCOHOL_CONTENT_ABV_PATTERN,
+    NET_CONTENTS_PATTERN,
     BrandDataStrict,
+    LabelExtractionStreamEvent,
     ProductInfoStrict,
     ProductOtherInfo
 )
+from treasury.services.gateways.ttb_api.main.application.usecases.label_field_extractor import LabelFieldExtractor
 from treasury.services.gateways.ttb_api.main.application.usecases.llm_prompts import LlmPrompts
+from treasury.services.gateways.ttb_api.main.application.utils.incremental_json_parser import (
+    IncrementalJsonParser,
+    JsonPath
+)
+from treasury.services.gateways.ttb_api.main.application.utils.json_extraction import (
+    M,
+    extract_json,
+    extract_json_model
+)
 
 
 class LabelDataExtractionService:
     _logger = GlobalConfig.get_logger(__name__)
 
-    def __init__(self, llm_client: OpenAiAdapter = None, ocr_adapter: OcrAdapter = None) -> None:
+    # Product fields that can be checked locally as soon as they arrive in a streamed completion
+    _LOCALLY_VERIFIED_FIELDS = {
+        'alcohol_content_abv': re.compile(ALCOHOL_CONTENT_ABV_PATTERN),
+        'net_contents': re.compile(NET_CONTENTS_PATTERN),
+    }
+
+    def __init__(
+            self,
+            llm_client: OpenAiAdapter = None,
+            ocr_adapter: OcrAdapter = None,
+            llm_router: LlmRoutingAdapter = None
+    ) -> None:
         self._llm_client_lazy = llm_client
         self._ocr_adapter_lazy = ocr_adapter
+        self._llm_router_lazy = llm_router
 
     @property
     def _llm_client(self) -> OpenAiAdapter:
         if self._llm_client_lazy is None:
-            self._llm_client_lazy = OpenAiAdapter()
+            self._llm_client_lazy = OpenAiAdapter.get_singleton_instance_of()
         return self._llm_client_lazy
 
+    @property
+    def _llm_router(self) -> LlmRoutingAdapter:
+        if self._llm_router_lazy is None:
+            self._llm_router_lazy = LlmRoutingAdapter(llm_client=self._llm_client)
+        return self._llm_router_lazy
+
     @property
     def _ocr_adapter(self) -> OcrAdapter:
         if self._ocr_adapter_lazy is None:
@@ -53,25 +86,94 @@ class LabelDataExtractionService:
             base64_image: Optional[str] = None,
             image_url: Optional[str] = None
     ) -> BrandDataStrict:
-        """Extract label data using LLM (OpenAI). Accepts either base64 or URL."""
+        """
+        Extract label data using LLM (OpenAI). Accepts either base64 or URL.
+        Starts on the cheapest model tier and escalates when the output is invalid or low confidence.
+        """
+        media = {"media_url": image_url} if image_url else {"media_base64": base64_image}
+        return self._llm_router.complete_prompt_with_media(
+            prompt=LlmPrompts.TTB_LABEL_IMAGE_INQUIRY_PROMPT,
+            prompt_version=LlmPrompts.LABEL_EXTRACTION_PROMPT_VERSION,
+            parse=self._parse_brand_data,
+            is_confident=self._is_confident_extraction,
+            **media
+        )
+
+    @classmethod
+    def _parse_brand_data(cls, llm_results: str) -> BrandDataStrict:
+        cls._logger.info(f"extract_label_data - LLM Results: {llm_results}")
+
+        # Parse JSON from LLM response (may include markdown code blocks) straight into the Pydantic model
+        return cls.extract_model_from_response(llm_results, BrandDataStrict)
+
+    @classmethod
+    def _is_confident_extraction(cls, brand_data: BrandDataStrict) -> bool:
+        """The prompt asks for "Unknown"/null when the model cannot read a value - treat that as low confidence"""
+        if not brand_data.brand_name or brand_data.brand_name.strip().lower() == "unknown":
+            return False
+        if not brand_data.products:
+            return False
+        return any(product.alcohol_content_abv or product.net_contents for product in brand_data.products)
+
+    def extract_label_data_stream(
+            self,
+            base64_image: Optional[str] = None,
+            image_url: Optional[str] = None
+    ) -> Generator[LabelExtractionStreamEvent, None, None]:
+        """
+        Extract label data using LLM (OpenAI), streaming the completion.
+
+        The JSON in the completion is parsed incrementally, so every field (brand_name,
+        products.0.alcohol_content_abv, ...) is yielded as soon as its value is complete. ABV and
+        net contents are format-checked locally on arrival. The last event has is_final=True and
+        carries the validated BrandDataStrict.
+
+        Raises:
+            ValueError: If the completion does not contain a complete JSON object
+        """
         if image_url:
-            llm_results: str = self._llm_client.complete_prompt_with_media(
+            chunks = self._llm_client.complete_prompt_with_media_stream(
                 prompt=LlmPrompts.TTB_LABEL_IMAGE_INQUIRY_PROMPT,
+                prompt_version=LlmPrompts.LABEL_EXTRACTION_PROMPT_VERSION,
                 media_url=image_url,
             )
         else:
-            llm_results: str = self._llm_client.complete_prompt_with_media(
+            chunks = self._llm_client.complete_prompt_with_media_stream(
                 prompt=LlmPrompts.TTB_LABEL_IMAGE_INQUIRY_PROMPT,
+                prompt_version=LlmPrompts.LABEL_EXTRACTION_PROMPT_VERSION,
                 media_base64=base64_image,
             )
-        self._logger.info(f"extract_label_data - LLM Results: {llm_results}")
 
-        # Parse JSON from LLM response (may include markdown code blocks)
-        json_data = self.extract_json_from_response(llm_results)
+        parser = IncrementalJsonParser()
+        for chunk in chunks:
+            for path, value in parser.feed(chunk):
+                yield self._to_stream_event(path, value)
+            if parser.is_complete:
+                # Stop consuming the stream, trailing prose is of no interest
+                break
+
+        if not parser.is_complete:
+            raise ValueError("LLM stream ended before a complete JSON object was received")
+
+        document = parser.get_document()
+        self._logger.info(f"extract_label_data_stream - LLM Results: {document}")
+        yield LabelExtractionStreamEvent(
+            is_final=True,
+            brand_data=BrandDataStrict.model_validate_json(document)
+        )
 
-        # Validate and parse into Pydantic model
-        results = BrandDataStrict.model_validate(json_data)
-        return results
+    @classmethod
+    def _to_stream_event(cls, path: JsonPath, value) -> LabelExtractionStreamEvent:
+        verified = None
+        pattern = cls._LOCALLY_VERIFIED_FIELDS.get(path[-1]) if path else None
+        if pattern is not None and value is not None:
+            verified = isinstance(value, str) and pattern.match(value) is not None
+
+        return LabelExtractionStreamEvent(
+            field_path='.'.join(str(p) for p in path),
+            value=value,
+            verified=verified
+        )
 
     def _extract_label_data_with_pytesseract(
             self,
@@ -80,7 +182,7 @@ class LabelDataExtractionService:
     ) -> BrandDataStrict:
         """
         Extract label data using pytesseract OCR.
-        Clips out substrings that match label field patterns.
+        Clips out substrings that match label field patterns (see LabelFieldExtractor).
         Accepts either base64 or URL.
         """
         if image_url:
@@ -95,205 +197,29 @@ class LabelDataExtractionService:
         extracted_text = ocr_result.full_text
         self._logger.info(f"extract_label_data_pytesseract - OCR extracted text: {extracted_text[:500]}...")
 
-        # Normalize text for pattern matching
-        normalized_text = re.sub(r'\s+', ' ', extracted_text).strip()
-
-        # Extract fields using regex patterns
-        brand_name = self._extract_brand_name(normalized_text, extracted_text)
-        alcohol_content = self._extract_alcohol_content(normalized_text)
-        net_contents = self._extract_net_contents(normalized_text)
-        product_class = self._extract_product_class(normalized_text)
-        warnings = self._extract_warnings(extracted_text)  # Use original for GOVERNMENT WARNING check
+        fields = LabelFieldExtractor.extract(extracted_text)
 
         return BrandDataStrict(
-            brand_name=brand_name,
+            brand_name=fields.brand_name,
             products=[
                 ProductInfoStrict(
-                    name=brand_name,
-                    product_class_type=product_class,
-                    alcohol_content_abv=alcohol_content,
-                    net_contents=net_contents,
+                    name=fields.brand_name,
+                    product_class_type=fields.product_class,
+                    alcohol_content_abv=fields.alcohol_content,
+                    net_contents=fields.net_contents,
                     other_info=ProductOtherInfo(
                         bottler_info=None,
                         manufacturer=None,
-                        warnings=warnings
+                        warnings=fields.warnings
                     )
                 )
             ]
         )
 
-    def _extract_brand_name(self, normalized_text: str, original_text: str) -> Optional[str]:
-        """
-        Extract brand name - typically the most prominent text on the label.
-        Heuristic: Look for capitalized words or the first significant line.
-        """
-        # Try to find prominent capitalized text (potential brand name)
-        # Look for sequences of capitalized words
-        cap_words_pattern = r'\b([A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)*)\b'
-        matches = re.findall(cap_words_pattern, original_text)
-
-        # Filter out common non-brand words
-        ignore_words = {'GOVERNMENT', 'WARNING', 'CONTAINS', 'ALCOHOL', 'ABV', 'ALC', 'VOL', 'NET', 'CONTENTS'}
-
-        for match in matches:
-            words = match.split()
-            # Skip if all words are in ignore list or too short
-            if len(match) >= 3 and not all(w.upper() in ignore_words for w in words):
-                self._logger.debug(f"Extracted brand name candidate: {match}")
-                return match
-
-        # Fallback: return first line that's not a warning
-        lines = [line.strip() for line in original_text.split('\n') if line.strip()]
-        for line in lines:
-            if 'GOVERNMENT' not in line.upper() and 'WARNING' not in line.upper():
-                if len(line) >= 3:
-                    return line
-
-        return None
-
-    def _extract_alcohol_content(self, normalized_text: str) -> Optional[str]:
-        """
-        Extract alcohol content - look for patterns like "40%", "47.3% ABV", "ALC 40% BY VOL"
-        """
-        # Pattern: number followed by % (with optional decimal)
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*%\s*(?:abv|alc|alcohol|by\s*vol)',  # "40% ABV", "40% ALC BY VOL"
-            r'(?:abv|alc|alcohol)\s*[:\.]?\s*(\d+(?:\.\d+)?)\s*%',  # "ABV: 40%", "ALC 40%"
-            r'(\d+(?:\.\d+)?)\s*%\s*(?:vol|volume)',                 # "40% VOL"
-            r'(\d+(?:\.\d+)?)\s*%',                                  # "40%" (generic)
-        ]
-
-        text_lower = normalized_text.lower()
-
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                value = match.group(1)
-                result = f"{value}%"
-                self._logger.debug(f"Extracted alcohol content: {result}")
-                return result
-
-        return None
-
-    def _extract_net_contents(self, normalized_text: str) -> Optional[str]:
-        """
-        Extract net contents - look for volume patterns like "750 mL", "1L", "12 fl oz"
-        """
-        # Pattern: number followed by volume unit
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*(ml|milliliters?|millilitres?)',     # "750 mL"
-            r'(\d+(?:\.\d+)?)\s*(cl|centiliters?|centilitres?)',     # "70 cL"
-            r'(\d+(?:\.\d+)?)\s*(l|liters?|litres?)',                # "1 L" or "1 liter"
-            r'(\d+(?:\.\d+)?)\s*(fl\.?\s*oz\.?|fluid\s*ounces?)',    # "12 fl oz"
-            r'(\d+(?:\.\d+)?)\s*(oz\.?|ounces?)',                    # "12 oz"
-            r'(\d+(?:\.\d+)?)\s*(gal\.?|gallons?)',                  # "1 gal"
-        ]
-
-        text_lower = normalized_text.lower()
-
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                value = match.group(1)
-                unit = match.group(2)
-                # Normalize unit
-                unit_map = {
-                    'ml': 'mL', 'milliliter': 'mL', 'millilitre': 'mL',
-                    'milliliters': 'mL', 'millilitres': 'mL',
-                    'cl': 'cL', 'centiliter': 'cL', 'centilitre': 'cL',
-                    'centiliters': 'cL', 'centilitres': 'cL',
-                    'l': 'L', 'liter': 'L', 'litre': 'L', 'liters': 'L', 'litres': 'L',
-                    'fl oz': 'fl oz', 'fl. oz': 'fl oz', 'fl. oz.': 'fl oz',
-                    'fluid ounce': 'fl oz', 'fluid ounces': 'fl oz',
-                    'oz': 'oz', 'oz.': 'oz', 'ounce': 'oz', 'ounces': 'oz',
-                    'gal': 'gal', 'gal.': 'gal', 'gallon': 'gal', 'gallons': 'gal',
-                }
-                normalized_unit = unit_map.get(unit.lower().strip(), unit)
-                result = f"{value} {normalized_unit}"
-                self._logger.debug(f"Extracted net contents: {result}")
-                return result
-
-        return None
-
-    def _extract_product_class(self, normalized_text: str) -> Optional[str]:
-        """
-        Extract product class/type - look for common alcohol type keywords
-        """
-        # Common product classes (order matters - more specific first)
-        product_classes = [
-            ('kentucky straight bourbon whiskey', 'Kentucky Straight Bourbon Whiskey'),
-            ('straight bourbon whiskey', 'Straight Bourbon Whiskey'),
-            ('bourbon whiskey', 'Bourbon Whiskey'),
-            ('tennessee whiskey', 'Tennessee Whiskey'),
-            ('scotch whisky', 'Scotch Whisky'),
-            ('single malt', 'Single Malt Whisky'),
-            ('rye whiskey', 'Rye Whiskey'),
-            ('irish whiskey', 'Irish Whiskey'),
-            ('canadian whisky', 'Canadian Whisky'),
-            ('whiskey', 'Whiskey'),
-            ('whisky', 'Whisky'),
-            ('bourbon', 'Bourbon'),
-            ('london dry gin', 'London Dry Gin'),
-            ('dry gin', 'Dry Gin'),
-            ('gin', 'Gin'),
-            ('vodka', 'Vodka'),
-            ('white rum', 'White Rum'),
-            ('dark rum', 'Dark Rum'),
-            ('spiced rum', 'Spiced Rum'),
-            ('rum', 'Rum'),
-            ('reposado tequila', 'Reposado Tequila'),
-            ('anejo tequila', 'Anejo Tequila'),
-            ('blanco tequila', 'Blanco Tequila'),
-            ('tequila', 'Tequila'),
-            ('mezcal', 'Mezcal'),
-            ('cognac', 'Cognac'),
-            ('brandy', 'Brandy'),
-            ('lager beer', 'Lager Beer'),
-            ('pale ale', 'Pale Ale'),
-            ('india pale ale', 'India Pale Ale'),
-            ('ipa', 'IPA'),
-            ('stout', 'Stout'),
-            ('porter', 'Porter'),
-            ('pilsner', 'Pilsner'),
-            ('lager', 'Lager'),
-            ('ale', 'Ale'),
-            ('beer', 'Beer'),
-            ('red wine', 'Red Wine'),
-            ('white wine', 'White Wine'),
-            ('rose wine', 'Rose Wine'),
-            ('sparkling wine', 'Sparkling Wine'),
-            ('champagne', 'Champagne'),
-            ('wine', 'Wine'),
-        ]
-
-        text_lower = normalized_text.lower()
-
-        for pattern, label in product_classes:
-            if pattern in text_lower:
-                self._logger.debug(f"Extracted product class: {label}")
-                return label
-
-        return None
-
-    def _extract_warnings(self, original_text: str) -> Optional[str]:
-        """
-        Extract health/government warning text
-        """
-        if 'GOVERNMENT WARNING' in original_text:
-            # Try to extract the full warning text
-            warning_pattern = r'GOVERNMENT WARNING[:\s]*(.+?)(?:\n\n|\Z)'
-            match = re.search(warning_pattern, original_text, re.DOTALL | re.IGNORECASE)
-            if match:
-                warning_text = f"GOVERNMENT WARNING: {match.group(1).strip()}"
-                self._logger.debug(f"Extracted warning: {warning_text[:100]}...")
-                return warning_text
-            return "GOVERNMENT WARNING"
-        return None
-
     @classmethod
     def extract_json_from_response(cls, response: str) -> dict:
         """
-        Extract JSON from LLM response, handling markdown code blocks
+        Extract JSON from LLM response, handling markdown code blocks and prose around the object
         Args:
             response: Raw LLM response string
         Returns:
@@ -301,23 +227,26 @@ class LabelDataExtractionService:
         Raises:
             ValueError: If JSON cannot be extracted or parsed
         """
-        # Try to extract JSON from markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # Try to find JSON object directly
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-            else:
-                # Assume entire response is JSON
-                json_str = response
+        try:
+            return extract_json(response)
+        except ValueError as e:
+            # The response itself was logged when it was received
+            cls._logger.error(f"Failed to parse JSON from LLM response: {str(e)} response_length={len(response)}")
+            raise ValueError(f"Could not parse JSON from LLM response: {str(e)}")
 
+    @classmethod
+    def extract_model_from_response(cls, response: str, model: Type[M]) -> M:
+        """
+        Extract the JSON object from an LLM response (see extract_json_from_response) and validate it as the
+        model directly from the JSON text, without an intermediate dict
+        Raises:
+            ValueError: If JSON cannot be extracted or parsed, a ValidationError if it does not fit the model
+        """
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            cls._logger.error(f"Failed to parse JSON from LLM response: {str(e)}")
-            cls._logger.error(f"Response: {response}")
+            return extract_json_model(response, model)
+        except ValidationError:
+            raise
+        except ValueError as e:
+            cls._logger.error(f"Failed to parse JSON from LLM response: {str(e)} response_length={len(response)}")
             raise ValueError(f"Could not parse JSON from LLM response: {str(e)}")
 
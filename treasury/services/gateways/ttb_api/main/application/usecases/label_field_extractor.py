@@ -0,0 +1,209 @@
+"""Single-pass extraction of label fields from OCR text, with all patterns compiled once"""
+
+import re
+import string
+from typing import Optional, Dict, NamedTuple, Tuple
+
+from pydantic import BaseModel
+
+# Every number with what follows it that makes it an alcohol content or a net contents: "40% ABV", "40% VOL",
+# "750 mL", "12 fl oz", ... The number is not a group: a pattern starting with a group is scanned for much slower
+QUANTITY = re.compile(
+    r'\d+(?:\.\d+)?\s*'
+    r'(?:'
+    r'(?P<percent>%)\s*(?P<abv_suffix>abv|alc|alcohol|by\s*vol|vol|volume)?'
+    r'|(?P<unit>ml|milliliters?|millilitres?|cl|centiliters?|centilitres?|l|liters?|litres?'
+    r'|fl\.?\s*oz\.?|fluid\s*ounces?|oz\.?|ounces?|gal\.?|gallons?)'
+    r')'
+)
+# "ALC. " in "ALC. 40%", matched against the text just before an alcohol content
+ABV_PREFIX = re.compile(r'(?:abv|alc|alcohol)\s*[:\.]?\s*$')
+ABV_PREFIX_MAX_LENGTH = len('alcohol : ')
+
+# Which alcohol content is taken when a label shows several, lower first
+ABV_WITH_ABV_SUFFIX, ABV_WITH_ABV_PREFIX, ABV_WITH_VOL_SUFFIX, ABV_PERCENT_ONLY = range(4)
+
+# Net contents units by rank (which one is taken when a label shows several, lower first) and the unit reported
+NET_CONTENTS_UNITS: Dict[str, Tuple[int, str]] = {
+    'ml': (0, 'mL'), 'milliliter': (0, 'mL'), 'millilitre': (0, 'mL'), 'milliliters': (0, 'mL'), 'millilitres': (0, 'mL'),
+    'cl': (1, 'cL'), 'centiliter': (1, 'cL'), 'centilitre': (1, 'cL'), 'centiliters': (1, 'cL'), 'centilitres': (1, 'cL'),
+    'l': (2, 'L'), 'liter': (2, 'L'), 'litre': (2, 'L'), 'liters': (2, 'L'), 'litres': (2, 'L'),
+    'fl oz': (3, 'fl oz'), 'fl. oz': (3, 'fl oz'), 'fl. oz.': (3, 'fl oz'),
+    'fluid ounce': (3, 'fl oz'), 'fluid ounces': (3, 'fl oz'),
+    'oz': (4, 'oz'), 'oz.': (4, 'oz'), 'ounce': (4, 'oz'), 'ounces': (4, 'oz'),
+    'gal': (5, 'gal'), 'gal.': (5, 'gal'), 'gallon': (5, 'gal'), 'gallons': (5, 'gal'),
+}
+NET_CONTENTS_UNIT_RANK = {'m': 0, 'c': 1, 'l': 2, 'f': 3, 'o': 4, 'g': 5}
+
+# Common product classes (order matters - more specific first)
+PRODUCT_CLASSES = [
+    ('kentucky straight bourbon whiskey', 'Kentucky Straight Bourbon Whiskey'),
+    ('straight bourbon whiskey', 'Straight Bourbon Whiskey'),
+    ('bourbon whiskey', 'Bourbon Whiskey'),
+    ('tennessee whiskey', 'Tennessee Whiskey'),
+    ('scotch whisky', 'Scotch Whisky'),
+    ('single malt', 'Single Malt Whisky'),
+    ('rye whiskey', 'Rye Whiskey'),
+    ('irish whiskey', 'Irish Whiskey'),
+    ('canadian whisky', 'Canadian Whisky'),
+    ('whiskey', 'Whiskey'),
+    ('whisky', 'Whisky'),
+    ('bourbon', 'Bourbon'),
+    ('london dry gin', 'London Dry Gin'),
+    ('dry gin', 'Dry Gin'),
+    ('gin', 'Gin'),
+    ('vodka', 'Vodka'),
+    ('white rum', 'White Rum'),
+    ('dark rum', 'Dark Rum'),
+    ('spiced rum', 'Spiced Rum'),
+    ('rum', 'Rum'),
+    ('reposado tequila', 'Reposado Tequila'),
+    ('anejo tequila', 'Anejo Tequila'),
+    ('blanco tequila', 'Blanco Tequila'),
+    ('tequila', 'Tequila'),
+    ('mezcal', 'Mezcal'),
+    ('cognac', 'Cognac'),
+    ('brandy', 'Brandy'),
+    ('lager beer', 'Lager Beer'),
+    ('pale ale', 'Pale Ale'),
+    ('india pale ale', 'India Pale Ale'),
+    ('ipa', 'IPA'),
+    ('stout', 'Stout'),
+    ('porter', 'Porter'),
+    ('pilsner', 'Pilsner'),
+    ('lager', 'Lager'),
+    ('ale', 'Ale'),
+    ('beer', 'Beer'),
+    ('red wine', 'Red Wine'),
+    ('white wine', 'White Wine'),
+    ('rose wine', 'Rose Wine'),
+    ('sparkling wine', 'Sparkling Wine'),
+    ('champagne', 'Champagne'),
+    ('wine', 'Wine'),
+]
+
+
+class ProductClassPhrase(NamedTuple):
+    phrase: str
+    label: str
+    # The phrase as whole words, checked only where the phrase is found at all
+    pattern: re.Pattern
+
+
+PRODUCT_CLASS_PHRASES = [
+    ProductClassPhrase(phrase=phrase, label=label, pattern=re.compile(rf'(?<![a-z]){re.escape(phrase)}(?![a-z])'))
+    for phrase, label in PRODUCT_CLASSES
+]
+
+# Sequences of capitalized words, the brand name candidates
+CAPITALIZED_WORDS = re.compile(r'\b([A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)*)\b')
+BRAND_NAME_IGNORE_WORDS = {'GOVERNMENT', 'WARNING', 'CONTAINS', 'ALCOHOL', 'ABV', 'ALC', 'VOL', 'NET', 'CONTENTS'}
+
+GOVERNMENT_WARNING = 'GOVERNMENT WARNING'
+# Separators between the heading and the text of the government warning
+WARNING_HEADING_SEPARATORS = ':' + string.whitespace
+
+
+class ExtractedLabelFields(BaseModel):
+    """Label fields found in OCR text"""
+    brand_name: Optional[str] = None
+    alcohol_content: Optional[str] = None
+    net_contents: Optional[str] = None
+    product_class: Optional[str] = None
+    warnings: Optional[str] = None
+
+
+class LabelFieldExtractor:
+    """
+    Extracts the label fields of the pytesseract analysis mode from OCR text. The text is normalized and
+    lowercased once; all alcohol contents and net contents are then found in one scan of the QUANTITY
+    pattern, and the product class with a substring check per class, confirmed as whole words. Where a label
+    shows several candidates the most specific one wins: "40% ABV" over "ALC 40%" over "40% VOL" over
+    "40%", mL over cL over L over fl oz over oz over gal, and the first of PRODUCT_CLASSES found.
+    Among equally specific quantities the first on the label is taken.
+    """
+
+    @classmethod
+    def extract(cls, text: str) -> ExtractedLabelFields:
+        text_lower = ' '.join(text.split()).lower()
+        alcohol_content, net_contents = cls._extract_quantities(text_lower)
+        return ExtractedLabelFields(
+            brand_name=cls._extract_brand_name(text),
+            alcohol_content=alcohol_content,
+            net_contents=net_contents,
+            product_class=cls._extract_product_class(text_lower),
+            # The original text, for its line breaks
+            warnings=cls._extract_warnings(text)
+        )
+
+    @classmethod
+    def _extract_quantities(cls, text_lower: str) -> Tuple[Optional[str], Optional[str]]:
+        best_abv: Optional[Tuple[int, str]] = None
+        best_net_contents: Optional[Tuple[int, str]] = None
+        for match in QUANTITY.finditer(text_lower):
+            if match.group('percent'):
+                value = text_lower[match.start():match.start('percent')].rstrip()
+                rank = cls._abv_rank(text_lower, match.start(), match.group('abv_suffix'))
+                if best_abv is None or rank < best_abv[0]:
+                    best_abv = (rank, f"{value}%")
+            else:
+                value = text_lower[match.start():match.start('unit')].rstrip()
+                unit = match.group('unit')
+                rank, normalized_unit = NET_CONTENTS_UNITS.get(unit, (NET_CONTENTS_UNIT_RANK[unit[0]], unit))
+                if best_net_contents is None or rank < best_net_contents[0]:
+                    best_net_contents = (rank, f"{value} {normalized_unit}")
+        return (
+            best_abv[1] if best_abv else None,
+            best_net_contents[1] if best_net_contents else None
+        )
+
+    @classmethod
+    def _abv_rank(cls, text_lower: str, start: int, suffix: Optional[str]) -> int:
+        if suffix and not suffix.startswith('vol'):
+            return ABV_WITH_ABV_SUFFIX
+        if ABV_PREFIX.search(text_lower, max(0, start - ABV_PREFIX_MAX_LENGTH), start):
+            return ABV_WITH_ABV_PREFIX
+        if suffix:
+            return ABV_WITH_VOL_SUFFIX
+        return ABV_PERCENT_ONLY
+
+    @classmethod
+    def _extract_product_class(cls, text_lower: str) -> Optional[str]:
+        """The first of PRODUCT_CLASSES on the label, matched as whole words"""
+        for phrase in PRODUCT_CLASS_PHRASES:
+            if phrase.phrase in text_lower and phrase.pattern.search(text_lower):
+                return phrase.label
+        return None
+
+    @classmethod
+    def _extract_brand_name(cls, original_text: str) -> Optional[str]:
+        """
+        The brand name is typically the most prominent text on the label: the first sequence of
+        capitalized words that are not all label boilerplate, else the first line that is not a warning.
+        """
+        for match in CAPITALIZED_WORDS.finditer(original_text):
+            candidate = match.group(1)
+            if len(candidate) >= 3 and not all(w.upper() in BRAND_NAME_IGNORE_WORDS for w in candidate.split()):
+                return candidate
+
+        for line in original_text.split('\n'):
+            line = line.strip()
+            if len(line) >= 3 and 'GOVERNMENT' not in line.upper() and 'WARNING' not in line.upper():
+                return line
+
+        return None
+
+    @classmethod
+    def _extract_warnings(cls, original_text: str) -> Optional[str]:
+        """The government warning, up to the end of its paragraph"""
+        start = original_text.find(GOVERNMENT_WARNING)
+        if start == -1:
+            return None
+        text_start = start + len(GOVERNMENT_WARNING)
+        while text_start < len(original_text) and original_text[text_start] in WARNING_HEADING_SEPARATORS:
+            text_start += 1
+        text_end = original_text.find('\n\n', text_start + 1)
+        warning_text = original_text[text_start:text_end if text_end != -1 else len(original_text)].strip()
+        if warning_text:
+            return f"{GOVERNMENT_WARNING}: {warning_text}"
+        return GOVERNMENT_WARNING
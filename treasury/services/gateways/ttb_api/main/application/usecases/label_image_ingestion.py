@@ -0,0 +1,221 @@
+"""Decode-once ingestion of base64 label images submitted with a label approval job"""
+
+import base64
+import binascii
+import hashlib
+from io import BytesIO
+from typing import Callable, Optional
+
+from PIL import Image
+
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.ingested_label_image import IngestedLabelImage
+
+MAX_IMAGE_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
+# Enough of an image for PIL to find its dimensions, metadata segments included, in all but odd files
+IMAGE_HEADER_BYTES = 64 * 1024
+
+_MAGIC_BYTES = [
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+]
+
+
+class LabelImageIngestionService:
+    """
+    Turns a "data:image/<type>;base64,..." string into an IngestedLabelImage.
+
+    The size limit is enforced from the base64 length before anything is decoded, the payload is
+    decoded exactly once, the format is sniffed from the magic bytes and PIL parses the image once.
+    """
+
+    _logger = GlobalConfig.get_logger(__name__)
+
+    @classmethod
+    def ingest(
+            cls,
+            label_image_base64: str,
+            permitted_types: list[str],
+            max_size_bytes: int = MAX_IMAGE_SIZE_BYTES
+    ) -> IngestedLabelImage:
+        """
+        Validate and decode a base64 data URI label image.
+
+        Raises:
+            ValueError: If the image is missing, too large, of a type that is not permitted, or corrupted
+        """
+        if not label_image_base64:
+            raise ValueError("Label image is required")
+
+        declared_type = next(
+            (t for t in permitted_types if label_image_base64.startswith(f"data:image/{t};base64,")),
+            None
+        )
+        if declared_type is None:
+            cls._logger.info(f"Label image type not permitted. Provided image base64 starts with: img_type={label_image_base64[:30]}...")
+            raise ValueError(f"Label image must be one of the following types: {', '.join(permitted_types)}")
+
+        payload_start = label_image_base64.index(",") + 1
+        if cls.decoded_size(label_image_base64, payload_start) > max_size_bytes:
+            raise ValueError("Image data exceeds maximum allowed size of 10 MB")
+
+        try:
+            image_data = cls.decode(label_image_base64, payload_start)
+        except ValueError as e:
+            # Reported like any other undecodable image, as createLabelApprovalJob always has
+            cls._logger.info(f"Label image is not valid base64: {str(e)}")
+            raise ValueError("Invalid or corrupted image") from e
+        return cls.ingest_bytes(
+            image_data,
+            declared_type=declared_type,
+            permitted_types=permitted_types,
+            max_size_bytes=max_size_bytes
+        )
+
+    @classmethod
+    def ingest_bytes(
+            cls,
+            image_data: bytes,
+            declared_type: str,
+            permitted_types: list[str],
+            max_size_bytes: int = MAX_IMAGE_SIZE_BYTES
+    ) -> IngestedLabelImage:
+        """
+        Validate raw image bytes (e.g. a streamed upload) declared as image/<declared_type>.
+
+        Raises:
+            ValueError: If the image is empty, too large, of a type that is not permitted, or corrupted
+        """
+        image_format = cls._verify_size_and_format_or_raise(
+            image_data, len(image_data), permitted_types, max_size_bytes
+        )
+        width, height = cls._verify_image_or_raise(image_data)
+
+        return IngestedLabelImage(
+            data=image_data,
+            declared_content_type=f"image/{declared_type}",
+            image_format=image_format,
+            width=width,
+            height=height,
+            sha256=hashlib.sha256(image_data).hexdigest()
+        )
+
+    @classmethod
+    def ingest_stored(
+            cls,
+            header: bytes,
+            size_bytes: int,
+            read_image: Callable[[], Optional[bytes]],
+            declared_type: str,
+            permitted_types: list[str],
+            max_size_bytes: int = MAX_IMAGE_SIZE_BYTES
+    ) -> IngestedLabelImage:
+        """
+        Validate an image stored elsewhere (e.g. a direct upload to blob storage) from its size and first
+        IMAGE_HEADER_BYTES, and only then read all of it with read_image. The whole image is verified like
+        ingest_bytes does, a valid header does not make a valid image.
+
+        Raises:
+            ValueError: If the image is empty, too large, of a type that is not permitted, or corrupted,
+                or if read_image finds it gone
+        """
+        # Rejected from the header before anything else is read
+        image_format = cls._verify_size_and_format_or_raise(header, size_bytes, permitted_types, max_size_bytes)
+        cls._dimensions_from_header(header, complete=len(header) >= size_bytes)
+
+        image_data = read_image()
+        if image_data is None:
+            raise ValueError("Image data is gone")
+        width, height = cls._verify_image_or_raise(image_data)
+
+        return IngestedLabelImage(
+            data=image_data,
+            declared_content_type=f"image/{declared_type}",
+            image_format=image_format,
+            width=width,
+            height=height,
+            sha256=hashlib.sha256(image_data).hexdigest()
+        )
+
+    @classmethod
+    def decoded_size(cls, label_image_base64: str, payload_start: int = 0) -> int:
+        """Exact decoded size of a (well-formed) base64 payload, computed without decoding it"""
+        payload_length = len(label_image_base64) - payload_start
+        padding = 0
+        if payload_length > 0 and label_image_base64.endswith("=="):
+            padding = 2
+        elif payload_length > 0 and label_image_base64.endswith("="):
+            padding = 1
+        return payload_length * 3 // 4 - padding
+
+    @classmethod
+    def decode(cls, label_image_base64: str, payload_start: Optional[int] = None) -> bytes:
+        """Decode the base64 payload of a data URI (or of a bare base64 string)"""
+        if payload_start is None:
+            payload_start = label_image_base64.index(",") + 1 if "," in label_image_base64 else 0
+        try:
+            return base64.b64decode(label_image_base64[payload_start:], validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 image data: {str(e)}") from e
+
+    @classmethod
+    def sniff_format(cls, image_data: bytes) -> str:
+        for magic, image_format in _MAGIC_BYTES:
+            if image_data.startswith(magic):
+                return image_format
+        return "unknown"
+
+    @classmethod
+    def _verify_size_and_format_or_raise(
+            cls,
+            image_data: bytes,
+            size_bytes: int,
+            permitted_types: list[str],
+            max_size_bytes: int
+    ) -> str:
+        """Check the size of an image and sniff its format from the magic bytes at the start of image_data"""
+        if size_bytes == 0:
+            raise ValueError("Image data is empty")
+        if size_bytes > max_size_bytes:
+            raise ValueError("Image data exceeds maximum allowed size of 10 MB")
+
+        image_format = cls.sniff_format(image_data)
+        normalized_permitted_types = {t.lower().replace('jpg', 'jpeg') for t in permitted_types}
+        if image_format not in normalized_permitted_types:
+            raise ValueError(f"Image format {image_format} does not match declared type in data URI")
+        return image_format
+
+    @classmethod
+    def _dimensions_from_header(cls, header: bytes, complete: bool) -> Optional[tuple[int, int]]:
+        """
+        Dimensions of an image parsed from its first bytes only, None if they are not in the header (when
+        the header is not the complete image, e.g. metadata segments longer than IMAGE_HEADER_BYTES)
+        """
+        try:
+            width, height = Image.open(BytesIO(header)).size
+        except Exception as e:
+            if not complete:
+                return None
+            cls._logger.info(f"Error reading label image header: {str(e)}")
+            raise ValueError("Invalid or corrupted image")
+
+        if width <= 0 or height <= 0:
+            raise ValueError("Image has invalid dimensions")
+        return width, height
+
+    @classmethod
+    def _verify_image_or_raise(cls, image_data: bytes) -> tuple[int, int]:
+        """Parse the image once with PIL: read its dimensions, then verify the data stream"""
+        try:
+            image = Image.open(BytesIO(image_data))
+            width, height = image.size
+            image.verify()
+        except Exception as e:
+            cls._logger.exception(f"Error verifying label image: {str(e)}")
+            raise ValueError("Invalid or corrupted image")
+
+        if width <= 0 or height <= 0:
+            raise ValueError("Image has invalid dimensions")
+        return width, height
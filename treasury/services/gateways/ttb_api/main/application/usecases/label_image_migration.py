@@ -0,0 +1,244 @@
+"""Background migration of label images stored inline as base64 into blob storage"""
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Callable
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.persistence.label_approvals_persistence_adapter import \
+    LabelApprovalJobsPersistenceAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter_factory import \
+    BlobStorageAdapterFactory
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import LabelApprovalJob, \
+    LabelImage
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import \
+    LabelImageIngestionService
+
+DEFAULT_BATCH_SIZE = 50
+
+
+class LabelImageMigrationProgress(BaseModel):
+    """Checkpointed state of a migration run - counters are cumulative across resumed runs"""
+    last_job_id: Optional[uuid.UUID] = None
+    jobs_scanned: int = 0
+    jobs_migrated: int = 0
+    images_migrated: int = 0
+    bytes_migrated: int = 0
+    # Jobs updated by someone else while being migrated, and images whose upload failed - their jobs are
+    # kept in retry_job_ids
+    jobs_skipped_concurrent_update: int = 0
+    images_failed: int = 0
+    # Jobs left with inline images behind last_job_id, retried first when the run is resumed
+    retry_job_ids: list[uuid.UUID] = []
+    elapsed_seconds: float = 0.0
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.jobs_scanned / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_migrated / 1024 / 1024 / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"jobs_scanned={self.jobs_scanned} jobs_migrated={self.jobs_migrated} "
+            f"images_migrated={self.images_migrated} images_failed={self.images_failed} "
+            f"jobs_skipped_concurrent_update={self.jobs_skipped_concurrent_update} "
+            f"mb_migrated={self.bytes_migrated / 1024 / 1024:.1f} elapsed_seconds={self.elapsed_seconds:.1f} "
+            f"jobs_per_second={self.jobs_per_second:.1f} mb_per_second={self.megabytes_per_second:.2f} "
+            f"last_job_id={self.last_job_id} jobs_to_retry={len(self.retry_job_ids)}"
+        )
+
+
+class LabelImageMigrationCheckpoint:
+    """Progress persisted as JSON, written atomically so a crash never leaves a torn checkpoint"""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self._path = Path(path) if path else None
+
+    def load(self) -> LabelImageMigrationProgress:
+        if self._path is None or not self._path.exists():
+            return LabelImageMigrationProgress()
+        return LabelImageMigrationProgress.model_validate_json(self._path.read_text())
+
+    def save(self, progress: LabelImageMigrationProgress) -> None:
+        if self._path is None:
+            return
+        partial_path = self._path.with_name(self._path.name + ".part")
+        partial_path.write_text(progress.model_dump_json(indent=2))
+        os.replace(partial_path, self._path)
+
+
+class LabelImageMigrationService:
+    """
+    Moves label images stored inline in the job metadata (LabelImage.base64, from old records and from
+    failed blob uploads) to blob storage, replacing them with an image_url.
+
+    Jobs are read in keyset-paginated batches, each job is rewritten only if it was not updated in the
+    meantime, and progress is checkpointed after every batch so that an interrupted run resumes where it
+    stopped. Jobs skipped because of a concurrent update, or with an image that failed to upload, are
+    checkpointed as retry_job_ids and retried at the start of the next run before it resumes the scan.
+    max_jobs_per_second caps the load put on the database and on blob storage.
+    """
+
+    def __init__(
+            self,
+            label_approval_jobs_persistence_adapter: LabelApprovalJobsPersistenceAdapter = None,
+            blob_storage_adapter: BlobStorageAdapter = None,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._label_approval_jobs_persistence_adapter_lazy = label_approval_jobs_persistence_adapter
+        self._blob_storage_adapter_lazy = blob_storage_adapter
+        self._clock = clock
+        self._sleep = sleep
+
+    @property
+    def _label_approval_jobs_persistence_adapter(self) -> LabelApprovalJobsPersistenceAdapter:
+        # Lazy initialization of the persistence adapter
+        if self._label_approval_jobs_persistence_adapter_lazy is None:
+            self._label_approval_jobs_persistence_adapter_lazy = LabelApprovalJobsPersistenceAdapter()
+        return self._label_approval_jobs_persistence_adapter_lazy
+
+    @property
+    def _blob_storage_adapter(self) -> BlobStorageAdapter:
+        # Lazy initialization of the configured blob storage backend
+        if self._blob_storage_adapter_lazy is None:
+            self._blob_storage_adapter_lazy = BlobStorageAdapterFactory.get_singleton_instance_of()
+        return self._blob_storage_adapter_lazy
+
+    def migrate(
+            self,
+            checkpoint: LabelImageMigrationCheckpoint,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            max_jobs_per_second: Optional[float] = None,
+            max_jobs: Optional[int] = None,
+            dry_run: bool = False,
+            on_batch_done: Optional[Callable[[LabelImageMigrationProgress], None]] = None
+    ) -> LabelImageMigrationProgress:
+        """
+        Run (or resume) the migration until no job with inline images is left or max_jobs jobs were scanned.
+
+        Args:
+            checkpoint: Where progress is loaded from and saved to after every batch
+            batch_size: Jobs read per query
+            max_jobs_per_second: Optional throughput cap
+            max_jobs: Optional number of jobs to scan in this run
+            dry_run: Only count what would be migrated - nothing is uploaded or written
+            on_batch_done: Called with the progress after every batch (e.g. to report throughput)
+        """
+        progress = checkpoint.load()
+        run_started = self._clock()
+        elapsed_before_run = progress.elapsed_seconds
+        jobs_scanned_in_run = 0
+
+        if progress.retry_job_ids:
+            self._retry_jobs(progress, dry_run)
+            progress.elapsed_seconds = elapsed_before_run + (self._clock() - run_started)
+            if not dry_run:
+                checkpoint.save(progress)
+
+        while max_jobs is None or jobs_scanned_in_run < max_jobs:
+            limit = batch_size if max_jobs is None else min(batch_size, max_jobs - jobs_scanned_in_run)
+            jobs = self._label_approval_jobs_persistence_adapter.list_jobs_with_inline_images(
+                after_job_id=progress.last_job_id,
+                limit=limit
+            )
+            if not jobs:
+                break
+
+            for job in jobs:
+                if not self._migrate_job(job, progress, dry_run):
+                    progress.retry_job_ids.append(job.id)
+                progress.last_job_id = job.id
+                progress.jobs_scanned += 1
+                jobs_scanned_in_run += 1
+                self._throttle(run_started, jobs_scanned_in_run, max_jobs_per_second)
+
+            progress.elapsed_seconds = elapsed_before_run + (self._clock() - run_started)
+            if not dry_run:
+                checkpoint.save(progress)
+            if on_batch_done is not None:
+                on_batch_done(progress)
+
+        progress.elapsed_seconds = elapsed_before_run + (self._clock() - run_started)
+        self._logger.info(f"Label image migration finished dry_run={dry_run} {progress.summary()}")
+        return progress
+
+    def _retry_jobs(self, progress: LabelImageMigrationProgress, dry_run: bool) -> None:
+        """Migrate the jobs left behind by earlier runs again, keeping those that still cannot be migrated"""
+        job_ids, progress.retry_job_ids = progress.retry_job_ids, []
+        for job_id in job_ids:
+            job = self._label_approval_jobs_persistence_adapter.get_approval_job_by_id(job_id=job_id)
+            # Deleted in the meantime
+            if job is None:
+                continue
+            if not self._migrate_job(job, progress, dry_run):
+                progress.retry_job_ids.append(job_id)
+        self._logger.info(f"Retried label image migration of {len(job_ids)} jobs, "
+                          f"{len(progress.retry_job_ids)} still left to retry")
+
+    def _migrate_job(self, job: LabelApprovalJob, progress: LabelImageMigrationProgress, dry_run: bool) -> bool:
+        """Migrate the inline images of a job, False if some are left inline (to be retried)"""
+        job_metadata = job.get_job_metadata()
+        migrated_images = 0
+        migrated_bytes = 0
+        failed_images = 0
+        for label_image in job_metadata.label_images or []:
+            if not label_image.base64:
+                continue
+            try:
+                image_bytes = LabelImageIngestionService.decode(label_image.base64)
+                if not dry_run:
+                    label_image.image_url = self._upload(label_image, image_bytes)
+                    label_image.base64 = None
+                migrated_images += 1
+                migrated_bytes += len(image_bytes)
+            except Exception as e:
+                # Left inline - the job is retried by the next run
+                failed_images += 1
+                progress.images_failed += 1
+                self._logger.warning(f"Failed to migrate label image job_id={job.id} error={str(e)}")
+
+        if migrated_images == 0:
+            return failed_images == 0
+
+        if not dry_run and not self._label_approval_jobs_persistence_adapter.set_job_metadata_if_unchanged(
+                job_id=job.id,
+                job_metadata=json.loads(job_metadata.model_dump_json(exclude_none=False)),
+                expected_updated_at=job.updated_at
+        ):
+            # The uploaded blobs are content-addressed, so the retry will reuse them
+            progress.jobs_skipped_concurrent_update += 1
+            self._logger.info(f"Job updated during label image migration, skipped job_id={job.id}")
+            return False
+
+        progress.jobs_migrated += 1
+        progress.images_migrated += migrated_images
+        progress.bytes_migrated += migrated_bytes
+        return failed_images == 0
+
+    def _upload(self, label_image: LabelImage, image_bytes: bytes) -> str:
+        content_type = label_image.image_content_type
+        if not content_type and label_image.base64.startswith("data:"):
+            content_type = label_image.base64[len("data:"):label_image.base64.index(";")]
+        return self._blob_storage_adapter.upload_image(
+            image_data=image_bytes,
+            content_type=content_type or "image/jpeg"
+        )
+
+    def _throttle(self, run_started: float, jobs_scanned: int, max_jobs_per_second: Optional[float]) -> None:
+        if not max_jobs_per_second:
+            return
+        # Sleep until the run is back on the allowed average rate
+        ahead_by = jobs_scanned / max_jobs_per_second - (self._clock() - run_started)
+        if ahead_by > 0:
+            self._sleep(ahead_by)
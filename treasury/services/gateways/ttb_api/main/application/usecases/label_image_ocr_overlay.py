@@ -0,0 +1,220 @@
+"""OCR overlays of label images: the Tesseract boxes drawn on the label, rendered on first request and stored"""
+
+import hashlib
+import re
+from io import BytesIO
+from typing import Optional
+
+import httpx
+from PIL import Image
+
+from treasury.services.gateways.ttb_api.main.adapter.out.http.http_client_provider import HttpClientProvider
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_annotation import OcrAnnotationRenderer
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_profiles import OcrProfile, OcrProfileSelector
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import (
+    BlobStorageAdapter,
+    LABEL_IMAGES_PREFIX
+)
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter_factory import \
+    BlobStorageAdapterFactory
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_spool_adapter import \
+    LabelImageSpoolAdapter
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import (
+    LabelApprovalJob,
+    LabelImage,
+    OcrOverlayLevel
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_pytesseract import \
+    LabelDataAnalysisPytesseractService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import \
+    LabelImageIngestionService
+
+# Bump whenever the rendering (or the OCR it draws) changes, so that new overlays get new keys
+OCR_OVERLAY_VARIANT = "ocr-overlay-v2"
+
+# The key of a label image stored (or pending) under its content address, and the SHA-256 in it
+_CONTENT_ADDRESS = re.compile(rf"({LABEL_IMAGES_PREFIX}/([0-9a-f]{{64}})\.[a-z]+)(?=$|[?#])")
+
+
+class LabelImageOcrOverlayService:
+    """
+    Serves the OCR boxes of a label image drawn on the image, for reviewers to see what Tesseract read.
+
+    An overlay is rendered on its first request only: the image bytes are read once (from blob storage or
+    the upload spool when the image is stored there, downloaded otherwise), decoded once, and the same
+    decoded image is OCR'd as the pytesseract analysis OCRs it - the profile of the job's product class,
+    in the stored pixel grid (EXIF orientation is not applied) - and drawn on. The JPEG is stored next to
+    the image's other renditions, keyed by the image's SHA-256, the OCR profile, the OCR preprocessing and
+    tiling settings and the drawing options, so later requests are a lookup.
+    """
+
+    def __init__(
+            self,
+            ocr_adapter: OcrAdapter = None,
+            ocr_profile_selector: OcrProfileSelector = None,
+            blob_storage_adapter: BlobStorageAdapter = None,
+            label_image_spool_adapter: LabelImageSpoolAdapter = None,
+            http_client: httpx.Client = None
+    ) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._ocr_adapter_lazy = ocr_adapter
+        self._ocr_profile_selector_lazy = ocr_profile_selector
+        self._blob_storage_adapter_lazy = blob_storage_adapter
+        self._label_image_spool_adapter_lazy = label_image_spool_adapter
+        self._http_client_lazy = http_client
+
+    @property
+    def _ocr_adapter(self) -> OcrAdapter:
+        if self._ocr_adapter_lazy is None:
+            self._ocr_adapter_lazy = OcrAdapter()
+        return self._ocr_adapter_lazy
+
+    @property
+    def _ocr_profile_selector(self) -> OcrProfileSelector:
+        # Lazy initialization of the product class to OCR profile mapping (OCR_PROFILE_BY_PRODUCT_CLASS)
+        if self._ocr_profile_selector_lazy is None:
+            self._ocr_profile_selector_lazy = OcrProfileSelector()
+        return self._ocr_profile_selector_lazy
+
+    @property
+    def _blob_storage_adapter(self) -> BlobStorageAdapter:
+        # Lazy initialization of the configured blob storage backend
+        if self._blob_storage_adapter_lazy is None:
+            self._blob_storage_adapter_lazy = BlobStorageAdapterFactory.get_singleton_instance_of()
+        return self._blob_storage_adapter_lazy
+
+    @property
+    def _label_image_spool_adapter(self) -> LabelImageSpoolAdapter:
+        # Lazy initialization of the local spool of images waiting for their upload
+        if self._label_image_spool_adapter_lazy is None:
+            self._label_image_spool_adapter_lazy = LabelImageSpoolAdapter()
+        return self._label_image_spool_adapter_lazy
+
+    @property
+    def _http_client(self) -> httpx.Client:
+        if self._http_client_lazy is None:
+            self._http_client_lazy = HttpClientProvider.get_client(HttpClientProvider.IMAGE_DOWNLOADS)
+        return self._http_client_lazy
+
+    def get_overlay_url(
+            self,
+            job: LabelApprovalJob,
+            label_image: LabelImage,
+            draw_level: OcrOverlayLevel = OcrOverlayLevel.words,
+            show_confidence: bool = True
+    ) -> str:
+        """
+        URL of the OCR overlay of a label image of the job, rendered and stored if it is not stored yet
+
+        Raises:
+            RuntimeError: If OCR fails or the overlay cannot be stored
+            ValueError: If the image cannot be read or decoded
+        """
+        profile = self._ocr_profile_selector.profile_for(LabelDataAnalysisPytesseractService.ocr_product_class_of(job))
+
+        # Known without reading the image for stored and spooled images
+        sha256 = self.content_sha256(label_image)
+        image_bytes: Optional[bytes] = None
+        if sha256 is None:
+            image_bytes = self._read_image(label_image)
+            sha256 = hashlib.sha256(image_bytes).hexdigest()
+
+        key = BlobStorageAdapter.variant_key(
+            sha256,
+            self.variant_name(profile, self._ocr_adapter.settings_digest(), draw_level, show_confidence),
+            "jpg"
+        )
+        overlay_url = self._blob_storage_adapter.get_url(key)
+        if overlay_url:
+            return overlay_url
+
+        if image_bytes is None:
+            image_bytes = self._read_image(label_image)
+        overlay_url = self._blob_storage_adapter.put(
+            key,
+            self.render(image_bytes, profile, draw_level, show_confidence),
+            "image/jpeg"
+        )
+        self._logger.info(f"Stored OCR overlay job={job.id} sha256={sha256} key={key}")
+        return overlay_url
+
+    def render(
+            self,
+            image_bytes: bytes,
+            profile: OcrProfile,
+            draw_level: OcrOverlayLevel = OcrOverlayLevel.words,
+            show_confidence: bool = True
+    ) -> bytes:
+        """
+        OCR the image and draw the boxes on the same decoded image, as a JPEG
+
+        Raises:
+            RuntimeError: If OCR fails
+            ValueError: If the image cannot be decoded
+        """
+        try:
+            image = Image.open(BytesIO(image_bytes))
+            image.load()
+        except Exception as e:
+            raise ValueError(f"Invalid or corrupted image: {str(e)}") from e
+
+        ocr_result = self._ocr_adapter.extract_text_from_image(image, profile)
+        if not ocr_result.success:
+            raise RuntimeError(f"OCR failed: {ocr_result.error_message}")
+        return OcrAnnotationRenderer(show_confidence=show_confidence).render_bytes(
+            image, ocr_result, draw_level.value
+        )
+
+    @classmethod
+    def variant_name(
+            cls,
+            profile: OcrProfile,
+            ocr_settings_digest: str,
+            draw_level: OcrOverlayLevel,
+            show_confidence: bool
+    ) -> str:
+        confidence = "-confidence" if show_confidence else ""
+        return f"{OCR_OVERLAY_VARIANT}-{profile.name}-{ocr_settings_digest}-{draw_level.value}{confidence}"
+
+    @classmethod
+    def content_sha256(cls, label_image: LabelImage) -> Optional[str]:
+        """SHA-256 of an image stored (or spooled) under its content address, None for inline images"""
+        if label_image.base64:
+            return None
+        for location in (label_image.pending_upload_key, label_image.image_url):
+            match = _CONTENT_ADDRESS.search(location or "")
+            if match:
+                return match.group(2)
+        return None
+
+    def _read_image(self, label_image: LabelImage) -> bytes:
+        """
+        The original bytes of a label image
+
+        Raises:
+            ValueError: If the image is not found
+        """
+        if label_image.base64:
+            return LabelImageIngestionService.decode(label_image.base64)
+
+        if label_image.pending_upload_key:
+            # Drained in the meantime? Then it is in blob storage under the same key
+            image_bytes = self._label_image_spool_adapter.read(label_image.pending_upload_key)
+            if image_bytes is None:
+                image_bytes = self._blob_storage_adapter.read(label_image.pending_upload_key)
+            if image_bytes is not None:
+                return image_bytes
+
+        if label_image.image_url:
+            # Read from storage rather than downloaded when it is one of ours
+            match = _CONTENT_ADDRESS.search(label_image.image_url)
+            image_bytes = self._blob_storage_adapter.read(match.group(1)) if match else None
+            if image_bytes is not None:
+                return image_bytes
+            response = self._http_client.get(label_image.image_url)
+            response.raise_for_status()
+            return response.content
+
+        raise ValueError("Label image not found")
@@ -0,0 +1,224 @@
+"""Background upload of spooled label images and patching of the jobs waiting for them"""
+
+import asyncio
+import json
+from typing import Optional
+
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.persistence.label_approvals_persistence_adapter import \
+    LabelApprovalJobsPersistenceAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter_factory import \
+    BlobStorageAdapterFactory
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_spool_adapter import \
+    LabelImageSpoolAdapter
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import LabelApprovalJob
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_variants import \
+    LabelImageVariantsService, LabelImageVariants
+from treasury.services.gateways.ttb_api.main.application.utils.circuit_breaker import CircuitOpenError
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_DRAIN_INTERVAL_SECONDS = 30.0
+
+
+class LabelImageUploadDrainResult(BaseModel):
+    images_uploaded: int = 0
+    images_failed: int = 0
+    jobs_patched: int = 0
+    # Jobs updated by someone else while being patched - patched by the next pass, which looks for them
+    jobs_skipped_concurrent_update: int = 0
+    # Blob storage was still down (circuit open), the pass stopped early
+    storage_unavailable: bool = False
+
+    def summary(self) -> str:
+        return (
+            f"images_uploaded={self.images_uploaded} images_failed={self.images_failed} "
+            f"jobs_patched={self.jobs_patched} jobs_skipped_concurrent_update={self.jobs_skipped_concurrent_update} "
+            f"storage_unavailable={self.storage_unavailable}"
+        )
+
+
+class LabelImageUploadDrainService:
+    """
+    Finishes label image uploads that failed while a job was created. Such images are spooled to local
+    disk (LabelImageSpoolAdapter) and the job references them by pending_upload_key only. A drain pass
+    uploads the spooled images, then sets image_url (and the renditions) on every job still waiting for
+    one and clears pending_upload_key. Jobs are rewritten only if they were not updated in the meantime.
+
+    Passes are idempotent: images are content-addressed, so uploading one twice or patching a job from
+    an image another process uploaded is harmless. A pass stops early while blob storage is down.
+
+    Jobs only become patchable when an image is uploaded, so a pass looks for pending jobs (a query
+    over the metadata that is not indexed) only when the spool had entries, the previous pass left jobs
+    unpatched, or it is the first pass of the process (which finishes jobs an interrupted pass left).
+    """
+
+    def __init__(
+            self,
+            label_approval_jobs_persistence_adapter: LabelApprovalJobsPersistenceAdapter = None,
+            blob_storage_adapter: BlobStorageAdapter = None,
+            label_image_spool_adapter: LabelImageSpoolAdapter = None,
+            label_image_variants_service: LabelImageVariantsService = None
+    ) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._label_approval_jobs_persistence_adapter_lazy = label_approval_jobs_persistence_adapter
+        self._blob_storage_adapter_lazy = blob_storage_adapter
+        self._label_image_spool_adapter_lazy = label_image_spool_adapter
+        self._label_image_variants_service_lazy = label_image_variants_service
+        self._jobs_left_to_patch = True
+
+    @property
+    def _label_approval_jobs_persistence_adapter(self) -> LabelApprovalJobsPersistenceAdapter:
+        # Lazy initialization of the persistence adapter
+        if self._label_approval_jobs_persistence_adapter_lazy is None:
+            self._label_approval_jobs_persistence_adapter_lazy = LabelApprovalJobsPersistenceAdapter()
+        return self._label_approval_jobs_persistence_adapter_lazy
+
+    @property
+    def _blob_storage_adapter(self) -> BlobStorageAdapter:
+        # Lazy initialization of the configured blob storage backend
+        if self._blob_storage_adapter_lazy is None:
+            self._blob_storage_adapter_lazy = BlobStorageAdapterFactory.get_singleton_instance_of()
+        return self._blob_storage_adapter_lazy
+
+    @property
+    def _label_image_spool_adapter(self) -> LabelImageSpoolAdapter:
+        # Lazy initialization of the spool
+        if self._label_image_spool_adapter_lazy is None:
+            self._label_image_spool_adapter_lazy = LabelImageSpoolAdapter()
+        return self._label_image_spool_adapter_lazy
+
+    @property
+    def _label_image_variants_service(self) -> LabelImageVariantsService:
+        # Lazy initialization of the variants service, storing renditions next to the originals
+        if self._label_image_variants_service_lazy is None:
+            self._label_image_variants_service_lazy = LabelImageVariantsService(
+                blob_storage_adapter=self._blob_storage_adapter
+            )
+        return self._label_image_variants_service_lazy
+
+    def drain_once(self, batch_size: int = DEFAULT_BATCH_SIZE) -> LabelImageUploadDrainResult:
+        """Upload the spooled images and patch the jobs waiting for them"""
+        result = LabelImageUploadDrainResult()
+        variants_by_key: dict[str, LabelImageVariants] = {}
+        try:
+            spooled = self._upload_spooled_images(result, variants_by_key)
+            if spooled or self._jobs_left_to_patch:
+                # Still set if the pass does not get through all of them
+                self._jobs_left_to_patch = True
+                self._patch_pending_jobs(result, variants_by_key, batch_size)
+                self._jobs_left_to_patch = result.jobs_skipped_concurrent_update > 0
+        except CircuitOpenError as e:
+            result.storage_unavailable = True
+            self._logger.warning(f"Blob storage unavailable, label image drain stopped early: {str(e)}")
+
+        if result.images_uploaded or result.images_failed or result.jobs_patched or result.storage_unavailable:
+            self._logger.info(f"Label image upload drain pass finished {result.summary()}")
+        return result
+
+    async def drain_periodically(self, interval_seconds: float = DEFAULT_DRAIN_INTERVAL_SECONDS) -> None:
+        """Run a drain pass every interval_seconds until cancelled. Passes block on I/O, so they run in a thread."""
+        while True:
+            try:
+                await asyncio.to_thread(self.drain_once)
+            except Exception as e:
+                self._logger.exception(f"Label image upload drain pass failed: {str(e)}")
+            await asyncio.sleep(interval_seconds)
+
+    def _upload_spooled_images(
+            self,
+            result: LabelImageUploadDrainResult,
+            variants_by_key: dict[str, LabelImageVariants]
+    ) -> bool:
+        """Upload the spooled images, False if the spool was empty"""
+        entries = self._label_image_spool_adapter.list_entries()
+        for entry in entries:
+            image_bytes = self._label_image_spool_adapter.read(entry.key)
+            if image_bytes is None:
+                # Drained by another process in the meantime
+                continue
+            try:
+                self._blob_storage_adapter.upload_image(image_data=image_bytes, content_type=entry.content_type)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                # Stays spooled for the next pass
+                result.images_failed += 1
+                self._logger.warning(f"Failed to upload spooled label image key={entry.key} error={str(e)}")
+                continue
+            variants_by_key[entry.key] = self._create_variants(image_bytes)
+            self._label_image_spool_adapter.delete(entry.key)
+            result.images_uploaded += 1
+        return bool(entries)
+
+    def _patch_pending_jobs(
+            self,
+            result: LabelImageUploadDrainResult,
+            variants_by_key: dict[str, LabelImageVariants],
+            batch_size: int
+    ) -> None:
+        after_job_id = None
+        while True:
+            jobs = self._label_approval_jobs_persistence_adapter.list_jobs_with_pending_uploads(
+                after_job_id=after_job_id,
+                limit=batch_size
+            )
+            if not jobs:
+                return
+            for job in jobs:
+                self._patch_job(job, result, variants_by_key)
+            after_job_id = jobs[-1].id
+
+    def _patch_job(
+            self,
+            job: LabelApprovalJob,
+            result: LabelImageUploadDrainResult,
+            variants_by_key: dict[str, LabelImageVariants]
+    ) -> None:
+        job_metadata = job.get_job_metadata()
+        patched_images = 0
+        for label_image in job_metadata.label_images or []:
+            if not label_image.pending_upload_key:
+                continue
+            key = label_image.pending_upload_key
+            image_url = self._blob_storage_adapter.get_url(key)
+            if image_url is None:
+                # Not uploaded yet (still spooled, or spooled by a process whose spool this one cannot see)
+                continue
+            if key not in variants_by_key:
+                variants_by_key[key] = self._create_variants(self._blob_storage_adapter.read(key))
+            variants = variants_by_key[key]
+            label_image.image_url = image_url
+            label_image.thumbnail_url = variants.thumbnail_url
+            label_image.display_url = variants.display_url
+            label_image.ocr_url = variants.ocr_url
+            label_image.pending_upload_key = None
+            patched_images += 1
+
+        if patched_images == 0:
+            return
+
+        if not self._label_approval_jobs_persistence_adapter.set_job_metadata_if_unchanged(
+                job_id=job.id,
+                job_metadata=json.loads(job_metadata.model_dump_json(exclude_none=False)),
+                expected_updated_at=job.updated_at
+        ):
+            result.jobs_skipped_concurrent_update += 1
+            self._logger.info(f"Job updated while patching its label image URL, retried next pass job_id={job.id}")
+            return
+        result.jobs_patched += 1
+        self._logger.info(f"Patched label image URL of job_id={job.id} images={patched_images}")
+
+    def _create_variants(self, image_bytes: Optional[bytes]) -> LabelImageVariants:
+        """Renditions are best effort here as on ingestion - consumers fall back to image_url"""
+        if image_bytes is None:
+            return LabelImageVariants()
+        try:
+            return self._label_image_variants_service.create_variants(image_bytes)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self._logger.warning(f"Failed to create label image variants: {str(e)}")
+            return LabelImageVariants()
@@ -0,0 +1,177 @@
+import asyncio
+import re
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Optional
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter, \
+    PresignedUpload
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter_factory import \
+    BlobStorageAdapterFactory
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_upload_staging_adapter import \
+    LabelImageUploadStagingAdapter, StagedUpload
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+from treasury.services.gateways.ttb_api.main.application.models.domain.ingested_label_image import IngestedLabelImage
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import \
+    LabelImageIngestionService, MAX_IMAGE_SIZE_BYTES, IMAGE_HEADER_BYTES
+
+# Content-Type of the upload request -> image type as used in data URIs
+UPLOAD_CONTENT_TYPES = {
+    "image/png": "png",
+    "image/jpeg": "jpeg",
+    "image/jpg": "jpg",
+    "image/gif": "gif",
+}
+STAGED_UPLOAD_TTL_SECONDS = 24 * 60 * 60
+EXPIRED_UPLOADS_SWEEP_INTERVAL_SECONDS = 10 * 60
+
+# Direct uploads land under this prefix (expire them with a bucket lifecycle rule) and are copied to
+# their content address once a job references them
+DIRECT_UPLOAD_PREFIX = "uploads/label-images"
+DIRECT_UPLOAD_EXPIRES_IN_SECONDS = 15 * 60
+DIRECT_UPLOAD_KEY_PATTERN = re.compile(r"^uploads/label-images/[0-9a-f]{32}\.(png|jpeg|jpg|gif)$")
+
+
+class LabelImageUploadsService:
+    """
+    Binary label image uploads, either streamed through the API and staged until createLabelApprovalJob
+    references them by upload id, or uploaded by the client directly to blob storage with a presigned
+    upload and referenced by object key.
+    """
+
+    def __init__(
+            self,
+            label_image_upload_staging_adapter: LabelImageUploadStagingAdapter = None,
+            blob_storage_adapter: BlobStorageAdapter = None
+    ) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._label_image_upload_staging_adapter_lazy = label_image_upload_staging_adapter
+        self._blob_storage_adapter_lazy = blob_storage_adapter
+        self._last_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+
+    @property
+    def _label_image_upload_staging_adapter(self) -> LabelImageUploadStagingAdapter:
+        # Lazy initialization of the staging adapter
+        if self._label_image_upload_staging_adapter_lazy is None:
+            self._label_image_upload_staging_adapter_lazy = LabelImageUploadStagingAdapter()
+        return self._label_image_upload_staging_adapter_lazy
+
+    @property
+    def _blob_storage_adapter(self) -> BlobStorageAdapter:
+        # Lazy initialization of the configured blob storage backend
+        if self._blob_storage_adapter_lazy is None:
+            self._blob_storage_adapter_lazy = BlobStorageAdapterFactory.get_singleton_instance_of()
+        return self._blob_storage_adapter_lazy
+
+    async def stage_upload(self, content_type: Optional[str], chunks: AsyncIterator[bytes]) -> StagedUpload:
+        """
+        Stream an uploaded image to the staging area, enforcing MAX_IMAGE_SIZE_BYTES as it arrives.
+
+        Raises:
+            ValueError: If the content type is not a permitted image type
+            UploadTooLargeError: If the upload exceeds MAX_IMAGE_SIZE_BYTES
+        """
+        image_type = UPLOAD_CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+        if image_type is None:
+            raise ValueError(f"Content-Type must be one of: {', '.join(UPLOAD_CONTENT_TYPES)}")
+
+        await asyncio.to_thread(self._delete_expired_uploads_periodically)
+        return await self._label_image_upload_staging_adapter.stage(
+            chunks,
+            image_type=image_type,
+            max_size_bytes=MAX_IMAGE_SIZE_BYTES
+        )
+
+    def ingest_staged_upload(self, upload_id: str, permitted_types: list[str]) -> IngestedLabelImage:
+        """
+        Load and validate a staged upload.
+
+        Raises:
+            ValueError: If there is no such upload or the image is not valid
+        """
+        staged = self._label_image_upload_staging_adapter.read(upload_id)
+        if staged is None:
+            raise ValueError(f"Label image upload {upload_id} not found or expired")
+        image_data, image_type = staged
+        return LabelImageIngestionService.ingest_bytes(image_data, declared_type=image_type, permitted_types=permitted_types)
+
+    def discard_staged_upload(self, upload_id: str) -> None:
+        try:
+            self._label_image_upload_staging_adapter.delete(upload_id)
+        except OSError as e:
+            self._logger.warning(f"Failed to delete staged upload upload_id={upload_id} error={e}")
+
+    def create_direct_upload(self, content_type: Optional[str]) -> PresignedUpload:
+        """
+        Presign an upload of one label image straight to blob storage, limited to MAX_IMAGE_SIZE_BYTES.
+
+        Raises:
+            ValueError: If the content type is not a permitted image type
+            NotImplementedError: If the blob storage backend does not support direct uploads
+        """
+        content_type = (content_type or "").split(";")[0].strip().lower()
+        image_type = UPLOAD_CONTENT_TYPES.get(content_type)
+        if image_type is None:
+            raise ValueError(f"Content type must be one of: {', '.join(UPLOAD_CONTENT_TYPES)}")
+
+        return self._blob_storage_adapter.create_presigned_upload(
+            key=f"{DIRECT_UPLOAD_PREFIX}/{uuid.uuid4().hex}.{image_type}",
+            content_type=content_type,
+            max_size_bytes=MAX_IMAGE_SIZE_BYTES,
+            expires_in_seconds=DIRECT_UPLOAD_EXPIRES_IN_SECONDS
+        )
+
+    def ingest_direct_upload(self, object_key: str, permitted_types: list[str]) -> IngestedLabelImage:
+        """
+        Load and validate an image the client uploaded directly to blob storage. The object is validated
+        from its size and content type (a HEAD request) and its first bytes (a ranged read), so that an
+        object that is not a permitted image is never downloaded. A valid image is then read once, for
+        its content address and renditions.
+
+        Raises:
+            ValueError: If the key was not issued for a direct upload, the object does not exist or
+                the image is not valid
+        """
+        match = DIRECT_UPLOAD_KEY_PATTERN.match(object_key or "")
+        if match is None:
+            # Only keys handed out by create_direct_upload may be referenced, not arbitrary objects
+            raise ValueError(f"Invalid label image object key {object_key}")
+        image_type = match.group(1)
+
+        metadata = self._blob_storage_adapter.head(object_key)
+        if metadata is None:
+            raise ValueError(f"Label image object {object_key} not found")
+        content_type = (metadata.content_type or "").split(";")[0].strip().lower()
+        if content_type and UPLOAD_CONTENT_TYPES.get(content_type) != image_type:
+            raise ValueError(f"Label image object {object_key} was uploaded as {content_type}")
+
+        header = b""
+        if metadata.size_bytes > 0:
+            header = self._blob_storage_adapter.read_range(object_key, 0, IMAGE_HEADER_BYTES)
+            if header is None:
+                raise ValueError(f"Label image object {object_key} not found")
+        return LabelImageIngestionService.ingest_stored(
+            header,
+            size_bytes=metadata.size_bytes,
+            read_image=lambda: self._blob_storage_adapter.read(object_key),
+            declared_type=image_type,
+            permitted_types=permitted_types
+        )
+
+    def discard_direct_upload(self, object_key: str) -> None:
+        try:
+            self._blob_storage_adapter.delete(object_key)
+        except RuntimeError as e:
+            self._logger.warning(f"Failed to delete direct upload object_key={object_key} error={e}")
+
+    def _delete_expired_uploads_periodically(self) -> None:
+        with self._sweep_lock:
+            now = time.monotonic()
+            if now - self._last_sweep < EXPIRED_UPLOADS_SWEEP_INTERVAL_SECONDS:
+                return
+            self._last_sweep = now
+        deleted = self._label_image_upload_staging_adapter.delete_expired(STAGED_UPLOAD_TTL_SECONDS)
+        if deleted:
+            self._logger.info(f"Deleted {deleted} expired staged label image uploads")
@@ -0,0 +1,145 @@
+"""Renditions of a label image derived once on ingestion: thumbnail, display-sized and OCR-optimized"""
+
+import hashlib
+from io import BytesIO
+from typing import Optional
+
+from PIL import Image, ImageOps
+from pydantic import BaseModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter import BlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.blob_storage_adapter_factory import \
+    BlobStorageAdapterFactory
+from treasury.services.gateways.ttb_api.main.application.config.config import GlobalConfig
+
+THUMBNAIL_MAX_SIDE = 256
+# Vision LLMs scale images down to fit 2048x2048 anyway, so nothing they would see is lost
+DISPLAY_MAX_SIDE = 2048
+
+# Bump a version whenever its rendering changes, so that new renditions get new keys
+THUMBNAIL_VARIANT = "thumbnail-v1"
+DISPLAY_VARIANT = "display-v1"
+# v1 was downscaled, EXIF-rotated and Otsu-binarized; v2 is a plain grayscale copy of the original
+OCR_VARIANT = "ocr-v2"
+
+
+class RenderedVariant(BaseModel):
+    data: bytes
+    content_type: str
+    extension: str
+
+
+class LabelImageVariants(BaseModel):
+    thumbnail_url: Optional[str] = None
+    display_url: Optional[str] = None
+    ocr_url: Optional[str] = None
+
+
+class LabelImageVariantsService:
+    """
+    Renders the thumbnail, display and OCR renditions of a label image from a single decode and stores
+    them next to the original, keyed by the original's SHA-256. Renditions that are already stored (the
+    same image submitted again) are neither rendered nor uploaded again.
+    """
+
+    def __init__(self, blob_storage_adapter: BlobStorageAdapter = None) -> None:
+        self._logger = GlobalConfig.get_logger(__name__)
+        self._blob_storage_adapter_lazy = blob_storage_adapter
+
+    @property
+    def _blob_storage_adapter(self) -> BlobStorageAdapter:
+        # Lazy initialization of the configured blob storage backend
+        if self._blob_storage_adapter_lazy is None:
+            self._blob_storage_adapter_lazy = BlobStorageAdapterFactory.get_singleton_instance_of()
+        return self._blob_storage_adapter_lazy
+
+    def create_variants(self, image_data: bytes, sha256: Optional[str] = None) -> LabelImageVariants:
+        """
+        Store the renditions of an image and return their URLs
+
+        Raises:
+            RuntimeError: If a rendition cannot be stored
+            ValueError: If the image cannot be decoded
+        """
+        sha256 = sha256 or hashlib.sha256(image_data).hexdigest()
+        keys = {
+            THUMBNAIL_VARIANT: BlobStorageAdapter.variant_key(sha256, THUMBNAIL_VARIANT, "jpg"),
+            DISPLAY_VARIANT: BlobStorageAdapter.variant_key(sha256, DISPLAY_VARIANT, "jpg"),
+            OCR_VARIANT: BlobStorageAdapter.variant_key(sha256, OCR_VARIANT, "png"),
+        }
+        urls = {variant: self._blob_storage_adapter.get_url(key) for variant, key in keys.items()}
+
+        missing = [variant for variant, url in urls.items() if url is None]
+        if missing:
+            rendered = self.render(image_data, variants=missing)
+            for variant in missing:
+                urls[variant] = self._blob_storage_adapter.put(
+                    keys[variant],
+                    rendered[variant].data,
+                    rendered[variant].content_type
+                )
+            self._logger.info(f"Stored label image variants sha256={sha256} variants={missing}")
+
+        return LabelImageVariants(
+            thumbnail_url=urls[THUMBNAIL_VARIANT],
+            display_url=urls[DISPLAY_VARIANT],
+            ocr_url=urls[OCR_VARIANT],
+        )
+
+    @classmethod
+    def render(
+            cls,
+            image_data: bytes,
+            variants: Optional[list[str]] = None
+    ) -> dict[str, RenderedVariant]:
+        """Render the requested renditions (all by default) from one decode of the image"""
+        variants = variants or [THUMBNAIL_VARIANT, DISPLAY_VARIANT, OCR_VARIANT]
+        try:
+            image = Image.open(BytesIO(image_data))
+            image.load()
+        except Exception as e:
+            raise ValueError(f"Invalid or corrupted image: {str(e)}") from e
+
+        rendered = {}
+        if THUMBNAIL_VARIANT in variants or DISPLAY_VARIANT in variants:
+            # Phone photos are often stored sideways with an EXIF orientation tag
+            rgb_image = cls._to_rgb(ImageOps.exif_transpose(image))
+            if THUMBNAIL_VARIANT in variants:
+                rendered[THUMBNAIL_VARIANT] = cls._jpeg(rgb_image, THUMBNAIL_MAX_SIDE, quality=80)
+            if DISPLAY_VARIANT in variants:
+                rendered[DISPLAY_VARIANT] = cls._jpeg(rgb_image, DISPLAY_MAX_SIDE, quality=85)
+        if OCR_VARIANT in variants:
+            rendered[OCR_VARIANT] = cls._ocr_png(image)
+        return rendered
+
+    @classmethod
+    def _to_rgb(cls, image: Image.Image) -> Image.Image:
+        if image.mode == "RGB":
+            return image
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            # Transparent areas become white rather than black
+            rgba_image = image.convert("RGBA")
+            background = Image.new("RGB", rgba_image.size, "white")
+            background.paste(rgba_image, mask=rgba_image.getchannel("A"))
+            return background
+        return image.convert("RGB")
+
+    @classmethod
+    def _jpeg(cls, image: Image.Image, max_side: int, quality: int) -> RenderedVariant:
+        resized = image.copy()
+        resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        resized.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+        return RenderedVariant(data=buffer.getvalue(), content_type="image/jpeg", extension="jpg")
+
+    @classmethod
+    def _ocr_png(cls, image: Image.Image) -> RenderedVariant:
+        """
+        A lossless grayscale copy in the pixel grid of the stored original - not resized or rotated, so
+        OCR bounding boxes line up with the original. Binarization and rescaling are left to the
+        configurable OCR preprocessing (OCR_PREPROCESSING, compared by tools/benchmark_ocr.py).
+        """
+        grayscale = cls._to_rgb(image).convert("L")
+        buffer = BytesIO()
+        grayscale.save(buffer, format="PNG", optimize=True)
+        return RenderedVariant(data=buffer.getvalue(), content_type="image/png", extension="png")
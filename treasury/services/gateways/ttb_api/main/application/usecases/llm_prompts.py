@@ -1,7 +1,19 @@
+import json
+
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
 
 
+def _compact(text: str) -> str:
+    """Strip indentation, trailing whitespace and blank lines - they cost tokens without adding meaning"""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
 class LlmPrompts:
+    # Bump when a prompt's text changes, so token usage can be compared across versions in the logs
+    LABEL_EXTRACTION_PROMPT_VERSION = "label-extraction-v2"
+    LABEL_ANALYSIS_PROMPT_VERSION = "label-analysis-v2"
+    LABEL_VERIFICATION_PROMPT_VERSION = "label-verification-v1"
+
     _TTB_LABEL_EXTRACTION_SCHEMA = """
 export type ABV = `${number}% | null;
 export type Volume = `${number} mL` | `${number} cL` | `${number} fl oz | `${number} gal` | null;
@@ -24,7 +36,7 @@ export interface BrandDataStrict {
 }    
     """
 
-    TTB_LABEL_IMAGE_INQUIRY_PROMPT = f"""
+    TTB_LABEL_IMAGE_INQUIRY_PROMPT = _compact(f"""
 You are an expert in extracting structured data from product label images for regulatory compliance.
 Alcohol and Tobacco Tax and Trade Bureau. 
 Given an image of a product label, your task is to extract key information and format it according
@@ -44,7 +56,7 @@ If there is more than one type of product on the label or if there are multiple
 appropriate. 
 
 Provide the final output as a JSON object that adheres strictly to the BrandDataStrict interface.
-"""
+""")
 
     _TTB_LABEL_ANALYSIS_SCHEMA = """
     export interface LabelImageAnalysisResult {
@@ -70,35 +82,23 @@ health_warning_found_results_reasoning?: string | null;
 }
 """
 
-    @classmethod
-    def get_label_analysis_prompt(cls, given_brand_label_info: BrandDataStrict, extracted_brand_label_info: BrandDataStrict) -> str:
+    # Static instructions go in the system prompt, ahead of any per-job data, so that the provider can
+    # serve the identical prefix from its prompt cache
+    TTB_LABEL_ANALYSIS_SYSTEM_PROMPT = _compact(f"""
+You are an expert in regulatory compliance for alcoholic beverage labels at the Alcohol and Tobacco Tax and Trade Bureau.
+A merchant has submitted a product label for approval. You are given the information provided by the merchant about the
+product (GIVEN) and the information extracted from the submitted product label image (EXTRACTED), both as JSON. Fields
+that are absent from the JSON have no value.
 
-        warnings_were_given = given_brand_label_info.products[0].other_info.warnings is not None and len(given_brand_label_info.products[0].other_info.warnings.strip()) > 0
-        if warnings_were_given:
-            warnings_prompt = "5. Health Warning Statement: For alcoholic beverages, a government warning is mandatory by law. Check that the phrase “GOVERNMENT WARNING” appears on the label image text and MUST BE EXACT including capitalization in all-caps GOVERNMENT WARNING"
-        else:
-            warnings_prompt = ""
-
-        prompt = f"""
-You are an expert in regulatory compliance for alcoholic beverage labels at the Alcohol and Tobacco Tax and Trade Bureau. 
-A merchant has submitted a product label for approval. You have the following information provided by the merchant about the product:
-{given_brand_label_info.model_dump_json(indent=2)}
-
-You have also extracted the following information from the submitted product label image:
-{extracted_brand_label_info.model_dump_json(indent=2)}
-        
 Analyze the extracted label data against the merchant-provided information and answer the following questions, the answers should be either True or False, along with a brief reasoning for each.
-        The schema for the extracted data is as follows:
-{cls._TTB_LABEL_ANALYSIS_SCHEMA}
-        
 1. Does the text on the label contain the Brand Name exactly as provided in the form?
 2. Does it contain the stated Product Class/Type (or something very close/identical. eg: Beer and Lager Beer are the same, Gin and London Gin are the same)?
 3. Does it mention the Alcohol Content (within the text, look for a number and “%” that matches the form input)?
 4. If you included Net Contents in the form, check if the volume (e.g. “750 mL” or “12 OZ”) appears on the label.
-{warnings_prompt}
+5. Only when the merchant provided warnings - Health Warning Statement: For alcoholic beverages, a government warning is mandatory by law. Check that the phrase “GOVERNMENT WARNING” appears on the label image text and MUST BE EXACT including capitalization in all-caps GOVERNMENT WARNING
 
 Health warning inputs are optional. If no warnings were provided in the merchant form, set health_warning_found to null
-and health_warning_found_results_reasoning as "Not applicable - no warnings provided". 
+and health_warning_found_results_reasoning as "Not applicable - no warnings provided".
 
 When the extracted field has a null or unknown value, the reasoning should reflect that the information was not found on the label.
 Keep the reasoning concise but informative and user-friendly for a non-technical reviewer. Avoid leaking internal data structure schema details to the reviewer.
@@ -106,6 +106,61 @@ Keep the reasoning concise but informative and user-friendly for a non-technical
 Example of a good reasoning for a missing alcohol content:
 "The form specifies an alcohol content of '5.0%', but the AI extracted label data show the field as missing, indicating no alcohol percentage was found on the label."
 
-Provide the final output as a JSON object that adheres strictly to the LabelImageAnalysisResult interface.
+Provide the final output as a JSON object that adheres strictly to the LabelImageAnalysisResult interface:
+{_TTB_LABEL_ANALYSIS_SCHEMA}
+""")
+
+    # Tiered analysis: only the fields OCR could not confirm are checked, directly on the label image
+    TTB_LABEL_VERIFICATION_SYSTEM_PROMPT = _compact("""
+You are an expert in regulatory compliance for alcoholic beverage labels at the Alcohol and Tobacco Tax and Trade Bureau.
+You are given a product label image and some of the values a merchant provided on the form (CHECK). OCR could not
+confirm these values on the label. Look at the label image and check each of them, and only them:
+- brand_name: the label shows the brand name exactly as provided (case does not matter).
+- product_class: the label shows the product class/type or something very close (eg: Beer and Lager Beer are the same, Gin and London Gin are the same).
+- alcohol_content: the label shows the alcohol content as a number and "%" matching the value provided.
+- net_contents: the label shows the volume provided (e.g. "750 mL" or "12 OZ").
+- health_warning: the label shows the phrase "GOVERNMENT WARNING", which MUST BE EXACT including capitalization in all-caps.
+For each field in CHECK answer <field>_found (true or false) and <field>_found_results_reasoning, a brief reasoning for a
+non-technical reviewer that does not mention OCR or internal data structures.
+Provide the final output as a JSON object with exactly these keys, without markdown or code blocks.
+""")
+
+    @classmethod
+    def get_label_verification_prompt(cls, given_brand_label_info: BrandDataStrict, fields: list[str]) -> str:
+        """
+        The per-job part of the label verification prompt, to be sent with TTB_LABEL_VERIFICATION_SYSTEM_PROMPT
+        and the label image: one line per field to check (see LABEL_ANALYSIS_FIELDS) with its value on the form.
         """
-        return prompt
\ No newline at end of file
+        product = given_brand_label_info.products[0] if given_brand_label_info.products else None
+        given_values = {
+            "brand_name": given_brand_label_info.brand_name,
+            "product_class": product.product_class_type if product else None,
+            "alcohol_content": product.alcohol_content_abv if product else None,
+            "net_contents": product.net_contents if product else None,
+            "health_warning": "GOVERNMENT WARNING",
+        }
+        return "CHECK:\n" + "\n".join(f"{field}: {json.dumps(given_values[field])}" for field in fields)
+
+    @classmethod
+    def get_label_analysis_prompt(cls, given_brand_label_info: BrandDataStrict, extracted_brand_label_info: BrandDataStrict) -> str:
+        """
+        The per-job part of the label analysis prompt, to be sent with TTB_LABEL_ANALYSIS_SYSTEM_PROMPT.
+        The label data is rendered as compact JSON without null fields.
+        """
+        warnings_were_given = given_brand_label_info.products[0].other_info.warnings is not None and len(given_brand_label_info.products[0].other_info.warnings.strip()) > 0
+
+        return (
+            f"GIVEN: {cls._compact_json(given_brand_label_info)}\n"
+            f"EXTRACTED: {cls._compact_json(extracted_brand_label_info)}\n"
+            f"Merchant provided warnings: {'yes' if warnings_were_given else 'no'}"
+        )
+
+    # Parsed from alcohol_content_abv and net_contents for the checks - not part of the label data the prompt describes
+    _DERIVED_PRODUCT_FIELDS = {"alcohol_content_percent", "net_contents_ml"}
+
+    @classmethod
+    def _compact_json(cls, brand_label_info: BrandDataStrict) -> str:
+        return brand_label_info.model_dump_json(
+            exclude_none=True,
+            exclude={"products": {"__all__": cls._DERIVED_PRODUCT_FIELDS}}
+        )
@@ -0,0 +1,154 @@
+"""Approximate (OCR-error-tolerant) search of phrases among OCR words, with a bounded edit distance"""
+
+import bisect
+import itertools
+from typing import Optional, List, Sequence, Tuple
+
+from pydantic import BaseModel
+
+
+class ApproximateMatch(BaseModel):
+    """The OCR words that best match a phrase"""
+    text: str
+    # Edits (insertions, deletions, substitutions, transpositions of adjacent characters) between phrase and text
+    distance: int
+    # 1 - distance / phrase length
+    similarity: float
+    # Mean Tesseract confidence (0-100) of the matched words, None if not known
+    ocr_confidence: Optional[float] = None
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Damerau-Levenshtein (optimal string alignment) distance of a and b, or None if it exceeds max_distance.
+    Only the diagonal band of width 2 * max_distance + 1 of the DP matrix is computed, and the computation
+    stops at the first row whose cells all exceed max_distance - O(len(a) * max_distance) at worst.
+    """
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > max_distance:
+        return None
+    if a == b:
+        return 0
+
+    # Any value above max_distance stands for "too far"
+    too_far = max_distance + 1
+    row_before_previous: List[int] = []
+    previous_row = [min(j, too_far) for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        current_row = [too_far] * (len_b + 1)
+        current_row[0] = min(i, too_far)
+        row_minimum = current_row[0]
+        char_a = a[i - 1]
+        for j in range(max(1, i - max_distance), min(len_b, i + max_distance) + 1):
+            char_b = b[j - 1]
+            distance = min(
+                previous_row[j] + 1,
+                current_row[j - 1] + 1,
+                previous_row[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, row_before_previous[j - 2] + 1)
+            current_row[j] = min(distance, too_far)
+            row_minimum = min(row_minimum, current_row[j])
+        if row_minimum > max_distance:
+            return None
+        row_before_previous, previous_row = previous_row, current_row
+
+    return previous_row[len_b] if previous_row[len_b] <= max_distance else None
+
+
+class ApproximatePhraseFinder:
+    """
+    Approximate (case-insensitive) search of phrases among the words of one OCR text, which are prepared
+    once for any number of phrases.
+
+    A phrase is matched by the run of consecutive words most similar to it, if at least min_similarity
+    similar: the phrase may differ from the words by k = floor(len(phrase) * (1 - min_similarity)) edits.
+    Runs of one word fewer or more than the phrase are tried too, for words OCR split or merged. With word
+    confidences, runs whose mean confidence is below min_ocr_confidence - noise that only looks like the
+    phrase - are skipped. Among equally close runs the most confidently read one is taken.
+
+    Only runs around a verbatim occurrence of a piece of the phrase are compared with the DP: the phrase
+    is cut into k + 1 pieces separated by single characters, so that each edit breaks at most one piece,
+    and any run within k edits contains an intact piece. The pieces are found with str.find.
+    """
+
+    def __init__(self, words: Sequence[str], word_confidences: Optional[Sequence[float]] = None) -> None:
+        self._words = words
+        self._word_confidences = word_confidences
+        words_lower = [word.lower() for word in words]
+        self._text = ' '.join(words_lower)
+        # Start of each word in the text, and one past the end of the text
+        self._offsets = list(itertools.accumulate((len(word) + 1 for word in words_lower), initial=0))
+
+    def find(
+            self,
+            phrase: str,
+            min_similarity: float = 0.85,
+            min_ocr_confidence: float = 0.0
+    ) -> Optional[ApproximateMatch]:
+        phrase = ' '.join(phrase.lower().split())
+        if not phrase or not self._words:
+            return None
+        max_distance = int(len(phrase) * (1 - min_similarity) + 1e-9)
+        n_phrase_words = phrase.count(' ') + 1
+        run_lengths = range(max(1, n_phrase_words - 1), n_phrase_words + 2)
+
+        best: Optional[ApproximateMatch] = None
+        for start, n_words in self._candidate_runs(phrase, max_distance, run_lengths):
+            bound = best.distance if best is not None else max_distance
+            text_start, text_end = self._offsets[start], self._offsets[start + n_words] - 1
+            if abs(text_end - text_start - len(phrase)) > bound:
+                continue
+            ocr_confidence = None
+            if self._word_confidences is not None:
+                ocr_confidence = sum(self._word_confidences[start:start + n_words]) / n_words
+                if ocr_confidence < min_ocr_confidence:
+                    continue
+            distance = bounded_edit_distance(phrase, self._text[text_start:text_end], bound)
+            if distance is None:
+                continue
+            if (
+                    best is None or distance < best.distance or
+                    (ocr_confidence or 0.0) > (best.ocr_confidence or 0.0)
+            ):
+                best = ApproximateMatch(
+                    text=' '.join(self._words[start:start + n_words]),
+                    distance=distance,
+                    similarity=1 - distance / len(phrase),
+                    ocr_confidence=ocr_confidence
+                )
+        return best
+
+    def _candidate_runs(self, phrase: str, max_distance: int, run_lengths: range) -> List[Tuple[int, int]]:
+        """(first word, number of words) of the runs containing a piece of the phrase, in text order"""
+        n_words_total = len(self._words)
+        pieces = self._pieces(phrase, max_distance)
+        if pieces is None:
+            return [(start, n) for n in run_lengths for start in range(n_words_total - n + 1)]
+
+        first_words = set()
+        for piece in pieces:
+            position = self._text.find(piece)
+            while position != -1:
+                first_words.add(bisect.bisect_right(self._offsets, position) - 1)
+                position = self._text.find(piece, position + 1)
+        runs = set()
+        for word in first_words:
+            for n in run_lengths:
+                runs.update((start, n) for start in range(max(0, word - n + 1), min(word, n_words_total - n) + 1))
+        return sorted(runs)
+
+    @classmethod
+    def _pieces(cls, phrase: str, max_distance: int) -> Optional[List[str]]:
+        """max_distance + 1 pieces of the phrase with one character between each two, None if it is too short"""
+        n_pieces = max_distance + 1
+        piece_length, longer_pieces = divmod(len(phrase) - max_distance, n_pieces)
+        if piece_length == 0:
+            return None
+        pieces, position = [], 0
+        for i in range(n_pieces):
+            length = piece_length + (i < longer_pieces)
+            pieces.append(phrase[position:position + length])
+            position += length + 1
+        return pieces
@@ -0,0 +1,120 @@
+"""Retries with jittered backoff behind a circuit breaker, for calls to flaky dependencies"""
+
+import random
+import threading
+import time
+from enum import Enum
+from typing import Callable, TypeVar, Optional
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """The dependency is considered down - the call was not attempted"""
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a dependency is down instead of making every caller wait for its timeouts.
+
+    After failure_threshold consecutive failed calls the circuit opens and calls raise CircuitOpenError
+    without being attempted. Once reset_timeout_seconds have passed, a single trial call is let through
+    (half open): success closes the circuit, failure opens it again.
+
+    Each call is retried up to max_attempts times with "full jitter" exponential backoff - a random
+    delay between 0 and min(max_backoff, base_backoff * 2^attempt) - so that callers recovering from
+    the same outage do not retry in lockstep. Only the outcome of the last attempt counts towards the
+    circuit.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 5,
+            reset_timeout_seconds: float = 30.0,
+            max_attempts: int = 3,
+            base_backoff_seconds: float = 0.2,
+            max_backoff_seconds: float = 2.0,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep,
+            rng: Optional[random.Random] = None
+    ) -> None:
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._max_attempts = max_attempts
+        self._base_backoff_seconds = base_backoff_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.closed
+        if self._clock() - self._opened_at >= self._reset_timeout_seconds:
+            return CircuitState.half_open
+        return CircuitState.open
+
+    def call(self, fn: Callable[[], T], is_retryable: Callable[[Exception], bool] = lambda e: True) -> T:
+        """
+        Run fn with retries, unless the circuit is open
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a half-open trial call is already running)
+            Exception: Whatever the last attempt of fn raised
+        """
+        self._before_call()
+        for attempt in range(self._max_attempts):
+            try:
+                result = fn()
+            except Exception as e:
+                if attempt == self._max_attempts - 1 or not is_retryable(e):
+                    self._record_failure()
+                    raise
+                self._sleep(self._backoff(attempt))
+                continue
+            self._record_success()
+            return result
+        raise AssertionError("unreachable")
+
+    def _before_call(self) -> None:
+        with self._lock:
+            state = self._state()
+            if state == CircuitState.open:
+                raise CircuitOpenError(f"Circuit {self.name} is open")
+            if state == CircuitState.half_open:
+                if self._trial_in_flight:
+                    raise CircuitOpenError(f"Circuit {self.name} is half open, a trial call is in flight")
+                self._trial_in_flight = True
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._trial_in_flight or self._consecutive_failures >= self._failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def _backoff(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self._max_backoff_seconds, self._base_backoff_seconds * 2 ** attempt))
@@ -0,0 +1,147 @@
+"""Incremental JSON parser for streamed LLM completions"""
+
+import json
+from typing import Any, Iterator, Optional, Union
+
+JsonPath = tuple[Union[str, int], ...]
+
+_WHITESPACE = ' \t\r\n'
+_LITERAL_TERMINATORS = _WHITESPACE + ',]}'
+
+
+class _Container:
+    __slots__ = ('is_object', 'key', 'index', 'awaiting_key')
+
+    def __init__(self, is_object: bool) -> None:
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.index = -1
+        self.awaiting_key = is_object
+
+
+class IncrementalJsonParser:
+    """
+    Parses a single JSON object from text that arrives in chunks (e.g. LLM token deltas).
+
+    Every scalar value (string, number, boolean or null) is emitted together with its path as soon
+    as the value is complete, without waiting for the enclosing object to close. Any text before the
+    first '{' (markdown fences, prose) and after the root object closes is ignored.
+
+    Example:
+        parser = IncrementalJsonParser()
+        for chunk in stream:
+            for path, value in parser.feed(chunk):
+                ...  # path == ("products", 0, "alcohol_content_abv"), value == "41.3%"
+        document = parser.get_document()
+    """
+
+    def __init__(self) -> None:
+        self._stack: list[_Container] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._token: list[str] = []
+        self._in_literal = False
+        self._document: list[str] = []
+
+    @property
+    def is_complete(self) -> bool:
+        """True once the root JSON object has been closed"""
+        return self._done
+
+    def get_document(self) -> str:
+        """The raw JSON text of the root object consumed so far"""
+        return ''.join(self._document)
+
+    def feed(self, chunk: str) -> Iterator[tuple[JsonPath, Any]]:
+        """
+        Consume the next chunk of text and yield every scalar value completed by it.
+
+        Raises:
+            ValueError: If the text is not well-formed JSON
+        """
+        for char in chunk:
+            if self._done:
+                return
+            if not self._started:
+                if char != '{':
+                    continue
+                self._started = True
+
+            self._document.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._token.append(char)
+                elif char == '\\':
+                    self._escape = True
+                    self._token.append(char)
+                elif char == '"':
+                    self._in_string = False
+                    value = json.loads('"' + ''.join(self._token) + '"')
+                    self._token = []
+                    yield from self._on_string(value)
+                else:
+                    self._token.append(char)
+                continue
+
+            if self._in_literal:
+                if char not in _LITERAL_TERMINATORS:
+                    self._token.append(char)
+                    continue
+                yield from self._finish_literal()
+
+            yield from self._on_structural(char)
+
+    def _on_structural(self, char: str) -> Iterator[tuple[JsonPath, Any]]:
+        if char in _WHITESPACE or char == ':':
+            return
+        if char == '"':
+            self._in_string = True
+        elif char == '{' or char == '[':
+            self._begin_value()
+            self._stack.append(_Container(is_object=char == '{'))
+        elif char == '}' or char == ']':
+            if not self._stack:
+                raise ValueError(f"Unexpected '{char}' in JSON stream")
+            self._stack.pop()
+            if not self._stack:
+                self._done = True
+        elif char == ',':
+            if self._stack and self._stack[-1].is_object:
+                self._stack[-1].awaiting_key = True
+        else:
+            self._in_literal = True
+            self._token.append(char)
+        # nothing is emitted for structural characters
+        yield from ()
+
+    def _on_string(self, value: str) -> Iterator[tuple[JsonPath, Any]]:
+        container = self._stack[-1]
+        if container.is_object and container.awaiting_key:
+            container.key = value
+            container.awaiting_key = False
+            return
+        self._begin_value()
+        yield self._current_path(), value
+
+    def _finish_literal(self) -> Iterator[tuple[JsonPath, Any]]:
+        literal = ''.join(self._token)
+        self._token = []
+        self._in_literal = False
+        try:
+            value = json.loads(literal)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON literal '{literal}': {str(e)}") from e
+        self._begin_value()
+        yield self._current_path(), value
+
+    def _begin_value(self) -> None:
+        """Advance the array index when a new value starts inside an array"""
+        if self._stack and not self._stack[-1].is_object:
+            self._stack[-1].index += 1
+
+    def _current_path(self) -> JsonPath:
+        return tuple(c.key if c.is_object else c.index for c in self._stack)
@@ -0,0 +1,100 @@
+"""Extraction of the JSON object from an LLM response - markdown fences and prose around it - in linear time"""
+
+import re
+from typing import Any, Iterator, List, Optional, Tuple, Type, TypeVar
+
+import orjson
+from pydantic import BaseModel, ValidationError
+
+M = TypeVar('M', bound=BaseModel)
+
+# Inside an object, the next string (skipped whole, escapes included; an unterminated one runs to the end of the
+# text) or brace. The possessive quantifier keeps a string that does not close from being rescanned.
+_STRING_OR_BRACE = re.compile(r'"(?:[^"\\]|\\.)*+(?:"|\\?\Z)|[{}]', re.DOTALL)
+
+
+def json_object_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    (start, end) of every top-level balanced {...} in the text, in order, each followed by the outermost
+    objects inside it - for a caller that moves on to the next span when one does not decode, braces in
+    prose around the object (or a "{" that never closes) do not hide it. Braces inside JSON strings are not
+    counted; quotes outside objects (prose) are ignored. Each character is scanned once, so a response with
+    many unbalanced braces costs no more than any other.
+    """
+    position = text.find('{')
+    while position != -1:
+        open_positions: List[int] = []
+        # Objects closed inside the one starting at position, in closing order
+        inner_spans: List[Tuple[int, int]] = []
+        for match in _STRING_OR_BRACE.finditer(text, position):
+            token = match.group()
+            if token == '{':
+                open_positions.append(match.start())
+            elif token == '}':
+                start = open_positions.pop()
+                if not open_positions:
+                    yield start, match.end()
+                    # Not JSON (prose in braces around the object): the objects inside it
+                    yield from _outermost_spans(inner_spans)
+                    position = text.find('{', match.end())
+                    break
+                inner_spans.append((start, match.end()))
+        else:
+            # The object never closes
+            yield from _outermost_spans(inner_spans)
+            return
+
+
+def _outermost_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """The spans not inside another one, in order. Spans nest or are disjoint, and one nests in a later-closing one."""
+    outermost: List[Tuple[int, int]] = []
+    for start, end in reversed(spans):
+        if not outermost or start < outermost[-1][0]:
+            outermost.append((start, end))
+    return outermost[::-1]
+
+
+def _candidate_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    The first "{" to the last "}" - the whole object when the prose around it has no braces, found without
+    scanning in Python - then the spans of json_object_spans
+    """
+    start, end = text.find('{'), text.rfind('}') + 1
+    if start != -1 and end > start:
+        yield start, end
+        yield from json_object_spans(text)
+
+
+def extract_json(text: str) -> Any:
+    """
+    The first JSON object in the text that decodes (with orjson), or the whole text decoded if it has
+    no object. Raises ValueError if nothing decodes.
+    """
+    for start, end in _candidate_spans(text):
+        try:
+            return orjson.loads(text[start:end])
+        except orjson.JSONDecodeError:
+            continue
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"No JSON object found: {e}")
+
+
+def extract_json_model(text: str, model: Type[M]) -> M:
+    """
+    The first JSON object in the text that decodes, validated as the model straight from the JSON
+    (model_validate_json) without an intermediate dict. Raises ValueError (a ValidationError if the
+    object does not fit the model) if there is none.
+    """
+    last_error: Optional[ValidationError] = None
+    for start, end in _candidate_spans(text):
+        try:
+            return model.model_validate_json(text[start:end])
+        except ValidationError as e:
+            if any(error['type'] != 'json_invalid' for error in e.errors()):
+                raise
+            last_error = e
+    if last_error is not None:
+        raise ValueError(f"No JSON object found: {last_error.errors()[0]['msg']}")
+    raise ValueError("No JSON object found")
@@ -0,0 +1,98 @@
+"""Canonical numeric values of alcohol contents (%) and net contents (mL), and their tolerance-based comparison"""
+
+import math
+import re
+from typing import Optional, Dict, List, NamedTuple
+
+# Spellings of each net contents unit on labels
+NET_CONTENTS_UNIT_VARIATIONS: Dict[str, List[str]] = {
+    'ml': ['ml', 'milliliter', 'millilitre', 'milliliters', 'millilitres'],
+    'cl': ['cl', 'centiliter', 'centilitre', 'centiliters', 'centilitres'],
+    'fl oz': ['fl oz', 'fl. oz.', 'fl. oz', 'fluid ounce', 'fluid ounces', 'floz'],
+    'oz': ['oz', 'oz.', 'ounce', 'ounces'],
+    'l': ['l', 'liter', 'litre', 'liters', 'litres'],
+    'gal': ['gal', 'gal.', 'gallon', 'gallons'],
+}
+
+
+def _base_units_by_variation(unit_variations: Dict[str, List[str]]) -> Dict[str, str]:
+    base_units: Dict[str, str] = {}
+    for base_unit, variations in unit_variations.items():
+        for variation in [base_unit, *variations]:
+            base_units.setdefault(variation, base_unit)
+    return base_units
+
+
+NET_CONTENTS_BASE_UNITS = _base_units_by_variation(NET_CONTENTS_UNIT_VARIATIONS)
+
+# Millilitres per base unit ("oz" on labels is the US fluid ounce)
+MILLILITRES_PER_UNIT: Dict[str, float] = {
+    'ml': 1.0,
+    'cl': 10.0,
+    'l': 1000.0,
+    'fl oz': 29.5735,
+    'oz': 29.5735,
+    'gal': 3785.41,
+}
+
+# A number and what follows it, the whole value
+QUANTITY = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*(.*?)\s*$')
+
+# Net contents in different units are equal within rounding of the conversion (25.4 fl oz is 751 mL)
+NET_CONTENTS_RELATIVE_TOLERANCE = 0.005
+ALCOHOL_CONTENT_ABSOLUTE_TOLERANCE = 1e-6
+
+
+class NetContents(NamedTuple):
+    quantity: float
+    # Base unit (a key of NET_CONTENTS_UNIT_VARIATIONS), None if the value has no unit
+    unit: Optional[str]
+
+    @property
+    def millilitres(self) -> Optional[float]:
+        return self.quantity * MILLILITRES_PER_UNIT[self.unit] if self.unit is not None else None
+
+
+def net_contents_base_unit(unit: str) -> Optional[str]:
+    """The base unit of any spelling of a net contents unit ("Fl. Oz." is "fl oz"), None if it is not one"""
+    normalized = ' '.join(unit.lower().split())
+    return NET_CONTENTS_BASE_UNITS.get(normalized) or NET_CONTENTS_BASE_UNITS.get(normalized.replace('.', '').strip())
+
+
+def parse_net_contents(text: Optional[str]) -> Optional[NetContents]:
+    """The quantity and unit of a net contents value ("750 mL", "25.4 fl. oz.", "355"), None if it is not one"""
+    match = QUANTITY.match(text) if text else None
+    if not match:
+        return None
+    if not match.group(2):
+        return NetContents(float(match.group(1)), None)
+    unit = net_contents_base_unit(match.group(2))
+    return NetContents(float(match.group(1)), unit) if unit is not None else None
+
+
+def net_contents_millilitres(text: Optional[str]) -> Optional[float]:
+    """The net contents value in mL, None if it is not a value with a unit"""
+    net_contents = parse_net_contents(text)
+    return net_contents.millilitres if net_contents is not None else None
+
+
+def parse_alcohol_content(text: Optional[str]) -> Optional[float]:
+    """The percentage of an alcohol content value ("41.3%", "5 %", "40"), None if it is not one"""
+    match = QUANTITY.match(text) if text else None
+    if not match or match.group(2) not in ('', '%'):
+        return None
+    return float(match.group(1))
+
+
+def net_contents_equal(a_millilitres: Optional[float], b_millilitres: Optional[float]) -> bool:
+    """Whether two net contents in mL are the same, allowing for unit conversion rounding"""
+    if a_millilitres is None or b_millilitres is None:
+        return False
+    return math.isclose(a_millilitres, b_millilitres, rel_tol=NET_CONTENTS_RELATIVE_TOLERANCE)
+
+
+def alcohol_contents_equal(a_percent: Optional[float], b_percent: Optional[float], tolerance: float = 0.0) -> bool:
+    """Whether two alcohol contents differ by at most tolerance percentage points ("40%" and "40.0%" are equal)"""
+    if a_percent is None or b_percent is None:
+        return False
+    return abs(a_percent - b_percent) <= tolerance + ALCOHOL_CONTENT_ABSOLUTE_TOLERANCE
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Command-line tool to re-verify the label data stored with jobs against the forms they were submitted with.
+
+Runs against the database configured for the API (PG* variables). The extracted_product_info of the first
+label image of each job is compared with the product_info of its form by the rules of AUDIT_RULES, a batch
+of jobs at a time; no label image is read and no OCR or LLM call is made. The outcome of every rule for every
+job that fails one (or every job, with --all-jobs) is written to a CSV report.
+
+With --synthetic N, N generated jobs are audited instead of the database, to measure the throughput.
+"""
+
+import argparse
+import json
+import random
+import sys
+import uuid
+from typing import Iterator, List
+
+from treasury.services.gateways.ttb_api.main.application.usecases.label_audit import (
+    AUDIT_RULES,
+    DEFAULT_AUDIT_BATCH_SIZE,
+    LabelAuditCsvReport,
+    LabelAuditService,
+    LabelAuditSummary,
+    LabelData
+)
+
+BRAND_NAMES = ["Old Fox", "Blue Harbor", "Stone Creek", "Highland Crown", "Tanqueray"]
+PRODUCT_CLASSES = [("Bourbon", "Kentucky Straight Bourbon"), ("Gin", "London Dry Gin"), ("Beer", "Lager"),
+                   ("Whisky", "Scotch Whisky"), ("Rum", "Dark Rum"), ("Vodka", "Vodka")]
+# (on the form, as extracted) - equal quantities written differently
+ALCOHOL_CONTENTS = [("40%", "40.0%"), ("45.5%", "45.5%"), ("5%", "5.0%"), ("41.3%", "41.3%")]
+NET_CONTENTS = [("750 mL", "750ml"), ("70 cl", "700 mL"), ("25.4 fl. oz.", "750 mL"), ("1000 mL", "100 cl")]
+
+
+def synthetic_label_data(n_jobs: int, batch_size: int, seed: int = 0) -> Iterator[List[LabelData]]:
+    """Batches of stored label data like that of real jobs, about one in ten with a mismatching value"""
+    rng = random.Random(seed)
+    for batch_start in range(0, n_jobs, batch_size):
+        batch = []
+        for _ in range(min(batch_size, n_jobs - batch_start)):
+            brand_name = rng.choice(BRAND_NAMES)
+            given_class, extracted_class = rng.choice(PRODUCT_CLASSES)
+            given_abv, extracted_abv = rng.choice(ALCOHOL_CONTENTS)
+            given_net_contents, extracted_net_contents = rng.choice(NET_CONTENTS)
+            if rng.random() < 0.1:
+                extracted_abv = rng.choice(ALCOHOL_CONTENTS)[1]
+            if rng.random() < 0.1:
+                extracted_net_contents = rng.choice(NET_CONTENTS)[1]
+            warnings = rng.choice([None, "GOVERNMENT WARNING"])
+            batch.append((
+                uuid.uuid4(),
+                {"brand_name": brand_name, "products": [{
+                    "product_class_type": given_class,
+                    "alcohol_content_abv": given_abv,
+                    "net_contents": given_net_contents,
+                    "other_info": {"warnings": warnings}
+                }]},
+                {"brand_name": brand_name.upper(), "products": [{
+                    "product_class_type": extracted_class,
+                    "alcohol_content_abv": extracted_abv,
+                    "net_contents": extracted_net_contents,
+                    "other_info": {"warnings": "GOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL"
+                                   if rng.random() < 0.95 else None}
+                }]}
+            ))
+        yield batch
+
+
+def print_progress(summary: LabelAuditSummary) -> None:
+    print(f"  audited {summary.jobs_audited} jobs, {summary.jobs_failed} failing - {summary.jobs_per_second:.0f} jobs/s")
+
+
+def main():
+    """Main entry point for the CLI tool."""
+    parser = argparse.ArgumentParser(
+        description="Re-verify the stored label data of jobs against their forms",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Rules: {", ".join(AUDIT_RULES)}
+
+Examples:
+  # Audit every job against all rules, failing jobs to label-audit.csv
+  python audit_label_jobs.py --output label-audit.csv
+
+  # Audit the first 100000 jobs against one rule
+  python audit_label_jobs.py --rules net_contents --max-jobs 100000
+
+  # Throughput on a million generated jobs, no database needed
+  python audit_label_jobs.py --synthetic 1000000 --output /dev/null
+        """
+    )
+
+    parser.add_argument(
+        "--rules",
+        nargs="+",
+        choices=list(AUDIT_RULES),
+        default=None,
+        help="Rules to evaluate (default: all)"
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_AUDIT_BATCH_SIZE,
+        help=f"Jobs read and compared at once (default: {DEFAULT_AUDIT_BATCH_SIZE})"
+    )
+
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        help="Stop after auditing this many jobs (default: all)"
+    )
+
+    parser.add_argument(
+        "--output",
+        default="label-audit.csv",
+        help="CSV report file (default: label-audit.csv)"
+    )
+
+    parser.add_argument(
+        "--all-jobs",
+        action="store_true",
+        help="Write every job to the report, not only those failing a rule"
+    )
+
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Audit N generated jobs instead of the database"
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the summary as JSON"
+    )
+
+    args = parser.parse_args()
+    rule_names = args.rules or list(AUDIT_RULES)
+    service = LabelAuditService()
+    on_batch_done = None if args.json else print_progress
+
+    try:
+        with open(args.output, "w", newline="") as output:
+            report = LabelAuditCsvReport(output, rule_names, failing_jobs_only=not args.all_jobs)
+            if args.synthetic is not None:
+                n_jobs = min(args.synthetic, args.max_jobs) if args.max_jobs is not None else args.synthetic
+                summary = service.audit_label_data(
+                    synthetic_label_data(n_jobs, args.batch_size),
+                    rule_names=rule_names,
+                    report=report,
+                    on_batch_done=on_batch_done
+                )
+            else:
+                summary = service.audit(
+                    rule_names=rule_names,
+                    batch_size=args.batch_size,
+                    max_jobs=args.max_jobs,
+                    report=report,
+                    on_batch_done=on_batch_done
+                )
+    except KeyboardInterrupt:
+        print("\nInterrupted - the report holds the jobs audited so far")
+        sys.exit(130)
+
+    if args.json:
+        print(json.dumps({**summary.model_dump(), "jobs_per_second": summary.jobs_per_second}, indent=2))
+        return
+
+    print("\n" + "=" * 80)
+    print("✓ DONE")
+    print(f"\n  Jobs audited: {summary.jobs_audited}")
+    print(f"  Jobs failing a rule: {summary.jobs_failed}")
+    for rule in summary.rules:
+        print(f"  {rule.name}: {rule.passed} passed, {rule.failed} failed, {summary.jobs_audited - rule.applicable} n/a")
+    print(f"  Throughput: {summary.jobs_per_second:.0f} jobs/s ({summary.elapsed_seconds:.1f} s)")
+    print(f"  Report: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Command-line tool to compare the time of getting a BrandDataStrict out of an LLM response: the bracket-balancing
+scanner decoding straight into the model (extract_json_model) against the regexes, json.loads and model_validate
+of the dict that LabelDataExtractionService used before.
+
+Synthetic extraction responses - a fenced JSON object between prose, as the models answer - are parsed both ways,
+along with pathological responses of unbalanced braces, on which the old greedy regex backtracks over the whole
+text for every "{". The time per response (median over --repeat runs) is reported. No LLM is called.
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
+from treasury.services.gateways.ttb_api.main.application.utils.json_extraction import extract_json_model
+
+BRAND_NAMES = ["Old Fox", "Blue Harbor", "Stone Creek", "Highland Crown", "Tanqueray"]
+
+
+def synthetic_responses(n_responses: int, seed: int = 0) -> List[str]:
+    """Extraction responses with a fenced BrandDataStrict object and prose before and after it"""
+    rng = random.Random(seed)
+    responses = []
+    for _ in range(n_responses):
+        brand_data = {
+            "brand_name": rng.choice(BRAND_NAMES),
+            "products": [{
+                "name": rng.choice(BRAND_NAMES),
+                "product_class_type": rng.choice(["Gin", "Bourbon", "Lager Beer"]),
+                "alcohol_content_abv": rng.choice(["40%", "45.5%", "5%"]),
+                "net_contents": rng.choice(["750 mL", "70 cl", "12 fl oz"]),
+                "other_info": {
+                    "bottler_info": "Bottled by Old Fox Distilling Co., Louisville, KY {est. 1890}",
+                    "manufacturer": None,
+                    "warnings": "GOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL, WOMEN SHOULD NOT DRINK "
+                                "ALCOHOLIC BEVERAGES DURING PREGNANCY BECAUSE OF THE RISK OF BIRTH DEFECTS."
+                }
+            } for _ in range(rng.randint(1, 3))]
+        }
+        responses.append(
+            "Here is the information extracted from the label:\n```json\n"
+            f"{json.dumps(brand_data, indent=2)}\n```\n"
+            "All values were read from the front label; none were marked Unknown."
+        )
+    return responses
+
+
+def pathological_responses(n_responses: int, length: int) -> List[str]:
+    """Responses of unbalanced braces, each failing to parse"""
+    return ["{ " * (length // 2)] * n_responses
+
+
+def parse_with_regexes(response: str) -> BrandDataStrict:
+    """The parsing LabelDataExtractionService.extract_json_from_response did before, kept as the reference"""
+    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
+    if json_match:
+        json_str = json_match.group(1)
+    else:
+        json_match = re.search(r'\{.*\}', response, re.DOTALL)
+        json_str = json_match.group(0) if json_match else response
+    return BrandDataStrict.model_validate(json.loads(json_str))
+
+
+def parse_with_scanner(response: str) -> BrandDataStrict:
+    return extract_json_model(response, BrandDataStrict)
+
+
+PARSERS: Dict[str, Callable[[str], BrandDataStrict]] = {
+    "regexes": parse_with_regexes,
+    "scanner": parse_with_scanner,
+}
+
+
+def benchmark_parser(name: str, responses: List[str], repeat: int) -> dict:
+    parse = PARSERS[name]
+    timings = []
+    failures = 0
+    for _ in range(repeat):
+        failures = 0
+        started = time.perf_counter()
+        for response in responses:
+            try:
+                parse(response)
+            except ValueError:
+                failures += 1
+        timings.append((time.perf_counter() - started) / len(responses))
+    return {"parser": name, "median_us_per_response": statistics.median(timings) * 1e6, "failures": failures}
+
+
+def main():
+    """Main entry point for the CLI tool."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark JSON extraction from LLM responses: bracket-balancing scanner vs regexes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 1000 responses, and 20 pathological responses of 10000 characters
+  python benchmark_json_extraction.py
+
+  # Longer pathological responses (the regexes take quadratic time on them)
+  python benchmark_json_extraction.py --pathological-length 40000
+        """
+    )
+
+    parser.add_argument(
+        "--responses",
+        type=int,
+        default=1000,
+        help="Number of synthetic extraction responses (default: 1000)"
+    )
+
+    parser.add_argument(
+        "--pathological-length",
+        type=int,
+        default=10000,
+        help="Characters per pathological response (default: 10000)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Runs per parser, the median time is reported (default: 5)"
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the results as JSON"
+    )
+
+    args = parser.parse_args()
+
+    corpora = {
+        "responses": synthetic_responses(args.responses),
+        "pathological": pathological_responses(20, args.pathological_length),
+    }
+    results = []
+    for corpus_name, responses in corpora.items():
+        for name in PARSERS:
+            results.append({"corpus": corpus_name, **benchmark_parser(name, responses, args.repeat)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'corpus':<13} {'parser':<8} {'median us/response':>19} {'failures':>9}")
+    for result in results:
+        print(
+            f"{result['corpus']:<13} {result['parser']:<8} {result['median_us_per_response']:>19.1f} "
+            f"{result['failures']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
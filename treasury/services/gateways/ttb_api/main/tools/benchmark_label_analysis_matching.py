@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Command-line tool to compare the speed of re-verifying OCR texts against the label data given on a form:
+one LabelAnalysisMatcher compiled for the form against the per-call checks the pytesseract analysis used
+before, which re-normalized the text and rebuilt their patterns for every check.
+
+Synthetic OCR label texts are checked against given label data both ways, and with the matcher's approximate
+matching of brand names and product classes and comparison of quantities by value on top. The time per text (median over --repeat runs) is reported,
+along with the number of texts whose exact matches differ. No tesseract binary is needed.
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
+    BrandDataStrict,
+    ProductInfoStrict,
+    ProductOtherInfo
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_analysis_matcher import (
+    FuzzyMatchingConfig,
+    LabelAnalysisMatcher,
+    LabelAnalysisMatches,
+    NET_CONTENTS_UNIT_VARIATIONS,
+    PRODUCT_CLASS_EQUIVALENTS
+)
+from treasury.services.gateways.ttb_api.main.tools.benchmark_label_field_extraction import synthetic_corpus
+
+GIVEN_PRODUCT_CLASSES = ["Bourbon", "Gin", "London Gin", "Beer", "Lager Beer", "Whisky", "Rum", "Wine", "Vodka"]
+# Values the form accepts (see ALCOHOL_CONTENT_ABV_PATTERN and NET_CONTENTS_PATTERN)
+GIVEN_ALCOHOL_CONTENTS = ["40%", "45.5%", "12.5%", "5%", "41.3%"]
+GIVEN_NET_CONTENTS = ["750 mL", "750ml", "70 cl", "50cL", "12 fl oz", "25.4 fl. oz.", "355 mL", "1000 mL"]
+
+
+def synthetic_brand_infos(n_forms: int, seed: int = 0) -> List[BrandDataStrict]:
+    """Label data as given on forms, with brand names, classes and quantities like those of the corpus"""
+    rng = random.Random(seed)
+    return [
+        BrandDataStrict(
+            brand_name=rng.choice(["Old Fox", "Blue Harbor", "Stone Creek", "Highland Crown", "Tanqueray"]),
+            products=[ProductInfoStrict(
+                product_class_type=rng.choice(GIVEN_PRODUCT_CLASSES),
+                alcohol_content_abv=rng.choice(GIVEN_ALCOHOL_CONTENTS),
+                net_contents=rng.choice(GIVEN_NET_CONTENTS),
+                other_info=ProductOtherInfo(warnings=rng.choice([None, "GOVERNMENT WARNING"]))
+            )]
+        )
+        for _ in range(n_forms)
+    ]
+
+
+def match_with_per_call_checks(given_brand_info: BrandDataStrict, extracted_text: str) -> LabelAnalysisMatches:
+    """The checks LabelDataAnalysisPytesseractService made before LabelAnalysisMatcher, kept as the reference"""
+    result = LabelAnalysisMatches()
+    extracted_text_lower = extracted_text.lower()
+    result.brand_name_found = given_brand_info.brand_name.lower() in extracted_text_lower
+
+    product = given_brand_info.products[0]
+    given_class = product.product_class_type.lower()
+    result.product_class_found = (
+        given_class in extracted_text_lower or
+        any(equivalent in extracted_text_lower for equivalent in PRODUCT_CLASS_EQUIVALENTS.get(given_class, [])) or
+        any(
+            given_class in variants and base_class in extracted_text_lower
+            for base_class, variants in PRODUCT_CLASS_EQUIVALENTS.items()
+        )
+    )
+
+    alcohol_value = product.alcohol_content_abv.replace('%', '').strip()
+    normalized_text = re.sub(r'\s+', ' ', extracted_text_lower).strip()
+    result.alcohol_content_found = any(pattern in normalized_text for pattern in [
+        f"{alcohol_value}%", f"{alcohol_value} %", f"{alcohol_value}% alc", f"{alcohol_value}% abv",
+        f"alc {alcohol_value}%", f"abv {alcohol_value}%", f"{alcohol_value} % alc", f"{alcohol_value} % abv",
+        f"alcohol {alcohol_value}%",
+    ]) or re.search(rf'{re.escape(alcohol_value)}\s*%', normalized_text) is not None
+
+    result.net_contents_found = _net_contents_found_with_per_call_checks(product.net_contents, extracted_text_lower)
+
+    warnings_were_given = product.other_info is not None and bool((product.other_info.warnings or '').strip())
+    result.health_warning_found = "GOVERNMENT WARNING" in extracted_text if warnings_were_given else None
+    return result
+
+
+def _net_contents_found_with_per_call_checks(net_contents: str, extracted_text: str) -> bool:
+    normalized_text = re.sub(r'\s+', ' ', extracted_text).strip()
+    net_contents_lower = net_contents.lower()
+    if net_contents_lower in normalized_text:
+        return True
+    if net_contents_lower.replace(' ', '') in normalized_text.replace(' ', ''):
+        return True
+    match = re.match(r'(\d+(?:\.\d+)?)\s*(.+)', net_contents_lower)
+    if match:
+        value, unit = match.group(1), match.group(2).strip()
+        base_unit = next(
+            (base for base, variations in NET_CONTENTS_UNIT_VARIATIONS.items() if unit in variations or unit == base),
+            None
+        )
+        if base_unit:
+            for variation in NET_CONTENTS_UNIT_VARIATIONS.get(base_unit, [base_unit]):
+                if re.search(rf'{re.escape(value)}\s*{re.escape(variation)}', normalized_text):
+                    return True
+    match = re.match(r'(\d+(?:\.\d+)?)', net_contents_lower)
+    if match:
+        if re.search(rf'{re.escape(match.group(1))}\s*(ml|l|cl|oz|fl\s*oz|gal)', normalized_text):
+            return True
+    return False
+
+
+def check_per_call(given_brand_info: BrandDataStrict, corpus: List[str]) -> List[LabelAnalysisMatches]:
+    return [match_with_per_call_checks(given_brand_info, text) for text in corpus]
+
+
+def check_with_matcher(given_brand_info: BrandDataStrict, corpus: List[str]) -> List[LabelAnalysisMatches]:
+    """Exact checks only, as the per-call checks made them"""
+    matcher = LabelAnalysisMatcher(
+        given_brand_info,
+        fuzzy_matching=FuzzyMatchingConfig(enabled=False),
+        compare_quantities_by_value=False
+    )
+    return [matcher.match(text) for text in corpus]
+
+
+def check_with_fuzzy_matcher(given_brand_info: BrandDataStrict, corpus: List[str]) -> List[LabelAnalysisMatches]:
+    matcher = LabelAnalysisMatcher(given_brand_info, fuzzy_matching=FuzzyMatchingConfig(enabled=True))
+    return [matcher.match(text) for text in corpus]
+
+
+CHECKERS: Dict[str, Callable[[BrandDataStrict, List[str]], List[LabelAnalysisMatches]]] = {
+    "per-call": check_per_call,
+    "matcher": check_with_matcher,
+    "matcher+fuzzy": check_with_fuzzy_matcher,
+}
+
+
+def benchmark_checker(name: str, brand_infos: List[BrandDataStrict], corpus: List[str], repeat: int) -> dict:
+    check = CHECKERS[name]
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for given_brand_info in brand_infos:
+            check(given_brand_info, corpus)
+        timings.append(time.perf_counter() - started)
+    return {
+        "checker": name,
+        "median_us_per_text": statistics.median(timings) / (len(brand_infos) * len(corpus)) * 1_000_000,
+    }
+
+
+def main():
+    """Main entry point for the CLI tool."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark re-verifying OCR texts against given label data: compiled matcher vs per-call checks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 20 forms, each checked against 1000 synthetic OCR texts
+  python benchmark_label_analysis_matching.py
+
+  # More texts per form, 10 runs
+  python benchmark_label_analysis_matching.py --forms 10 --texts 10000 --repeat 10
+        """
+    )
+
+    parser.add_argument(
+        "--forms",
+        type=int,
+        default=20,
+        help="Number of synthetic forms (given label data) (default: 20)"
+    )
+
+    parser.add_argument(
+        "--texts",
+        type=int,
+        default=1000,
+        help="Number of synthetic OCR label texts checked against each form (default: 1000)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Passes over the forms and texts per checker, the median time is reported (default: 5)"
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the results as JSON"
+    )
+
+    args = parser.parse_args()
+
+    brand_infos = synthetic_brand_infos(args.forms)
+    corpus = synthetic_corpus(args.texts)
+    results = [benchmark_checker(name, brand_infos, corpus, args.repeat) for name in CHECKERS]
+    differing_checks = sum(
+        expected != actual
+        for given_brand_info in brand_infos
+        for expected, actual in zip(check_per_call(given_brand_info, corpus), check_with_matcher(given_brand_info, corpus))
+    )
+    speedup = results[0]["median_us_per_text"] / results[1]["median_us_per_text"]
+    n_checks = len(brand_infos) * len(corpus)
+
+    if args.json:
+        print(json.dumps(
+            {"checks": n_checks, "results": results, "speedup": speedup, "differing_checks": differing_checks},
+            indent=2
+        ))
+        return
+
+    print(f"{'checker':<14} {'median us/text':>15}")
+    for result in results:
+        print(f"{result['checker']:<14} {result['median_us_per_text']:>15.1f}")
+    print(f"speedup: {speedup:.1f}x, texts with different matches: {differing_checks} of {n_checks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Command-line tool to compare the speed of label field extraction from OCR text: LabelFieldExtractor
+against the per-field extraction the pytesseract analysis mode used before, which searched the text
+once per pattern and once per product class.
+
+A synthetic corpus of OCR label texts is extracted both ways. The time per text (median over --repeat
+runs) is reported, along with the number of texts whose fields differ. No tesseract binary is needed.
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+from treasury.services.gateways.ttb_api.main.application.usecases.label_field_extractor import (
+    ExtractedLabelFields,
+    LabelFieldExtractor,
+    PRODUCT_CLASSES
+)
+
+FILLER_WORDS = (
+    "distilled and bottled by the company est aged years in oak barrels smooth finish premium batch "
+    "product of imported from kentucky scotland mexico france small handcrafted since reserve"
+).split()
+BRAND_NAMES = ["Old Fox", "Blue Harbor", "Stone Creek", "Highland Crown", "Copper Still", "Silver Lake"]
+ABV_FORMATS = ["{abv}% ABV", "ALC. {abv}% BY VOL.", "ALC {abv}%", "{abv}% VOL", "{abv}%"]
+NET_CONTENTS_FORMATS = ["{ml} mL", "{ml} ML", "{cl} cL", "{l} L", "{oz} FL OZ", "{oz} fl. oz."]
+WARNING = (
+    "GOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL, WOMEN SHOULD NOT DRINK ALCOHOLIC BEVERAGES "
+    "DURING PREGNANCY BECAUSE OF THE RISK OF BIRTH DEFECTS. (2) CONSUMPTION OF ALCOHOLIC BEVERAGES IMPAIRS "
+    "YOUR ABILITY TO DRIVE A CAR OR OPERATE MACHINERY, AND MAY CAUSE HEALTH PROBLEMS."
+)
+
+
+def synthetic_label_text(rng: random.Random) -> str:
+    """OCR text of a label: brand, product class, alcohol content and net contents amid filler, then the warning"""
+    words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(20, 80))]
+    for field in (
+            rng.choice(PRODUCT_CLASSES)[1].upper(),
+            rng.choice(ABV_FORMATS).format(abv=f"{rng.randint(4, 60)}.{rng.randint(0, 9)}"),
+            rng.choice(NET_CONTENTS_FORMATS).format(
+                ml=rng.choice([355, 375, 750, 1000]), cl=rng.choice([50, 70]), l=rng.choice([1, 1.75]),
+                oz=rng.choice([12, 16, 25.4])
+            ),
+    ):
+        words.insert(rng.randrange(len(words) + 1), field)
+    lines = [' '.join(words[i:i + 8]) for i in range(0, len(words), 8)]
+    blocks = [rng.choice(BRAND_NAMES), '\n'.join(lines)]
+    if rng.random() < 0.8:
+        blocks.append(WARNING)
+    return '\n\n'.join(blocks)
+
+
+def synthetic_corpus(n_texts: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [synthetic_label_text(rng) for _ in range(n_texts)]
+
+
+LEGACY_ABV_PATTERNS = [
+    r'(\d+(?:\.\d+)?)\s*%\s*(?:abv|alc|alcohol|by\s*vol)',
+    r'(?:abv|alc|alcohol)\s*[:\.]?\s*(\d+(?:\.\d+)?)\s*%',
+    r'(\d+(?:\.\d+)?)\s*%\s*(?:vol|volume)',
+    r'(\d+(?:\.\d+)?)\s*%',
+]
+LEGACY_NET_CONTENTS_PATTERNS = [
+    r'(\d+(?:\.\d+)?)\s*(ml|milliliters?|millilitres?)',
+    r'(\d+(?:\.\d+)?)\s*(cl|centiliters?|centilitres?)',
+    r'(\d+(?:\.\d+)?)\s*(l|liters?|litres?)',
+    r'(\d+(?:\.\d+)?)\s*(fl\.?\s*oz\.?|fluid\s*ounces?)',
+    r'(\d+(?:\.\d+)?)\s*(oz\.?|ounces?)',
+    r'(\d+(?:\.\d+)?)\s*(gal\.?|gallons?)',
+]
+LEGACY_UNIT_MAP = {
+    'ml': 'mL', 'milliliter': 'mL', 'millilitre': 'mL', 'milliliters': 'mL', 'millilitres': 'mL',
+    'cl': 'cL', 'centiliter': 'cL', 'centilitre': 'cL', 'centiliters': 'cL', 'centilitres': 'cL',
+    'l': 'L', 'liter': 'L', 'litre': 'L', 'liters': 'L', 'litres': 'L',
+    'fl oz': 'fl oz', 'fl. oz': 'fl oz', 'fl. oz.': 'fl oz', 'fluid ounce': 'fl oz', 'fluid ounces': 'fl oz',
+    'oz': 'oz', 'oz.': 'oz', 'ounce': 'oz', 'ounces': 'oz',
+    'gal': 'gal', 'gal.': 'gal', 'gallon': 'gal', 'gallons': 'gal',
+}
+
+
+def extract_with_legacy_patterns(text: str) -> ExtractedLabelFields:
+    """The per-field extraction LabelDataExtractionService used before LabelFieldExtractor, kept as the reference"""
+    normalized_text = re.sub(r'\s+', ' ', text).strip()
+    text_lower = normalized_text.lower()
+
+    brand_name: Optional[str] = None
+    for match in re.findall(r'\b([A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)*)\b', text):
+        ignore_words = {'GOVERNMENT', 'WARNING', 'CONTAINS', 'ALCOHOL', 'ABV', 'ALC', 'VOL', 'NET', 'CONTENTS'}
+        if len(match) >= 3 and not all(w.upper() in ignore_words for w in match.split()):
+            brand_name = match
+            break
+    if brand_name is None:
+        for line in [line.strip() for line in text.split('\n') if line.strip()]:
+            if 'GOVERNMENT' not in line.upper() and 'WARNING' not in line.upper() and len(line) >= 3:
+                brand_name = line
+                break
+
+    alcohol_content: Optional[str] = None
+    for pattern in LEGACY_ABV_PATTERNS:
+        match = re.search(pattern, text_lower)
+        if match:
+            alcohol_content = f"{match.group(1)}%"
+            break
+
+    net_contents: Optional[str] = None
+    for pattern in LEGACY_NET_CONTENTS_PATTERNS:
+        match = re.search(pattern, text_lower)
+        if match:
+            unit = match.group(2)
+            net_contents = f"{match.group(1)} {LEGACY_UNIT_MAP.get(unit.lower().strip(), unit)}"
+            break
+
+    product_class = next((label for pattern, label in PRODUCT_CLASSES if pattern in text_lower), None)
+
+    warnings: Optional[str] = None
+    if 'GOVERNMENT WARNING' in text:
+        match = re.search(r'GOVERNMENT WARNING[:\s]*(.+?)(?:\n\n|\Z)', text, re.DOTALL | re.IGNORECASE)
+        warnings = f"GOVERNMENT WARNING: {match.group(1).strip()}" if match else "GOVERNMENT WARNING"
+
+    return ExtractedLabelFields(
+        brand_name=brand_name,
+        alcohol_content=alcohol_content,
+        net_contents=net_contents,
+        product_class=product_class,
+        warnings=warnings
+    )
+
+
+EXTRACTORS: Dict[str, Callable[[str], ExtractedLabelFields]] = {
+    "legacy": extract_with_legacy_patterns,
+    "single-pass": LabelFieldExtractor.extract,
+}
+
+
+def benchmark_extractor(name: str, corpus: List[str], repeat: int) -> dict:
+    extract = EXTRACTORS[name]
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            extract(text)
+        timings.append(time.perf_counter() - started)
+    return {
+        "extractor": name,
+        "median_us_per_text": statistics.median(timings) / len(corpus) * 1_000_000,
+    }
+
+
+def main():
+    """Main entry point for the CLI tool."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark label field extraction from OCR text: single pass vs per-field patterns",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 5000 synthetic label texts
+  python benchmark_label_field_extraction.py
+
+  # A larger corpus, 10 runs
+  python benchmark_label_field_extraction.py --texts 50000 --repeat 10
+        """
+    )
+
+    parser.add_argument(
+        "--texts",
+        type=int,
+        default=5000,
+        help="Number of synthetic OCR label texts (default: 5000)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Passes over the corpus per extractor, the median time is reported (default: 5)"
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the results as JSON"
+    )
+
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.texts)
+    results = [benchmark_extractor(name, corpus, args.repeat) for name in EXTRACTORS]
+    differing_texts = sum(
+        1 for text in corpus if extract_with_legacy_patterns(text) != LabelFieldExtractor.extract(text)
+    )
+    speedup = results[0]["median_us_per_text"] / results[1]["median_us_per_text"]
+
+    if args.json:
+        print(json.dumps(
+            {"texts": len(corpus), "results": results, "speedup": speedup, "differing_texts": differing_texts},
+            indent=2
+        ))
+        return
+
+    print(f"{'extractor':<12} {'median us/text':>15}")
+    for result in results:
+        print(f"{result['extractor']:<12} {result['median_us_per_text']:>15.1f}")
+    print(f"speedup: {speedup:.1f}x, texts with different fields: {differing_texts} of {len(corpus)}")
+
+
+if __name__ == "__main__":
+    main()
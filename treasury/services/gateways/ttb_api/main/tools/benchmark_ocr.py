@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Command-line tool to compare OCR preprocessing pipelines and Tesseract profiles on a set of label images.
+
+For every pipeline (see OcrPreprocessingConfig.presets) and OCR profile (see OcrProfile.presets) each
+fixture image is run through OcrAdapter, and the OCR time, Tesseract's average confidence and the share
+of expected label fields (brand name, product class, alcohol content, net contents) found by the
+pytesseract analysis are reported.
+Requires the tesseract binary.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_preprocessing import OcrPreprocessingConfig
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_profiles import OcrProfile
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling import OcrTilingConfig, OcrProcessPool
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import \
+    BrandDataStrict, ProductInfoStrict
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_pytesseract import \
+    LabelDataAnalysisPytesseractService
+
+DEFAULT_FIXTURES_DIR = Path(__file__).resolve().parents[2] / "test" / "assets"
+FIXTURES_FILE_NAME = "ocr_benchmark_fixtures.json"
+
+# Result flag checked for each expected field
+FIELD_RESULT_FLAGS = {
+    "brand_name": "brand_name_found",
+    "product_class_type": "product_class_found",
+    "alcohol_content_abv": "alcohol_content_found",
+    "net_contents": "net_contents_found",
+}
+
+
+def load_fixtures(fixtures_dir: Path) -> dict[str, dict]:
+    """Expected label fields per image file name, from ocr_benchmark_fixtures.json in the fixtures dir"""
+    return json.loads((fixtures_dir / FIXTURES_FILE_NAME).read_text())
+
+
+def expected_brand_data(expected: dict) -> BrandDataStrict:
+    return BrandDataStrict(
+        brand_name=expected.get("brand_name"),
+        products=[ProductInfoStrict(
+            product_class_type=expected.get("product_class_type"),
+            alcohol_content_abv=expected.get("alcohol_content_abv"),
+            net_contents=expected.get("net_contents"),
+        )]
+    )
+
+
+def benchmark_pipeline(
+        pipeline: str,
+        profile: str,
+        fixtures_dir: Path,
+        fixtures: dict[str, dict],
+        repeat: int,
+        tiling: OcrTilingConfig
+) -> dict:
+    ocr_adapter = OcrAdapter(
+        preprocessing=OcrPreprocessingConfig.from_preset(pipeline),
+        tiling=tiling,
+        profile=OcrProfile.from_preset(profile)
+    )
+    analysis_service = LabelDataAnalysisPytesseractService(ocr_adapter=ocr_adapter)
+    timings, confidences = [], []
+    fields_expected = fields_matched = 0
+
+    for file_name, expected in fixtures.items():
+        with Image.open(fixtures_dir / file_name) as image:
+            image.load()
+            for _ in range(repeat):
+                started = time.perf_counter()
+                ocr_result = ocr_adapter.extract_text_from_image(image)
+                timings.append(time.perf_counter() - started)
+            if not ocr_result.success:
+                raise RuntimeError(f"OCR failed for {file_name}: {ocr_result.error_message}")
+        confidences.append(ocr_result.average_confidence)
+
+        analysis = analysis_service._analyze_ocr_text(ocr_result.full_text, expected_brand_data(expected))
+        for field, flag in FIELD_RESULT_FLAGS.items():
+            if expected.get(field):
+                fields_expected += 1
+                fields_matched += int(getattr(analysis, flag))
+
+    return {
+        "pipeline": pipeline,
+        "profile": profile,
+        "tiled": tiling.enabled,
+        "median_ocr_seconds": statistics.median(timings),
+        "total_ocr_seconds": sum(timings) / repeat,
+        "average_confidence": statistics.mean(confidences),
+        "field_match_accuracy": fields_matched / fields_expected if fields_expected else 0.0,
+    }
+
+
+def main():
+    """Main entry point for the CLI tool."""
+    presets = list(OcrPreprocessingConfig.presets())
+    profiles = list(OcrProfile.presets())
+    parser = argparse.ArgumentParser(
+        description="Benchmark OCR preprocessing pipelines and Tesseract profiles",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # All pipelines on the test fixtures
+  python benchmark_ocr.py
+
+  # Two pipelines on your own images (with an ocr_benchmark_fixtures.json next to them)
+  python benchmark_ocr.py --fixtures-dir ./labels --pipelines none full --repeat 3
+
+  # Speed and accuracy of each Tesseract profile, without preprocessing
+  python benchmark_ocr.py --pipelines none --profiles default sparse block fast
+
+  # Parallel tiled OCR, every image split into tiles of at most 512 px
+  python benchmark_ocr.py --pipelines none --tiled --tile-size 512
+        """
+    )
+
+    parser.add_argument(
+        "--fixtures-dir",
+        type=Path,
+        default=DEFAULT_FIXTURES_DIR,
+        help=f"Directory with the images and {FIXTURES_FILE_NAME} (default: the test assets)"
+    )
+
+    parser.add_argument(
+        "--pipelines",
+        nargs="+",
+        choices=presets,
+        default=presets,
+        help=f"Preprocessing presets to compare (default: all of {', '.join(presets)})"
+    )
+
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=profiles,
+        default=["default"],
+        help=f"OCR profiles to compare, each with every pipeline (default: default; available: {', '.join(profiles)})"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="OCR runs per image, the median time is reported (default: 1)"
+    )
+
+    parser.add_argument(
+        "--tiled",
+        action="store_true",
+        help="OCR the images as overlapping tiles across worker processes"
+    )
+
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=OcrTilingConfig().tile_size_px,
+        help="Tile size in pixels with --tiled (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the results as JSON"
+    )
+
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures_dir)
+    # With --tiled every image is tiled, however small
+    tiling = OcrTilingConfig(enabled=args.tiled, min_image_side_px=0, tile_size_px=args.tile_size)
+    try:
+        results = [
+            benchmark_pipeline(pipeline, profile, args.fixtures_dir, fixtures, args.repeat, tiling)
+            for pipeline in args.pipelines
+            for profile in args.profiles
+        ]
+    except RuntimeError as e:
+        print(f"✗ {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        OcrProcessPool.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{len(fixtures)} images, {args.repeat} run(s) each\n")
+    print(f"{'pipeline':<16} {'profile':<8} {'median s/image':>15} {'total s':>9} {'avg confidence':>15} {'field accuracy':>15}")
+    for result in results:
+        label = f"{result['pipeline']} tiled" if result['tiled'] else result['pipeline']
+        print(
+            f"{label:<16} {result['profile']:<8} {result['median_ocr_seconds']:>15.3f} {result['total_ocr_seconds']:>9.2f} "
+            f"{result['average_confidence']:>15.1f} {result['field_match_accuracy']:>15.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
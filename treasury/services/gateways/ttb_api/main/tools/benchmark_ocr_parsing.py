@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Command-line tool to compare the parse time and memory of OCR results: the columnar OcrTextLayout
+against building a Pydantic word, line and block object per entry.
+
+Synthetic pytesseract image_to_data output of a given number of words is parsed both ways. The time
+(median over --repeat runs) and the memory held by the parsed result (measured with tracemalloc) are
+reported, for the layout alone and with its Pydantic views built. No tesseract binary is needed.
+"""
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import OcrTextLayout, WORD_LEVEL
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import (
+    BoundingBox,
+    OcrBlock,
+    OcrLine,
+    OcrWord
+)
+
+WORDS_PER_LINE = 8
+LINES_PER_BLOCK = 5
+
+
+def synthetic_ocr_data(n_words: int, seed: int = 0) -> Dict[str, list]:
+    """image_to_data style output with block, paragraph and line entries before their words"""
+    rng = random.Random(seed)
+    ocr_data: Dict[str, list] = {key: [] for key in ('level', 'page_num', 'block_num', 'par_num', 'line_num',
+                                                      'word_num', 'left', 'top', 'width', 'height', 'conf', 'text')}
+
+    def add(level, block_num, line_num, word_num, left, top, width, height, conf, text):
+        for key, value in (('level', level), ('page_num', 1), ('block_num', block_num), ('par_num', 1),
+                           ('line_num', line_num), ('word_num', word_num), ('left', left), ('top', top),
+                           ('width', width), ('height', height), ('conf', conf), ('text', text)):
+            ocr_data[key].append(value)
+
+    for i in range(n_words):
+        line, word_num = divmod(i, WORDS_PER_LINE)
+        block, line_num = divmod(line, LINES_PER_BLOCK)
+        if word_num == 0:
+            add(4, block + 1, line_num + 1, 0, 0, line * 40, 1000, 30, -1, '')
+        add(WORD_LEVEL, block + 1, line_num + 1, word_num + 1, word_num * 120, line * 40,
+            rng.randint(40, 110), 30, round(rng.uniform(30, 99), 6), f"word{i}")
+    return ocr_data
+
+
+def parse_with_models(ocr_data: Dict) -> tuple[List[OcrWord], List[OcrBlock]]:
+    """The per-object parsing OcrAdapter used before OcrTextLayout, kept as the reference"""
+    all_words: List[OcrWord] = []
+    lines_dict: Dict[tuple, Dict] = {}
+    for i in range(len(ocr_data['text'])):
+        text = str(ocr_data['text'][i]).strip()
+        conf = int(ocr_data['conf'][i])
+        if not text or conf == -1 or int(ocr_data['level'][i]) != WORD_LEVEL:
+            continue
+        word = OcrWord(
+            text=text,
+            confidence=float(conf),
+            bounding_box=BoundingBox(
+                x=int(ocr_data['left'][i]),
+                y=int(ocr_data['top'][i]),
+                width=int(ocr_data['width'][i]),
+                height=int(ocr_data['height'][i])
+            )
+        )
+        all_words.append(word)
+        line_key = (int(ocr_data['block_num'][i]), int(ocr_data['par_num'][i]), int(ocr_data['line_num'][i]))
+        lines_dict.setdefault(line_key, []).append(word)
+
+    block_lines: Dict[int, List[OcrLine]] = {}
+    for (block_num, _, _), words in lines_dict.items():
+        min_x = min(w.bounding_box.x for w in words)
+        min_y = min(w.bounding_box.y for w in words)
+        max_x = max(w.bounding_box.x2 for w in words)
+        max_y = max(w.bounding_box.y2 for w in words)
+        block_lines.setdefault(block_num, []).append(OcrLine(
+            text=' '.join(w.text for w in words),
+            words=words,
+            confidence=sum(w.confidence for w in words) / len(words),
+            bounding_box=BoundingBox(x=min_x, y=min_y, width=max_x - min_x, height=max_y - min_y)
+        ))
+
+    blocks = []
+    for lines in block_lines.values():
+        min_x = min(line.bounding_box.x for line in lines)
+        min_y = min(line.bounding_box.y for line in lines)
+        max_x = max(line.bounding_box.x2 for line in lines)
+        max_y = max(line.bounding_box.y2 for line in lines)
+        blocks.append(OcrBlock(
+            text='\n'.join(line.text for line in lines),
+            lines=lines,
+            confidence=sum(line.confidence for line in lines) / len(lines),
+            bounding_box=BoundingBox(x=min_x, y=min_y, width=max_x - min_x, height=max_y - min_y)
+        ))
+    return all_words, blocks
+
+
+def parse_with_layout(ocr_data: Dict) -> OcrTextLayout:
+    return OcrTextLayout.from_ocr_data(ocr_data)
+
+
+def parse_with_layout_and_views(ocr_data: Dict) -> tuple[OcrTextLayout, List[OcrWord], List[OcrBlock]]:
+    layout = OcrTextLayout.from_ocr_data(ocr_data)
+    words = layout.words()
+    return layout, words, layout.blocks(words)
+
+
+PARSERS: Dict[str, Callable[[Dict], object]] = {
+    "models": parse_with_models,
+    "layout": parse_with_layout,
+    "layout+views": parse_with_layout_and_views,
+}
+
+
+def benchmark_parser(name: str, ocr_data: Dict, repeat: int) -> dict:
+    parse = PARSERS[name]
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(ocr_data)
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    parsed = parse(ocr_data)
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+
+    return {
+        "parser": name,
+        "median_parse_ms": statistics.median(timings) * 1000,
+        "retained_kib": retained_bytes / 1024,
+        "peak_kib": peak_bytes / 1024,
+    }
+
+
+def main():
+    """Main entry point for the CLI tool."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark OCR result parsing: columnar layout vs Pydantic models",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 200, 2000 and 20000 words
+  python benchmark_ocr_parsing.py
+
+  # A dense label, 20 runs
+  python benchmark_ocr_parsing.py --words 5000 --repeat 20
+        """
+    )
+
+    parser.add_argument(
+        "--words",
+        type=int,
+        nargs="+",
+        default=[200, 2000, 20000],
+        help="Numbers of words per synthetic OCR result (default: 200 2000 20000)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Parses per size, the median time is reported (default: 5)"
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the results as JSON"
+    )
+
+    args = parser.parse_args()
+
+    results = []
+    for n_words in args.words:
+        ocr_data = synthetic_ocr_data(n_words)
+        for name in PARSERS:
+            results.append({"words": n_words, **benchmark_parser(name, ocr_data, args.repeat)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'words':>7} {'parser':<13} {'median ms':>10} {'retained KiB':>13} {'peak KiB':>10}")
+    for result in results:
+        print(
+            f"{result['words']:>7} {result['parser']:<13} {result['median_parse_ms']:>10.2f} "
+            f"{result['retained_kib']:>13.0f} {result['peak_kib']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
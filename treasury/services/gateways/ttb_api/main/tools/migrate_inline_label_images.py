@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Command-line tool to move label images stored inline as base64 in the job metadata to blob storage.
+
+Runs against the database and blob storage configured for the API (PG* and BLOB_STORAGE_* variables).
+Progress is checkpointed after every batch; running the tool again with the same checkpoint file
+resumes where the previous run stopped, retrying the jobs it left with inline images first.
+"""
+
+import argparse
+import sys
+
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_migration import (
+    DEFAULT_BATCH_SIZE,
+    LabelImageMigrationCheckpoint,
+    LabelImageMigrationProgress,
+    LabelImageMigrationService
+)
+
+
+def print_progress(progress: LabelImageMigrationProgress) -> None:
+    print(
+        f"  scanned {progress.jobs_scanned} jobs, migrated {progress.images_migrated} images "
+        f"({progress.bytes_migrated / 1024 / 1024:.1f} MB) - "
+        f"{progress.jobs_per_second:.1f} jobs/s, {progress.megabytes_per_second:.2f} MB/s"
+    )
+
+
+def main():
+    """Main entry point for the CLI tool."""
+    parser = argparse.ArgumentParser(
+        description="Migrate inline base64 label images to blob storage",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # See how much would be migrated
+  python migrate_inline_label_images.py --dry-run
+
+  # Migrate at most 20 jobs per second, resumable
+  python migrate_inline_label_images.py \\
+    --checkpoint-file ./label-image-migration.json \\
+    --max-jobs-per-second 20
+        """
+    )
+
+    parser.add_argument(
+        "--checkpoint-file",
+        default="label-image-migration-checkpoint.json",
+        help="File progress is saved to and resumed from (default: label-image-migration-checkpoint.json)"
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Jobs read per query (default: {DEFAULT_BATCH_SIZE})"
+    )
+
+    parser.add_argument(
+        "--max-jobs-per-second",
+        type=float,
+        default=None,
+        help="Throughput cap to limit the load on the database and blob storage (default: unlimited)"
+    )
+
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        help="Stop after scanning this many jobs in this run (default: all)"
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count the images that would be migrated, do not upload or write anything"
+    )
+
+    args = parser.parse_args()
+
+    checkpoint = LabelImageMigrationCheckpoint(args.checkpoint_file)
+    resumed_from = checkpoint.load()
+    if resumed_from.last_job_id and not args.dry_run:
+        print(f"Resuming after job {resumed_from.last_job_id} ({resumed_from.jobs_scanned} jobs scanned so far)")
+
+    print(f"Migrating inline label images{' (dry run)' if args.dry_run else ''}...")
+    try:
+        progress = LabelImageMigrationService().migrate(
+            checkpoint=checkpoint if not args.dry_run else LabelImageMigrationCheckpoint(None),
+            batch_size=args.batch_size,
+            max_jobs_per_second=args.max_jobs_per_second,
+            max_jobs=args.max_jobs,
+            dry_run=args.dry_run,
+            on_batch_done=print_progress
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted - run again with the same checkpoint file to resume")
+        sys.exit(130)
+
+    print("\n" + "=" * 80)
+    print("✓ DONE")
+    print(f"\n  Jobs scanned: {progress.jobs_scanned}")
+    print(f"  Jobs migrated: {progress.jobs_migrated}")
+    print(f"  Images migrated: {progress.images_migrated} ({progress.bytes_migrated / 1024 / 1024:.1f} MB)")
+    print(f"  Images failed: {progress.images_failed}")
+    print(f"  Jobs skipped (updated during migration): {progress.jobs_skipped_concurrent_update}")
+    print(f"  Throughput: {progress.jobs_per_second:.1f} jobs/s, {progress.megabytes_per_second:.2f} MB/s")
+
+    if progress.retry_job_ids:
+        print(f"\n{len(progress.retry_job_ids)} jobs still have inline images - run again with the same "
+              f"checkpoint file to retry them")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
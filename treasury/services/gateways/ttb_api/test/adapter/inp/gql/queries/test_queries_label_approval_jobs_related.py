@@ -11,6 +11,9 @@ from treasury.services.gateways.ttb_api.main.application.models.gql.label_approv
 from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.get_label_approval_job_request import (
     GetLabelApprovalJobResponse
 )
+from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.get_label_image_ocr_overlay_request import (
+    GetLabelImageOcrOverlayResponse
+)
 from treasury.services.gateways.ttb_api.main.application.usecases.label_approval_jobs import \
     LabelApprovalJobsService
 from treasury.services.gateways.ttb_api.test.testing.base_api_service_test_case import BaseApiServiceTestCase
@@ -378,3 +381,53 @@ class TestQueriesLabelApprovalJobsRelated(BaseApiServiceTestCase):
         # Verify service was called
         QueriesCommon._label_approval_jobs_service.get_label_approval_job.assert_called_once()
 
+    def test_get_label_image_ocr_overlay(self):
+        """Test getting the OCR overlay of a label image"""
+        test_job_id = uuid.uuid4()
+        overlay_url = f"https://blob.example.com/label-images/{'a' * 64}/ocr-overlay-v1-default-lines.jpg"
+
+        # Mock service response
+        mock_response = GetLabelImageOcrOverlayResponse(
+            overlay_url=overlay_url,
+            success=True,
+            message="OCR overlay retrieved successfully"
+        )
+        QueriesCommon._label_approval_jobs_service.get_label_image_ocr_overlay.return_value = mock_response
+
+        # GraphQL query
+        query = """
+            query GetOcrOverlay($input: GetLabelImageOcrOverlayInput!) {
+                getLabelImageOcrOverlay(input: $input) {
+                    overlayUrl
+                    success
+                    message
+                }
+            }
+        """
+
+        variables = {
+            "input": {
+                "jobId": str(test_job_id),
+                "drawLevel": "lines",
+                "showConfidence": False
+            }
+        }
+
+        # Execute query
+        response = self.post("/graphql", json={"query": query, "variables": variables})
+
+        # Verify response
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("data", data)
+        overlay_response = data["data"]["getLabelImageOcrOverlay"]
+        self.assertTrue(overlay_response["success"])
+        self.assertEqual(overlay_response["overlayUrl"], overlay_url)
+
+        # Verify the service got the drawing options, and the first image by default
+        QueriesCommon._label_approval_jobs_service.get_label_image_ocr_overlay.assert_called_once()
+        overlay_input = QueriesCommon._label_approval_jobs_service.get_label_image_ocr_overlay.call_args.kwargs["input"]
+        self.assertEqual(overlay_input.job_id, test_job_id)
+        self.assertEqual(overlay_input.image_index, 0)
+        self.assertEqual(overlay_input.draw_level.value, "lines")
+        self.assertFalse(overlay_input.show_confidence)
@@ -0,0 +1,91 @@
+import asyncio
+import base64
+import tempfile
+from unittest.mock import patch
+
+from treasury.services.gateways.ttb_api.main.adapter.inp.http.label_image_uploads_route import LabelImageUploadsRoute
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_upload_staging_adapter import \
+    LabelImageUploadStagingAdapter
+from treasury.services.gateways.ttb_api.main.application.config.api_service_config import ApiServiceConfig
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_uploads import LabelImageUploadsService
+from treasury.services.gateways.ttb_api.test.testing.base_api_service_test_case import BaseApiServiceTestCase
+
+PNG_1X1 = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+class TestLabelImageUploadsRoute(BaseApiServiceTestCase):
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(
+            *args,
+            api_service_config_base=ApiServiceConfig(),
+            **kwargs
+        )
+
+    def setUp(self):
+        super().setUp()
+        self._staging_dir = tempfile.TemporaryDirectory()
+        self.staging_adapter = LabelImageUploadStagingAdapter(staging_dir=self._staging_dir.name)
+        self.uploads_service = LabelImageUploadsService(label_image_upload_staging_adapter=self.staging_adapter)
+        LabelImageUploadsRoute._label_image_uploads_service = self.uploads_service
+
+    def tearDown(self):
+        self._staging_dir.cleanup()
+
+    def test_upload_label_image(self):
+        response = self.post("/uploads/label-images", content=PNG_1X1, headers={"Content-Type": "image/png"})
+
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertTrue(body["success"])
+        self.assertEqual(body["size_bytes"], len(PNG_1X1))
+
+        ingested = self.uploads_service.ingest_staged_upload(body["upload_id"], permitted_types=["png"])
+        self.assertEqual(ingested.data, PNG_1X1)
+        self.assertEqual(ingested.declared_content_type, "image/png")
+
+    def test_upload_without_authentication(self):
+        self._security_context.get_authenticated_entity_from_security_ctx.return_value = None
+
+        response = self.post("/uploads/label-images", content=PNG_1X1, headers={"Content-Type": "image/png"})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.json()["success"])
+        # nothing is staged for unauthenticated callers
+        self.assertEqual(list(self.staging_adapter._staging_dir.iterdir()), [])
+
+    def test_upload_is_authenticated_off_the_event_loop(self):
+        with patch(
+            'treasury.services.gateways.ttb_api.main.adapter.inp.http.label_image_uploads_route.asyncio.to_thread',
+            wraps=asyncio.to_thread
+        ) as to_thread:
+            response = self.post("/uploads/label-images", content=PNG_1X1, headers={"Content-Type": "image/png"})
+
+        self.assertEqual(response.status_code, 201)
+        # the first call, before the body is staged
+        self.assertEqual(to_thread.call_args_list[0].args[0].__name__, "_is_authenticated")
+
+    def test_upload_unsupported_content_type(self):
+        response = self.post("/uploads/label-images", content=b"BM...", headers={"Content-Type": "image/bmp"})
+
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(response.json()["success"])
+
+    @patch('treasury.services.gateways.ttb_api.main.application.usecases.label_image_uploads.MAX_IMAGE_SIZE_BYTES', 1024)
+    def test_upload_too_large_while_streaming(self):
+        def body():
+            # chunked - there is no Content-Length to reject up front
+            for _ in range(4):
+                yield b"\x00" * 512
+
+        response = self.post("/uploads/label-images", content=body(), headers={"Content-Type": "image/png"})
+
+        self.assertEqual(response.status_code, 413)
+        # nothing is left behind in the staging area
+        self.assertEqual(list(self.staging_adapter._staging_dir.iterdir()), [])
+
+    def test_ingest_unknown_upload(self):
+        with self.assertRaises(ValueError):
+            self.uploads_service.ingest_staged_upload("../../etc/passwd", permitted_types=["png"])
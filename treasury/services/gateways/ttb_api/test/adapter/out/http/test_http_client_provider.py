@@ -0,0 +1,47 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from treasury.services.gateways.ttb_api.main.adapter.out.http.http_client_provider import HttpClientProvider
+
+
+class TestHttpClientProvider(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        HttpClientProvider.close_all()
+
+    def test_client_is_shared_per_upstream(self):
+        client = HttpClientProvider.get_client(HttpClientProvider.IMAGE_DOWNLOADS)
+
+        self.assertIs(HttpClientProvider.get_client(HttpClientProvider.IMAGE_DOWNLOADS), client)
+        self.assertIsNot(HttpClientProvider.get_client(HttpClientProvider.BLOB_STORAGE), client)
+
+    def test_read_timeout_override(self):
+        client = HttpClientProvider.get_client("slow-upstream", read_timeout_seconds=123.0)
+
+        self.assertEqual(client.timeout.read, 123.0)
+
+    @patch.dict(os.environ, {
+        "HTTP_MAX_CONNECTIONS_PER_CLIENT": "7",
+        "HTTP_MAX_KEEPALIVE_CONNECTIONS_PER_CLIENT": "3"
+    })
+    def test_connection_limits_per_client(self):
+        with patch("treasury.services.gateways.ttb_api.main.adapter.out.http.http_client_provider.httpx.Client") as client:
+            HttpClientProvider.get_client("limited-upstream")
+
+        limits = client.call_args.kwargs["limits"]
+        self.assertEqual(limits.max_connections, 7)
+        self.assertEqual(limits.max_keepalive_connections, 3)
+
+    def test_closed_client_is_recreated(self):
+        client = HttpClientProvider.get_client(HttpClientProvider.IMAGE_DOWNLOADS)
+        HttpClientProvider.close_all()
+
+        self.assertTrue(client.is_closed)
+        new_client = HttpClientProvider.get_client(HttpClientProvider.IMAGE_DOWNLOADS)
+        self.assertIsNot(new_client, client)
+        self.assertFalse(new_client.is_closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
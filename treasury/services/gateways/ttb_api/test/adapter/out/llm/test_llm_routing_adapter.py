@@ -0,0 +1,150 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import Mock
+
+from treasury.services.gateways.ttb_api.main.adapter.out.llm.llm_routing_adapter import LlmRoutingAdapter, \
+    LlmRoutingMetrics
+
+
+class TestLlmRoutingAdapter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.llm_client = Mock()
+        self.metrics = LlmRoutingMetrics()
+
+    def _router(self, **kwargs) -> LlmRoutingAdapter:
+        return LlmRoutingAdapter(
+            llm_client=self.llm_client,
+            models=["small", "large"],
+            hedging_enabled=kwargs.pop("hedging_enabled", False),
+            metrics=self.metrics,
+            **kwargs
+        )
+
+    def _metrics_for(self, model: str):
+        return next(m for m in self.metrics.snapshot() if m.model == model)
+
+    def test_first_tier_accepted(self):
+        self.llm_client.complete_prompt.return_value = '{"ok": true}'
+
+        result = self._router().complete_prompt(prompt="p", parse=json.loads)
+
+        self.assertEqual(result, {"ok": True})
+        self.llm_client.complete_prompt.assert_called_once_with(prompt="p", model="small")
+        self.assertEqual(self._metrics_for("small").escalations, 0)
+
+    def test_escalates_on_schema_invalid_output(self):
+        self.llm_client.complete_prompt_with_media.side_effect = lambda prompt, model, **kwargs: \
+            "not json" if model == "small" else '{"ok": true}'
+
+        result = self._router().complete_prompt_with_media(prompt="p", parse=json.loads, media_url="https://x")
+
+        self.assertEqual(result, {"ok": True})
+        self.assertEqual(
+            [c.kwargs["model"] for c in self.llm_client.complete_prompt_with_media.call_args_list],
+            ["small", "large"]
+        )
+        self.assertEqual(self._metrics_for("small").escalations, 1)
+        self.assertEqual(self._metrics_for("small").rejected_outputs, 1)
+
+    def test_escalates_on_low_confidence_and_keeps_last_tier_answer(self):
+        self.llm_client.complete_prompt.side_effect = ['{"brand": "Unknown"}', '{"brand": "Unknown"}']
+
+        result = self._router().complete_prompt(
+            prompt="p",
+            parse=json.loads,
+            is_confident=lambda r: r["brand"] != "Unknown"
+        )
+
+        # No better model left - the last tier's answer is returned
+        self.assertEqual(result, {"brand": "Unknown"})
+        self.assertEqual(self.llm_client.complete_prompt.call_count, 2)
+
+    def test_escalates_on_request_failure_and_raises_on_last_tier(self):
+        self.llm_client.complete_prompt.side_effect = RuntimeError("upstream error")
+
+        with self.assertRaises(RuntimeError):
+            self._router().complete_prompt(prompt="p", parse=json.loads)
+
+        self.assertEqual(self.llm_client.complete_prompt.call_count, 2)
+        self.assertEqual(self._metrics_for("small").failures, 1)
+        self.assertEqual(self._metrics_for("large").failures, 1)
+
+    def test_hedged_request_wins_over_slow_primary(self):
+        release_primary = threading.Event()
+        calls = []
+
+        def complete_prompt(prompt, model):
+            calls.append(model)
+            if len(calls) == 1:
+                # the primary request is stuck in the slow tail
+                release_primary.wait(5)
+                return '{"from": "primary"}'
+            return '{"from": "hedge"}'
+
+        self.llm_client.complete_prompt.side_effect = complete_prompt
+
+        try:
+            result = self._router(hedging_enabled=True, hedge_deadline_seconds=0.05).complete_prompt(
+                prompt="p",
+                parse=json.loads
+            )
+        finally:
+            release_primary.set()
+
+        self.assertEqual(result, {"from": "hedge"})
+        self.assertEqual(calls, ["small", "small"])
+        self.assertEqual(self._metrics_for("small").hedged_requests, 1)
+        self.assertEqual(self._metrics_for("small").hedge_wins, 1)
+
+    def test_no_hedge_when_primary_is_fast(self):
+        self.llm_client.complete_prompt.return_value = '{"ok": true}'
+
+        self._router(hedging_enabled=True, hedge_deadline_seconds=5).complete_prompt(prompt="p", parse=json.loads)
+
+        self.llm_client.complete_prompt.assert_called_once()
+        self.assertEqual(self._metrics_for("small").hedged_requests, 0)
+
+
+class TestLlmRoutingMetrics(unittest.TestCase):
+
+    def test_latency_percentiles(self):
+        metrics = LlmRoutingMetrics()
+        for latency in range(1, 101):
+            metrics.record_request("model", float(latency), succeeded=True)
+        metrics.record_request("model", 1000.0, succeeded=False)
+
+        snapshot = metrics.snapshot()[0]
+
+        self.assertEqual(snapshot.requests, 101)
+        self.assertEqual(snapshot.failures, 1)
+        # failed requests do not count towards latency percentiles
+        self.assertEqual(snapshot.p50_seconds, 50.0)
+        self.assertEqual(snapshot.p95_seconds, 95.0)
+        self.assertEqual(snapshot.p99_seconds, 99.0)
+        self.assertIsNone(metrics.latency_percentile("other-model", 95))
+
+    def test_metrics_are_logged_periodically(self):
+        metrics = LlmRoutingMetrics()
+        metrics.record_request("gpt-5-mini", 2.0, succeeded=True)
+        metrics.record_escalation("gpt-5-mini")
+
+        async def log_twice():
+            task = asyncio.create_task(LlmRoutingAdapter.log_metrics_periodically(0.01, metrics=metrics))
+            await asyncio.sleep(0.035)
+            task.cancel()
+
+        with self.assertLogs(LlmRoutingAdapter._metrics_logger, level="INFO") as logs:
+            asyncio.run(log_twice())
+
+        lines = [line for line in logs.output if "LLM routing metrics" in line]
+        self.assertGreaterEqual(len(lines), 2)
+        self.assertIn("model=gpt-5-mini requests=1 failures=0", lines[0])
+        self.assertIn("escalations=1", lines[0])
+        self.assertIn("p50_seconds=2.0", lines[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,8 @@ from treasury.services.gateways.ttb_api.main.adapter.out.ocr import (
     OcrBlock,
     BoundingBox
 )
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_preprocessing import OcrPreprocessingConfig
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling import OcrTilingConfig
 
 
 class TestOcrAdapter(unittest.TestCase):
@@ -562,5 +564,27 @@ class TestOcrAdapter(unittest.TestCase):
         self.assertIsNotNone(result.error_message)
 
 
+class TestOcrAdapterSettingsDigest(unittest.TestCase):
+
+    def test_digest_follows_preprocessing_and_enabled_tiling(self):
+        default = OcrAdapter(preprocessing=OcrPreprocessingConfig(), tiling=OcrTilingConfig()).settings_digest()
+
+        self.assertEqual(
+            OcrAdapter(preprocessing=OcrPreprocessingConfig(), tiling=OcrTilingConfig()).settings_digest(), default
+        )
+        self.assertNotEqual(
+            OcrAdapter(preprocessing=OcrPreprocessingConfig.from_preset("binarized")).settings_digest(), default
+        )
+        self.assertNotEqual(
+            OcrAdapter(preprocessing=OcrPreprocessingConfig(), tiling=OcrTilingConfig(enabled=True)).settings_digest(),
+            default
+        )
+        # Tile sizes do not matter while tiling is off
+        self.assertEqual(
+            OcrAdapter(preprocessing=OcrPreprocessingConfig(), tiling=OcrTilingConfig(tile_size_px=512)).settings_digest(),
+            default
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
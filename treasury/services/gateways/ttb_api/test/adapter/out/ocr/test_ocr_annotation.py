@@ -0,0 +1,134 @@
+import base64
+import unittest
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_annotation import (
+    OcrAnnotationRenderer,
+    annotation_font,
+    boxes_and_confidences
+)
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import OcrTextLayout
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import OcrResult
+
+RED = (255, 0, 0)
+
+# image_to_data output: LONDON DRY / GIN in block 2, reported first, and TANQUERAY in block 1
+OCR_DATA = {
+    'level': [5, 5, 5, 5],
+    'page_num': [1, 1, 1, 1],
+    'block_num': [2, 2, 2, 1],
+    'par_num': [1, 1, 1, 1],
+    'line_num': [1, 1, 2, 1],
+    'word_num': [1, 2, 1, 1],
+    'left': [200, 260, 210, 20],
+    'top': [10, 12, 40, 300],
+    'width': [50, 40, 60, 80],
+    'height': [20, 20, 22, 30],
+    'conf': [91.7, 88.2, 75.0, 96.0],
+    'text': ['LONDON', 'DRY', 'GIN', 'TANQUERAY'],
+}
+
+
+def _ocr_result() -> OcrResult:
+    return OcrResult.from_layout(
+        OcrTextLayout.from_ocr_data(OCR_DATA),
+        full_text="LONDON DRY GIN\n\nTANQUERAY",
+        average_confidence=87.5,
+        image_width=600,
+        image_height=400
+    )
+
+
+def _image_bytes(image_format="PNG") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (600, 400), "white").save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class TestOcrAnnotationRenderer(unittest.TestCase):
+
+    def test_boxes_from_the_layout_match_the_views(self):
+        ocr_result = _ocr_result()
+        views = OcrResult.model_validate(ocr_result.model_dump())
+        self.assertIsNone(views.layout)
+
+        for draw_level in ('words', 'lines', 'blocks'):
+            boxes, confidences = boxes_and_confidences(ocr_result, draw_level)
+            view_boxes, view_confidences = boxes_and_confidences(views, draw_level)
+            self.assertEqual(boxes.tolist(), view_boxes.tolist())
+            self.assertEqual(confidences, view_confidences)
+        self.assertEqual(len(boxes_and_confidences(ocr_result, 'lines')[0]), 3)
+
+    def test_render_draws_the_boxes_on_a_copy(self):
+        image = Image.new("L", (600, 400), 255)
+
+        annotated = OcrAnnotationRenderer(show_confidence=False).render(image, _ocr_result(), 'words')
+
+        self.assertEqual(annotated.mode, "RGB")
+        # Outline of the TANQUERAY word box (20, 300, 80x30), inside left untouched
+        self.assertEqual(annotated.getpixel((20, 315)), RED)
+        self.assertEqual(annotated.getpixel((100, 330)), RED)
+        self.assertEqual(annotated.getpixel((60, 315)), (255, 255, 255))
+        self.assertEqual(image.getpixel((20, 315)), 255)
+
+    def test_render_blocks_with_confidence_labels(self):
+        annotated = OcrAnnotationRenderer(box_color='#00ff00').render(_image_bytes(), _ocr_result(), 'blocks')
+
+        # The LONDON DRY / GIN block spans (200, 10) to (300, 62)
+        self.assertEqual(annotated.getpixel((200, 40)), (0, 255, 0))
+        self.assertEqual(annotated.getpixel((300, 40)), (0, 255, 0))
+        # Its label sits on a white background above the box (clamped to the top edge)
+        label = annotated.crop((200, 0, 240, 10))
+        self.assertIn((0, 255, 0), {color for _, color in label.getcolors(4096)})
+
+    def test_render_without_boxes(self):
+        ocr_result = OcrResult.from_layout(
+            OcrTextLayout.empty(), full_text="", average_confidence=0.0, image_width=600, image_height=400
+        )
+
+        annotated = OcrAnnotationRenderer().render(_image_bytes(), ocr_result)
+
+        self.assertEqual(annotated.getcolors(), [(600 * 400, (255, 255, 255))])
+
+    def test_render_invalid_image(self):
+        with self.assertRaises(ValueError):
+            OcrAnnotationRenderer().render(b"not an image", _ocr_result())
+
+    def test_font_is_loaded_once(self):
+        self.assertIs(annotation_font(), annotation_font())
+
+
+class TestOcrAdapterDrawing(unittest.TestCase):
+
+    def test_draw_from_url_uses_the_bytes_already_downloaded(self):
+        http_client = MagicMock()
+        adapter = OcrAdapter(http_client=http_client)
+
+        data_uri = adapter.draw_bounding_boxes_from_url(
+            "https://example.com/label.png", _ocr_result(), image_bytes=_image_bytes()
+        )
+
+        http_client.get.assert_not_called()
+        self.assertTrue(data_uri.startswith("data:image/jpeg;base64,"))
+        annotated = Image.open(BytesIO(base64.b64decode(data_uri.split(",", 1)[1])))
+        self.assertEqual(annotated.format, "JPEG")
+        self.assertEqual(annotated.size, (600, 400))
+
+    def test_draw_from_base64_keeps_the_format(self):
+        image_base64 = base64.b64encode(_image_bytes()).decode('ascii')
+
+        data_uri = OcrAdapter().draw_bounding_boxes_from_base64(
+            f"data:image/png;base64,{image_base64}", _ocr_result(), draw_level='lines', show_confidence=False
+        )
+
+        self.assertTrue(data_uri.startswith("data:image/png;base64,"))
+        annotated = Image.open(BytesIO(base64.b64decode(data_uri.split(",", 1)[1]))).convert("RGB")
+        self.assertEqual(annotated.getpixel((20, 315)), RED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import OcrTextLayout
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import OcrResult
+from treasury.services.gateways.ttb_api.main.tools.benchmark_ocr_parsing import (
+    parse_with_models,
+    synthetic_ocr_data
+)
+
+
+def ocr_data(*entries):
+    """image_to_data output from (level, block, par, line, left, top, width, height, conf, text) entries"""
+    keys = ('level', 'block_num', 'par_num', 'line_num', 'left', 'top', 'width', 'height', 'conf', 'text')
+    data = {key: [entry[i] for entry in entries] for i, key in enumerate(keys)}
+    data['page_num'] = [1] * len(entries)
+    data['word_num'] = list(range(len(entries)))
+    return data
+
+
+# Block 2 is reported before block 1; its two lines are interleaved with a skipped block entry
+OCR_DATA = ocr_data(
+    (2, 2, 1, 0, 0, 0, 500, 100, -1, ''),
+    (5, 2, 1, 1, 200, 10, 50, 20, 91.7, 'LONDON'),
+    (5, 2, 1, 1, 260, 12, 40, 20, 88.2, 'DRY'),
+    (5, 2, 1, 2, 210, 40, 60, 22, 75.0, 'GIN'),
+    (5, 2, 1, 2, 280, 40, 10, 22, 12.0, '  '),
+    (5, 1, 1, 1, 20, 300, 80, 30, 96.0, 'TANQUERAY'),
+    (5, 1, 1, 1, 110, 300, 30, 30, -1, 'noise'),
+)
+
+
+class TestOcrTextLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.layout = OcrTextLayout.from_ocr_data(OCR_DATA)
+
+    def test_words_without_text_or_confidence_are_skipped(self):
+        self.assertEqual(self.layout.texts, ['LONDON', 'DRY', 'GIN', 'TANQUERAY'])
+        # Confidences are truncated to whole numbers
+        self.assertEqual(self.layout.confidences.tolist(), [91.0, 88.0, 75.0, 96.0])
+
+    def test_lines_and_blocks_in_order_of_appearance(self):
+        self.assertEqual(self.layout.line_ids.tolist(), [0, 0, 1, 2])
+        self.assertEqual(self.layout.line_block_ids.tolist(), [0, 0, 1])
+        self.assertEqual(self.layout.line_texts(), ['LONDON DRY', 'GIN', 'TANQUERAY'])
+        self.assertEqual(self.layout.block_texts(), ['LONDON DRY\nGIN', 'TANQUERAY'])
+
+    def test_group_boxes_and_confidences(self):
+        self.assertEqual(self.layout.line_boxes.tolist(), [[200, 10, 100, 22], [210, 40, 60, 22], [20, 300, 80, 30]])
+        self.assertEqual(self.layout.block_boxes.tolist(), [[200, 10, 100, 52], [20, 300, 80, 30]])
+        self.assertEqual(self.layout.line_confidences.tolist(), [89.5, 75.0, 96.0])
+        # The mean of the block's line confidences
+        self.assertEqual(self.layout.block_confidences.tolist(), [82.25, 96.0])
+
+    def test_text_in_reading_order(self):
+        layout = OcrTextLayout.from_ocr_data(ocr_data(
+            (5, 1, 1, 1, 500, 100, 50, 20, 90, 'right'),
+            (5, 2, 1, 1, 10, 500, 50, 20, 90, 'bottom'),
+            (5, 3, 1, 1, 10, 100, 50, 20, 90, 'left'),
+        ))
+
+        self.assertEqual(layout.text_in_reading_order(), 'left\n\nright\n\nbottom')
+
+    def test_views_match_the_per_object_models(self):
+        data = synthetic_ocr_data(500)
+        layout = OcrTextLayout.from_ocr_data(data)
+        words, blocks = parse_with_models(data)
+
+        layout_words = layout.words()
+        self.assertEqual([word.model_dump() for word in layout_words], [word.model_dump() for word in words])
+        self.assertEqual(
+            [block.model_dump() for block in layout.blocks(layout_words)],
+            [block.model_dump() for block in blocks]
+        )
+
+    def test_empty_ocr_data(self):
+        layout = OcrTextLayout.from_ocr_data({key: [] for key in OCR_DATA})
+
+        self.assertEqual((layout.word_count, layout.line_count, layout.block_count), (0, 0, 0))
+        self.assertEqual(layout.blocks(), [])
+        self.assertEqual(layout.text_in_reading_order(), '')
+
+
+class TestOcrResultViews(unittest.TestCase):
+
+    def _result(self) -> OcrResult:
+        return OcrResult.from_layout(
+            OcrTextLayout.from_ocr_data(OCR_DATA),
+            full_text="LONDON DRY GIN TANQUERAY",
+            average_confidence=87.5,
+            image_width=600,
+            image_height=400
+        )
+
+    def test_views_are_built_on_first_access(self):
+        result = self._result()
+
+        self.assertEqual(result.word_count, 4)
+        self.assertIsNone(result._words)
+        self.assertIsNone(result._blocks)
+
+        first_line = result.blocks[0].lines[0]
+        self.assertEqual(first_line.text, 'LONDON DRY')
+        self.assertIs(first_line.words[0], result.words[0])
+        self.assertEqual([word.text for word in result.low_confidence_words], ['GIN'])
+
+    def test_serialization_includes_the_views(self):
+        dumped = self._result().model_dump()
+
+        self.assertEqual(len(dumped['words']), 4)
+        self.assertEqual(dumped['blocks'][1]['text'], 'TANQUERAY')
+        self.assertEqual(OcrResult.model_validate(dumped).blocks[0].lines[1].words[0].text, 'GIN')
+
+    def test_views_given_as_values(self):
+        result = OcrResult(
+            full_text="", blocks=[], words=[], average_confidence=0.0, image_width=0, image_height=0, success=False
+        )
+
+        self.assertEqual((result.words, result.blocks, result.word_count), ([], [], 0))
+        self.assertIsNone(result.layout)
+
+
+if __name__ == '__main__':
+    unittest.main()
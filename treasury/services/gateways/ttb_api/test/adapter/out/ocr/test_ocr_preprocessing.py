@@ -0,0 +1,128 @@
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_preprocessing import (
+    OcrImagePreprocessor,
+    OcrPreprocessingConfig,
+    PreprocessedOcrImage
+)
+
+
+def text_lines_image(size=(800, 600), line_height=12, first_line_y=200, fill=0, background=255) -> Image.Image:
+    """Dark bars standing in for lines of text"""
+    image = Image.new('L', size, background)
+    draw = ImageDraw.Draw(image)
+    for y in range(first_line_y, size[1] - 50, 40):
+        draw.rectangle([100, y, size[0] - 100, y + line_height], fill=fill)
+    return image
+
+
+class TestOcrImagePreprocessor(unittest.TestCase):
+
+    def test_noop_config_returns_the_image_unchanged(self):
+        image = text_lines_image()
+
+        preprocessed = OcrImagePreprocessor(OcrPreprocessingConfig.from_preset("none")).preprocess(image)
+
+        self.assertIs(preprocessed.image, image)
+        self.assertTrue(preprocessed.is_identity)
+
+    def test_unknown_preset_is_rejected(self):
+        with self.assertRaises(ValueError):
+            OcrPreprocessingConfig.from_preset("sharpest")
+
+    def test_estimate_text_height(self):
+        gray = np.asarray(text_lines_image(line_height=12))
+
+        self.assertEqual(OcrImagePreprocessor.estimate_text_height_px(gray), 13.0)
+
+    def test_rescale_to_target_text_height(self):
+        image = text_lines_image(line_height=12)
+
+        preprocessed = OcrImagePreprocessor(
+            OcrPreprocessingConfig(grayscale=True, target_text_height_px=26)
+        ).preprocess(image)
+
+        self.assertAlmostEqual(preprocessed.scale, 2.0, places=1)
+        self.assertEqual(preprocessed.image.size, (1600, 1200))
+
+    def test_rescale_respects_max_side(self):
+        preprocessed = OcrImagePreprocessor(
+            OcrPreprocessingConfig(grayscale=True, target_text_height_px=100, max_side_px=1000)
+        ).preprocess(text_lines_image(line_height=12))
+
+        self.assertEqual(max(preprocessed.image.size), 1000)
+
+    def test_deskew_estimates_the_rotation_that_straightens_the_text(self):
+        for angle in (3, -5):
+            skewed = np.asarray(text_lines_image(first_line_y=50).rotate(angle, fillcolor=255))
+            self.assertEqual(OcrImagePreprocessor.estimate_skew_degrees(skewed, max_degrees=10), -angle)
+        straight = np.asarray(text_lines_image(first_line_y=50))
+        self.assertEqual(OcrImagePreprocessor.estimate_skew_degrees(straight, max_degrees=10), 0.0)
+
+    def test_boxes_are_mapped_back_to_original_coordinates(self):
+        # A dot above the text lines, found at (591, 91) in the skewed input
+        image = text_lines_image()
+        ImageDraw.Draw(image).rectangle([600, 100, 610, 110], fill=0)
+        skewed = image.rotate(4, fillcolor=255)
+
+        preprocessed = OcrImagePreprocessor(
+            OcrPreprocessingConfig(grayscale=True, target_text_height_px=26, deskew=True)
+        ).preprocess(skewed)
+        processed = np.asarray(preprocessed.image)
+        search_from_x = int(450 * preprocessed.scale)
+        ys, xs = np.nonzero(processed[:int(170 * preprocessed.scale), search_from_x:] < 128)
+        center_x, center_y = int(xs.mean()) + search_from_x, int(ys.mean())
+
+        mapped = preprocessed.map_ocr_data_to_original(
+            {'left': [center_x - 12], 'top': [center_y - 12], 'width': [24], 'height': [24], 'text': ['.']}
+        )
+
+        self.assertAlmostEqual(mapped['left'][0] + mapped['width'][0] / 2, 591, delta=2)
+        self.assertAlmostEqual(mapped['top'][0] + mapped['height'][0] / 2, 91, delta=2)
+        self.assertEqual(mapped['text'], ['.'])
+
+    def test_identity_mapping_returns_data_unchanged(self):
+        ocr_data = {'left': [1], 'top': [2], 'width': [3], 'height': [4]}
+
+        preprocessed = PreprocessedOcrImage(image=Image.new('L', (10, 10)), original_size=(10, 10))
+
+        self.assertIs(preprocessed.map_ocr_data_to_original(ocr_data), ocr_data)
+
+    def test_adaptive_threshold_handles_uneven_lighting(self):
+        # A stroke that is darker than its surroundings, on a background going from grey to white -
+        # the right end of the stroke is brighter than the left end of the background
+        gradient = np.tile(np.linspace(120, 255, 400), (200, 1))
+        gray = gradient.copy()
+        gray[95:105, 20:380] -= 50
+        gray = np.clip(gray, 0, 255).astype(np.uint8)
+
+        binary = OcrImagePreprocessor.adaptive_threshold(gray, window_px=31, offset=10)
+
+        self.assertGreater(gray[100, 370], gray[20, 30])
+        self.assertTrue(np.all(binary[95:105, 30:370] == 0))
+        self.assertTrue(np.all(binary[20:60, :] == 255))
+
+    def test_adaptive_threshold_inverts_light_text_on_dark_background(self):
+        gray = np.asarray(text_lines_image(fill=255, background=0))
+
+        binary = OcrImagePreprocessor.adaptive_threshold(gray, window_px=31, offset=10)
+
+        self.assertGreater((binary == 255).mean(), 0.5)
+        self.assertEqual(binary[206, 400], 0)
+
+    def test_median_filter_removes_speckle(self):
+        gray = np.full((50, 50), 255, dtype=np.uint8)
+        gray[10, 10] = 0
+        gray[20:30, 20:30] = 0
+
+        filtered = OcrImagePreprocessor.median_filter_3x3(gray)
+
+        self.assertEqual(filtered[10, 10], 255)
+        self.assertTrue(np.all(filtered[21:29, 21:29] == 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import shlex
+import unittest
+from unittest.mock import patch
+
+from PIL import Image
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_preprocessing import OcrPreprocessingConfig
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_profiles import (
+    LABEL_TEXT_WHITELIST,
+    OcrProfile,
+    OcrProfileSelector
+)
+
+EMPTY_OCR_DATA = {key: [] for key in ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                                      'left', 'top', 'width', 'height', 'conf', 'text')}
+
+
+class TestOcrProfile(unittest.TestCase):
+
+    def test_default_profile_passes_no_options(self):
+        profile = OcrProfile.from_preset("default")
+
+        self.assertEqual(profile.tesseract_config(), "")
+        self.assertIsNone(profile.languages)
+
+    def test_tesseract_config_survives_pytesseract_argument_splitting(self):
+        config = OcrProfile.from_preset("fast").tesseract_config()
+
+        self.assertEqual(shlex.split(config), [
+            "--psm", "11",
+            "--oem", "1",
+            "-c", f"tessedit_char_whitelist={LABEL_TEXT_WHITELIST}",
+            "-c", "tessedit_do_invert=0",
+        ])
+
+    def test_unknown_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            OcrProfile.from_preset("fastest")
+
+
+class TestOcrProfileSelector(unittest.TestCase):
+
+    def setUp(self):
+        self.selector = OcrProfileSelector(
+            default_profile=OcrProfile.from_preset("default"),
+            profiles_by_product_class=OcrProfileSelector.parse_profiles_by_product_class(
+                "beer=sparse, London Dry Gin=fast,gin=block"
+            )
+        )
+
+    def test_exact_class_match_wins(self):
+        self.assertEqual(self.selector.profile_for("london dry gin").name, "fast")
+        self.assertEqual(self.selector.profile_for("Beer").name, "sparse")
+
+    def test_class_containing_a_mapped_class_as_words(self):
+        self.assertEqual(self.selector.profile_for("Lager Beer").name, "sparse")
+        self.assertEqual(self.selector.profile_for("Old Tom Gin").name, "block")
+        self.assertEqual(self.selector.profile_for("Ginger Ale").name, "default")
+
+    def test_unmapped_or_missing_class_gets_the_default(self):
+        self.assertEqual(self.selector.profile_for("Vodka").name, "default")
+        self.assertEqual(self.selector.profile_for(None).name, "default")
+
+    def test_invalid_mapping_is_rejected(self):
+        with self.assertRaises(ValueError):
+            OcrProfileSelector.parse_profiles_by_product_class("beer:sparse")
+
+
+class TestOcrAdapterProfiles(unittest.TestCase):
+
+    @patch('treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter.pytesseract.image_to_string',
+           return_value="")
+    @patch('treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter.pytesseract.image_to_data',
+           return_value=EMPTY_OCR_DATA)
+    def test_profile_settings_are_passed_to_tesseract(self, mock_image_to_data, mock_image_to_string):
+        ocr_adapter = OcrAdapter(
+            preprocessing=OcrPreprocessingConfig.from_preset("none"),
+            profile=OcrProfile.from_preset("default")
+        )
+        sparse = OcrProfile.from_preset("sparse")
+
+        ocr_adapter.extract_text_from_image(Image.new('L', (100, 100), 255), profile=sparse)
+        ocr_adapter.extract_text_from_image(Image.new('L', (100, 100), 255))
+
+        first_call, second_call = mock_image_to_data.call_args_list
+        self.assertEqual((first_call.kwargs['lang'], first_call.kwargs['config']), ("eng", "--psm 11 --oem 1"))
+        self.assertEqual((second_call.kwargs['lang'], second_call.kwargs['config']), (None, ""))
+        self.assertEqual(mock_image_to_string.call_args_list[0].kwargs['config'], "--psm 11 --oem 1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pytesseract
+from PIL import Image, ImageDraw
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter import OcrAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_preprocessing import OcrPreprocessingConfig
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling import (
+    OcrTiledRecognizer,
+    OcrTilingConfig,
+    TILE_BLOCK_NUM_STRIDE
+)
+
+# Words as (left, top, width, height), each drawn in its own grey level - some straddle tile edges
+WORDS = [
+    (100, 100, 150, 30),
+    (780, 300, 160, 30),    # in the overlap of the first two tile columns
+    (1010, 600, 120, 30),   # across the edge of the first tile column
+    (1700, 830, 140, 30),   # in the overlap of the tile rows
+    (2300, 1400, 90, 30),
+]
+
+
+def words_image(size=(2500, 1500)) -> Image.Image:
+    image = Image.new('L', size, 255)
+    draw = ImageDraw.Draw(image)
+    for i, (left, top, width, height) in enumerate(WORDS):
+        draw.rectangle([left, top, left + width - 1, top + height - 1], fill=10 * (i + 1))
+    return image
+
+
+def fake_image_to_data(image, **kwargs):
+    """image_to_data stand-in reporting every grey rectangle of the tile (or its visible part) as a word"""
+    gray = np.asarray(image)
+    ocr_data = {key: [] for key in ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                                    'left', 'top', 'width', 'height', 'conf', 'text')}
+    for value in np.unique(gray[gray < 255]):
+        ys, xs = np.nonzero(gray == value)
+        for key, item in (('level', 5), ('page_num', 1), ('block_num', 1), ('par_num', 1),
+                          ('line_num', int(value)), ('word_num', 1), ('left', int(xs.min())),
+                          ('top', int(ys.min())), ('width', int(xs.max() - xs.min() + 1)),
+                          ('height', int(ys.max() - ys.min() + 1)), ('conf', 90), ('text', f"w{value}")):
+            ocr_data[key].append(item)
+    return ocr_data
+
+
+class TestOcrTiledRecognizer(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.recognizer = OcrTiledRecognizer(
+            OcrTilingConfig(enabled=True, min_image_side_px=2000, tile_size_px=1024, overlap_px=200),
+            executor=self.executor
+        )
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_tile_cores_partition_the_image(self):
+        tiles = OcrTiledRecognizer.plan_tiles(2500, 1500, tile_size=1024, overlap=200)
+
+        owners = np.zeros((1500, 2500), dtype=int)
+        for tile in tiles:
+            self.assertLessEqual(tile.x + tile.width, 2500)
+            self.assertLessEqual(tile.y + tile.height, 1500)
+            self.assertTrue(tile.x <= tile.core_x0 < tile.core_x1 <= tile.x + tile.width)
+            self.assertTrue(tile.y <= tile.core_y0 < tile.core_y1 <= tile.y + tile.height)
+            owners[tile.core_y0:tile.core_y1, tile.core_x0:tile.core_x1] += 1
+
+        self.assertEqual(len(tiles), 6)
+        self.assertTrue(np.all(owners == 1))
+
+    def test_image_smaller_than_a_tile_is_one_tile(self):
+        tiles = OcrTiledRecognizer.plan_tiles(800, 600, tile_size=1024, overlap=200)
+
+        self.assertEqual(len(tiles), 1)
+        self.assertEqual((tiles[0].core_x1, tiles[0].core_y1), (800, 600))
+
+    def test_only_large_images_are_tiled_when_enabled(self):
+        self.assertTrue(self.recognizer.should_tile(Image.new('L', (2500, 1500))))
+        self.assertFalse(self.recognizer.should_tile(Image.new('L', (1500, 1500))))
+        self.assertFalse(OcrTiledRecognizer(OcrTilingConfig()).should_tile(Image.new('L', (2500, 1500))))
+
+    @patch('treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling.pytesseract.image_to_data',
+           side_effect=fake_image_to_data)
+    def test_words_are_merged_once_in_image_coordinates(self, mock_image_to_data):
+        ocr_data = self.recognizer.recognize(words_image())
+
+        self.assertEqual(mock_image_to_data.call_count, 6)
+        boxes = sorted(zip(ocr_data['left'], ocr_data['top'], ocr_data['width'], ocr_data['height']))
+        self.assertEqual(boxes, sorted(WORDS))
+        self.assertEqual(len(set(ocr_data['text'])), len(WORDS))
+        # Blocks of different tiles stay apart - the words belong to tiles 0, 1 and 5
+        self.assertEqual(
+            sorted(set(ocr_data['block_num'])),
+            [1, TILE_BLOCK_NUM_STRIDE + 1, 5 * TILE_BLOCK_NUM_STRIDE + 1]
+        )
+
+
+class TestOcrAdapterTiling(unittest.TestCase):
+
+    @patch('treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_adapter.pytesseract.image_to_string')
+    @patch('treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling.pytesseract.image_to_data',
+           side_effect=fake_image_to_data)
+    def test_large_image_is_recognized_as_tiles(self, mock_image_to_data, mock_image_to_string):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            ocr_adapter = OcrAdapter(
+                preprocessing=OcrPreprocessingConfig.from_preset("none"),
+                tiled_recognizer=OcrTiledRecognizer(OcrTilingConfig(enabled=True), executor=executor)
+            )
+            result = ocr_adapter.extract_text_from_image(words_image())
+
+        self.assertTrue(result.success)
+        self.assertEqual(len(result.words), len(WORDS))
+        self.assertEqual((result.image_width, result.image_height), (2500, 1500))
+        # Full text in reading order, without another pass over the whole image
+        self.assertEqual(result.full_text.split(), ['w10', 'w20', 'w30', 'w40', 'w50'])
+        mock_image_to_string.assert_not_called()
+
+    @patch('treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_tiling.pytesseract.image_to_data',
+           side_effect=pytesseract.TesseractNotFoundError())
+    def test_missing_tesseract_in_a_worker_is_reported(self, mock_image_to_data):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            ocr_adapter = OcrAdapter(
+                preprocessing=OcrPreprocessingConfig.from_preset("none"),
+                tiled_recognizer=OcrTiledRecognizer(OcrTilingConfig(enabled=True), executor=executor)
+            )
+            result = ocr_adapter.extract_text_from_image(words_image())
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error_message, "Tesseract OCR not installed or not found in PATH")
+
+
+if __name__ == '__main__':
+    unittest.main()
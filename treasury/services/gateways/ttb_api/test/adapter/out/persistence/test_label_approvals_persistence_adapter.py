@@ -1,5 +1,8 @@
 import unittest
 import uuid
+from unittest.mock import Mock
+
+from sqlalchemy.dialects import postgresql
 from sqlmodel import SQLModel
 from sqlalchemy.orm import Session
 
@@ -8,7 +11,9 @@ from treasury.services.gateways.ttb_api.main.adapter.out.persistence.label_appro
     LabelApprovalJobsPersistenceAdapter
 from treasury.services.gateways.ttb_api.main.application.models.domain.entity_descriptor import EntityDescriptor
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import LabelApprovalJob, \
-    JobMetadata, LabelApprovalStatus
+    JobMetadata, LabelApprovalStatus, LabelImage
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict, \
+    ProductInfoStrict
 
 
 class TestLabelApprovalJobsPersistenceAdapter(unittest.TestCase):
@@ -617,3 +622,106 @@ class TestLabelApprovalJobsPersistenceAdapter(unittest.TestCase):
         self.assertEqual(jobs[0].id, created3.id)
         self.assertEqual(jobs[1].id, created2.id)
         self.assertEqual(jobs[2].id, created1.id)
+
+    def test_list_jobs_with_inline_images(self):
+        """Test keyset pagination over jobs that still hold base64 label images"""
+        created_by = EntityDescriptor.of_user(id=str(self.test_user_id), org_id=self.test_org_id)
+        inline_job_ids = []
+        for i in range(3):
+            metadata = JobMetadata(label_images=[LabelImage(base64="data:image/png;base64,iVBORw0KGgo=")])
+            job = LabelApprovalJob(brand_name=f"Inline {i}", product_class="beer", job_metadata=metadata)
+            inline_job_ids.append(self.adapter.create_approval_job(job=job, created_by=created_by).id)
+        metadata = JobMetadata(label_images=[LabelImage(image_url="https://blob.example/label.png")])
+        job = LabelApprovalJob(brand_name="Uploaded", product_class="beer", job_metadata=metadata)
+        self.adapter.create_approval_job(job=job, created_by=created_by)
+
+        first_batch = self.adapter.list_jobs_with_inline_images(limit=2)
+        second_batch = self.adapter.list_jobs_with_inline_images(after_job_id=first_batch[-1].id, limit=2)
+
+        self.assertEqual([j.id for j in first_batch + second_batch], sorted(inline_job_ids))
+        self.assertIsInstance(first_batch[0].get_job_metadata(), JobMetadata)
+
+    def test_label_image_predicate_on_postgresql(self):
+        """Test that PostgreSQL matches label images with a JSON path, not the serialized text"""
+        session = Mock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+
+        predicate = LabelApprovalJobsPersistenceAdapter._has_label_image_with(session, "base64")
+
+        sql = str(predicate.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        self.assertIn("jsonb_path_exists(CAST(label_approval_jobs.metadata AS JSONB)", sql)
+        self.assertIn("$.label_images[*] ? (@.base64 != null)", sql)
+        self.assertNotIn("LIKE", sql)
+
+    def test_list_jobs_with_pending_uploads(self):
+        """Test that the jobs waiting for a spooled upload follow the label images of the metadata"""
+        created_by = EntityDescriptor.of_user(id=str(self.test_user_id), org_id=self.test_org_id)
+        pending_metadata = JobMetadata(label_images=[LabelImage(pending_upload_key="label-images/abc.png")])
+        pending = self.adapter.create_approval_job(
+            job=LabelApprovalJob(brand_name="Pending", product_class="beer", job_metadata=pending_metadata),
+            created_by=created_by
+        )
+        uploaded_metadata = JobMetadata(label_images=[LabelImage(image_url="https://blob.example/label.png")])
+        uploaded = self.adapter.create_approval_job(
+            job=LabelApprovalJob(brand_name="Uploaded", product_class="beer", job_metadata=uploaded_metadata),
+            created_by=created_by
+        )
+        self.assertEqual([j.id for j in self.adapter.list_jobs_with_pending_uploads()], [pending.id])
+
+        self.assertTrue(self.adapter.set_job_metadata_if_unchanged(
+            job_id=pending.id,
+            job_metadata=uploaded_metadata.model_dump(),
+            expected_updated_at=pending.updated_at
+        ))
+        self.assertEqual(self.adapter.list_jobs_with_pending_uploads(), [])
+
+        self.adapter.set_job_metadata(job_id=uploaded.id, job_metadata=pending_metadata.model_dump(), updated_by=created_by)
+        self.assertEqual([j.id for j in self.adapter.list_jobs_with_pending_uploads()], [uploaded.id])
+
+    def test_list_job_label_data(self):
+        """Test keyset pagination over the given and extracted label data of jobs"""
+        created_by = EntityDescriptor.of_user(id=str(self.test_user_id), org_id=self.test_org_id)
+        given = BrandDataStrict(brand_name="Old Fox", products=[ProductInfoStrict(net_contents="750 mL")])
+        extracted = BrandDataStrict(brand_name="OLD FOX", products=[ProductInfoStrict(net_contents="75 cl")])
+        metadata = JobMetadata(product_info=given, label_images=[LabelImage(extracted_product_info=extracted)])
+        analyzed = self.adapter.create_approval_job(
+            job=LabelApprovalJob(brand_name="Old Fox", product_class="bourbon", job_metadata=metadata),
+            created_by=created_by
+        )
+        pending = self.adapter.create_approval_job(
+            job=LabelApprovalJob(brand_name="New", product_class="gin", job_metadata=JobMetadata()),
+            created_by=created_by
+        )
+
+        first_batch = self.adapter.list_job_label_data(limit=1)
+        second_batch = self.adapter.list_job_label_data(after_job_id=first_batch[-1][0], limit=5)
+
+        label_data = {job_id: (given_info, extracted_info) for job_id, given_info, extracted_info in first_batch + second_batch}
+        self.assertEqual(sorted(label_data), sorted([analyzed.id, pending.id]))
+        self.assertEqual(label_data[analyzed.id][0]["brand_name"], "Old Fox")
+        self.assertEqual(label_data[analyzed.id][1]["products"][0]["net_contents"], "75 cl")
+        self.assertEqual(label_data[pending.id], (None, None))
+
+    def test_set_job_metadata_if_unchanged(self):
+        """Test that the conditional metadata rewrite does not clobber concurrent updates"""
+        created_by = EntityDescriptor.of_user(id=str(self.test_user_id), org_id=self.test_org_id)
+        job = LabelApprovalJob(brand_name="Brand", product_class="beer", job_metadata=JobMetadata(reviewer_id="a"))
+        created = self.adapter.create_approval_job(job=job, created_by=created_by)
+
+        self.assertTrue(self.adapter.set_job_metadata_if_unchanged(
+            job_id=created.id,
+            job_metadata=JobMetadata(reviewer_id="b").model_dump(),
+            expected_updated_at=created.updated_at
+        ))
+        updated = self.adapter.get_approval_job_by_id(job_id=created.id)
+        self.assertEqual(updated.get_job_metadata().reviewer_id, "b")
+        self.assertEqual(updated.updated_at, created.updated_at)
+
+        self.adapter.set_job_status(job_id=created.id, status=LabelApprovalStatus.approved, updated_by=created_by)
+        self.assertFalse(self.adapter.set_job_metadata_if_unchanged(
+            job_id=created.id,
+            job_metadata=JobMetadata(reviewer_id="c").model_dump(),
+            expected_updated_at=created.updated_at
+        ))
+        self.assertEqual(self.adapter.get_approval_job_by_id(job_id=created.id).get_job_metadata().reviewer_id, "b")
+
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import unittest
+
+from treasury.services.gateways.ttb_api.main.adapter.out.pubsub.in_process_pubsub_adapter import \
+    InProcessPubSubAdapter
+
+
+class TestInProcessPubSubAdapter(unittest.TestCase):
+    """Test the in-process publish/subscribe adapter"""
+
+    def test_publish_delivers_to_topic_subscribers_only(self):
+        async def scenario():
+            adapter = InProcessPubSubAdapter()
+            subscription = await adapter.subscribe("jobs/1")
+            other_subscription = await adapter.subscribe("jobs/2")
+
+            adapter.publish("jobs/1", "first")
+            adapter.publish("jobs/1", "second")
+
+            received = [await asyncio.wait_for(anext(subscription), 1), await asyncio.wait_for(anext(subscription), 1)]
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(anext(other_subscription), 0.05)
+            return received
+
+        self.assertEqual(asyncio.run(scenario()), ["first", "second"])
+
+    def test_publish_from_worker_thread(self):
+        """Publishers run on the analysis worker threads, not on the subscriber's event loop"""
+        async def scenario():
+            adapter = InProcessPubSubAdapter()
+            subscription = await adapter.subscribe("jobs/1")
+            publisher = threading.Thread(target=adapter.publish, args=("jobs/1", "from-thread"))
+            publisher.start()
+            publisher.join()
+            return await asyncio.wait_for(anext(subscription), 1)
+
+        self.assertEqual(asyncio.run(scenario()), "from-thread")
+
+    def test_close_removes_subscriber(self):
+        async def scenario():
+            adapter = InProcessPubSubAdapter()
+            subscription = await adapter.subscribe("jobs/1")
+            self.assertEqual(adapter.subscriber_count("jobs/1"), 1)
+            await subscription.close()
+            self.assertEqual(adapter.subscriber_count("jobs/1"), 0)
+            # Publishing without subscribers is a no-op
+            adapter.publish("jobs/1", "nobody listening")
+
+        asyncio.run(scenario())
+
+    def test_slow_subscriber_drops_oldest_messages(self):
+        async def scenario():
+            adapter = InProcessPubSubAdapter(max_queued_messages=2)
+            subscription = await adapter.subscribe("jobs/1")
+            for message in ["1", "2", "3"]:
+                adapter.publish("jobs/1", message)
+            # let the loop run the thread-safe deliveries
+            await asyncio.sleep(0)
+            return [await anext(subscription), await anext(subscription)]
+
+        self.assertEqual(asyncio.run(scenario()), ["2", "3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
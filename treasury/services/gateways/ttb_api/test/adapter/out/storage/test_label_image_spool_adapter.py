@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_spool_adapter import \
+    LabelImageSpoolAdapter
+
+
+class TestLabelImageSpoolAdapter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.adapter = LabelImageSpoolAdapter(spool_dir=self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_spool_read_list_delete(self):
+        self.adapter.spool("label-images/abc.png", b"png-bytes", "image/png")
+
+        self.assertEqual(self.adapter.read("label-images/abc.png"), b"png-bytes")
+        entries = self.adapter.list_entries()
+        self.assertEqual([(e.key, e.content_type, e.size_bytes) for e in entries],
+                         [("label-images/abc.png", "image/png", 9)])
+
+        self.adapter.delete("label-images/abc.png")
+        self.assertIsNone(self.adapter.read("label-images/abc.png"))
+        self.assertEqual(self.adapter.list_entries(), [])
+
+    def test_rejects_keys_escaping_the_spool_dir(self):
+        with self.assertRaises(ValueError):
+            self.adapter.spool("../outside.png", b"png-bytes", "image/png")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.local_filesystem_blob_storage_adapter import \
+    LocalFilesystemBlobStorageAdapter
+
+
+class TestLocalFilesystemBlobStorageAdapter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = Path(self._temp_dir.name)
+        self.adapter = LocalFilesystemBlobStorageAdapter(root_dir=self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_upload_image_is_content_addressed(self):
+        sha256 = hashlib.sha256(b"jpg-bytes").hexdigest()
+
+        first_url = self.adapter.upload_image(image_data=b"jpg-bytes", content_type="image/jpeg")
+        second_url = self.adapter.upload_image(image_data=b"jpg-bytes", content_type="image/jpeg")
+
+        self.assertEqual(first_url, second_url)
+        self.assertTrue(first_url.endswith(f"/label-images/{sha256}.jpg"))
+        self.assertEqual((self.root_dir / "label-images" / f"{sha256}.jpg").read_bytes(), b"jpg-bytes")
+        self.assertEqual(len(list((self.root_dir / "label-images").iterdir())), 1)
+
+    def test_upload_image_skips_existing_object(self):
+        url = self.adapter.upload_image(image_data=b"png-bytes", content_type="image/png", sha256="abc")
+        stored_path = self.root_dir / "label-images" / "abc.png"
+        modified_at = stored_path.stat().st_mtime_ns
+
+        self.assertEqual(self.adapter.upload_image(image_data=b"png-bytes", content_type="image/png", sha256="abc"), url)
+        self.assertEqual(stored_path.stat().st_mtime_ns, modified_at)
+
+    def test_get_url(self):
+        self.assertIsNone(self.adapter.get_url("label-images/missing.png"))
+
+        adapter = LocalFilesystemBlobStorageAdapter(root_dir=self._temp_dir.name, base_url="http://localhost:9000/blobs/")
+        self.assertEqual(adapter.put("label-images/abc.png", b"png", "image/png"), "http://localhost:9000/blobs/label-images/abc.png")
+        self.assertEqual(adapter.get_url("label-images/abc.png"), "http://localhost:9000/blobs/label-images/abc.png")
+
+    def test_head_and_read_range(self):
+        self.assertIsNone(self.adapter.head("label-images/missing.png"))
+        self.assertIsNone(self.adapter.read_range("label-images/missing.png", 0, 4))
+
+        self.adapter.put("label-images/abc.png", b"png-bytes", "image/png")
+
+        self.assertEqual(self.adapter.head("label-images/abc.png").size_bytes, 9)
+        self.assertEqual(self.adapter.read_range("label-images/abc.png", 0, 3), b"png")
+        self.assertEqual(self.adapter.read_range("label-images/abc.png", 4, 100), b"bytes")
+
+    def test_key_outside_root_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.adapter.put("../escape.png", b"png", "image/png")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import Mock
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.resilient_blob_storage_adapter import \
+    ResilientBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.application.utils.circuit_breaker import CircuitBreaker, \
+    CircuitOpenError
+
+
+class TestResilientBlobStorageAdapter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.inner = Mock()
+        self.adapter = ResilientBlobStorageAdapter(
+            self.inner,
+            circuit_breaker=CircuitBreaker(name="test", failure_threshold=2, max_attempts=3, sleep=lambda _: None)
+        )
+
+    def test_put_is_retried(self):
+        self.inner.put.side_effect = [RuntimeError("timeout"), "https://blob.example/a.jpg"]
+
+        url = self.adapter.put("a.jpg", b"data", "image/jpeg")
+
+        self.assertEqual(url, "https://blob.example/a.jpg")
+        self.assertEqual(self.inner.put.call_count, 2)
+
+    def test_upload_image_fails_fast_once_the_circuit_is_open(self):
+        self.inner.get_url.side_effect = RuntimeError("down")
+        self.inner.put.side_effect = RuntimeError("down")
+
+        with self.assertRaises(RuntimeError):
+            self.adapter.upload_image(image_data=b"data", content_type="image/jpeg")
+        self.assertEqual(self.inner.put.call_count, 3)
+
+        self.inner.reset_mock()
+        with self.assertRaises(CircuitOpenError):
+            self.adapter.upload_image(image_data=b"data", content_type="image/jpeg")
+        self.inner.put.assert_not_called()
+
+    def test_presigned_uploads_are_delegated(self):
+        self.inner.supports_presigned_uploads = True
+
+        self.assertTrue(self.adapter.supports_presigned_uploads)
+        self.adapter.create_presigned_upload("uploads/a.jpg", "image/jpeg", 100, 60)
+        self.inner.create_presigned_upload.assert_called_once_with("uploads/a.jpg", "image/jpeg", 100, 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import boto3
+from moto import mock_aws
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.s3_blob_storage_adapter import S3BlobStorageAdapter
+
+
+@mock_aws
+class TestS3BlobStorageAdapter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.s3_client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test"
+        )
+        self.s3_client.create_bucket(Bucket="label-images-bucket")
+        self.adapter = S3BlobStorageAdapter(
+            bucket="label-images-bucket",
+            public_base_url="https://cdn.example",
+            s3_client=self.s3_client
+        )
+
+    def test_upload_image_is_content_addressed(self):
+        first_url = self.adapter.upload_image(image_data=b"png-bytes", content_type="image/png", sha256="abc")
+        second_url = self.adapter.upload_image(image_data=b"png-bytes", content_type="image/png", sha256="abc")
+
+        self.assertEqual(first_url, "https://cdn.example/label-images/abc.png")
+        self.assertEqual(second_url, first_url)
+        stored = self.s3_client.get_object(Bucket="label-images-bucket", Key="label-images/abc.png")
+        self.assertEqual(stored["Body"].read(), b"png-bytes")
+        self.assertEqual(stored["ContentType"], "image/png")
+
+    def test_read_and_delete(self):
+        self.assertIsNone(self.adapter.read("label-images/missing.png"))
+        self.assertIsNone(self.adapter.get_url("label-images/missing.png"))
+
+        self.adapter.put("label-images/abc.png", b"png-bytes", "image/png")
+        self.assertEqual(self.adapter.read("label-images/abc.png"), b"png-bytes")
+
+        self.adapter.delete("label-images/abc.png")
+        self.assertIsNone(self.adapter.read("label-images/abc.png"))
+
+    def test_head_and_read_range(self):
+        self.assertIsNone(self.adapter.head("label-images/missing.png"))
+        self.assertIsNone(self.adapter.read_range("label-images/missing.png", 0, 4))
+
+        self.adapter.put("label-images/abc.png", b"png-bytes", "image/png")
+
+        metadata = self.adapter.head("label-images/abc.png")
+        self.assertEqual(metadata.size_bytes, 9)
+        self.assertEqual(metadata.content_type, "image/png")
+        self.assertEqual(self.adapter.read_range("label-images/abc.png", 0, 3), b"png")
+        self.assertEqual(self.adapter.read_range("label-images/abc.png", 4, 100), b"bytes")
+
+    def test_upload_image_copies_direct_upload(self):
+        self.s3_client.put_object(Bucket="label-images-bucket", Key="uploads/label-images/1.png", Body=b"png-bytes")
+
+        url = self.adapter.upload_image(
+            image_data=b"png-bytes",
+            content_type="image/png",
+            sha256="abc",
+            source_key="uploads/label-images/1.png"
+        )
+
+        self.assertEqual(url, "https://cdn.example/label-images/abc.png")
+        self.assertEqual(self.adapter.read("label-images/abc.png"), b"png-bytes")
+
+    def test_create_presigned_upload(self):
+        presigned = self.adapter.create_presigned_upload(
+            key="uploads/label-images/1.png",
+            content_type="image/png",
+            max_size_bytes=1024,
+            expires_in_seconds=60
+        )
+
+        self.assertTrue(self.adapter.supports_presigned_uploads)
+        self.assertIn("label-images-bucket", presigned.url)
+        self.assertEqual(presigned.key, "uploads/label-images/1.png")
+        self.assertEqual(presigned.fields["key"], "uploads/label-images/1.png")
+        self.assertEqual(presigned.fields["Content-Type"], "image/png")
+        self.assertIn("policy", presigned.fields)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import hashlib
+import unittest
+
+import httpx
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.vercel_blob_storage_adapter import \
+    VercelBlobStorageAdapter
+
+
+class TestVercelBlobStorageAdapter(unittest.TestCase):
+
+    def _adapter(self, handler) -> VercelBlobStorageAdapter:
+        return VercelBlobStorageAdapter(token="token", http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    def test_upload_image(self):
+        requests_seen: list[httpx.Request] = []
+        sha256 = hashlib.sha256(b"png-bytes").hexdigest()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests_seen.append(request)
+            if request.method == "GET":
+                return httpx.Response(404, json={"error": {"code": "not_found"}})
+            return httpx.Response(200, json={"url": f"https://store.public.blob.vercel-storage.com/label-images/{sha256}.png"})
+
+        url = self._adapter(handler).upload_image(image_data=b"png-bytes", content_type="image/png")
+
+        self.assertEqual(url, f"https://store.public.blob.vercel-storage.com/label-images/{sha256}.png")
+        self.assertEqual([r.method for r in requests_seen], ["GET", "PUT"])
+        self.assertEqual(requests_seen[0].url.params["url"], f"label-images/{sha256}.png")
+        put_request = requests_seen[1]
+        self.assertEqual(put_request.url.path, f"/label-images/{sha256}.png")
+        self.assertEqual(put_request.content, b"png-bytes")
+        self.assertEqual(put_request.headers["authorization"], "Bearer token")
+        self.assertEqual(put_request.headers["x-content-type"], "image/png")
+        self.assertEqual(put_request.headers["x-add-random-suffix"], "0")
+
+    def test_upload_image_skips_existing_blob(self):
+        requests_seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests_seen.append(request)
+            return httpx.Response(200, json={"url": "https://store.public.blob.vercel-storage.com/label-images/abc.png"})
+
+        url = self._adapter(handler).upload_image(image_data=b"png-bytes", content_type="image/png", sha256="abc")
+
+        self.assertEqual(url, "https://store.public.blob.vercel-storage.com/label-images/abc.png")
+        self.assertEqual([r.method for r in requests_seen], ["GET"])
+
+    def test_upload_image_when_existence_check_fails(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"url": "https://store.public.blob.vercel-storage.com/label-images/abc.png"})
+
+        url = self._adapter(handler).upload_image(image_data=b"png-bytes", content_type="image/png", sha256="abc")
+
+        self.assertEqual(url, "https://store.public.blob.vercel-storage.com/label-images/abc.png")
+
+    def test_upload_image_http_error(self):
+        adapter = self._adapter(lambda request: httpx.Response(503))
+
+        with self.assertRaises(RuntimeError):
+            adapter.upload_image(image_data=b"png-bytes", content_type="image/png")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from treasury.services.gateways.ttb_api.main.application.usecases.government_warning_index import (
+    GOVERNMENT_WARNING_INDEX,
+    GOVERNMENT_WARNING_TEXT,
+    GovernmentWarningIndex
+)
+
+OCR_LABEL_TEXT = """OLD FOX
+KENTUCKY STRAIGHT BOURBON
+GOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL, WOMEN SHOULD
+NOT DRINK ALCOHOLIC BEV-
+ERAGES DURING PREGNANCY BECAUSE OF THE RISK OF BIRTH DEFECTS. (2) CONSUMPTION
+OF ALCOHOLIC BEVERAGES IMPAIRS YOUR ABILITY TO DRIVE A CAR OR OPERATE
+MACHINERY, AND MAY CAUSE HEALTH PROBLEMS.
+750 mL 45% ALC./VOL."""
+
+
+class TestGovernmentWarningIndex(unittest.TestCase):
+
+    def test_full_warning_across_lines(self):
+        verification = GOVERNMENT_WARNING_INDEX.verify(OCR_LABEL_TEXT)
+
+        self.assertEqual(verification.coverage, 1.0)
+        self.assertEqual(verification.variant, "statutory")
+        self.assertEqual(verification.missing_phrases, [])
+        self.assertTrue(verification.heading_all_caps)
+        self.assertTrue(verification.compliant)
+
+    def test_misread_and_missing_words(self):
+        ocr_text = OCR_LABEL_TEXT.replace("CONSUMPTION", "C0NSUMPTI0N").replace(", AND MAY CAUSE HEALTH PROBLEMS", "")
+
+        verification = GOVERNMENT_WARNING_INDEX.verify(ocr_text)
+
+        self.assertEqual(verification.missing_phrases, ["Consumption", "and may cause health problems"])
+        self.assertAlmostEqual(verification.coverage, 37 / 43)
+        self.assertFalse(verification.compliant)
+        self.assertIn("'and may cause health problems'", verification.describe())
+
+    def test_heading_must_be_all_caps(self):
+        verification = GOVERNMENT_WARNING_INDEX.verify(GOVERNMENT_WARNING_TEXT.replace("GOVERNMENT WARNING", "Government Warning"))
+
+        self.assertEqual(verification.coverage, 1.0)
+        self.assertTrue(verification.heading_found)
+        self.assertFalse(verification.heading_all_caps)
+        self.assertFalse(verification.compliant)
+
+    def test_accepted_variant(self):
+        verification = GOVERNMENT_WARNING_INDEX.verify(OCR_LABEL_TEXT.replace("(1) ", "").replace("(2) ", ""))
+
+        self.assertEqual(verification.variant, "unnumbered")
+        self.assertEqual(verification.coverage, 1.0)
+
+    def test_words_out_of_order_are_not_aligned(self):
+        index = GovernmentWarningIndex({"text": "one two three four five six"})
+
+        self.assertEqual(index.verify("four five six one two three").coverage, 0.5)
+        self.assertEqual(index.verify("one two three four five six").coverage, 1.0)
+
+    def test_no_warning(self):
+        verification = GOVERNMENT_WARNING_INDEX.verify("OLD FOX BOURBON 750 mL")
+
+        self.assertEqual(verification.coverage, 0.0)
+        self.assertFalse(verification.heading_found)
+        self.assertEqual(verification.missing_phrases, [GOVERNMENT_WARNING_TEXT.rstrip(".")])
+        self.assertEqual(verification.describe(), "The statutory warning text was not found.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
+    BrandDataStrict,
+    ProductInfoStrict,
+    ProductOtherInfo
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_analysis_matcher import (
+    FuzzyMatchingConfig,
+    LabelAnalysisMatcher
+)
+from treasury.services.gateways.ttb_api.main.tools.benchmark_label_analysis_matching import (
+    match_with_per_call_checks,
+    synthetic_brand_infos
+)
+from treasury.services.gateways.ttb_api.main.tools.benchmark_label_field_extraction import synthetic_corpus
+
+
+def brand_info(product_class_type="Gin", alcohol_content_abv="41.3%", net_contents="70 cl", warnings=None):
+    return BrandDataStrict(
+        brand_name="Stone's Throw",
+        products=[ProductInfoStrict(
+            product_class_type=product_class_type,
+            alcohol_content_abv=alcohol_content_abv,
+            net_contents=net_contents,
+            other_info=ProductOtherInfo(warnings=warnings)
+        )]
+    )
+
+
+class TestLabelAnalysisMatcher(unittest.TestCase):
+
+    def test_fields_found_across_line_breaks_and_case(self):
+        matches = LabelAnalysisMatcher(brand_info(warnings="GOVERNMENT WARNING")).match(
+            "STONE'S THROW\nLONDON DRY GIN\n41.3\n% ALC./VOL.\n70\nCL\n\nGOVERNMENT WARNING: ..."
+        )
+
+        self.assertTrue(matches.brand_name_found)
+        self.assertTrue(matches.product_class_found)
+        self.assertTrue(matches.alcohol_content_found)
+        self.assertTrue(matches.net_contents_found)
+        self.assertTrue(matches.health_warning_found)
+
+    def test_fields_not_found(self):
+        matches = LabelAnalysisMatcher(brand_info(warnings="GOVERNMENT WARNING")).match(
+            "Blue Harbor Vodka 40% ALC./VOL. 750 mL Government Warning: ..."
+        )
+
+        self.assertFalse(matches.brand_name_found)
+        self.assertFalse(matches.product_class_found)
+        self.assertFalse(matches.alcohol_content_found)
+        self.assertFalse(matches.net_contents_found)
+        # Only the all-caps heading counts
+        self.assertFalse(matches.health_warning_found)
+
+    def test_product_class_equivalents(self):
+        self.assertTrue(LabelAnalysisMatcher(brand_info(product_class_type="Beer")).match("Pilsner").product_class_found)
+        self.assertTrue(LabelAnalysisMatcher(brand_info(product_class_type="Dry Gin")).match("GIN").product_class_found)
+        self.assertFalse(LabelAnalysisMatcher(brand_info(product_class_type="Rum")).match("Gin").product_class_found)
+
+    def test_net_contents_unit_spellings(self):
+        matcher = LabelAnalysisMatcher(brand_info(net_contents="12 fl oz"))
+
+        self.assertTrue(matcher.match("12 FLUID OUNCES").net_contents_found)
+        self.assertTrue(matcher.match("12 FL. OZ.").net_contents_found)
+        self.assertTrue(matcher.match("12FLOZ").net_contents_found)
+        self.assertFalse(matcher.match("16 FL OZ").net_contents_found)
+
+    def test_fields_not_given_are_not_checked(self):
+        matches = LabelAnalysisMatcher(BrandDataStrict(brand_name=None, products=[])).match("GOVERNMENT WARNING")
+
+        self.assertIsNone(matches.brand_name_found)
+        self.assertIsNone(matches.product_class_found)
+        self.assertIsNone(matches.alcohol_content_found)
+        self.assertIsNone(matches.net_contents_found)
+        self.assertIsNone(matches.health_warning_found)
+        self.assertIsNone(LabelAnalysisMatcher(brand_info()).match("GOVERNMENT WARNING").health_warning_found)
+
+    def test_misread_brand_name_and_class_found_approximately(self):
+        matches = LabelAnalysisMatcher(brand_info(product_class_type="London Gin")).match(
+            "STONF'S THROW\nL0NDON DRY GlN\n41.3% ALC./VOL.",
+            word_texts=["STONF'S", "THROW", "L0NDON", "DRY", "GlN", "41.3%", "ALC./VOL."],
+            word_confidences=[81.0, 93.0, 70.0, 90.0, 66.0, 95.0, 88.0]
+        )
+
+        self.assertTrue(matches.brand_name_found)
+        self.assertEqual(matches.brand_name_match.text, "STONF'S THROW")
+        self.assertEqual(matches.brand_name_match.ocr_confidence, 87.0)
+        self.assertTrue(matches.product_class_found)
+        self.assertEqual(matches.product_class_match.text, "L0NDON DRY GlN")
+
+    def test_exact_matches_have_no_approximate_match(self):
+        matches = LabelAnalysisMatcher(brand_info()).match("STONE'S THROW GIN")
+
+        self.assertTrue(matches.brand_name_found)
+        self.assertIsNone(matches.brand_name_match)
+        self.assertIsNone(matches.product_class_match)
+
+    def test_low_confidence_words_not_matched_approximately(self):
+        matches = LabelAnalysisMatcher(brand_info()).match(
+            "STONF'S THROW", word_texts=["STONF'S", "THROW"], word_confidences=[12.0, 30.0]
+        )
+
+        self.assertFalse(matches.brand_name_found)
+        self.assertIsNone(matches.brand_name_match)
+
+    def test_approximate_matching_disabled(self):
+        matcher = LabelAnalysisMatcher(brand_info(), fuzzy_matching=FuzzyMatchingConfig(enabled=False))
+
+        self.assertFalse(matcher.match("STONF'S THROW").brand_name_found)
+
+    def test_numbers_only_matched_exactly(self):
+        matches = LabelAnalysisMatcher(brand_info()).match("STONE'S THROW GIN 41.8% ALC./VOL. 76 CL")
+
+        self.assertFalse(matches.alcohol_content_found)
+        self.assertFalse(matches.net_contents_found)
+
+    def test_same_matches_as_per_call_checks(self):
+        corpus = synthetic_corpus(100)
+        for given_brand_info in synthetic_brand_infos(20):
+            matcher = LabelAnalysisMatcher(
+                given_brand_info,
+                fuzzy_matching=FuzzyMatchingConfig(enabled=False),
+                compare_quantities_by_value=False
+            )
+            for text in corpus:
+                self.assertEqual(matcher.match(text), match_with_per_call_checks(given_brand_info, text))
+
+    def test_quantities_compared_by_value(self):
+        matcher = LabelAnalysisMatcher(brand_info(alcohol_content_abv="40%", net_contents="25.4 fl. oz."))
+
+        matches = matcher.match("STONE'S THROW GIN 40.0% ALC./VOL. 750 ML")
+
+        self.assertTrue(matches.alcohol_content_found)
+        self.assertTrue(matches.net_contents_found)
+        self.assertFalse(matcher.match("40.5% ALC./VOL. 700 ML").net_contents_found)
+        self.assertFalse(LabelAnalysisMatcher(
+            brand_info(alcohol_content_abv="40%"), compare_quantities_by_value=False
+        ).match("40.0% ALC./VOL.").alcohol_content_found)
+
+
+if __name__ == '__main__':
+    unittest.main()
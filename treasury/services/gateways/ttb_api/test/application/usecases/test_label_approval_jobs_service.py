@@ -1,14 +1,25 @@
+import asyncio
+import base64
+import hashlib
+import tempfile
 import unittest
 import uuid
 from datetime import datetime
 from unittest.mock import Mock, patch
 
+from treasury.services.gateways.ttb_api.main.adapter.out.pubsub.in_process_pubsub_adapter import \
+    InProcessPubSubAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_spool_adapter import \
+    LabelImageSpoolAdapter
 from treasury.services.gateways.ttb_api.main.application.models.domain.entity_descriptor import EntityDescriptor
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import (
     LabelApprovalJob,
     JobMetadata,
-    LabelImage
+    LabelImage,
+    LabelImageAnalysisResult
 )
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job_update import \
+    LabelApprovalJobStage
 from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
     BrandDataStrict,
     ProductInfoStrict,
@@ -30,8 +41,15 @@ from treasury.services.gateways.ttb_api.main.application.models.gql.label_approv
     ListLabelApprovalJobsInput,
     ListLabelApprovalJobsResponse
 )
+from treasury.services.gateways.ttb_api.main.application.models.gql.label_approvals.get_label_image_ocr_overlay_request import \
+    GetLabelImageOcrOverlayInput
+from treasury.services.gateways.ttb_api.main.application.usecases.label_approval_job_events import \
+    LabelApprovalJobEventsService
 from treasury.services.gateways.ttb_api.main.application.usecases.label_approval_jobs import \
     LabelApprovalJobsService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import \
+    LabelImageIngestionService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_variants import LabelImageVariants
 
 
 class TestLabelApprovalJobsServiceValidations(unittest.TestCase):
@@ -130,7 +148,7 @@ class TestLabelApprovalJobsServiceValidations(unittest.TestCase):
         mock_blob_adapter = Mock()
         mock_blob_adapter.upload_image.return_value = "https://blob.vercel-storage.com/label-images/test/label.jpg"
 
-        service = LabelApprovalJobsService(vercel_blob_storage_adapter=mock_blob_adapter)
+        service = LabelApprovalJobsService(blob_storage_adapter=mock_blob_adapter)
         jpg_base64 = "data:image/jpg;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
         images = service._upload_and_create_label_images(jpg_base64)
 
@@ -141,12 +159,40 @@ class TestLabelApprovalJobsServiceValidations(unittest.TestCase):
         self.assertEqual(images[0].image_url, "https://blob.vercel-storage.com/label-images/test/label.jpg")
         mock_blob_adapter.upload_image.assert_called_once()
 
+    def test_upload_and_create_label_images_with_variants(self):
+        """Test that the rendition URLs are recorded on the label image"""
+        mock_blob_adapter = Mock()
+        mock_blob_adapter.upload_image.return_value = "https://blob.example/label-images/abc.png"
+        mock_variants_service = Mock()
+        mock_variants_service.create_variants.return_value = LabelImageVariants(
+            thumbnail_url="https://blob.example/label-images/abc/thumbnail-v1.jpg",
+            display_url="https://blob.example/label-images/abc/display-v1.jpg",
+            ocr_url="https://blob.example/label-images/abc/ocr-v1.png"
+        )
+
+        service = LabelApprovalJobsService(
+            blob_storage_adapter=mock_blob_adapter,
+            label_image_variants_service=mock_variants_service
+        )
+        png_base64 = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+        images = service._upload_and_create_label_images(png_base64)
+
+        self.assertEqual(images[0].thumbnail_url, "https://blob.example/label-images/abc/thumbnail-v1.jpg")
+        self.assertEqual(images[0].display_url, "https://blob.example/label-images/abc/display-v1.jpg")
+        self.assertEqual(images[0].ocr_url, "https://blob.example/label-images/abc/ocr-v1.png")
+
+        # Without renditions the image is still usable through image_url
+        mock_variants_service.create_variants.side_effect = ValueError("cannot decode")
+        images = service._upload_and_create_label_images(png_base64)
+        self.assertEqual(images[0].image_url, "https://blob.example/label-images/abc.png")
+        self.assertIsNone(images[0].thumbnail_url)
+
     def test_upload_and_create_label_images_png_success(self):
         """Test uploading and creating label images from base64 PNG"""
         mock_blob_adapter = Mock()
         mock_blob_adapter.upload_image.return_value = "https://blob.vercel-storage.com/label-images/test/label.png"
 
-        service = LabelApprovalJobsService(vercel_blob_storage_adapter=mock_blob_adapter)
+        service = LabelApprovalJobsService(blob_storage_adapter=mock_blob_adapter)
         png_base64 = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
         images = service._upload_and_create_label_images(png_base64)
 
@@ -161,7 +207,7 @@ class TestLabelApprovalJobsServiceValidations(unittest.TestCase):
         mock_blob_adapter = Mock()
         mock_blob_adapter.upload_image.return_value = "https://blob.vercel-storage.com/label-images/test/label.gif"
 
-        service = LabelApprovalJobsService(vercel_blob_storage_adapter=mock_blob_adapter)
+        service = LabelApprovalJobsService(blob_storage_adapter=mock_blob_adapter)
         gif_base64 = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
         images = service._upload_and_create_label_images(gif_base64)
 
@@ -178,19 +224,80 @@ class TestLabelApprovalJobsServiceValidations(unittest.TestCase):
 
         self.assertEqual(len(images), 0)
 
-    def test_upload_and_create_label_images_fallback_on_upload_failure(self):
-        """Test fallback to base64 storage when blob upload fails"""
+    def test_upload_and_create_label_images_spools_on_upload_failure(self):
+        """Test that the image is spooled for a later upload when the blob upload fails"""
         mock_blob_adapter = Mock()
         mock_blob_adapter.upload_image.side_effect = RuntimeError("Upload failed")
 
-        service = LabelApprovalJobsService(vercel_blob_storage_adapter=mock_blob_adapter)
+        with tempfile.TemporaryDirectory() as spool_dir:
+            spool_adapter = LabelImageSpoolAdapter(spool_dir=spool_dir)
+            service = LabelApprovalJobsService(
+                blob_storage_adapter=mock_blob_adapter,
+                label_image_spool_adapter=spool_adapter
+            )
+            jpg_base64 = "data:image/jpg;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+            images = service._upload_and_create_label_images(jpg_base64)
+
+            self.assertEqual(len(images), 1)
+            self.assertIsNone(images[0].image_url)
+            self.assertIsNone(images[0].base64)
+            self.assertEqual(images[0].image_content_type, "image/jpg")
+            self.assertRegex(images[0].pending_upload_key, r"^label-images/[0-9a-f]{64}\.jpg$")
+            self.assertEqual(
+                spool_adapter.read(images[0].pending_upload_key),
+                base64.b64decode(jpg_base64.split(",", 1)[1])
+            )
+
+    def test_upload_and_create_label_images_fallback_to_base64_when_spool_fails(self):
+        """Test the last-resort fallback to base64 storage when neither upload nor spooling works"""
+        mock_blob_adapter = Mock()
+        mock_blob_adapter.upload_image.side_effect = RuntimeError("Upload failed")
+        mock_spool_adapter = Mock()
+        mock_spool_adapter.spool.side_effect = RuntimeError("Disk full")
+
+        service = LabelApprovalJobsService(
+            blob_storage_adapter=mock_blob_adapter,
+            label_image_spool_adapter=mock_spool_adapter
+        )
         jpg_base64 = "data:image/jpg;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
         images = service._upload_and_create_label_images(jpg_base64)
 
         self.assertEqual(len(images), 1)
         self.assertIsNone(images[0].image_url)
+        self.assertIsNone(images[0].pending_upload_key)
         self.assertEqual(images[0].base64, jpg_base64)
-        self.assertEqual(images[0].image_content_type, "image/jpg")
+
+    def test_analysis_reads_spooled_image_without_persisting_it(self):
+        """Test that a spooled image is inlined for the analysis only"""
+        with tempfile.TemporaryDirectory() as spool_dir:
+            spool_adapter = LabelImageSpoolAdapter(spool_dir=spool_dir)
+            spool_adapter.spool("label-images/abc.png", b"png-bytes", "image/png")
+            service = LabelApprovalJobsService(label_image_spool_adapter=spool_adapter)
+            job = LabelApprovalJob(
+                id=uuid.uuid4(),
+                brand_name="Brand",
+                product_class="Class",
+                job_metadata=JobMetadata(label_images=[
+                    LabelImage(image_content_type="image/png", pending_upload_key="label-images/abc.png")
+                ]),
+                created_at=datetime.now(),
+                updated_at=datetime.now(),
+                created_by_entity="user",
+                created_by_entity_id="1",
+                created_by_entity_domain="org",
+                updated_by_entity="user"
+            )
+
+            job_for_analysis = service._with_spooled_images(job)
+
+            self.assertEqual(
+                job_for_analysis.get_job_metadata().label_images[0].base64,
+                f"data:image/png;base64,{base64.b64encode(b'png-bytes').decode('ascii')}"
+            )
+            self.assertIsNone(job.get_job_metadata().label_images[0].base64)
+            persisted_metadata = LabelApprovalJobsService._without_spooled_images(job_for_analysis)
+            self.assertIsNone(persisted_metadata.label_images[0].base64)
+            self.assertEqual(persisted_metadata.label_images[0].pending_upload_key, "label-images/abc.png")
 
 
 class TestLabelApprovalJobsServiceCreateJob(unittest.TestCase):
@@ -205,11 +312,18 @@ class TestLabelApprovalJobsServiceCreateJob(unittest.TestCase):
         # Create mock dependencies
         self.mock_persistence_adapter = Mock()
         self.mock_user_management_service = Mock()
+        # Images whose upload fails are spooled, keep them out of the shared temp dir
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        # New jobs are analyzed in the background, after the response
+        self.mock_analysis_executor = Mock()
 
         # Create service instance with mocked dependencies
         self.service = LabelApprovalJobsService(
             label_approval_jobs_persistence_adapter=self.mock_persistence_adapter,
-            user_management_service=self.mock_user_management_service
+            user_management_service=self.mock_user_management_service,
+            label_image_spool_adapter=LabelImageSpoolAdapter(spool_dir=spool_dir.name),
+            analysis_executor=self.mock_analysis_executor
         )
 
     def _create_mock_info(self) -> Mock:
@@ -348,6 +462,77 @@ class TestLabelApprovalJobsServiceCreateJob(unittest.TestCase):
         self.assertEqual(created_job_arg.brand_name, self.test_brand_name)
         self.assertEqual(created_job_arg.product_class, 'beer')
 
+        # The analysis is left to the background executor, the response does not wait for it
+        self.mock_analysis_executor.submit.assert_called_once_with(
+            self.service._analyze_in_background,
+            mock_created_job,
+            mock_security_ctx_instance.get_authenticated_entity_from_security_ctx.return_value
+        )
+        self.mock_persistence_adapter.set_job_metadata.assert_not_called()
+
+    @patch('treasury.services.gateways.ttb_api.main.application.usecases.label_approval_jobs.SecurityContext')
+    def test_create_label_approval_job_waiting_for_analysis(self, mock_security_context):
+        """Test that a caller who asks to wait gets the analyzed job, with nothing left to the background executor"""
+        mock_security_ctx_instance = Mock()
+        mock_security_context.from_info.return_value = mock_security_ctx_instance
+        mock_security_ctx_instance.get_authenticated_entity_from_security_ctx.return_value = EntityDescriptor.of_user(
+            id=str(self.test_user_id),
+            org_id=self.test_org_id
+        )
+        self.mock_user_management_service.get_user_by_authenticated_entity.return_value = self._create_mock_user()
+        mock_created_job = self._create_mock_created_job()
+        self.mock_persistence_adapter.create_approval_job.return_value = mock_created_job
+        analyzed_job = self._create_mock_created_job()
+        analyzed_job.get_job_metadata().label_images = [LabelImage(
+            image_url="https://blob/label.png",
+            analysis_result=LabelImageAnalysisResult(brand_name_found=True)
+        )]
+
+        with patch.object(self.service, "_analyze_label_images", return_value=analyzed_job):
+            response = self.service.create_label_approval_job(
+                info=self._create_mock_info(),
+                input=self._create_test_input(wait_for_analysis=True)
+            )
+
+        self.assertTrue(response.success)
+        self.assertTrue(response.job.job_metadata.label_images[0].analysis_result.brand_name_found)
+        self.mock_persistence_adapter.set_job_metadata.assert_called_once()
+        self.mock_analysis_executor.submit.assert_not_called()
+
+    def test_background_analysis_stores_and_publishes_the_results(self):
+        """Test that the background analysis persists the analyzed job and tells subscribers"""
+        events_service = Mock()
+        service = LabelApprovalJobsService(
+            label_approval_jobs_persistence_adapter=self.mock_persistence_adapter,
+            label_approval_job_events_service=events_service
+        )
+        job = self._create_mock_created_job()
+        updated_by = EntityDescriptor.of_user(id=str(self.test_user_id), org_id=self.test_org_id)
+
+        with patch.object(service, "_analyze_label_images", return_value=job):
+            service._analyze_in_background(job, updated_by)
+
+        self.mock_persistence_adapter.set_job_metadata.assert_called_once()
+        self.assertEqual(self.mock_persistence_adapter.set_job_metadata.call_args.kwargs['updated_by'], updated_by)
+        events_service.publish.assert_called_once()
+        events_service.publish_stage.assert_not_called()
+
+    def test_background_analysis_error_is_published_as_failed(self):
+        """Test that an error in the background analysis ends the job's updates with a failed stage"""
+        events_service = Mock()
+        service = LabelApprovalJobsService(
+            label_approval_jobs_persistence_adapter=self.mock_persistence_adapter,
+            label_approval_job_events_service=events_service
+        )
+        job = self._create_mock_created_job()
+
+        with patch.object(service, "_analyze_label_images", side_effect=RuntimeError("LLM unavailable")):
+            service._analyze_in_background(job, EntityDescriptor.of_user(id=str(self.test_user_id), org_id=self.test_org_id))
+
+        self.mock_persistence_adapter.set_job_metadata.assert_not_called()
+        events_service.publish_stage.assert_called_once()
+        self.assertEqual(events_service.publish_stage.call_args.args, (job.id, LabelApprovalJobStage.failed))
+
     @patch('treasury.services.gateways.ttb_api.main.application.usecases.label_approval_jobs.SecurityContext')
     def test_create_label_approval_job_user_not_found(self, mock_security_context):
         """Test creation fails when authenticated user is not found"""
@@ -637,6 +822,97 @@ class TestLabelApprovalJobsServiceCreateJob(unittest.TestCase):
         # Verify persistence adapter was called
         self.mock_persistence_adapter.create_approval_job.assert_called_once()
 
+    @patch('treasury.services.gateways.ttb_api.main.application.usecases.label_approval_jobs.SecurityContext')
+    def test_create_label_approval_job_from_staged_upload(self, mock_security_context):
+        """Test creation referencing a streamed upload instead of a base64 image"""
+        mock_info = self._create_mock_info()
+        mock_security_ctx_instance = Mock()
+        mock_security_context.from_info.return_value = mock_security_ctx_instance
+        mock_security_ctx_instance.get_authenticated_entity_from_security_ctx.return_value = EntityDescriptor.of_user(
+            id=str(self.test_user_id),
+            org_id=self.test_org_id
+        )
+        self.mock_user_management_service.get_user_by_authenticated_entity.return_value = self._create_mock_user()
+        self.mock_persistence_adapter.create_approval_job.return_value = self._create_mock_created_job()
+
+        png_bytes = base64.b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==")
+        mock_uploads_service = Mock()
+        mock_uploads_service.ingest_staged_upload.return_value = LabelImageIngestionService.ingest_bytes(
+            png_bytes,
+            declared_type="png",
+            permitted_types=["png"]
+        )
+        mock_blob_adapter = Mock()
+        mock_blob_adapter.upload_image.return_value = "https://blob.vercel-storage.com/label-images/test/label.png"
+        service = LabelApprovalJobsService(
+            label_approval_jobs_persistence_adapter=self.mock_persistence_adapter,
+            user_management_service=self.mock_user_management_service,
+            blob_storage_adapter=mock_blob_adapter,
+            label_image_uploads_service=mock_uploads_service,
+            analysis_executor=self.mock_analysis_executor
+        )
+        test_input = self._create_test_input(job_metadata=JobMetadataInput(
+            brand_name=self.test_brand_name,
+            product_class='beer',
+            label_image_upload_id='0123456789abcdef0123456789abcdef'
+        ))
+
+        response = service.create_label_approval_job(info=mock_info, input=test_input)
+
+        self.assertTrue(response.success)
+        mock_blob_adapter.upload_image.assert_called_once_with(
+            image_data=png_bytes,
+            content_type="image/png",
+            sha256=hashlib.sha256(png_bytes).hexdigest(),
+            source_key=None
+        )
+        created_job_arg = self.mock_persistence_adapter.create_approval_job.call_args.kwargs['job']
+        self.assertEqual(created_job_arg.get_job_metadata().label_images[0].image_url, "https://blob.vercel-storage.com/label-images/test/label.png")
+        mock_uploads_service.discard_staged_upload.assert_called_once_with('0123456789abcdef0123456789abcdef')
+
+    @patch('treasury.services.gateways.ttb_api.main.application.usecases.label_approval_jobs.SecurityContext')
+    def test_create_label_approval_job_from_direct_upload(self, mock_security_context):
+        """Test creation referencing an image the client uploaded directly to blob storage"""
+        mock_info = self._create_mock_info()
+        mock_security_ctx_instance = Mock()
+        mock_security_context.from_info.return_value = mock_security_ctx_instance
+        mock_security_ctx_instance.get_authenticated_entity_from_security_ctx.return_value = EntityDescriptor.of_user(
+            id=str(self.test_user_id),
+            org_id=self.test_org_id
+        )
+        self.mock_user_management_service.get_user_by_authenticated_entity.return_value = self._create_mock_user()
+        self.mock_persistence_adapter.create_approval_job.return_value = self._create_mock_created_job()
+
+        png_bytes = base64.b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==")
+        object_key = "uploads/label-images/0123456789abcdef0123456789abcdef.png"
+        mock_uploads_service = Mock()
+        mock_uploads_service.ingest_direct_upload.return_value = LabelImageIngestionService.ingest_bytes(
+            png_bytes,
+            declared_type="png",
+            permitted_types=["png"]
+        )
+        mock_blob_adapter = Mock()
+        mock_blob_adapter.upload_image.return_value = "https://bucket.example/label-images/label.png"
+        service = LabelApprovalJobsService(
+            label_approval_jobs_persistence_adapter=self.mock_persistence_adapter,
+            user_management_service=self.mock_user_management_service,
+            blob_storage_adapter=mock_blob_adapter,
+            label_image_uploads_service=mock_uploads_service,
+            analysis_executor=self.mock_analysis_executor
+        )
+        test_input = self._create_test_input(job_metadata=JobMetadataInput(
+            brand_name=self.test_brand_name,
+            product_class='beer',
+            label_image_object_key=object_key
+        ))
+
+        response = service.create_label_approval_job(info=mock_info, input=test_input)
+
+        self.assertTrue(response.success)
+        self.assertEqual(mock_blob_adapter.upload_image.call_args.kwargs['source_key'], object_key)
+        mock_uploads_service.discard_direct_upload.assert_called_once_with(object_key)
+        mock_uploads_service.ingest_staged_upload.assert_not_called()
+
 
 class TestLabelApprovalJobsServiceSingleton(unittest.TestCase):
     """Test singleton pattern of LabelApprovalJobsService"""
@@ -1442,5 +1718,179 @@ class TestLabelApprovalJobsServiceListJobs(unittest.TestCase):
         self.assertIn("Invalid or corrupted image", str(context.exception))
 
 
+class TestLabelApprovalJobsServiceSubscribe(unittest.TestCase):
+    """Test subscribe_to_label_approval_job_updates method of LabelApprovalJobsService"""
+
+    def setUp(self):
+        self.mock_persistence_adapter = Mock()
+        self.events_service = LabelApprovalJobEventsService(pubsub_adapter=InProcessPubSubAdapter())
+        self.service = LabelApprovalJobsService(
+            label_approval_jobs_persistence_adapter=self.mock_persistence_adapter,
+            label_approval_job_events_service=self.events_service
+        )
+
+    def _create_job(self, analysis_result: LabelImageAnalysisResult = None) -> LabelApprovalJob:
+        return LabelApprovalJob(
+            id=uuid.uuid4(),
+            brand_name="Test Brand",
+            product_class='beer',
+            status='pending',
+            job_metadata=JobMetadata(label_images=[LabelImage(image_url="https://blob/label.png", analysis_result=analysis_result)]),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            created_by_entity='user',
+            created_by_entity_id='user-id',
+            created_by_entity_domain='org-id',
+            updated_by_entity='user'
+        )
+
+    def test_snapshot_then_live_updates(self):
+        """Test that the current state is sent first, followed by published stage updates"""
+        job = self._create_job()
+        self.mock_persistence_adapter.get_approval_job_by_id.return_value = job
+
+        async def scenario():
+            updates = self.service.subscribe_to_label_approval_job_updates(info=Mock(), job_id=job.id)
+            snapshot = await anext(updates)
+            self.assertTrue(self.events_service.has_subscribers(job.id))
+
+            self.events_service.publish_stage(
+                job.id,
+                LabelApprovalJobStage.extraction_partial,
+                field_path="brand_name",
+                field_value="Test Brand",
+                field_verified=True
+            )
+            partial = await asyncio.wait_for(anext(updates), 1)
+            await updates.aclose()
+            return snapshot, partial
+
+        snapshot, partial = asyncio.run(scenario())
+
+        self.assertEqual(snapshot.stage, LabelApprovalJobStage.uploaded)
+        self.assertEqual(snapshot.job_id, job.id)
+        self.assertEqual(partial.stage, LabelApprovalJobStage.extraction_partial)
+        self.assertEqual(partial.field_path, "brand_name")
+        self.assertEqual(partial.field_value, "Test Brand")
+        # Closing the stream releases the subscription
+        self.assertFalse(self.events_service.has_subscribers(job.id))
+
+    def test_snapshot_of_analyzed_job(self):
+        """Test that a client subscribing after the analysis finished gets the result straight away"""
+        job = self._create_job(analysis_result=LabelImageAnalysisResult(brand_name_found=True))
+        self.mock_persistence_adapter.get_approval_job_by_id.return_value = job
+
+        async def scenario():
+            updates = self.service.subscribe_to_label_approval_job_updates(info=Mock(), job_id=job.id)
+            snapshot = await anext(updates)
+            await updates.aclose()
+            return snapshot
+
+        snapshot = asyncio.run(scenario())
+
+        self.assertEqual(snapshot.stage, LabelApprovalJobStage.analysis_done)
+        self.assertTrue(snapshot.analysis_result.brand_name_found)
+
+    def test_stream_ends_after_the_analysis(self):
+        """Test that the stream ends by itself once the analysis is done"""
+        job = self._create_job()
+        self.mock_persistence_adapter.get_approval_job_by_id.return_value = job
+
+        async def scenario():
+            updates = self.service.subscribe_to_label_approval_job_updates(info=Mock(), job_id=job.id)
+            received = [await anext(updates)]
+            self.events_service.publish_stage(job.id, LabelApprovalJobStage.extraction_done)
+            self.events_service.publish_stage(job.id, LabelApprovalJobStage.analysis_done)
+            async for update in updates:
+                received.append(update)
+            return received
+
+        received = asyncio.run(asyncio.wait_for(scenario(), 1))
+
+        self.assertEqual(
+            [update.stage for update in received],
+            [LabelApprovalJobStage.uploaded, LabelApprovalJobStage.extraction_done, LabelApprovalJobStage.analysis_done]
+        )
+        self.assertFalse(self.events_service.has_subscribers(job.id))
+
+    def test_stream_of_analyzed_job_ends_with_the_snapshot(self):
+        job = self._create_job(analysis_result=LabelImageAnalysisResult(brand_name_found=True))
+        self.mock_persistence_adapter.get_approval_job_by_id.return_value = job
+
+        async def scenario():
+            return [update async for update in self.service.subscribe_to_label_approval_job_updates(info=Mock(), job_id=job.id)]
+
+        updates = asyncio.run(asyncio.wait_for(scenario(), 1))
+
+        self.assertEqual([update.stage for update in updates], [LabelApprovalJobStage.analysis_done])
+
+    def test_job_not_found(self):
+        self.mock_persistence_adapter.get_approval_job_by_id.return_value = None
+        job_id = uuid.uuid4()
+
+        async def scenario():
+            return [update async for update in self.service.subscribe_to_label_approval_job_updates(info=Mock(), job_id=job_id)]
+
+        updates = asyncio.run(scenario())
+
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0].stage, LabelApprovalJobStage.failed)
+        self.assertFalse(self.events_service.has_subscribers(job_id))
+
+
+
+class TestLabelImageOcrOverlay(unittest.TestCase):
+    """Test get_label_image_ocr_overlay of LabelApprovalJobsService"""
+
+    def setUp(self):
+        self.mock_persistence_adapter = Mock()
+        self.mock_overlay_service = Mock()
+        self.service = LabelApprovalJobsService(
+            label_approval_jobs_persistence_adapter=self.mock_persistence_adapter,
+            label_image_ocr_overlay_service=self.mock_overlay_service
+        )
+        self.label_image = LabelImage(image_url="https://blob.example.com/label-images/label.png")
+        self.job = LabelApprovalJob(
+            id=uuid.uuid4(),
+            brand_name="Brand",
+            product_class="beer",
+            job_metadata=JobMetadata(label_images=[self.label_image])
+        )
+        self.mock_persistence_adapter.get_approval_job_by_id.return_value = self.job
+
+    def test_overlay_of_the_requested_image(self):
+        self.mock_overlay_service.get_overlay_url.return_value = "https://blob.example.com/overlay.jpg"
+
+        response = self.service.get_label_image_ocr_overlay(
+            info=Mock(), input=GetLabelImageOcrOverlayInput(job_id=self.job.id, show_confidence=False)
+        )
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.overlay_url, "https://blob.example.com/overlay.jpg")
+        kwargs = self.mock_overlay_service.get_overlay_url.call_args.kwargs
+        self.assertEqual(kwargs["label_image"], self.label_image)
+        self.assertFalse(kwargs["show_confidence"])
+
+    def test_image_index_out_of_range(self):
+        response = self.service.get_label_image_ocr_overlay(
+            info=Mock(), input=GetLabelImageOcrOverlayInput(job_id=self.job.id, image_index=1)
+        )
+
+        self.assertFalse(response.success)
+        self.assertIn("no label image at index 1", response.message)
+        self.mock_overlay_service.get_overlay_url.assert_not_called()
+
+    def test_ocr_failure(self):
+        self.mock_overlay_service.get_overlay_url.side_effect = RuntimeError("OCR failed: Tesseract not found")
+
+        response = self.service.get_label_image_ocr_overlay(
+            info=Mock(), input=GetLabelImageOcrOverlayInput(job_id=self.job.id)
+        )
+
+        self.assertFalse(response.success)
+        self.assertIsNone(response.overlay_url)
+        self.assertIn("OCR failed", response.message)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,142 @@
+import io
+import math
+import unittest
+import uuid
+from unittest.mock import Mock
+
+import numpy as np
+
+from treasury.services.gateways.ttb_api.main.application.usecases.label_audit import (
+    AUDIT_RULES,
+    LabelAuditColumns,
+    LabelAuditCsvReport,
+    LabelAuditService,
+    LabelAuditVocabulary,
+    OUTCOME_FAIL,
+    OUTCOME_NOT_APPLICABLE,
+    OUTCOME_PASS
+)
+
+
+def _label_data(brand_name="Old Fox", product_class="Bourbon", abv="45%", net_contents="750 mL", warnings=None):
+    return {"brand_name": brand_name, "products": [{
+        "product_class_type": product_class,
+        "alcohol_content_abv": abv,
+        "net_contents": net_contents,
+        "other_info": {"warnings": warnings}
+    }]}
+
+
+class TestLabelAuditService(unittest.TestCase):
+
+    def setUp(self):
+        self.persistence_adapter = Mock()
+        self.service = LabelAuditService(label_approval_jobs_persistence_adapter=self.persistence_adapter)
+
+    def _outcomes(self, given, extracted, rule_names=None):
+        columns = LabelAuditColumns.from_label_data([(uuid.uuid4(), given, extracted)], LabelAuditVocabulary())
+        rules = [AUDIT_RULES[name] for name in (rule_names or list(AUDIT_RULES))]
+        return dict(zip([rule.name for rule in rules], self.service.evaluate(columns, rules)[:, 0].tolist()))
+
+    def test_matching_label_passes_every_rule(self):
+        outcomes = self._outcomes(
+            _label_data(warnings="GOVERNMENT WARNING"),
+            _label_data(
+                brand_name="OLD FOX", product_class="Kentucky Straight Bourbon", abv="45.0%", net_contents="75 cl",
+                warnings="GOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL"
+            )
+        )
+
+        self.assertEqual(set(outcomes.values()), {OUTCOME_PASS})
+
+    def test_mismatches_fail(self):
+        outcomes = self._outcomes(
+            _label_data(warnings="GOVERNMENT WARNING"),
+            _label_data(brand_name="Young Fox", product_class="Gin", abv="45.2%", net_contents="700 mL", warnings="Government warning")
+        )
+
+        self.assertEqual(outcomes, {
+            "brand_name": OUTCOME_FAIL,
+            "product_class": OUTCOME_FAIL,
+            "alcohol_content": OUTCOME_FAIL,
+            "alcohol_content_tolerance": OUTCOME_PASS,
+            "net_contents": OUTCOME_FAIL,
+            "health_warning": OUTCOME_FAIL,
+        })
+
+    def test_net_contents_in_other_units(self):
+        self.assertEqual(
+            self._outcomes(_label_data(net_contents="25.4 fl. oz."), _label_data(net_contents="750 mL"), ["net_contents"]),
+            {"net_contents": OUTCOME_PASS}
+        )
+        self.assertEqual(
+            self._outcomes(_label_data(net_contents="12 fl oz"), _label_data(net_contents="375 mL"), ["net_contents"]),
+            {"net_contents": OUTCOME_FAIL}
+        )
+
+    def test_stored_numeric_values_are_used(self):
+        extracted = _label_data(net_contents="750 mL")
+        extracted["products"][0]["net_contents_ml"] = 700.0
+
+        self.assertEqual(self._outcomes(_label_data(net_contents="70 cl"), extracted, ["net_contents"]),
+                         {"net_contents": OUTCOME_PASS})
+
+    def test_missing_values(self):
+        outcomes = self._outcomes(_label_data(abv=None, net_contents=None), None)
+
+        self.assertEqual(outcomes["brand_name"], OUTCOME_FAIL)
+        self.assertEqual(outcomes["product_class"], OUTCOME_FAIL)
+        self.assertEqual(outcomes["alcohol_content"], OUTCOME_NOT_APPLICABLE)
+        self.assertEqual(outcomes["net_contents"], OUTCOME_NOT_APPLICABLE)
+        self.assertEqual(outcomes["health_warning"], OUTCOME_NOT_APPLICABLE)
+
+    def test_vocabulary_compares_each_distinct_pair_once(self):
+        vocabulary = LabelAuditVocabulary()
+        given = np.array([vocabulary.id_of("brand_name", name) for name in ["Old Fox", "old  fox", "Stone Creek", None]])
+        extracted = np.array([vocabulary.id_of("brand_name", name) for name in ["OLD FOX", "OLD FOX", "OLD FOX", "OLD FOX"]])
+
+        self.assertEqual(vocabulary.pairwise("brand_name", given, extracted).tolist(), [True, True, False, False])
+        self.assertEqual(len(vocabulary._pair_results["brand_name"]), 2)
+        self.assertTrue(math.isnan(vocabulary.quantity_of("net_contents", "a bottle")))
+
+    def test_audit_reads_batches_and_reports_failing_jobs(self):
+        job_ids = sorted(uuid.uuid4() for _ in range(3))
+        self.persistence_adapter.list_job_label_data.side_effect = [
+            [(job_ids[0], _label_data(), _label_data()), (job_ids[1], _label_data(), _label_data(abv="40%"))],
+            [(job_ids[2], _label_data(), _label_data())],
+            [],
+        ]
+        output = io.StringIO()
+        progress = []
+
+        summary = self.service.audit(
+            rule_names=["brand_name", "alcohol_content"],
+            batch_size=2,
+            report=LabelAuditCsvReport(output, ["brand_name", "alcohol_content"]),
+            on_batch_done=lambda running: progress.append(running.jobs_audited)
+        )
+
+        self.assertEqual(self.persistence_adapter.list_job_label_data.call_args_list[1].kwargs["after_job_id"], job_ids[1])
+        self.assertEqual(progress, [2, 3])
+        self.assertEqual(summary.jobs_audited, 3)
+        self.assertEqual(summary.jobs_failed, 1)
+        self.assertEqual([(rule.name, rule.passed, rule.failed) for rule in summary.rules],
+                         [("brand_name", 3, 0), ("alcohol_content", 2, 1)])
+        self.assertEqual(output.getvalue().splitlines(), [
+            "job_id,brand_name,alcohol_content",
+            f"{job_ids[1]},pass,fail",
+        ])
+
+    def test_audit_stops_at_max_jobs(self):
+        self.persistence_adapter.list_job_label_data.side_effect = lambda after_job_id, limit: [
+            (uuid.uuid4(), _label_data(), _label_data()) for _ in range(limit)
+        ]
+
+        summary = self.service.audit(batch_size=2, max_jobs=3)
+
+        self.assertEqual(summary.jobs_audited, 3)
+        self.assertEqual(self.persistence_adapter.list_job_label_data.call_args_list[1].kwargs["limit"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import OcrResult
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_profiles import OcrProfile, OcrProfileSelector
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import (
+    LabelApprovalJob,
+    LabelImage,
+    JobMetadata
+)
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
+    BrandDataStrict,
+    ProductInfoStrict,
+    ProductOtherInfo
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_pytesseract import \
+    LabelDataAnalysisPytesseractService
+
+
+class TestLabelDataAnalysisPytesseractService(unittest.TestCase):
+
+    def setUp(self):
+        self.ocr_adapter = Mock()
+        self.ocr_adapter.extract_text_from_url.return_value = OcrResult(
+            full_text="TANQUERAY LONDON DRY GIN 41.3% ALC./VOL. 70 cl",
+            average_confidence=90.0,
+            image_width=100,
+            image_height=100
+        )
+        self.service = LabelDataAnalysisPytesseractService(
+            ocr_adapter=self.ocr_adapter,
+            ocr_profile_selector=OcrProfileSelector(
+                default_profile=OcrProfile.from_preset("default"),
+                profiles_by_product_class={"gin": OcrProfile.from_preset("fast")}
+            )
+        )
+
+    def _job(self, product_class_type, job_product_class="spirits") -> LabelApprovalJob:
+        image = LabelImage(image_content_type="image/png", image_url="https://blob.example/label.png")
+        now = datetime.now(timezone.utc)
+        return LabelApprovalJob(
+            id=uuid.uuid4(),
+            brand_name="Tanqueray",
+            product_class=job_product_class,
+            job_metadata=JobMetadata(
+                reviewer_id="reviewer",
+                label_images=[image],
+                product_info=BrandDataStrict(
+                    brand_name="Tanqueray",
+                    products=[ProductInfoStrict(product_class_type=product_class_type, alcohol_content_abv="41.3%")]
+                )
+            ),
+            created_at=now,
+            updated_at=now,
+            created_by_entity="user",
+            created_by_entity_id="reviewer",
+            created_by_entity_domain="ttb",
+            updated_by_entity="user"
+        )
+
+    def test_ocr_profile_is_picked_by_product_class(self):
+        job = self._job("London Dry Gin")
+
+        result = self.service.answer_analysis_questions_with_pytesseract(job, job.get_job_metadata().label_images[0])
+
+        self.assertEqual(self.ocr_adapter.extract_text_from_url.call_args.kwargs['profile'].name, "fast")
+        analysis = result.get_job_metadata().label_images[0].analysis_result
+        self.assertTrue(analysis.product_class_found)
+        self.assertTrue(analysis.alcohol_content_found)
+
+    def test_job_product_class_is_used_without_one_on_the_form(self):
+        job = self._job(None, job_product_class="Gin")
+
+        self.service.answer_analysis_questions_with_pytesseract(job, job.get_job_metadata().label_images[0])
+
+        self.assertEqual(self.ocr_adapter.extract_text_from_url.call_args.kwargs['profile'].name, "fast")
+
+    def test_other_classes_get_the_default_profile(self):
+        job = self._job("Vodka", job_product_class="Vodka")
+
+        self.service.answer_analysis_questions_with_pytesseract(job, job.get_job_metadata().label_images[0])
+
+        self.assertEqual(self.ocr_adapter.extract_text_from_url.call_args.kwargs['profile'].name, "default")
+
+    def test_misread_brand_name_is_an_approximate_match(self):
+        self.ocr_adapter.extract_text_from_url.return_value = OcrResult(
+            full_text="TANQUERAV LONDON DRY GIN",
+            average_confidence=90.0,
+            image_width=100,
+            image_height=100
+        )
+        job = self._job("Gin")
+
+        result = self.service.answer_analysis_questions_with_pytesseract(job, job.get_job_metadata().label_images[0])
+
+        analysis = result.get_job_metadata().label_images[0].analysis_result
+        self.assertTrue(analysis.brand_name_found)
+        self.assertIn("'TANQUERAV', an approximate match (1 character edit", analysis.brand_name_found_results_reasoning)
+
+    def test_warning_text_coverage_is_reported(self):
+        self.ocr_adapter.extract_text_from_url.return_value = OcrResult(
+            full_text="TANQUERAY GIN\nGOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL, WOMEN SHOULD NOT DRINK",
+            average_confidence=90.0,
+            image_width=100,
+            image_height=100
+        )
+        job = self._job("Gin")
+        job.get_job_metadata().product_info.products[0].other_info = ProductOtherInfo(warnings="GOVERNMENT WARNING")
+
+        result = self.service.answer_analysis_questions_with_pytesseract(job, job.get_job_metadata().label_images[0])
+
+        analysis = result.get_job_metadata().label_images[0].analysis_result
+        self.assertTrue(analysis.health_warning_found)
+        self.assertAlmostEqual(analysis.health_warning_text_coverage, 12 / 43)
+        self.assertEqual(analysis.health_warning_missing_phrases[-1][:20], "alcoholic beverages ")
+        self.assertIn("28% of the statutory warning text was found", analysis.health_warning_found_results_reasoning)
+
+
+if __name__ == '__main__':
+    unittest.main()
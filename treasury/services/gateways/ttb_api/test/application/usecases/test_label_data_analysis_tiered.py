@@ -0,0 +1,165 @@
+import json
+import unittest
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import OcrResult
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import (
+    AnalysisTier,
+    LabelApprovalJob,
+    LabelImage,
+    JobMetadata
+)
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
+    BrandDataStrict,
+    ProductInfoStrict,
+    ProductOtherInfo
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_analysis_matcher import FuzzyMatchingConfig
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_pytesseract import \
+    LabelDataAnalysisPytesseractService
+from treasury.services.gateways.ttb_api.main.application.usecases.label_data_analysis_tiered import \
+    LabelDataAnalysisTieredService
+
+
+class TestLabelDataAnalysisTieredService(unittest.TestCase):
+
+    def setUp(self):
+        self.ocr_adapter = Mock()
+        self.llm_router = Mock()
+        self.llm_response = None
+        self.llm_router.complete_prompt_with_media.side_effect = \
+            lambda parse, **kwargs: parse(json.dumps(self.llm_response))
+        self.service = LabelDataAnalysisTieredService(
+            pytesseract_analysis_service=LabelDataAnalysisPytesseractService(
+                ocr_adapter=self.ocr_adapter,
+                ocr_profile_selector=Mock(),
+                fuzzy_matching=FuzzyMatchingConfig()
+            ),
+            llm_router=self.llm_router,
+            min_ocr_confidence=80.0
+        )
+
+    def _ocr_reads(self, text, word_confidences=None):
+        words = [
+            {"text": word, "confidence": confidence, "bounding_box": {"x": 0, "y": 0, "width": 1, "height": 1}}
+            for word, confidence in zip(text.split(), word_confidences or [])
+        ]
+        self.ocr_adapter.extract_text_from_url.return_value = OcrResult.model_validate({
+            "full_text": text,
+            "average_confidence": 90.0,
+            "image_width": 100,
+            "image_height": 100,
+            "words": words,
+        })
+
+    def _job(self, warnings=None) -> LabelApprovalJob:
+        image = LabelImage(
+            image_content_type="image/png",
+            image_url="https://blob.example/label.png",
+            display_url="https://blob.example/label-display.jpg"
+        )
+        now = datetime.now(timezone.utc)
+        return LabelApprovalJob(
+            id=uuid.uuid4(),
+            brand_name="Tanqueray",
+            product_class="Gin",
+            job_metadata=JobMetadata(
+                label_images=[image],
+                product_info=BrandDataStrict(
+                    brand_name="Tanqueray",
+                    products=[ProductInfoStrict(
+                        product_class_type="London Dry Gin",
+                        alcohol_content_abv="47.3%",
+                        net_contents="750 mL",
+                        other_info=ProductOtherInfo(warnings=warnings)
+                    )]
+                )
+            ),
+            created_at=now,
+            updated_at=now,
+            created_by_entity="user",
+            created_by_entity_id="reviewer",
+            created_by_entity_domain="ttb",
+            updated_by_entity="user"
+        )
+
+    def _analyze(self, job):
+        result = self.service.answer_analysis_questions_tiered(job, job.get_job_metadata().label_images[0])
+        return result.get_job_metadata().label_images[0].analysis_result
+
+    def test_clean_label_makes_no_llm_call(self):
+        self._ocr_reads("TANQUERAY LONDON DRY GIN 47.3% ALC./VOL. 750 mL")
+
+        analysis = self._analyze(self._job())
+
+        self.llm_router.complete_prompt_with_media.assert_not_called()
+        self.assertTrue(analysis.brand_name_found)
+        self.assertTrue(analysis.net_contents_found)
+        self.assertIsNone(analysis.health_warning_found)
+        self.assertEqual(set(analysis.decided_by.values()), {AnalysisTier.ocr})
+
+    def test_only_failing_fields_are_escalated(self):
+        self._ocr_reads("TANQUERAY LONDON DRY GIN 47.3% ALC./VOL. 75O mL")
+        self.llm_response = {
+            "net_contents_found": True,
+            "net_contents_found_results_reasoning": "The label shows 750 mL.",
+            "health_warning_found": False,
+            "health_warning_found_results_reasoning": "No government warning."
+        }
+
+        analysis = self._analyze(self._job(warnings="GOVERNMENT WARNING"))
+
+        call = self.llm_router.complete_prompt_with_media.call_args.kwargs
+        self.assertEqual(call["prompt"], 'CHECK:\nnet_contents: "750 mL"\nhealth_warning: "GOVERNMENT WARNING"')
+        self.assertEqual(call["media_url"], "https://blob.example/label-display.jpg")
+        self.assertTrue(analysis.net_contents_found)
+        self.assertEqual(analysis.net_contents_found_results_reasoning, "The label shows 750 mL.")
+        self.assertFalse(analysis.health_warning_found)
+        self.assertEqual(analysis.decided_by["net_contents"], AnalysisTier.llm)
+        self.assertEqual(analysis.decided_by["health_warning"], AnalysisTier.llm)
+        self.assertEqual(analysis.decided_by["brand_name"], AnalysisTier.ocr)
+
+    def test_approximate_match_in_low_confidence_words_is_escalated(self):
+        self._ocr_reads(
+            "TANQUERAV LONDON DRY GIN 47.3% 750 mL",
+            word_confidences=[55.0, 95.0, 95.0, 95.0, 95.0, 95.0, 95.0]
+        )
+        self.llm_response = {"brand_name_found": True, "brand_name_found_results_reasoning": "Found."}
+
+        analysis = self._analyze(self._job())
+
+        self.assertIn("brand_name:", self.llm_router.complete_prompt_with_media.call_args.kwargs["prompt"])
+        self.assertEqual(analysis.decided_by["brand_name"], AnalysisTier.llm)
+        self.assertEqual(analysis.decided_by["product_class"], AnalysisTier.ocr)
+
+    def test_incomplete_llm_answer_is_rejected(self):
+        self._ocr_reads("TANQUERAY LONDON DRY GIN 47.3%")
+        self.llm_response = {"brand_name_found": True}
+
+        analysis = self._analyze(self._job())
+
+        # The OCR answer is kept when the LLM tier fails
+        self.assertFalse(analysis.net_contents_found)
+        self.assertEqual(analysis.decided_by["net_contents"], AnalysisTier.ocr)
+
+    def test_ocr_failure_escalates_every_given_field(self):
+        self.ocr_adapter.extract_text_from_url.return_value = OcrResult(
+            full_text="", average_confidence=0.0, image_width=0, image_height=0, success=False
+        )
+        self.llm_response = {
+            f"{field}_found": True for field in ["brand_name", "product_class", "alcohol_content", "net_contents"]
+        }
+
+        analysis = self._analyze(self._job())
+
+        self.assertEqual(
+            self.llm_router.complete_prompt_with_media.call_args.kwargs["prompt"].count("\n"), 4
+        )
+        self.assertTrue(analysis.alcohol_content_found)
+        self.assertEqual(analysis.decided_by["health_warning"], AnalysisTier.ocr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 import unittest
 import base64
 from pathlib import Path
+from unittest.mock import Mock
 
 from treasury.services.gateways.ttb_api.main.application.config import config
 from treasury.services.gateways.ttb_api.main.application.usecases.label_data_extraction import (
@@ -97,5 +98,57 @@ class TestLabelDataExtractionService(unittest.TestCase):
         self.assertGreater(len(result.brand_name), 0)
 
 
+class TestLabelDataExtractionServiceStreaming(unittest.TestCase):
+    """Tests for streaming LLM extraction with a mocked OpenAI adapter"""
+
+    _COMPLETION = (
+        '```json\n{"brand_name": "Tanqueray", "products": [{"name": "Tanqueray London Dry Gin", '
+        '"product_class_type": "London Dry Gin", "alcohol_content_abv": "41.3%", "net_contents": "70 cl", '
+        '"other_info": {"bottler_info": "Unknown", "manufacturer": "Unknown", "warnings": "Unknown"}}]}\n```'
+    )
+
+    def _service_streaming(self, completion: str, chunk_size: int = 5) -> tuple[LabelDataExtractionService, Mock]:
+        llm_client = Mock()
+        llm_client.complete_prompt_with_media_stream.return_value = iter(
+            completion[i:i + chunk_size] for i in range(0, len(completion), chunk_size)
+        )
+        return LabelDataExtractionService(llm_client=llm_client), llm_client
+
+    def test_extract_label_data_stream_yields_fields_then_final_result(self):
+        """Test that fields are surfaced incrementally and the final event holds the parsed model"""
+        service, llm_client = self._service_streaming(self._COMPLETION)
+
+        events = list(service.extract_label_data_stream(image_url="https://example.com/label.png"))
+
+        llm_client.complete_prompt_with_media_stream.assert_called_once()
+        self.assertEqual(events[0].field_path, "brand_name")
+        self.assertEqual(events[0].value, "Tanqueray")
+
+        by_path = {e.field_path: e for e in events if not e.is_final}
+        self.assertEqual(by_path["products.0.alcohol_content_abv"].value, "41.3%")
+        self.assertTrue(by_path["products.0.alcohol_content_abv"].verified)
+        self.assertTrue(by_path["products.0.net_contents"].verified)
+        self.assertIsNone(by_path["products.0.name"].verified)
+
+        final = events[-1]
+        self.assertTrue(final.is_final)
+        self.assertIsInstance(final.brand_data, BrandDataStrict)
+        self.assertEqual(final.brand_data.products[0].product_class_type, "London Dry Gin")
+
+    def test_extract_label_data_stream_flags_invalid_abv_before_completion(self):
+        """Test that local ABV verification runs as soon as the field arrives"""
+        service, _ = self._service_streaming('{"brand_name": "X", "products": [{"alcohol_content_abv": "Unknown", ')
+        stream = service.extract_label_data_stream(base64_image="abc")
+
+        next(stream)  # brand_name
+        abv_event = next(stream)
+        self.assertEqual(abv_event.field_path, "products.0.alcohol_content_abv")
+        self.assertFalse(abv_event.verified)
+
+        # The completion never closes the object
+        with self.assertRaises(ValueError):
+            next(stream)
+
+
 if __name__ == '__main__':
     unittest.main()
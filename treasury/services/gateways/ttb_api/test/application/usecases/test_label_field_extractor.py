@@ -0,0 +1,70 @@
+import unittest
+
+from treasury.services.gateways.ttb_api.main.application.usecases.label_field_extractor import LabelFieldExtractor
+from treasury.services.gateways.ttb_api.main.tools.benchmark_label_field_extraction import (
+    extract_with_legacy_patterns,
+    synthetic_corpus
+)
+
+LABEL_TEXT = """OLD FOX
+
+45% ALC./VOL. 750 mL
+Kentucky Straight Bourbon Whiskey
+aged 4 years, 12% of the barrels are selected.
+
+GOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL, WOMEN SHOULD NOT DRINK
+ALCOHOLIC BEVERAGES DURING PREGNANCY.
+
+Bottled by Old Fox Distilling Co."""
+
+
+class TestLabelFieldExtractor(unittest.TestCase):
+
+    def test_label_fields(self):
+        fields = LabelFieldExtractor.extract(LABEL_TEXT)
+
+        self.assertEqual(fields.brand_name, "OLD FOX")
+        self.assertEqual(fields.product_class, "Kentucky Straight Bourbon Whiskey")
+        self.assertEqual(fields.alcohol_content, "45%")
+        self.assertEqual(fields.net_contents, "750 mL")
+        self.assertEqual(
+            fields.warnings,
+            "GOVERNMENT WARNING: (1) ACCORDING TO THE SURGEON GENERAL, WOMEN SHOULD NOT DRINK\n"
+            "ALCOHOLIC BEVERAGES DURING PREGNANCY."
+        )
+
+    def test_most_specific_alcohol_content_wins(self):
+        self.assertEqual(LabelFieldExtractor.extract("12% malt 40% ABV").alcohol_content, "40%")
+        self.assertEqual(LabelFieldExtractor.extract("12% VOL, ALC. 40%").alcohol_content, "40%")
+        self.assertEqual(LabelFieldExtractor.extract("12% 40% vol").alcohol_content, "40%")
+        self.assertEqual(LabelFieldExtractor.extract("12.5% and 40%").alcohol_content, "12.5%")
+
+    def test_most_specific_net_contents_unit_wins(self):
+        self.assertEqual(LabelFieldExtractor.extract("25.4 FL OZ 750 ML").net_contents, "750 mL")
+        self.assertEqual(LabelFieldExtractor.extract("1 gallon 2 Litres").net_contents, "2 L")
+        self.assertEqual(LabelFieldExtractor.extract("12 fl. oz.").net_contents, "12 fl oz")
+
+    def test_product_class_is_matched_as_whole_words(self):
+        self.assertEqual(LabelFieldExtractor.extract("original recipe, imported by ACME").product_class, None)
+        self.assertEqual(LabelFieldExtractor.extract("Original London Dry Gin").product_class, "London Dry Gin")
+        self.assertEqual(LabelFieldExtractor.extract("INDIA PALE ALE").product_class, "Pale Ale")
+
+    def test_text_without_fields(self):
+        fields = LabelFieldExtractor.extract("")
+
+        self.assertIsNone(fields.brand_name)
+        self.assertIsNone(fields.alcohol_content)
+        self.assertIsNone(fields.net_contents)
+        self.assertIsNone(fields.product_class)
+        self.assertIsNone(fields.warnings)
+
+    def test_government_warning_without_text(self):
+        self.assertEqual(LabelFieldExtractor.extract("Brand\n\nGOVERNMENT WARNING:").warnings, "GOVERNMENT WARNING")
+
+    def test_same_fields_as_per_field_patterns(self):
+        for text in synthetic_corpus(500):
+            self.assertEqual(LabelFieldExtractor.extract(text), extract_with_legacy_patterns(text), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
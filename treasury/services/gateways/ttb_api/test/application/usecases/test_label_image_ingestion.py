@@ -0,0 +1,116 @@
+import base64
+import hashlib
+import os
+import unittest
+from io import BytesIO
+
+from PIL import Image
+
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import \
+    LabelImageIngestionService, IMAGE_HEADER_BYTES
+
+PNG_1X1 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+PERMITTED_TYPES = ["jpg", "png", "gif", "jpeg"]
+
+
+class TestLabelImageIngestionService(unittest.TestCase):
+
+    def test_ingest_png(self):
+        ingested = LabelImageIngestionService.ingest(f"data:image/png;base64,{PNG_1X1}", PERMITTED_TYPES)
+
+        data = base64.b64decode(PNG_1X1)
+        self.assertEqual(ingested.data, data)
+        self.assertEqual(ingested.image_format, "png")
+        self.assertEqual(ingested.declared_content_type, "image/png")
+        self.assertEqual((ingested.width, ingested.height), (1, 1))
+        self.assertEqual(ingested.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(ingested.size_bytes, len(data))
+
+    def test_ingest_jpeg(self):
+        buffer = BytesIO()
+        Image.new("RGB", (4, 3), "white").save(buffer, format="JPEG")
+        jpeg_base64 = base64.b64encode(buffer.getvalue()).decode("ascii")
+
+        ingested = LabelImageIngestionService.ingest(f"data:image/jpeg;base64,{jpeg_base64}", PERMITTED_TYPES)
+
+        self.assertEqual(ingested.image_format, "jpeg")
+        self.assertEqual((ingested.width, ingested.height), (4, 3))
+
+    def test_ingest_stored_reads_the_image_after_validating_its_header(self):
+        data = base64.b64decode(PNG_1X1)
+        reads = []
+
+        ingested = LabelImageIngestionService.ingest_stored(
+            data[:IMAGE_HEADER_BYTES], len(data), lambda: reads.append(1) or data, "png", PERMITTED_TYPES
+        )
+
+        self.assertEqual(reads, [1])
+        self.assertEqual(ingested.data, data)
+        self.assertEqual((ingested.width, ingested.height), (1, 1))
+        self.assertEqual(ingested.sha256, hashlib.sha256(data).hexdigest())
+
+        with self.assertRaises(ValueError):
+            LabelImageIngestionService.ingest_stored(data, 11 * 1024 * 1024, lambda: self.fail("read"), "png", PERMITTED_TYPES)
+
+    def test_ingest_stored_with_metadata_longer_than_the_header(self):
+        buffer = BytesIO()
+        # An ICC profile puts the frame header of the JPEG past IMAGE_HEADER_BYTES
+        Image.new("RGB", (4, 3), "white").save(buffer, format="JPEG", icc_profile=bytes(2 * IMAGE_HEADER_BYTES))
+        data = buffer.getvalue()
+
+        ingested = LabelImageIngestionService.ingest_stored(
+            data[:IMAGE_HEADER_BYTES], len(data), lambda: data, "jpeg", PERMITTED_TYPES
+        )
+
+        self.assertEqual((ingested.width, ingested.height), (4, 3))
+
+    def test_ingest_stored_rejects_a_corrupt_body_behind_a_valid_header(self):
+        buffer = BytesIO()
+        # Noise does not compress, the PNG is several times IMAGE_HEADER_BYTES
+        Image.frombytes("RGB", (400, 400), os.urandom(400 * 400 * 3)).save(buffer, format="PNG")
+        valid = buffer.getvalue()
+        corrupt = valid[:IMAGE_HEADER_BYTES] + bytes(len(valid) - IMAGE_HEADER_BYTES)
+        self.assertGreater(len(corrupt), 4 * IMAGE_HEADER_BYTES)
+
+        with self.assertRaisesRegex(ValueError, "Invalid or corrupted image"):
+            LabelImageIngestionService.ingest_bytes(corrupt, "png", PERMITTED_TYPES)
+        with self.assertRaisesRegex(ValueError, "Invalid or corrupted image"):
+            LabelImageIngestionService.ingest_stored(
+                corrupt[:IMAGE_HEADER_BYTES], len(corrupt), lambda: corrupt, "png", PERMITTED_TYPES
+            )
+
+    def test_decoded_size_matches_decode(self):
+        for raw in [b"", b"a", b"ab", b"abc", b"abcd", bytes(range(256))]:
+            encoded = "data:image/png;base64," + base64.b64encode(raw).decode("ascii")
+            self.assertEqual(LabelImageIngestionService.decoded_size(encoded, encoded.index(",") + 1), len(raw))
+
+    def test_oversized_image_rejected_before_decoding(self):
+        # 3 MB of base64 'A's decode to 2.25 MB - well-formed, but never decoded or parsed
+        oversized = "data:image/png;base64," + "A" * (3 * 1024 * 1024)
+
+        with self.assertRaises(ValueError) as context:
+            LabelImageIngestionService.ingest(oversized, PERMITTED_TYPES, max_size_bytes=2 * 1024 * 1024)
+        self.assertIn("exceeds maximum allowed size", str(context.exception))
+
+    def test_format_not_permitted(self):
+        gif = "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+        with self.assertRaises(ValueError) as context:
+            LabelImageIngestionService.ingest(f"data:image/png;base64,{gif}", ["jpg", "png"])
+        self.assertIn("Image format gif", str(context.exception))
+
+    def test_invalid_base64(self):
+        with self.assertRaises(ValueError) as context:
+            LabelImageIngestionService.ingest("data:image/png;base64,not*base64", PERMITTED_TYPES)
+        self.assertEqual(str(context.exception), "Invalid or corrupted image")
+
+    def test_unknown_magic_bytes(self):
+        garbage = base64.b64encode(b"definitely not an image").decode("ascii")
+
+        with self.assertRaises(ValueError) as context:
+            LabelImageIngestionService.ingest(f"data:image/png;base64,{garbage}", PERMITTED_TYPES)
+        self.assertIn("Image format unknown", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import base64
+import hashlib
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.persistence.common.db_config import DbConfig
+from treasury.services.gateways.ttb_api.main.adapter.out.persistence.label_approvals_persistence_adapter import \
+    LabelApprovalJobsPersistenceAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.local_filesystem_blob_storage_adapter import \
+    LocalFilesystemBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.application.models.domain.entity_descriptor import EntityDescriptor
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import LabelApprovalJob, \
+    JobMetadata, LabelImage
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_migration import \
+    LabelImageMigrationService, LabelImageMigrationCheckpoint
+
+PNG_BASE64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+
+class TestLabelImageMigrationService(unittest.TestCase):
+    orm_engine = DbConfig.get_orm_engine(in_memory=True, local_on_disk=False)
+    SQLModel.metadata.create_all(bind=orm_engine)
+
+    def setUp(self) -> None:
+        with Session(self.orm_engine) as session:
+            session.query(LabelApprovalJob).delete()
+            session.commit()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.persistence_adapter = LabelApprovalJobsPersistenceAdapter(orm_engine=self.orm_engine)
+        self.blob_storage_adapter = LocalFilesystemBlobStorageAdapter(root_dir=f"{self._temp_dir.name}/blobs")
+        self.checkpoint_path = f"{self._temp_dir.name}/checkpoint.json"
+        self.created_by = EntityDescriptor.of_user(id=str(uuid.uuid4()), org_id=uuid.uuid4())
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _service(self, **kwargs) -> LabelImageMigrationService:
+        return LabelImageMigrationService(
+            label_approval_jobs_persistence_adapter=self.persistence_adapter,
+            blob_storage_adapter=self.blob_storage_adapter,
+            **kwargs
+        )
+
+    def _create_job(self, label_image: LabelImage) -> LabelApprovalJob:
+        job = LabelApprovalJob(
+            brand_name="Brand",
+            product_class="beer",
+            job_metadata=JobMetadata(reviewer_id="reviewer", label_images=[label_image])
+        )
+        return self.persistence_adapter.create_approval_job(job=job, created_by=self.created_by)
+
+    def _inline_job(self) -> LabelApprovalJob:
+        return self._create_job(LabelImage(base64=f"data:image/png;base64,{PNG_BASE64}", image_content_type="image/png"))
+
+    def test_migrate_moves_inline_images_to_blob_storage(self):
+        inline_jobs = [self._inline_job() for _ in range(3)]
+        uploaded_job = self._create_job(LabelImage(image_url="https://blob.example/label.png"))
+
+        progress = self._service().migrate(LabelImageMigrationCheckpoint(self.checkpoint_path), batch_size=2)
+
+        self.assertEqual(progress.jobs_scanned, 3)
+        self.assertEqual(progress.jobs_migrated, 3)
+        self.assertEqual(progress.images_migrated, 3)
+        self.assertEqual(progress.bytes_migrated, 3 * len(base64.b64decode(PNG_BASE64)))
+        sha256 = hashlib.sha256(base64.b64decode(PNG_BASE64)).hexdigest()
+        for job in inline_jobs:
+            label_image = self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().label_images[0]
+            self.assertIsNone(label_image.base64)
+            self.assertTrue(label_image.image_url.endswith(f"label-images/{sha256}.png"))
+            self.assertEqual(self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().reviewer_id, "reviewer")
+        untouched = self.persistence_adapter.get_approval_job_by_id(uploaded_job.id).get_job_metadata().label_images[0]
+        self.assertEqual(untouched.image_url, "https://blob.example/label.png")
+        self.assertEqual(self.persistence_adapter.list_jobs_with_inline_images(), [])
+
+    def test_migrate_resumes_from_checkpoint(self):
+        for _ in range(3):
+            self._inline_job()
+        checkpoint = LabelImageMigrationCheckpoint(self.checkpoint_path)
+
+        first_run = self._service().migrate(checkpoint, batch_size=1, max_jobs=2)
+        self.assertEqual(first_run.jobs_scanned, 2)
+        self.assertTrue(Path(self.checkpoint_path).exists())
+
+        second_run = self._service().migrate(checkpoint, batch_size=1)
+        # counters are cumulative, and the already migrated jobs are not scanned again
+        self.assertEqual(second_run.jobs_scanned, 3)
+        self.assertEqual(second_run.jobs_migrated, 3)
+
+    def test_dry_run_changes_nothing(self):
+        job = self._inline_job()
+
+        progress = self._service().migrate(LabelImageMigrationCheckpoint(self.checkpoint_path), dry_run=True)
+
+        self.assertEqual(progress.images_migrated, 1)
+        self.assertIsNotNone(self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().label_images[0].base64)
+        self.assertFalse(Path(self.checkpoint_path).exists())
+
+    def test_failed_upload_keeps_image_inline(self):
+        job = self._inline_job()
+        failing_blob_storage_adapter = Mock()
+        failing_blob_storage_adapter.upload_image.side_effect = RuntimeError("Upload failed")
+        service = LabelImageMigrationService(
+            label_approval_jobs_persistence_adapter=self.persistence_adapter,
+            blob_storage_adapter=failing_blob_storage_adapter
+        )
+
+        progress = service.migrate(LabelImageMigrationCheckpoint(None))
+
+        self.assertEqual(progress.images_failed, 1)
+        self.assertEqual(progress.jobs_migrated, 0)
+        self.assertIsNotNone(self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().label_images[0].base64)
+
+    def test_failed_upload_is_retried_first_by_the_resumed_run(self):
+        job = self._inline_job()
+        checkpoint = LabelImageMigrationCheckpoint(self.checkpoint_path)
+        failing_blob_storage_adapter = Mock()
+        failing_blob_storage_adapter.upload_image.side_effect = RuntimeError("Upload failed")
+        failed_run = LabelImageMigrationService(
+            label_approval_jobs_persistence_adapter=self.persistence_adapter,
+            blob_storage_adapter=failing_blob_storage_adapter
+        ).migrate(checkpoint)
+        self.assertEqual(failed_run.last_job_id, job.id)
+        self.assertEqual(failed_run.retry_job_ids, [job.id])
+
+        resumed_run = self._service().migrate(checkpoint)
+
+        self.assertEqual(resumed_run.jobs_migrated, 1)
+        self.assertEqual(resumed_run.retry_job_ids, [])
+        self.assertIsNone(self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().label_images[0].base64)
+
+    def test_job_updated_during_migration_is_retried_first_by_the_resumed_run(self):
+        job = self._inline_job()
+        checkpoint = LabelImageMigrationCheckpoint(self.checkpoint_path)
+        with patch.object(self.persistence_adapter, "set_job_metadata_if_unchanged", return_value=False):
+            skipped_run = self._service().migrate(checkpoint)
+        self.assertEqual(skipped_run.jobs_skipped_concurrent_update, 1)
+        self.assertEqual(skipped_run.retry_job_ids, [job.id])
+
+        resumed_run = self._service().migrate(checkpoint)
+
+        self.assertEqual(resumed_run.jobs_migrated, 1)
+        self.assertEqual(resumed_run.retry_job_ids, [])
+        self.assertEqual(self.persistence_adapter.list_jobs_with_inline_images(), [])
+
+    def test_rate_limit(self):
+        for _ in range(4):
+            self._inline_job()
+        sleeps = []
+        service = self._service(clock=lambda: 0.0, sleep=sleeps.append)
+
+        service.migrate(LabelImageMigrationCheckpoint(None), max_jobs_per_second=2)
+
+        # with a frozen clock every job puts the run another half second ahead of the allowed rate
+        self.assertEqual(sleeps, [0.5, 1.0, 1.5, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import tempfile
+import unittest
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_layout import OcrTextLayout
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_models import OcrResult
+from treasury.services.gateways.ttb_api.main.adapter.out.ocr.ocr_profiles import OcrProfile, OcrProfileSelector
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.local_filesystem_blob_storage_adapter import \
+    LocalFilesystemBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_spool_adapter import \
+    LabelImageSpoolAdapter
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import (
+    JobMetadata,
+    LabelApprovalJob,
+    LabelImage,
+    OcrOverlayLevel
+)
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
+    BrandDataStrict,
+    ProductInfoStrict
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ocr_overlay import \
+    LabelImageOcrOverlayService
+
+
+def _image_bytes() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (400, 200), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _ocr_result() -> OcrResult:
+    layout = OcrTextLayout.from_ocr_data({
+        'level': [5], 'page_num': [1], 'block_num': [1], 'par_num': [1], 'line_num': [1], 'word_num': [1],
+        'left': [50], 'top': [60], 'width': [100], 'height': [40], 'conf': [93.0], 'text': ['PILSNER'],
+    })
+    return OcrResult.from_layout(
+        layout, full_text="PILSNER", average_confidence=93.0, image_width=400, image_height=200
+    )
+
+
+class TestLabelImageOcrOverlayService(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.blob_storage_adapter = LocalFilesystemBlobStorageAdapter(root_dir=f"{self._temp_dir.name}/blobs")
+        self.spool_adapter = LabelImageSpoolAdapter(spool_dir=f"{self._temp_dir.name}/spool")
+        self.ocr_adapter = MagicMock()
+        self.ocr_adapter.extract_text_from_image.return_value = _ocr_result()
+        self.ocr_adapter.settings_digest.return_value = "0123456789ab"
+        self.http_client = MagicMock()
+        self.service = LabelImageOcrOverlayService(
+            ocr_adapter=self.ocr_adapter,
+            ocr_profile_selector=OcrProfileSelector(profiles_by_product_class={"beer": OcrProfile.from_preset("sparse")}),
+            blob_storage_adapter=self.blob_storage_adapter,
+            label_image_spool_adapter=self.spool_adapter,
+            http_client=self.http_client
+        )
+        self.image_bytes = _image_bytes()
+        self.sha256 = hashlib.sha256(self.image_bytes).hexdigest()
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _job(self, label_image: LabelImage) -> LabelApprovalJob:
+        return LabelApprovalJob(
+            brand_name="Brand",
+            product_class="spirits",
+            job_metadata=JobMetadata(
+                product_info=BrandDataStrict(products=[ProductInfoStrict(product_class_type="Beer")]),
+                label_images=[label_image]
+            )
+        )
+
+    def _overlay(self, overlay_url: str) -> Image.Image:
+        return Image.open(BytesIO(self.blob_storage_adapter.read(overlay_url[overlay_url.index("label-images/"):])))
+
+    def test_overlay_is_rendered_once_then_looked_up(self):
+        image_url = self.blob_storage_adapter.upload_image(self.image_bytes, "image/png")
+        label_image = LabelImage(image_url=image_url, image_content_type="image/png")
+
+        overlay_url = self.service.get_overlay_url(self._job(label_image), label_image)
+        self.assertEqual(self.service.get_overlay_url(self._job(label_image), label_image), overlay_url)
+
+        self.assertIn(f"label-images/{self.sha256}/ocr-overlay-v2-sparse-0123456789ab-words-confidence.jpg", overlay_url)
+        # OCR'd once, with the profile of the product class on the form, and never downloaded
+        self.assertEqual(self.ocr_adapter.extract_text_from_image.call_count, 1)
+        image, profile = self.ocr_adapter.extract_text_from_image.call_args.args
+        self.assertEqual(profile.name, "sparse")
+        self.http_client.get.assert_not_called()
+
+        overlay = self._overlay(overlay_url)
+        self.assertEqual(overlay.format, "JPEG")
+        self.assertEqual(overlay.size, (400, 200))
+
+    def test_drawing_options_get_their_own_overlays(self):
+        image_url = self.blob_storage_adapter.upload_image(self.image_bytes, "image/png")
+        label_image = LabelImage(image_url=image_url, image_content_type="image/png")
+
+        words_url = self.service.get_overlay_url(self._job(label_image), label_image)
+        blocks_url = self.service.get_overlay_url(
+            self._job(label_image), label_image, draw_level=OcrOverlayLevel.blocks, show_confidence=False
+        )
+
+        self.assertNotEqual(words_url, blocks_url)
+        self.assertTrue(blocks_url.endswith("ocr-overlay-v2-sparse-0123456789ab-blocks.jpg"))
+        self.assertEqual(self.ocr_adapter.extract_text_from_image.call_count, 2)
+
+    def test_ocr_settings_get_their_own_overlays(self):
+        image_url = self.blob_storage_adapter.upload_image(self.image_bytes, "image/png")
+        label_image = LabelImage(image_url=image_url, image_content_type="image/png")
+
+        default_url = self.service.get_overlay_url(self._job(label_image), label_image)
+        # e.g. another OCR_PREPROCESSING preset
+        self.ocr_adapter.settings_digest.return_value = "ba9876543210"
+        preprocessed_url = self.service.get_overlay_url(self._job(label_image), label_image)
+
+        self.assertNotEqual(default_url, preprocessed_url)
+        self.assertEqual(self.ocr_adapter.extract_text_from_image.call_count, 2)
+
+    def test_image_is_ocrd_in_its_stored_orientation(self):
+        buffer = BytesIO()
+        image = Image.new("RGB", (400, 200), "white")
+        exif = image.getexif()
+        exif[0x0112] = 6  # Orientation: rotated 90 degrees
+        image.save(buffer, format="JPEG", exif=exif)
+
+        overlay = Image.open(BytesIO(self.service.render(buffer.getvalue(), OcrProfile.from_preset("default"))))
+
+        # As the pytesseract analysis reads it, boxes and all
+        ocr_image, _ = self.ocr_adapter.extract_text_from_image.call_args.args
+        self.assertEqual(ocr_image.size, (400, 200))
+        self.assertEqual(overlay.size, (400, 200))
+
+    def test_spooled_and_inline_images(self):
+        key = f"label-images/{self.sha256}.png"
+        self.spool_adapter.spool(key, self.image_bytes, "image/png")
+        spooled = LabelImage(pending_upload_key=key, image_content_type="image/png")
+        inline = LabelImage(
+            base64=f"data:image/png;base64,{base64.b64encode(self.image_bytes).decode('ascii')}",
+            image_content_type="image/png"
+        )
+
+        spooled_url = self.service.get_overlay_url(self._job(spooled), spooled)
+        inline_url = self.service.get_overlay_url(self._job(inline), inline)
+
+        # The same bytes, so the same overlay
+        self.assertEqual(spooled_url, inline_url)
+        self.assertEqual(self.ocr_adapter.extract_text_from_image.call_count, 1)
+
+    def test_image_stored_elsewhere_is_downloaded(self):
+        self.http_client.get.return_value.content = self.image_bytes
+        label_image = LabelImage(image_url="https://example.com/label.png")
+
+        overlay_url = self.service.get_overlay_url(self._job(label_image), label_image)
+
+        self.http_client.get.assert_called_once_with("https://example.com/label.png")
+        self.assertIn(f"label-images/{self.sha256}/", overlay_url)
+
+    def test_ocr_failure(self):
+        self.ocr_adapter.extract_text_from_image.return_value = OcrResult(
+            full_text="", average_confidence=0.0, image_width=0, image_height=0, success=False,
+            error_message="Tesseract OCR not installed or not found in PATH"
+        )
+        image_url = self.blob_storage_adapter.upload_image(self.image_bytes, "image/png")
+        label_image = LabelImage(image_url=image_url, image_content_type="image/png")
+
+        with self.assertRaises(RuntimeError):
+            self.service.get_overlay_url(self._job(label_image), label_image)
+
+    def test_render_draws_on_the_decoded_image(self):
+        overlay = Image.open(BytesIO(self.service.render(
+            self.image_bytes, OcrProfile.from_preset("default"), OcrOverlayLevel.words, show_confidence=False
+        ))).convert("RGB")
+
+        red, green, blue = overlay.getpixel((51, 80))
+        self.assertGreater(red, 200)
+        self.assertLess(max(green, blue), 80)
+        self.assertGreater(min(overlay.getpixel((100, 80))), 240)
+
+
+if __name__ == '__main__':
+    unittest.main()
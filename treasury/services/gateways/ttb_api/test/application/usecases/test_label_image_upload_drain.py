@@ -0,0 +1,140 @@
+import base64
+import hashlib
+import tempfile
+import unittest
+import uuid
+from unittest.mock import Mock
+
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from treasury.services.gateways.ttb_api.main.adapter.out.persistence.common.db_config import DbConfig
+from treasury.services.gateways.ttb_api.main.adapter.out.persistence.label_approvals_persistence_adapter import \
+    LabelApprovalJobsPersistenceAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.label_image_spool_adapter import \
+    LabelImageSpoolAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.local_filesystem_blob_storage_adapter import \
+    LocalFilesystemBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.application.models.domain.entity_descriptor import EntityDescriptor
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_approval_job import LabelApprovalJob, \
+    JobMetadata, LabelImage
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_upload_drain import \
+    LabelImageUploadDrainService
+from treasury.services.gateways.ttb_api.main.application.utils.circuit_breaker import CircuitOpenError
+
+PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+PNG_KEY = f"label-images/{hashlib.sha256(PNG_BYTES).hexdigest()}.png"
+
+
+class TestLabelImageUploadDrainService(unittest.TestCase):
+    orm_engine = DbConfig.get_orm_engine(in_memory=True, local_on_disk=False)
+    SQLModel.metadata.create_all(bind=orm_engine)
+
+    def setUp(self) -> None:
+        with Session(self.orm_engine) as session:
+            session.query(LabelApprovalJob).delete()
+            session.commit()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.persistence_adapter = LabelApprovalJobsPersistenceAdapter(orm_engine=self.orm_engine)
+        self.blob_storage_adapter = LocalFilesystemBlobStorageAdapter(root_dir=f"{self._temp_dir.name}/blobs")
+        self.spool_adapter = LabelImageSpoolAdapter(spool_dir=f"{self._temp_dir.name}/spool")
+        self.created_by = EntityDescriptor.of_user(id=str(uuid.uuid4()), org_id=uuid.uuid4())
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _service(self, blob_storage_adapter=None) -> LabelImageUploadDrainService:
+        return LabelImageUploadDrainService(
+            label_approval_jobs_persistence_adapter=self.persistence_adapter,
+            blob_storage_adapter=blob_storage_adapter or self.blob_storage_adapter,
+            label_image_spool_adapter=self.spool_adapter
+        )
+
+    def _pending_job(self) -> LabelApprovalJob:
+        job = LabelApprovalJob(
+            brand_name="Brand",
+            product_class="beer",
+            job_metadata=JobMetadata(
+                reviewer_id="reviewer",
+                label_images=[LabelImage(image_content_type="image/png", pending_upload_key=PNG_KEY)]
+            )
+        )
+        return self.persistence_adapter.create_approval_job(job=job, created_by=self.created_by)
+
+    def test_drain_uploads_spooled_images_and_patches_jobs(self):
+        self.spool_adapter.spool(PNG_KEY, PNG_BYTES, "image/png")
+        jobs = [self._pending_job() for _ in range(3)]
+
+        result = self._service().drain_once(batch_size=2)
+
+        self.assertEqual(result.images_uploaded, 1)
+        self.assertEqual(result.jobs_patched, 3)
+        self.assertEqual(self.spool_adapter.list_entries(), [])
+        self.assertEqual(self.blob_storage_adapter.read(PNG_KEY), PNG_BYTES)
+        for job in jobs:
+            label_image = self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().label_images[0]
+            self.assertIsNone(label_image.pending_upload_key)
+            self.assertTrue(label_image.image_url.endswith(PNG_KEY))
+            self.assertIsNotNone(label_image.thumbnail_url)
+        self.assertEqual(self.persistence_adapter.list_jobs_with_pending_uploads(), [])
+
+    def test_drain_keeps_images_spooled_while_storage_is_down(self):
+        self.spool_adapter.spool(PNG_KEY, PNG_BYTES, "image/png")
+        job = self._pending_job()
+        unavailable_blob_storage = Mock()
+        unavailable_blob_storage.upload_image.side_effect = CircuitOpenError("Circuit is open")
+
+        result = self._service(blob_storage_adapter=unavailable_blob_storage).drain_once()
+
+        self.assertTrue(result.storage_unavailable)
+        self.assertEqual(len(self.spool_adapter.list_entries()), 1)
+        label_image = self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().label_images[0]
+        self.assertEqual(label_image.pending_upload_key, PNG_KEY)
+
+        # Storage is back: the next pass finishes the job
+        result = self._service().drain_once()
+        self.assertEqual(result.jobs_patched, 1)
+
+    def test_drain_skips_jobs_updated_concurrently(self):
+        self.spool_adapter.spool(PNG_KEY, PNG_BYTES, "image/png")
+        job = self._pending_job()
+        self.persistence_adapter.set_job_status(job_id=job.id, status="approved", updated_by=self.created_by)
+        stale_job = job.model_copy()
+        persistence_adapter = Mock(wraps=self.persistence_adapter)
+        persistence_adapter.list_jobs_with_pending_uploads.side_effect = [[stale_job], []]
+
+        result = LabelImageUploadDrainService(
+            label_approval_jobs_persistence_adapter=persistence_adapter,
+            blob_storage_adapter=self.blob_storage_adapter,
+            label_image_spool_adapter=self.spool_adapter
+        ).drain_once()
+
+        self.assertEqual(result.jobs_skipped_concurrent_update, 1)
+        self.assertEqual(self._service().drain_once().jobs_patched, 1)
+
+    def test_drain_looks_for_pending_jobs_only_when_there_is_something_to_patch(self):
+        persistence_adapter = Mock(wraps=self.persistence_adapter)
+        service = LabelImageUploadDrainService(
+            label_approval_jobs_persistence_adapter=persistence_adapter,
+            blob_storage_adapter=self.blob_storage_adapter,
+            label_image_spool_adapter=self.spool_adapter
+        )
+
+        # The first pass finishes what an interrupted one may have left, later ones wait for the spool
+        service.drain_once()
+        service.drain_once()
+        self.assertEqual(persistence_adapter.list_jobs_with_pending_uploads.call_count, 1)
+
+        self.spool_adapter.spool(PNG_KEY, PNG_BYTES, "image/png")
+        job = self._pending_job()
+        self.assertEqual(service.drain_once().jobs_patched, 1)
+        self.assertIsNone(self.persistence_adapter.get_approval_job_by_id(job.id).get_job_metadata().label_images[0].pending_upload_key)
+        call_count = persistence_adapter.list_jobs_with_pending_uploads.call_count
+        service.drain_once()
+        self.assertEqual(persistence_adapter.list_jobs_with_pending_uploads.call_count, call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import base64
+import unittest
+from unittest.mock import Mock
+
+import boto3
+from moto import mock_aws
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.local_filesystem_blob_storage_adapter import \
+    LocalFilesystemBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.s3_blob_storage_adapter import S3BlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_ingestion import IMAGE_HEADER_BYTES
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_uploads import LabelImageUploadsService
+
+PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+@mock_aws
+class TestLabelImageUploadsServiceDirectUploads(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.s3_client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test"
+        )
+        self.s3_client.create_bucket(Bucket="label-images-bucket")
+        self.service = LabelImageUploadsService(
+            blob_storage_adapter=S3BlobStorageAdapter(bucket="label-images-bucket", s3_client=self.s3_client)
+        )
+
+    def test_direct_upload_round_trip(self):
+        presigned = self.service.create_direct_upload("image/png")
+        self.assertRegex(presigned.key, r"^uploads/label-images/[0-9a-f]{32}\.png$")
+
+        # The client uploads straight to the bucket, with the content type the upload was presigned for
+        self.s3_client.put_object(Bucket="label-images-bucket", Key=presigned.key, Body=PNG_BYTES, ContentType="image/png")
+
+        ingested = self.service.ingest_direct_upload(presigned.key, permitted_types=["png"])
+        self.assertEqual(ingested.data, PNG_BYTES)
+        self.assertEqual(ingested.image_format, "png")
+
+        self.service.discard_direct_upload(presigned.key)
+        with self.assertRaises(ValueError):
+            self.service.ingest_direct_upload(presigned.key, permitted_types=["png"])
+
+    def test_ingest_direct_upload_validates_before_downloading(self):
+        adapter = self.service._blob_storage_adapter
+        read = Mock(wraps=adapter.read)
+        read_range = Mock(wraps=adapter.read_range)
+        adapter.read, adapter.read_range = read, read_range
+        presigned = self.service.create_direct_upload("image/png")
+        self.s3_client.put_object(Bucket="label-images-bucket", Key=presigned.key, Body=b"not an image", ContentType="image/png")
+
+        with self.assertRaises(ValueError):
+            self.service.ingest_direct_upload(presigned.key, permitted_types=["png"])
+
+        # Rejected from the first bytes, the object was never read in full
+        read_range.assert_called_once_with(presigned.key, 0, IMAGE_HEADER_BYTES)
+        read.assert_not_called()
+
+    def test_ingest_direct_upload_rejects_other_content_type(self):
+        presigned = self.service.create_direct_upload("image/png")
+        self.s3_client.put_object(Bucket="label-images-bucket", Key=presigned.key, Body=PNG_BYTES, ContentType="image/gif")
+
+        with self.assertRaises(ValueError):
+            self.service.ingest_direct_upload(presigned.key, permitted_types=["png", "gif"])
+
+    def test_create_direct_upload_invalid_content_type(self):
+        with self.assertRaises(ValueError):
+            self.service.create_direct_upload("image/bmp")
+
+    def test_ingest_direct_upload_rejects_keys_not_issued_for_uploads(self):
+        self.s3_client.put_object(Bucket="label-images-bucket", Key="label-images/abc.png", Body=PNG_BYTES)
+
+        with self.assertRaises(ValueError):
+            self.service.ingest_direct_upload("label-images/abc.png", permitted_types=["png"])
+
+    def test_create_direct_upload_unsupported_backend(self):
+        service = LabelImageUploadsService(blob_storage_adapter=LocalFilesystemBlobStorageAdapter())
+
+        with self.assertRaises(NotImplementedError):
+            service.create_direct_upload("image/png")
+
+
+if __name__ == '__main__':
+    unittest.main()
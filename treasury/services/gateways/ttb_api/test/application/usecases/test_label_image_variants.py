@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from treasury.services.gateways.ttb_api.main.adapter.out.storage.local_filesystem_blob_storage_adapter import \
+    LocalFilesystemBlobStorageAdapter
+from treasury.services.gateways.ttb_api.main.application.usecases.label_image_variants import \
+    LabelImageVariantsService, THUMBNAIL_VARIANT, DISPLAY_VARIANT, OCR_VARIANT, THUMBNAIL_MAX_SIDE
+
+
+def _label_image_bytes(size=(3000, 1500), image_format="PNG", mode="RGB") -> bytes:
+    image = Image.new(mode, size, "white" if mode != "RGBA" else (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([(100, 100), (1200, 400)], fill="black")
+    buffer = BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class TestLabelImageVariantsService(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.blob_storage_adapter = LocalFilesystemBlobStorageAdapter(root_dir=self._temp_dir.name)
+        self.service = LabelImageVariantsService(blob_storage_adapter=self.blob_storage_adapter)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_render(self):
+        rendered = LabelImageVariantsService.render(_label_image_bytes())
+
+        thumbnail = Image.open(BytesIO(rendered[THUMBNAIL_VARIANT].data))
+        self.assertEqual(thumbnail.format, "JPEG")
+        self.assertEqual(thumbnail.size, (THUMBNAIL_MAX_SIDE, THUMBNAIL_MAX_SIDE // 2))
+
+        display = Image.open(BytesIO(rendered[DISPLAY_VARIANT].data))
+        self.assertEqual(display.format, "JPEG")
+        self.assertEqual(display.size, (2048, 1024))
+
+        ocr = Image.open(BytesIO(rendered[OCR_VARIANT].data))
+        self.assertEqual(ocr.format, "PNG")
+        self.assertEqual(ocr.mode, "L")
+        # full resolution, so OCR bounding boxes line up with the original
+        self.assertEqual(ocr.size, (3000, 1500))
+        self.assertEqual(ocr.getpixel((500, 200)), 0)
+        self.assertEqual(ocr.getpixel((2500, 1000)), 255)
+
+    def test_ocr_rendition_keeps_the_pixel_grid_of_the_original(self):
+        image = Image.new("RGB", (5000, 300), "white")
+        exif = image.getexif()
+        exif[0x0112] = 6  # Orientation: rotated 90 degrees
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", exif=exif)
+
+        rendered = LabelImageVariantsService.render(buffer.getvalue())
+
+        # Neither downscaled nor rotated, unlike the display rendition
+        self.assertEqual(Image.open(BytesIO(rendered[OCR_VARIANT].data)).size, (5000, 300))
+        self.assertEqual(Image.open(BytesIO(rendered[DISPLAY_VARIANT].data)).size, (123, 2048))
+
+    def test_render_transparent_image_on_white(self):
+        rendered = LabelImageVariantsService.render(_label_image_bytes(size=(100, 100), mode="RGBA"))
+
+        thumbnail = Image.open(BytesIO(rendered[THUMBNAIL_VARIANT].data)).convert("RGB")
+        self.assertGreater(min(thumbnail.getpixel((0, 0))), 240)
+
+    def test_render_invalid_image(self):
+        with self.assertRaises(ValueError):
+            LabelImageVariantsService.render(b"not an image")
+
+    def test_create_variants(self):
+        variants = self.service.create_variants(_label_image_bytes(), sha256="abc")
+
+        self.assertTrue(variants.thumbnail_url.endswith(f"label-images/abc/{THUMBNAIL_VARIANT}.jpg"))
+        self.assertTrue(variants.display_url.endswith(f"label-images/abc/{DISPLAY_VARIANT}.jpg"))
+        self.assertTrue(variants.ocr_url.endswith(f"label-images/abc/{OCR_VARIANT}.png"))
+
+    def test_create_variants_reuses_stored_renditions(self):
+        first = self.service.create_variants(_label_image_bytes(), sha256="abc")
+        thumbnail_path = Path(self._temp_dir.name) / "label-images" / "abc" / f"{THUMBNAIL_VARIANT}.jpg"
+        modified_at = thumbnail_path.stat().st_mtime_ns
+
+        # Not decoded again - the bytes are not even an image
+        second = self.service.create_variants(b"not an image", sha256="abc")
+
+        self.assertEqual(first, second)
+        self.assertEqual(thumbnail_path.stat().st_mtime_ns, modified_at)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import unittest
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import (
+    BrandDataStrict,
+    ProductInfoStrict,
+    ProductOtherInfo
+)
+from treasury.services.gateways.ttb_api.main.application.usecases.llm_prompts import LlmPrompts
+
+
+class TestLlmPrompts(unittest.TestCase):
+
+    def _brand_data(self, warnings: str = None) -> BrandDataStrict:
+        return BrandDataStrict(
+            brand_name="Old Tom Distillery",
+            products=[ProductInfoStrict(
+                name="Old Tom Gin",
+                product_class_type="Gin",
+                alcohol_content_abv="41.3%",
+                net_contents=None,
+                other_info=ProductOtherInfo(warnings=warnings)
+            )]
+        )
+
+    def test_label_analysis_prompt_is_compact(self):
+        prompt = LlmPrompts.get_label_analysis_prompt(
+            given_brand_label_info=self._brand_data(warnings="GOVERNMENT WARNING: ..."),
+            extracted_brand_label_info=self._brand_data()
+        )
+
+        given_line, extracted_line, warnings_line = prompt.split("\n")
+        given = json.loads(given_line.removeprefix("GIVEN: "))
+        extracted = json.loads(extracted_line.removeprefix("EXTRACTED: "))
+
+        # null fields are dropped and the JSON is not indented
+        self.assertNotIn("net_contents", given["products"][0])
+        self.assertNotIn("warnings", extracted["products"][0]["other_info"])
+        self.assertNotIn("null", prompt)
+        self.assertNotIn("  ", prompt)
+        self.assertEqual(warnings_line, "Merchant provided warnings: yes")
+
+    def test_label_analysis_prompt_leaves_out_the_parsed_quantities(self):
+        prompt = LlmPrompts.get_label_analysis_prompt(
+            given_brand_label_info=self._brand_data(warnings="GOVERNMENT WARNING: ..."),
+            extracted_brand_label_info=self._brand_data()
+        )
+
+        self.assertIn('"alcohol_content_abv":"41.3%"', prompt)
+        self.assertNotIn("alcohol_content_percent", prompt)
+        self.assertNotIn("net_contents_ml", prompt)
+
+    def test_static_prompts_have_no_padding(self):
+        for prompt in [
+            LlmPrompts.TTB_LABEL_ANALYSIS_SYSTEM_PROMPT,
+            LlmPrompts.TTB_LABEL_IMAGE_INQUIRY_PROMPT,
+            LlmPrompts.TTB_LABEL_VERIFICATION_SYSTEM_PROMPT
+        ]:
+            for line in prompt.split("\n"):
+                self.assertTrue(line)
+                self.assertEqual(line, line.strip())
+        self.assertIn("export interface LabelImageAnalysisResult", LlmPrompts.TTB_LABEL_ANALYSIS_SYSTEM_PROMPT)
+
+    def test_label_verification_prompt_lists_only_the_fields_to_check(self):
+        prompt = LlmPrompts.get_label_verification_prompt(self._brand_data(), ["brand_name", "alcohol_content"])
+
+        self.assertEqual(prompt, 'CHECK:\nbrand_name: "Old Tom Distillery"\nalcohol_content: "41.3%"')
+
+
+if __name__ == '__main__':
+    unittest.main()
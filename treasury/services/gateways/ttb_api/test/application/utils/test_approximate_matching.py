@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from treasury.services.gateways.ttb_api.main.application.utils.approximate_matching import (
+    ApproximatePhraseFinder,
+    bounded_edit_distance
+)
+
+
+def osa_distance(a: str, b: str) -> int:
+    """Full-matrix optimal string alignment distance, the reference for the banded one"""
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+class TestBoundedEditDistance(unittest.TestCase):
+
+    def test_edits(self):
+        self.assertEqual(bounded_edit_distance("stone's throw", "stone's throw", 2), 0)
+        self.assertEqual(bounded_edit_distance("stone's throw", "stonf's throw", 2), 1)
+        self.assertEqual(bounded_edit_distance("stone's throw", "stnoe's throw", 2), 1)
+        self.assertEqual(bounded_edit_distance("stone's throw", "stone'sthrow", 2), 1)
+        self.assertEqual(bounded_edit_distance("stone's throw", "stone's thr0w!", 2), 2)
+        self.assertIsNone(bounded_edit_distance("stone's throw", "stone's thr0w!", 1))
+        self.assertIsNone(bounded_edit_distance("gin", "vodka", 1))
+
+    def test_same_as_full_matrix_within_bound(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            a = ''.join(rng.choice("abc ") for _ in range(rng.randint(0, 10)))
+            b = ''.join(rng.choice("abc ") for _ in range(rng.randint(0, 10)))
+            max_distance = rng.randint(0, 4)
+            expected = osa_distance(a, b)
+            self.assertEqual(
+                bounded_edit_distance(a, b, max_distance),
+                expected if expected <= max_distance else None,
+                (a, b, max_distance)
+            )
+
+
+class TestApproximatePhraseFinder(unittest.TestCase):
+
+    def test_misread_character(self):
+        match = ApproximatePhraseFinder("DISTILLED BY STONF'S THROW CO.".split()).find("Stone's Throw")
+
+        self.assertEqual(match.text, "STONF'S THROW")
+        self.assertEqual(match.distance, 1)
+        self.assertAlmostEqual(match.similarity, 1 - 1 / 13)
+
+    def test_split_and_merged_words(self):
+        self.assertEqual(ApproximatePhraseFinder(["STONE'STHROW"]).find("Stone's Throw").text, "STONE'STHROW")
+        self.assertEqual(ApproximatePhraseFinder("TANQU ERAY GIN".split()).find("Tanqueray").text, "TANQU ERAY")
+
+    def test_too_many_edits(self):
+        finder = ApproximatePhraseFinder("STONY'S THRUST".split())
+
+        self.assertIsNone(finder.find("Stone's Throw"))
+        self.assertIsNotNone(finder.find("Stone's Throw", min_similarity=0.6))
+
+    def test_short_phrases_must_match_whole_words(self):
+        self.assertIsNone(ApproximatePhraseFinder("FOR GIFTS".split()).find("Gin"))
+        self.assertEqual(ApproximatePhraseFinder("DRY GIN".split()).find("Gin").text, "GIN")
+
+    def test_low_confidence_words_are_not_matched(self):
+        words = "STONF'S THROW".split()
+
+        self.assertIsNone(ApproximatePhraseFinder(words, [20.0, 30.0]).find("Stone's Throw", min_ocr_confidence=40))
+        match = ApproximatePhraseFinder(words, [60.0, 90.0]).find("Stone's Throw", min_ocr_confidence=40)
+        self.assertEqual(match.ocr_confidence, 75.0)
+
+    def test_most_confident_of_equally_close_runs(self):
+        finder = ApproximatePhraseFinder("STONF'S THROW STONE'Z THROW".split(), [50.0, 50.0, 95.0, 95.0])
+
+        self.assertEqual(finder.find("Stone's Throw").text, "STONE'Z THROW")
+
+    def test_no_words(self):
+        self.assertIsNone(ApproximatePhraseFinder([]).find("Stone's Throw"))
+        self.assertIsNone(ApproximatePhraseFinder(["GIN"]).find(" "))
+
+
+if __name__ == '__main__':
+    unittest.main()
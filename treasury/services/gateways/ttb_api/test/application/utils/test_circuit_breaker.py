@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import Mock
+
+from treasury.services.gateways.ttb_api.main.application.utils.circuit_breaker import CircuitBreaker, \
+    CircuitOpenError, CircuitState
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.sleeps = []
+        self.breaker = CircuitBreaker(
+            name="test",
+            failure_threshold=2,
+            reset_timeout_seconds=10,
+            max_attempts=3,
+            base_backoff_seconds=0.2,
+            max_backoff_seconds=0.5,
+            clock=self.clock,
+            sleep=self.sleeps.append
+        )
+
+    def test_retries_until_success(self):
+        fn = Mock(side_effect=[RuntimeError("boom"), RuntimeError("boom"), "ok"])
+
+        self.assertEqual(self.breaker.call(fn), "ok")
+
+        self.assertEqual(fn.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        # Full jitter: anywhere between 0 and the capped exponential delay
+        self.assertTrue(0 <= self.sleeps[0] <= 0.2)
+        self.assertTrue(0 <= self.sleeps[1] <= 0.4)
+        self.assertEqual(self.breaker.state, CircuitState.closed)
+
+    def test_backoff_is_capped(self):
+        breaker = CircuitBreaker(name="test", max_attempts=6, base_backoff_seconds=1, max_backoff_seconds=2,
+                                 sleep=self.sleeps.append)
+        with self.assertRaises(RuntimeError):
+            breaker.call(Mock(side_effect=RuntimeError("boom")))
+        self.assertEqual(len(self.sleeps), 5)
+        self.assertTrue(all(0 <= delay <= 2 for delay in self.sleeps))
+
+    def test_non_retryable_errors_are_not_retried(self):
+        fn = Mock(side_effect=ValueError("bad input"))
+
+        with self.assertRaises(ValueError):
+            self.breaker.call(fn, is_retryable=lambda e: not isinstance(e, ValueError))
+
+        self.assertEqual(fn.call_count, 1)
+
+    def test_opens_after_consecutive_failures_and_fails_fast(self):
+        failing = Mock(side_effect=RuntimeError("down"))
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(failing)
+        self.assertEqual(self.breaker.state, CircuitState.open)
+
+        not_called = Mock()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(not_called)
+        not_called.assert_not_called()
+
+    def test_half_open_trial_closes_or_reopens_the_circuit(self):
+        failing = Mock(side_effect=RuntimeError("down"))
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(failing)
+
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, CircuitState.half_open)
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(failing)
+        # A failed trial opens the circuit again right away
+        self.assertEqual(self.breaker.state, CircuitState.open)
+
+        self.clock.now = 20
+        self.assertEqual(self.breaker.call(Mock(return_value="ok")), "ok")
+        self.assertEqual(self.breaker.state, CircuitState.closed)
+
+    def test_success_resets_the_failure_count(self):
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(Mock(side_effect=RuntimeError("down")))
+        self.breaker.call(Mock(return_value="ok"))
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(Mock(side_effect=RuntimeError("down")))
+
+        self.assertEqual(self.breaker.state, CircuitState.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import json
+import unittest
+
+from treasury.services.gateways.ttb_api.main.application.utils.incremental_json_parser import IncrementalJsonParser
+
+
+class TestIncrementalJsonParser(unittest.TestCase):
+
+    _DOCUMENT = {
+        "brand_name": "Tanqueray",
+        "products": [
+            {
+                "name": "Tanqueray London Dry Gin \"No. 10\"",
+                "alcohol_content_abv": "41.3%",
+                "net_contents": None,
+                "rating": 4.5,
+                "organic": False,
+            }
+        ]
+    }
+
+    def _feed_all(self, parser: IncrementalJsonParser, text: str, chunk_size: int) -> list:
+        events = []
+        for i in range(0, len(text), chunk_size):
+            events.extend(parser.feed(text[i:i + chunk_size]))
+        return events
+
+    def test_emits_scalars_with_paths(self):
+        """Test that every scalar is emitted with its full path"""
+        parser = IncrementalJsonParser()
+        events = self._feed_all(parser, json.dumps(self._DOCUMENT), chunk_size=1000)
+
+        self.assertEqual(events, [
+            (("brand_name",), "Tanqueray"),
+            (("products", 0, "name"), "Tanqueray London Dry Gin \"No. 10\""),
+            (("products", 0, "alcohol_content_abv"), "41.3%"),
+            (("products", 0, "net_contents"), None),
+            (("products", 0, "rating"), 4.5),
+            (("products", 0, "organic"), False),
+        ])
+        self.assertTrue(parser.is_complete)
+        self.assertEqual(json.loads(parser.get_document()), self._DOCUMENT)
+
+    def test_chunk_boundaries_do_not_matter(self):
+        """Test that splitting the text into single characters yields the same events"""
+        text = json.dumps(self._DOCUMENT, indent=2)
+        expected = self._feed_all(IncrementalJsonParser(), text, chunk_size=len(text))
+        for chunk_size in (1, 2, 3, 7):
+            self.assertEqual(self._feed_all(IncrementalJsonParser(), text, chunk_size), expected)
+
+    def test_field_is_emitted_before_document_completes(self):
+        """Test that a field is available as soon as its value closes"""
+        parser = IncrementalJsonParser()
+        events = list(parser.feed('{"brand_name": "Stone\'s Throw", "products": [{"alcohol_content_abv": "5'))
+        self.assertEqual(events, [(("brand_name",), "Stone's Throw")])
+        self.assertFalse(parser.is_complete)
+
+        events = list(parser.feed('.0%", "net_contents": 355'))
+        self.assertEqual(events, [(("products", 0, "alcohol_content_abv"), "5.0%")])
+
+        events = list(parser.feed('}]}'))
+        self.assertEqual(events, [(("products", 0, "net_contents"), 355)])
+        self.assertTrue(parser.is_complete)
+
+    def test_ignores_markdown_fences_and_trailing_prose(self):
+        """Test that text around the JSON object is ignored"""
+        parser = IncrementalJsonParser()
+        events = self._feed_all(parser, 'Here you go:\n```json\n{"a": [1, "x"]}\n```\nDone {', chunk_size=4)
+        self.assertEqual(events, [(("a", 0), 1), (("a", 1), "x")])
+        self.assertEqual(parser.get_document(), '{"a": [1, "x"]}')
+
+    def test_unicode_escapes(self):
+        """Test that escape sequences are decoded"""
+        parser = IncrementalJsonParser()
+        events = list(parser.feed('{"name": "Ros\\u00e9 \\\\ Co"}'))
+        self.assertEqual(events, [(("name",), "Rosé \\ Co")])
+
+    def test_invalid_literal_raises(self):
+        """Test that malformed literals raise ValueError"""
+        parser = IncrementalJsonParser()
+        with self.assertRaises(ValueError):
+            list(parser.feed('{"abv": 4x.5}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
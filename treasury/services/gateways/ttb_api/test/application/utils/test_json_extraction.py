@@ -0,0 +1,80 @@
+import json
+import random
+import unittest
+
+from pydantic import ValidationError
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import BrandDataStrict
+from treasury.services.gateways.ttb_api.main.application.utils.json_extraction import (
+    extract_json,
+    extract_json_model,
+    json_object_spans
+)
+
+PROSE = ["Here is the extracted data:", "Sure! {see below}", "Note: values marked \"Unknown\" were unreadable.",
+         "I hope this helps } {", "```", "```json", "", "\n"]
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    kind = rng.randrange(6 if depth < 3 else 4)
+    if kind == 0:
+        return rng.choice(["plain", "brace } in {string", 'quote \" and \\ backslash', "ünïcödé", "```"])
+    if kind == 1:
+        return rng.choice([0, -1, 41.3, 1e10])
+    if kind == 2:
+        return rng.choice([True, False])
+    if kind == 3:
+        return None
+    if kind == 4:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randrange(3))]
+    return {f"key{i}": _random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+
+
+class TestJsonExtraction(unittest.TestCase):
+
+    def test_fenced_object_with_trailing_prose(self):
+        response = '```json\n{"brand_name": "Old Fox", "products": [{"net_contents": "750 mL"}]}\n```\nLet me know!'
+
+        self.assertEqual(extract_json(response)["products"][0]["net_contents"], "750 mL")
+        self.assertEqual(extract_json_model(response, BrandDataStrict).products[0].net_contents_ml, 750.0)
+
+    def test_braces_in_prose_and_strings(self):
+        response = 'Result {not json} follows: {"a": "} {", "b": {"c": "\\"}"}} and {"ignored": true}'
+
+        self.assertEqual(list(json_object_spans('{"a": "}"} x {}')), [(0, 10), (13, 15)])
+        self.assertEqual(extract_json(response), {"a": "} {", "b": {"c": '"}'}})
+        self.assertEqual(extract_json('I hope { this helps: {"a": {"b": 1}} and {"c": 2}'), {"a": {"b": 1}})
+
+    def test_no_object(self):
+        self.assertEqual(extract_json("[1, 2]"), [1, 2])
+        with self.assertRaises(ValueError):
+            extract_json("I could not read the label.")
+        with self.assertRaises(ValueError):
+            extract_json('{"unclosed": "object"')
+        with self.assertRaises(ValueError):
+            extract_json_model("{not json}", BrandDataStrict)
+
+    def test_object_not_fitting_the_model(self):
+        with self.assertRaises(ValidationError):
+            extract_json_model('{"products": [{"alcohol_content_abv": "strong"}]}', BrandDataStrict)
+
+    def test_fuzz_against_json_loads(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            document = {f"field{i}": _random_value(rng) for i in range(rng.randrange(1, 5))}
+            encoded = json.dumps(document, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 2]))
+            response = f"{rng.choice(PROSE[:-2])}\n```json\n{encoded}\n```\n{rng.choice(PROSE)}"
+
+            self.assertEqual(extract_json(response), document, response)
+
+    def test_pathological_responses(self):
+        # Many unbalanced braces and unterminated strings: each character is scanned once
+        for response in ["{" * 200_000, "{" + '\\"' * 100_000, '{"' + "a" * 200_000, "}" * 200_000]:
+            with self.assertRaises(ValueError):
+                extract_json(response)
+        self.assertEqual(extract_json("{" * 100_000 + '{"a": 1}'), {"a": 1})
+        self.assertEqual(extract_json('{} ' * 50_000 + '{"a": 1}'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
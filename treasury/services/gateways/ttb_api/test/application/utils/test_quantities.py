@@ -0,0 +1,58 @@
+import unittest
+
+from treasury.services.gateways.ttb_api.main.application.models.domain.label_extraction_data import ProductInfoStrict
+from treasury.services.gateways.ttb_api.main.application.utils.quantities import (
+    NetContents,
+    alcohol_contents_equal,
+    net_contents_equal,
+    net_contents_millilitres,
+    parse_alcohol_content,
+    parse_net_contents
+)
+
+
+class TestQuantities(unittest.TestCase):
+
+    def test_net_contents_units(self):
+        self.assertEqual(net_contents_millilitres("750 mL"), 750.0)
+        self.assertEqual(net_contents_millilitres("70 cL"), 700.0)
+        self.assertEqual(net_contents_millilitres("1.75 Liters"), 1750.0)
+        self.assertAlmostEqual(net_contents_millilitres("12 fl. oz."), 354.882)
+        self.assertAlmostEqual(net_contents_millilitres("12 FL OZ"), 354.882)
+
+    def test_net_contents_without_or_with_unknown_unit(self):
+        self.assertEqual(parse_net_contents("355"), NetContents(355.0, None))
+        self.assertIsNone(net_contents_millilitres("355"))
+        self.assertEqual(parse_net_contents("-100 mL"), NetContents(-100.0, "ml"))
+        self.assertIsNone(parse_net_contents("750 bottles"))
+        self.assertIsNone(parse_net_contents("abc"))
+        self.assertIsNone(parse_net_contents(None))
+
+    def test_alcohol_content(self):
+        self.assertEqual(parse_alcohol_content("41.3%"), 41.3)
+        self.assertEqual(parse_alcohol_content("5 %"), 5.0)
+        self.assertEqual(parse_alcohol_content("40"), 40.0)
+        self.assertIsNone(parse_alcohol_content("abc%"))
+        self.assertIsNone(parse_alcohol_content("40% ABV"))
+
+    def test_tolerance_based_comparison(self):
+        self.assertTrue(net_contents_equal(net_contents_millilitres("25.4 fl. oz."), 750.0))
+        self.assertFalse(net_contents_equal(net_contents_millilitres("12 fl oz"), 375.0))
+        self.assertFalse(net_contents_equal(None, 750.0))
+        self.assertTrue(alcohol_contents_equal(parse_alcohol_content("40%"), parse_alcohol_content("40.0%")))
+        self.assertFalse(alcohol_contents_equal(40.0, 40.2))
+        self.assertTrue(alcohol_contents_equal(40.0, 40.2, tolerance=0.3))
+
+    def test_product_info_carries_the_numeric_values(self):
+        product = ProductInfoStrict(alcohol_content_abv="41.3%", net_contents="70 cL")
+
+        self.assertEqual(product.alcohol_content_percent, 41.3)
+        self.assertEqual(product.net_contents_ml, 700.0)
+        self.assertEqual(product.net_contents_as_millilitres(), 700.0)
+        self.assertEqual(ProductInfoStrict.model_validate(product.model_dump()).net_contents_ml, 700.0)
+        with self.assertRaises(ValueError):
+            ProductInfoStrict().net_contents_as_millilitres()
+
+
+if __name__ == '__main__':
+    unittest.main()